@@ -28,11 +28,18 @@ import unicodedata
 from decimal import Decimal, Context, Inexact
 
 from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from base.models import academic_year, session_exam_calendar, exam_enrollment, program_manager, tutor, offer_year, \
     learning_unit_year
 from base.models.enums import exam_enrollment_justification_type
+from base.models.exceptions import JustificationValueException
+
+ENCODING_FIELDS = [
+    'score_draft', 'justification_draft', 'score_reencoded', 'justification_reencoded',
+    'score_final', 'justification_final', 'changed',
+]
 
 
 def get_scores_encoding_list(user, **kwargs):
@@ -90,11 +97,7 @@ def get_scores_encoding_list(user, **kwargs):
 
 
 def _append_session_exam_deadline(enrollments):
-    for enrollment in enrollments:
-        enrollment.deadline = exam_enrollment.get_deadline(enrollment)
-        enrollment.deadline_reached = exam_enrollment.is_deadline_reached(enrollment)
-        enrollment.deadline_tutor_reached = exam_enrollment.is_deadline_tutor_reached(enrollment)
-    return enrollments
+    return exam_enrollment.resolve_session_exam_deadlines(enrollments)
 
 
 def filter_without_closed_exam_enrollments(scores_encoding_list, is_program_manager=True):
@@ -123,15 +126,58 @@ def find_related_learning_unit_years(scores_encoding_list):
 
 
 def update_enrollments(scores_encoding_list, user):
+    """
+    Validate the encoded enrollments in memory, then write the changed ones and their history in bulk.
+    As with a row by row save, the enrollments preceding an invalid one are saved and the error of the invalid
+    one is raised.
+    """
     is_program_manager = program_manager.is_program_manager(user)
     updated_enrollments = []
+    error = None
     for enrollment in scores_encoding_list.enrollments:
-        enrollment_updated = update_enrollment(enrollment, user, is_program_manager)
+        try:
+            enrollment_updated = prepare_enrollment_update(enrollment, is_program_manager)
+        except Exception as e:
+            error = e
+            break
         if enrollment_updated:
             updated_enrollments.append(enrollment_updated)
+
+    bulk_save_enrollments(updated_enrollments, user, is_program_manager)
+    if error:
+        raise error
     return updated_enrollments
 
 
+def prepare_enrollment_update(enrollment, is_program_manager):
+    enrollment = clean_score_and_justification(enrollment)
+    if can_modify_exam_enrollment(enrollment, is_program_manager) and \
+            is_enrollment_changed(enrollment, is_program_manager):
+        _assign_score_and_justification(enrollment, is_program_manager)
+        _validate_enrollment(enrollment)
+        return enrollment
+    return None
+
+
+def _validate_enrollment(enrollment):
+    # Foreign keys and uniqueness are not modified by the encoding : skip their validation queries
+    enrollment.full_clean(exclude=['session_exam', 'learning_unit_enrollment'], validate_unique=False)
+    if not enrollment.justification_valid():
+        raise JustificationValueException
+
+
+def bulk_save_enrollments(enrollments, user, is_program_manager):
+    if not enrollments:
+        return
+    now = timezone.now()
+    for enrollment in enrollments:
+        enrollment.changed = now
+    with transaction.atomic():
+        exam_enrollment.ExamEnrollment.objects.bulk_update(enrollments, ENCODING_FIELDS)
+        if is_program_manager:
+            exam_enrollment.bulk_create_exam_enrollment_historic(user, enrollments)
+
+
 def assign_encoded_to_reencoded_enrollments(scores_encoding_list):
     scores_encoding_list_assigned = []
     for enrollment in scores_encoding_list.enrollments:
@@ -236,6 +282,16 @@ def is_deadline_reached(enrollment, is_program_manager=True):
 
 
 def set_score_and_justification(enrollment, is_program_manager):
+    _assign_score_and_justification(enrollment, is_program_manager)
+
+    #Validation
+    enrollment.full_clean()
+    enrollment.save()
+
+    return enrollment
+
+
+def _assign_score_and_justification(enrollment, is_program_manager):
     enrollment.score_reencoded = None
     enrollment.justification_reencoded = None
     enrollment.score_draft = enrollment.score_encoded
@@ -244,12 +300,6 @@ def set_score_and_justification(enrollment, is_program_manager):
         enrollment.score_final = enrollment.score_encoded
         enrollment.justification_final = enrollment.justification_encoded
 
-    #Validation
-    enrollment.full_clean()
-    enrollment.save()
-
-    return enrollment
-
 
 class ScoresEncodingList:
     def __init__(self, **kwargs):
@@ -0,0 +1,90 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from celery.utils import uuid
+from django.conf import settings
+from django.core.cache import cache
+from openpyxl import load_workbook
+
+from assessments import tasks
+
+UPLOAD_TASK_CACHE_KEY = "scores_upload_task_{}"
+UPLOAD_TASK_CACHE_TIMEOUT = 86400  # seconds -> 1 day
+
+
+def read_rows(file_name):
+    """
+    Read the values of the active worksheet in one pass.
+    :return: A list of (row_number, row_values) with values serializable in JSON
+    """
+    workbook = load_workbook(file_name, read_only=True, data_only=True)
+    return [
+        (count + 1, [_get_serializable_value(cell.value) for cell in row])
+        for count, row in enumerate(workbook.active.rows)
+    ]
+
+
+def _get_serializable_value(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def must_be_imported_asynchronously(rows):
+    min_rows = settings.SCORES_UPLOAD_ASYNC_MIN_ROWS
+    return bool(min_rows) and len(rows) >= min_rows
+
+
+def start_import_task(user, learning_unit_year_id, rows):
+    """
+    Import the rows in a celery task. The owner of the task is kept so that nobody else can follow its progress.
+    :return: The id of the task
+    """
+    task_id = uuid()
+    cache.set(
+        UPLOAD_TASK_CACHE_KEY.format(task_id),
+        _get_task_owner(user, learning_unit_year_id),
+        UPLOAD_TASK_CACHE_TIMEOUT
+    )
+    tasks.import_scores.apply_async(args=(user.pk, learning_unit_year_id, rows), task_id=task_id)
+    return task_id
+
+
+def is_import_task_owner(task_id, user, learning_unit_year_id):
+    return bool(task_id) and \
+        cache.get(UPLOAD_TASK_CACHE_KEY.format(task_id)) == _get_task_owner(user, learning_unit_year_id)
+
+
+def get_import_task_result(task_id):
+    return tasks.import_scores.AsyncResult(task_id)
+
+
+def forget_import_task(result):
+    result.forget()
+    cache.delete(UPLOAD_TASK_CACHE_KEY.format(result.id))
+
+
+def _get_task_owner(user, learning_unit_year_id):
+    return {'user_id': user.pk, 'learning_unit_year_id': learning_unit_year_id}
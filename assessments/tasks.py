@@ -0,0 +1,43 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.models import User
+from django.utils import translation
+
+from backoffice.celery import app as celery_app
+from base.models import person
+
+
+@celery_app.task(bind=True)
+def import_scores(self, user_id, learning_unit_year_id, rows):
+    from assessments.views import upload_xls_utils
+
+    def report_progress(current, total):
+        self.update_state(state='PROGRESS', meta={'user_id': user_id, 'current': current, 'total': total})
+
+    user = User.objects.get(pk=user_id)
+    with translation.override(person.get_user_interface_language(user)):
+        messages_to_show = upload_xls_utils.import_scores(user, learning_unit_year_id, rows, report_progress)
+    return {'user_id': user_id, 'messages': [(level, str(message)) for level, message in messages_to_show]}
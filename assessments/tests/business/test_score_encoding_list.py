@@ -24,10 +24,15 @@
 #
 ##############################################################################
 import decimal
+from unittest import mock
 
 from django.test import TestCase
 
 from assessments.business import score_encoding_list
+from assessments.business.score_encoding_list import ScoresEncodingList
+from assessments.tests.views.test_upload_xls_utils import generate_exam_enrollments
+from base.models.exam_enrollment import ExamEnrollmentHistory
+from base.tests.factories.program_manager import ProgramManagerFactory
 
 
 class TestConvertToDecimal(TestCase):
@@ -45,3 +50,40 @@ class TestConvertToDecimal(TestCase):
     def test_when_deciamls_unauthorized(self):
         with self.assertRaises(ValueError):
             score_encoding_list._convert_to_decimal(float(15.555), False)
+
+
+@mock.patch("assessments.business.score_encoding_list.can_modify_exam_enrollment", return_value=True)
+class TestUpdateEnrollments(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        data = generate_exam_enrollments(2017)
+        cls.enrollments = data["exam_enrollments"]
+        cls.program_manager = ProgramManagerFactory(offer_year=data["offer_years"][0])
+
+    def _encode(self, *scores):
+        for enrollment, score in zip(self.enrollments, scores):
+            enrollment.score_encoded = score
+            enrollment.justification_encoded = None
+        return ScoresEncodingList(enrollments=self.enrollments)
+
+    def test_should_save_changed_enrollments_and_their_history_in_bulk(self, mock_can_modify):
+        updated_enrollments = score_encoding_list.update_enrollments(
+            self._encode("15", "18"),
+            self.program_manager.person.user
+        )
+
+        self.assertEqual(len(updated_enrollments), 2)
+        for enrollment, expected_score in zip(self.enrollments, [15, 18]):
+            enrollment.refresh_from_db()
+            self.assertEqual(enrollment.score_final, expected_score)
+            self.assertEqual(enrollment.score_draft, expected_score)
+        self.assertEqual(ExamEnrollmentHistory.objects.filter(exam_enrollment__in=self.enrollments).count(), 2)
+
+    def test_should_save_enrollments_preceding_an_invalid_one_and_raise_its_error(self, mock_can_modify):
+        with self.assertRaises(ValueError):
+            score_encoding_list.update_enrollments(self._encode("15", "abc"), self.program_manager.person.user)
+
+        self.enrollments[0].refresh_from_db()
+        self.enrollments[1].refresh_from_db()
+        self.assertEqual(self.enrollments[0].score_final, 15)
+        self.assertIsNone(self.enrollments[1].score_final)
@@ -26,13 +26,16 @@
 import datetime
 from unittest import mock
 
-from django.contrib.auth.models import Group
+from django.contrib import messages
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
 from django.http import Http404
-from django.test import TestCase, TransactionTestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
-from assessments.views.upload_xls_utils import _get_score_list_filtered_by_enrolled_state
+from assessments.business.scores_upload import read_rows, UPLOAD_TASK_CACHE_KEY
+from assessments.views.upload_xls_utils import _get_score_list_filtered_by_enrolled_state, import_scores
 from attribution.tests.factories.attribution import AttributionFactory
 from base.models.enums import exam_enrollment_state
 from base.models.enums import number_session, academic_calendar_type, exam_enrollment_justification_type
@@ -317,3 +320,100 @@ class TestUploadXls(MixinTestUploadScoresFile, TestCase):
     def _unsubscribe_one_student(self, exam):
         exam.enrollment_state = exam_enrollment_state.NOT_ENROLLED
         exam.save()
+
+
+class TestImportScores(MixinTestUploadScoresFile, TestCase):
+    def test_should_report_progress_of_validation(self):
+        report_progress = mock.Mock()
+        with open("assessments/tests/resources/correct_score_sheet.xlsx", 'rb') as score_sheet:
+            rows = read_rows(score_sheet)
+
+        result_messages = import_scores(self.a_user, self.learning_unit_year.id, rows, report_progress)
+
+        self.assertIn((messages.SUCCESS, '2 %s' % _('Score saved')), result_messages)
+        report_progress.assert_called_with(2, 2)
+        self.assert_enrollments_equal(
+            self.exam_enrollments,
+            [("score_draft", 16), ("justification_draft", exam_enrollment_justification_type.ABSENCE_UNJUSTIFIED)]
+        )
+
+    @override_settings(SCORES_UPLOAD_ASYNC_MIN_ROWS=1)
+    @mock.patch("assessments.tasks.import_scores.apply_async")
+    def test_should_import_large_sheet_asynchronously(self, mock_apply_async):
+        with open("assessments/tests/resources/correct_score_sheet.xlsx", 'rb') as score_sheet:
+            response = self.client.post(self.url, {'file': score_sheet})
+
+        task_id = mock_apply_async.call_args[1]['task_id']
+        self.assertIn("upload_task_id={}".format(task_id), response.url)
+        self.assertEqual(
+            cache.get(UPLOAD_TASK_CACHE_KEY.format(task_id)),
+            {'user_id': self.a_user.pk, 'learning_unit_year_id': self.learning_unit_year.id}
+        )
+        self.assert_enrollments_equal(self.exam_enrollments, [("score_draft", None), ("justification_draft", None)])
+
+
+class TestUploadScoresFileProgress(MixinTestUploadScoresFile, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.a_user.user_permissions.add(Permission.objects.get(codename='can_access_scoreencoding'))
+        self.progress_url = reverse(
+            'upload_encoding_progress',
+            kwargs={'learning_unit_year_id': self.learning_unit_year.id}
+        )
+        cache.set(
+            UPLOAD_TASK_CACHE_KEY.format('task-id'),
+            {'user_id': self.a_user.pk, 'learning_unit_year_id': self.learning_unit_year.id}
+        )
+        self.addCleanup(cache.clear)
+
+    @mock.patch("assessments.tasks.import_scores.AsyncResult")
+    def test_should_return_progress_of_import(self, mock_async_result):
+        mock_async_result.return_value.configure_mock(
+            info={'user_id': self.a_user.pk, 'current': 1, 'total': 2},
+            state='PROGRESS',
+            **{'successful.return_value': False, 'failed.return_value': False}
+        )
+
+        response = self.client.get(self.progress_url, {'task_id': 'task-id'})
+
+        self.assertEqual(response.json(), {'state': 'PROGRESS', 'current': 1, 'total': 2})
+
+    @mock.patch("assessments.tasks.import_scores.AsyncResult")
+    def test_should_deny_progress_of_import_launched_by_another_user(self, mock_async_result):
+        cache.set(
+            UPLOAD_TASK_CACHE_KEY.format('task-id'),
+            {'user_id': self.a_user.pk + 1, 'learning_unit_year_id': self.learning_unit_year.id}
+        )
+
+        response = self.client.get(self.progress_url, {'task_id': 'task-id'})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(mock_async_result.called)
+
+    @mock.patch("assessments.tasks.import_scores.AsyncResult")
+    def test_should_deny_progress_of_unknown_or_failed_import_without_owner(self, mock_async_result):
+        mock_async_result.return_value.configure_mock(
+            info=Exception("failure"),
+            state='FAILURE',
+            **{'successful.return_value': False, 'failed.return_value': True}
+        )
+
+        response = self.client.get(self.progress_url, {'task_id': 'other-task-id'})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(mock_async_result.return_value.forget.called)
+
+    @mock.patch("assessments.tasks.import_scores.AsyncResult")
+    def test_should_deny_progress_of_import_of_another_learning_unit_year(self, mock_async_result):
+        url = reverse('upload_encoding_progress', kwargs={'learning_unit_year_id': self.learning_unit_year.id + 1})
+
+        response = self.client.get(url, {'task_id': 'task-id'})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_should_deny_progress_without_score_encoding_permission(self):
+        self.a_user.user_permissions.clear()
+
+        response = self.client.get(self.progress_url, {'task_id': 'task-id'})
+
+        self.assertEqual(response.status_code, 403)
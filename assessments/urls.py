@@ -67,6 +67,8 @@ urlpatterns = [
             score_encoding.export_xls, name='scores_encoding_download'),
         url(r'^upload/(?P<learning_unit_year_id>[0-9]+)/$',
             upload_xls_utils.upload_scores_file, name='upload_encoding'),
+        url(r'^upload/(?P<learning_unit_year_id>[0-9]+)/progress/$',
+            upload_xls_utils.upload_scores_file_progress, name='upload_encoding_progress'),
     ])),
 
     url(r'^jsi18n/', JavaScriptCatalog.as_view(), js_info_dict),
@@ -26,16 +26,15 @@
 import decimal
 
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required
-from django.core.exceptions import ValidationError
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.exceptions import ValidationError, PermissionDenied
 from django.db import transaction
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from django.views.decorators.http import require_http_methods
-from openpyxl import load_workbook
 
-from assessments.business import score_encoding_list
+from assessments.business import score_encoding_list, scores_upload
 from assessments.business.score_encoding_export import HEADER
 from assessments.forms.score_file import ScoreFileForm
 from attribution import models as mdl_attr
@@ -53,6 +52,8 @@ col_justification = HEADER.index(_('Justification (A,T)'))
 
 REGISTRATION_ID_LENGTH = 8
 
+PROGRESS_REPORT_STEP = 100
+
 AUTHORIZED_JUSTIFICATION_ALIASES = {
     'T': justification_types.CHEATING,
     'A': justification_types.ABSENCE_UNJUSTIFIED
@@ -74,21 +75,56 @@ def upload_scores_file(request, learning_unit_year_id=None):
         if file_name is not None:
             learning_unit_year = mdl.learning_unit_year.get_by_id(learning_unit_year_id)
             try:
-                __save_xls_scores(request, file_name, learning_unit_year.id)
-            except IndexError:
-                messages.add_message(request, messages.ERROR,
-                                     _("Your excel file isn't well structured. "
-                                       "Please follow the structure of the excel file provided "
-                                       "(button '%(button_value)s')") % {'button_value':  _('Get Excel file')})
+                rows = scores_upload.read_rows(file_name)
+            except KeyError:
+                messages.add_message(request, messages.ERROR, _("The file must be a valid 'XLSX' excel file"))
+                return HttpResponseRedirect(reverse('online_encoding', args=[learning_unit_year_id, ]))
+
+            if scores_upload.must_be_imported_asynchronously(rows):
+                task_id = scores_upload.start_import_task(request.user, learning_unit_year.id, rows)
+                messages.add_message(request, messages.INFO, _("The scores sheet is being imported"))
+                return HttpResponseRedirect("{}?upload_task_id={}".format(
+                    reverse('online_encoding', args=[learning_unit_year_id, ]),
+                    task_id
+                ))
+            _add_messages(request, import_scores(request.user, learning_unit_year.id, rows))
     else:
         for error_msg in [error_msg for error_msgs in form.errors.values() for error_msg in error_msgs]:
             messages.add_message(request, messages.ERROR, "{}".format(error_msg))
     return HttpResponseRedirect(reverse('online_encoding', args=[learning_unit_year_id, ]))
 
 
-def _get_all_data(worksheet):
+@login_required
+@permission_required('assessments.can_access_scoreencoding', raise_exception=True)
+@require_http_methods(["GET"])
+def upload_scores_file_progress(request, learning_unit_year_id=None):
+    task_id = request.GET.get('task_id')
+    if not scores_upload.is_import_task_owner(task_id, request.user, int(learning_unit_year_id)):
+        raise PermissionDenied
+
+    result = scores_upload.get_import_task_result(task_id)
+    info = result.info if isinstance(result.info, dict) else {}
+    if result.successful():
+        _add_messages(request, info['messages'])
+        scores_upload.forget_import_task(result)
+    elif result.failed():
+        messages.add_message(request, messages.ERROR, _("The import of the scores sheet failed"))
+        scores_upload.forget_import_task(result)
+    return JsonResponse({
+        'state': result.state,
+        'current': info.get('current', 0),
+        'total': info.get('total', 0),
+    })
+
+
+def _add_messages(request, messages_to_show):
+    for level, message in messages_to_show:
+        messages.add_message(request, level, message)
+
+
+def _get_all_data(rows):
     """
-    :param worksheet: The excel worksheet (containing examEnrollments/scores)
+    :param rows: The rows values of the excel worksheet (containing examEnrollments/scores)
     :return: All learn_unit_acronyms, offer_acronyms, registration_ids, session and academic_years
              in all lines of the worksheet.
     """
@@ -98,35 +134,35 @@ def _get_all_data(worksheet):
     sessions = []
     academic_years = []
 
-    for count, row in enumerate(worksheet.rows):
+    for row in rows:
         if not _is_valid_registration_id(row):
             # In case of blank line or line that is not a examEnrollment
             continue
-        session = row[col_session].value
+        session = row[col_session]
         session = int(session) if isinstance(session, str) and session.isdigit() else session
         if session and session not in sessions:
             sessions.append(session)
 
         try:
             academic_year = None
-            if type(row[col_academic_year].value) is int:
-                academic_year = int(row[col_academic_year].value)
-            elif type(row[col_academic_year].value) is str:
-                academic_year = int(row[col_academic_year].value[:4])
+            if type(row[col_academic_year]) is int:
+                academic_year = int(row[col_academic_year])
+            elif type(row[col_academic_year]) is str:
+                academic_year = int(row[col_academic_year][:4])
             if academic_year and academic_year not in academic_years:
                 academic_years.append(academic_year)
         except (ValueError, TypeError):
             pass
 
-        learn_unit_acronym = row[col_learning_unit].value
+        learn_unit_acronym = row[col_learning_unit]
         if learn_unit_acronym and learn_unit_acronym not in learn_unit_acronyms:
             learn_unit_acronyms.append(learn_unit_acronym)
 
-        offer_acronym = row[col_offer].value
+        offer_acronym = row[col_offer]
         if offer_acronym and offer_acronym not in offer_acronyms:
             offer_acronyms.append(offer_acronym)
 
-        registration_id = row[col_registration_id].value
+        registration_id = row[col_registration_id]
         if registration_id and registration_id not in registration_ids:
             registration_ids.append(registration_id)
 
@@ -137,33 +173,38 @@ def _get_all_data(worksheet):
             'academic_years': academic_years}
 
 
-def __save_xls_scores(request, file_name, learning_unit_year_id):
+def import_scores(user, learning_unit_year_id, rows, report_progress=None):
+    """
+    Validate all the rows of a scores sheet in memory, then save the valid scores in bulk.
+    :param rows: List of (row_number, row_values) as returned by scores_upload.read_rows()
+    :param report_progress: Optional callable(current, total) called while the rows are validated
+    :return: List of (level, message) to show to the user
+    """
     try:
-        workbook = load_workbook(file_name, read_only=True, data_only=True)
-    except KeyError:
-        messages.add_message(request, messages.ERROR, _("The file must be a valid 'XLSX' excel file"))
-        return False
-    worksheet = workbook.active
-    new_scores_number = 0
+        return __import_scores(user, learning_unit_year_id, rows, report_progress)
+    except IndexError:
+        return [(messages.ERROR, _("Your excel file isn't well structured. "
+                                   "Please follow the structure of the excel file provided "
+                                   "(button '%(button_value)s')") % {'button_value': _('Get Excel file')})]
+
+
+def __import_scores(user, learning_unit_year_id, rows, report_progress):
     learning_unit_year = mdl.learning_unit_year.get_by_id(learning_unit_year_id)
-    is_program_manager = mdl.program_manager.is_program_manager(request.user)
+    is_program_manager = mdl.program_manager.is_program_manager(user)
 
-    data_xls = _get_all_data(worksheet)
+    data_xls = _get_all_data(row for row_number, row in rows)
 
     try:
         data_xls['session'] = _extract_session_number(data_xls)
         data_xls['academic_year'] = _extract_academic_year(data_xls)
     except Exception as e:
-        messages.add_message(request, messages.ERROR, _(e.args[0]))
-        return False
+        return [(messages.ERROR, _(e.args[0]))]
 
     academic_year_in_database = mdl.academic_year.find_academic_year_by_year(data_xls['academic_year'])
     if not academic_year_in_database:
-        messages.add_message(request, messages.ERROR,
-                             '%s (%s).' % (_("No data for this academic year"), data_xls['academic_year']))
-        return False
+        return [(messages.ERROR, '%s (%s).' % (_("No data for this academic year"), data_xls['academic_year']))]
 
-    score_list = _get_score_list_filtered_by_enrolled_state(learning_unit_year_id, request.user)
+    score_list = _get_score_list_filtered_by_enrolled_state(learning_unit_year_id, user)
 
     offer_acronyms_managed_by_user = {offer_year.acronym for offer_year
                                       in score_encoding_list.find_related_offer_years(score_list)}
@@ -172,36 +213,41 @@ def __save_xls_scores(request, file_name, learning_unit_year_id):
     registration_ids_managed_by_user = score_encoding_list.find_related_registration_ids(score_list)
 
     enrollments_grouped = _group_exam_enrollments_by_registration_id_and_learning_unit_year(score_list.enrollments)
-    errors_list = {}
-    # Iterates over the lines of the spreadsheet.
-    for count, row in enumerate(worksheet.rows):
-        if _row_can_be_ignored(row):
-            continue
+    emails_by_registration_id = _get_emails_by_registration_id(score_list.enrollments)
+    rows_to_import = [(row_number, row) for row_number, row in rows if not _row_can_be_ignored(row)]
 
-        row_number = count + 1
+    errors_list = {}
+    new_scores_number = 0
+    updated_enrollments_by_id = {}
+    for count, (row_number, row) in enumerate(rows_to_import, start=1):
         try:
             _check_intergity_data(row,
                                   offer_acronyms_managed=offer_acronyms_managed_by_user,
                                   learn_unit_acronyms_managed=learn_unit_acronyms_managed_by_user,
                                   registration_ids_managed=registration_ids_managed_by_user,
                                   learning_unit_year=learning_unit_year)
-            _check_consistency_data(row)
-            updated_row = _update_row(request.user, row, enrollments_grouped, is_program_manager)
-            if updated_row:
-                new_scores_number+=1
+            _check_consistency_data(row, emails_by_registration_id)
+            updated_enrollment = _get_updated_enrollment(row, enrollments_grouped, is_program_manager)
+            if updated_enrollment:
+                updated_enrollments_by_id[updated_enrollment.pk] = updated_enrollment
+                new_scores_number += 1
         except Exception as e:
             errors_list[row_number] = e
+        if report_progress and (count % PROGRESS_REPORT_STEP == 0 or count == len(rows_to_import)):
+            report_progress(count, len(rows_to_import))
+
+    score_encoding_list.bulk_save_enrollments(list(updated_enrollments_by_id.values()), user, is_program_manager)
 
-    _show_error_messages(request, errors_list)
+    messages_to_show = []
+    _show_error_messages(messages_to_show, errors_list)
 
     if new_scores_number:
-        messages.add_message(request, messages.SUCCESS, '%s %s' % (str(new_scores_number), _('Score saved')))
+        messages_to_show.append((messages.SUCCESS, '%s %s' % (str(new_scores_number), _('Score saved'))))
         if not is_program_manager:
-            __warn_that_score_responsibles_must_submit_scores(request, learning_unit_year)
-        return True
+            __warn_that_score_responsibles_must_submit_scores(messages_to_show, user, learning_unit_year)
     else:
-        messages.add_message(request, messages.ERROR, '%s' % _("No scores injected"))
-        return False
+        messages_to_show.append((messages.ERROR, '%s' % _("No scores injected")))
+    return messages_to_show
 
 
 def _extract_session_number(data_xls):
@@ -229,13 +275,13 @@ def _extract_academic_year(data_xls):
 
 def _extract_registration_id(row):
     if _is_valid_registration_id(row):
-        xls_registration_id = str(row[col_registration_id].value)
+        xls_registration_id = str(row[col_registration_id])
         return xls_registration_id.zfill(REGISTRATION_ID_LENGTH)
     return None
 
 
 def _extract_email(row):
-    return str(row[col_email].value)
+    return str(row[col_email])
 
 
 def _group_exam_enrollments_by_registration_id_and_learning_unit_year(enrollments):
@@ -252,18 +298,18 @@ def _row_can_be_ignored(row):
 
 
 def _is_valid_registration_id(row):
-    registration_id_value = row[col_registration_id].value
+    registration_id_value = row[col_registration_id]
     return registration_id_value and str(registration_id_value).isdigit()
 
 
 def _is_empty_row(row):
-    return (row[col_score].value is None or row[col_score].value == '') and not row[col_justification].value
+    return (row[col_score] is None or row[col_score] == '') and not row[col_justification]
 
 
 def _check_intergity_data(row, **kwargs):
     xls_registration_id = _extract_registration_id(row)
-    xls_offer_year_acronym = row[col_offer].value
-    xls_learning_unit_acronym = row[col_learning_unit].value
+    xls_offer_year_acronym = row[col_offer]
+    xls_learning_unit_acronym = row[col_learning_unit]
     registration_ids_managed = kwargs.get('registration_ids_managed')
     learn_unit_acronyms_managed = kwargs.get('learn_unit_acronyms_managed')
     offer_acronyms_managed = kwargs.get('offer_acronyms_managed')
@@ -294,25 +340,32 @@ def _check_intergity_data(row, **kwargs):
             raise UploadValueError("%s" % _("Student not registered for exam"), messages.ERROR)
 
 
-def _check_consistency_data(row):
+def _check_consistency_data(row, emails_by_registration_id):
     xls_registration_id = _extract_registration_id(row)
     xls_email = _extract_email(row)
-    if not _registration_id_matches_email(xls_registration_id, xls_email):
+    if not _registration_id_matches_email(emails_by_registration_id.get(xls_registration_id), xls_email):
         raise UploadValueError("%s" % _("Registration ID does not match email"), messages.ERROR)
 
 
-def _registration_id_matches_email(registration_id, email):
-    student_by_registration_id = mdl.student.find_by_registration_id(registration_id)
+def _get_emails_by_registration_id(enrollments):
+    return {
+        enrollment.learning_unit_enrollment.student.registration_id:
+            enrollment.learning_unit_enrollment.student.person.email
+        for enrollment in enrollments
+    }
+
+
+def _registration_id_matches_email(student_email, email):
     if email == 'None':
         email = ""
-    return str(student_by_registration_id.person.email).strip() == email.strip()
+    return str(student_email).strip() == email.strip()
 
 
-def _update_row(user, row, enrollments_managed_grouped, is_program_manager):
+def _get_updated_enrollment(row, enrollments_managed_grouped, is_program_manager):
     xls_registration_id = _extract_registration_id(row)
-    xls_learning_unit_acronym = row[col_learning_unit].value
-    xls_score = _clean_value(row[col_score].value)
-    xls_justification = _clean_value(row[col_justification].value)
+    xls_learning_unit_acronym = row[col_learning_unit]
+    xls_score = _clean_value(row[col_score])
+    xls_justification = _clean_value(row[col_justification])
 
     key = "{}_{}".format(xls_registration_id, xls_learning_unit_acronym)
     enrollments = enrollments_managed_grouped.get(key, [])
@@ -334,16 +387,13 @@ def _update_row(user, row, enrollments_managed_grouped, is_program_manager):
         raise UploadValueError("%s" % _("You can't encode a 'score' and a 'justification' together"), messages.ERROR)
 
     if xls_justification and _is_informative_justification(enrollment, xls_justification, is_program_manager):
-       return False
+        return None
 
     enrollment.score_encoded = xls_score
     enrollment.justification_encoded = None
     if xls_justification:
         enrollment.justification_encoded = _get_justification_from_aliases(enrollment, xls_justification)
-    return score_encoding_list.update_enrollment(
-        enrollment=enrollment,
-        user=user
-    )
+    return score_encoding_list.prepare_enrollment_update(enrollment, is_program_manager)
 
 
 def _clean_value(value):
@@ -357,11 +407,10 @@ def _is_informative_justification(enrollment, xls_justification, is_program_mana
     return justification and justification_informative and justification == justification_informative
 
 
-def __warn_that_score_responsibles_must_submit_scores(request, learning_unit_year):
-    tutor = mdl.tutor.find_by_user(request.user)
-    if tutor and not mdl_attr.attribution.is_score_responsible(request.user, learning_unit_year):
-        messages.add_message(request, messages.SUCCESS,
-                             '%s' % _("The scores responsible must still submit the scores"))
+def __warn_that_score_responsibles_must_submit_scores(messages_to_show, user, learning_unit_year):
+    tutor = mdl.tutor.find_by_user(user)
+    if tutor and not mdl_attr.attribution.is_score_responsible(user, learning_unit_year):
+        messages_to_show.append((messages.SUCCESS, '%s' % _("The scores responsible must still submit the scores")))
 
 
 def _get_justification_from_aliases(enrollment, justification_encoded):
@@ -382,13 +431,12 @@ def _check_is_user_try_change_justified_to_unjustified_absence(enrollment, justi
                 '%s' % _("Absence justified cannot be remplaced by absence unjustified"), messages.ERROR)
 
 
-def _show_error_messages(request, errors_list):
+def _show_error_messages(messages_to_show, errors_list):
     errors_list_grouped = _errors_list_group_by_message(errors_list)
     for message, error in errors_list_grouped.items():
         rows_number = sorted(error.get('rows_number', []))
         str_rows_number_formated = ', '.join([str(nb) for nb in rows_number])
-        messages.add_message(request, error.get('level'), "%s : %s %s" % (message, _('Line'),
-                                                                          str_rows_number_formated))
+        messages_to_show.append((error.get('level'), "%s : %s %s" % (message, _('Line'), str_rows_number_formated)))
 
 
 def _errors_list_group_by_message(errors_list):
@@ -23,7 +23,8 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable
 
 from django.db.models import Q, Prefetch
 
@@ -44,6 +45,21 @@ def find_attribution_charge_new_by_learning_unit_year_as_dict(learning_unit_year
     return create_attributions_dictionary(attribution_charges)
 
 
+def find_attribution_charge_new_by_learning_unit_years_as_dict(learning_unit_year_ids: Iterable[int]) -> Dict:
+    attribution_charges = attribution_charge_new.AttributionChargeNew.objects \
+        .filter(learning_component_year__learning_unit_year_id__in=learning_unit_year_ids) \
+        .select_related('learning_component_year', 'attribution__tutor__person').order_by('attribution__tutor__person')
+    charges_by_learning_unit_year = defaultdict(list)
+    for attribution_charge in attribution_charges:
+        charges_by_learning_unit_year[attribution_charge.learning_component_year.learning_unit_year_id].append(
+            attribution_charge
+        )
+    return {
+        learning_unit_year_id: create_attributions_dictionary(charges)
+        for learning_unit_year_id, charges in charges_by_learning_unit_year.items()
+    }
+
+
 def create_attributions_dictionary(attribution_charges):
     attributions = OrderedDict()
     for attribution_charge in attribution_charges:
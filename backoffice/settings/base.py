@@ -120,6 +120,8 @@ MIDDLEWARE = (
     'waffle.middleware.WaffleMiddleware',
     'base.middlewares.notification_middleware.NotificationMiddleware',
     'base.middlewares.reversion_middleware.BaseRevisionMiddleware',
+    'base.middlewares.tree_identity_map_middleware.TreeIdentityMapMiddleware',
+    'osis_role.contrib.middleware.PermsCacheMiddleware',
 )
 
 
@@ -274,6 +276,21 @@ CELERY_BROKER_URL = "amqp://{user}:{password}@{host}:{port}".format(
 CELERY_CELERYBEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'django-db')
 
+# Scores sheets with at least this number of rows are imported by a celery task (0 : always imported in the request)
+SCORES_UPLOAD_ASYNC_MIN_ROWS = int(os.environ.get('SCORES_UPLOAD_ASYNC_MIN_ROWS', 0))
+
+# Excel exports of searches with at least this number of results are generated by a celery task
+# (0 : always generated in the request)
+EXPORT_ASYNC_MIN_ROWS = int(os.environ.get('EXPORT_ASYNC_MIN_ROWS', 0))
+# Seconds during which the export job of an identical search is reused (0 to never reuse it)
+EXPORT_JOB_TTL = int(os.environ.get('EXPORT_JOB_TTL', 600))
+# Days after which the export jobs and their files are deleted
+EXPORT_JOB_RETENTION_DAYS = int(os.environ.get('EXPORT_JOB_RETENTION_DAYS', 7))
+
+# Consolidations and cancellations of at least this number of proposals are applied by celery tasks
+# (0 : always applied in the request)
+PROPOSALS_ACTION_ASYNC_MIN_ROWS = int(os.environ.get('PROPOSALS_ACTION_ASYNC_MIN_ROWS', 0))
+
 # Additionnal Locale Path
 # Add local path in your environment settings (ex: dev.py)
 LOCALE_PATHS = ()
@@ -406,6 +423,11 @@ ESB_STUDENT_API = os.environ.get('ESB_STUDENT_API')
 ESB_REFRESH_PEDAGOGY_ENDPOINT = os.environ.get('ESB_REFRESH_PEDAGOGY_ENDPOINT')
 ESB_REFRESH_COMMON_PEDAGOGY_ENDPOINT = os.environ.get('ESB_REFRESH_COMMON_PEDAGOGY_ENDPOINT')
 ESB_REFRESH_COMMON_ADMISSION_ENDPOINT = os.environ.get('ESB_REFRESH_COMMON_ADMISSION_ENDPOINT')
+# Publication of program trees through the ESB
+ESB_PUBLISH_MAX_WORKERS = int(os.environ.get('ESB_PUBLISH_MAX_WORKERS', 8))
+ESB_PUBLISH_MAX_RETRIES = int(os.environ.get('ESB_PUBLISH_MAX_RETRIES', 3))
+ESB_PUBLISH_BACKOFF_FACTOR = float(os.environ.get('ESB_PUBLISH_BACKOFF_FACTOR', 0.5))
+ESB_PUBLISH_DEDUPLICATION_WINDOW = int(os.environ.get('ESB_PUBLISH_DEDUPLICATION_WINDOW', 60))  # In seconds
 
 RELEASE_TAG = os.environ.get('RELEASE_TAG')
 
@@ -458,6 +480,13 @@ else:
 
 CACHES = {"default": CACHE_CONFIG}
 
+# Keep the hierarchy of entity versions in memory, shared between requests, until an entity version is saved
+ENTITY_VERSION_STRUCTURE_CACHE = os.environ.get('ENTITY_VERSION_STRUCTURE_CACHE', 'True').lower() == 'true'
+# Keep the loaded program trees and their serialized views in the cache, keyed by the revision of the tree
+PROGRAM_TREE_CACHE = os.environ.get('PROGRAM_TREE_CACHE', 'True').lower() == 'true'
+# Keep the academic years and calendars in memory, shared between requests, until one of them is saved
+ACADEMIC_CALENDAR_SNAPSHOT = os.environ.get('ACADEMIC_CALENDAR_SNAPSHOT', 'True').lower() == 'true'
+
 
 WAFFLE_FLAG_DEFAULT = os.environ.get("WAFFLE_FLAG_DEFAULT", "False").lower() == 'true'
 
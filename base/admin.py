@@ -209,6 +209,15 @@ admin.site.register(tutor.Tutor,
 admin.site.register(authorized_relationship.AuthorizedRelationship,
                     authorized_relationship.AuthorizedRelationshipAdmin)
 
+admin.site.register(automatic_postponement.AutomaticPostponementRun,
+                    automatic_postponement.AutomaticPostponementRunAdmin)
+
+admin.site.register(export_job.ExportJob,
+                    export_job.ExportJobAdmin)
+
+admin.site.register(notification_run.NotificationRun,
+                    notification_run.NotificationRunAdmin)
+
 admin.site.register(validation_rule.ValidationRule,
                     validation_rule.ValidationRuleAdmin)
 
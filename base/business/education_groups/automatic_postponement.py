@@ -28,9 +28,11 @@ from django.utils.translation import gettext as _
 
 from base.business.education_groups.create import create_initial_group_element_year_structure
 from base.business.education_groups.postponement import duplicate_education_group_year, ConsistencyError
-from base.business.utils.model import update_related_object
+from base.business.utils.model import update_related_object, bulk_update_related_objects
 from base.business.utils.postponement import AutomaticPostponementToN6, AutomaticPostponement
+from base.models.admission_condition import AdmissionConditionLine
 from base.models.education_group import EducationGroup
+from base.models.education_group_detailed_achievement import EducationGroupDetailedAchievement
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums.education_group_categories import TRAINING
 from base.models.enums.education_group_types import MiniTrainingType
@@ -124,15 +126,17 @@ class ReddotEducationGroupAutomaticPostponement(AutomaticPostponement):
     def _postpone_cms(old_egy, new_egy):
         TranslatedText.objects.filter(entity=entity_name.OFFER_YEAR, reference=str(new_egy.pk)).delete()
 
-        for text in TranslatedText.objects.filter(entity=entity_name.OFFER_YEAR, reference=str(old_egy.pk)):
-            update_related_object(text, "reference", str(new_egy.pk))
+        bulk_update_related_objects(
+            TranslatedText.objects.filter(entity=entity_name.OFFER_YEAR, reference=str(old_egy.pk)),
+            "reference",
+            str(new_egy.pk)
+        )
 
     @staticmethod
     def _postpone_publication(old_egy: EducationGroupYear, new_egy: EducationGroupYear):
         new_egy.educationgrouppublicationcontact_set.all().delete()
 
-        for publication in old_egy.educationgrouppublicationcontact_set.all():
-            update_related_object(publication, "education_group_year", new_egy)
+        bulk_update_related_objects(old_egy.educationgrouppublicationcontact_set.all(), "education_group_year", new_egy)
 
         new_egy.publication_contact_entity = old_egy.publication_contact_entity
         new_egy.save()
@@ -141,11 +145,15 @@ class ReddotEducationGroupAutomaticPostponement(AutomaticPostponement):
     def _postpone_achievement(old_egy: EducationGroupYear, new_egy: EducationGroupYear):
         new_egy.educationgroupachievement_set.all().delete()
 
-        for achievement in old_egy.educationgroupachievement_set.all():
-            new_achievement = update_related_object(achievement, "education_group_year", new_egy)
-
-            for detail in achievement.educationgroupdetailedachievement_set.all():
-                update_related_object(detail, "education_group_achievement", new_achievement)
+        achievements = list(
+            old_egy.educationgroupachievement_set.prefetch_related('educationgroupdetailedachievement_set')
+        )
+        new_achievements = bulk_update_related_objects(achievements, "education_group_year", new_egy)
+        EducationGroupDetailedAchievement.objects.bulk_create([
+            update_related_object(detail, "education_group_achievement", new_achievement, commit_save=False)
+            for achievement, new_achievement in zip(achievements, new_achievements)
+            for detail in achievement.educationgroupdetailedachievement_set.all()
+        ])
 
     @staticmethod
     def _postpone_admission(old_egy: EducationGroupYear, new_egy: EducationGroupYear):
@@ -157,5 +165,8 @@ class ReddotEducationGroupAutomaticPostponement(AutomaticPostponement):
 
         new_admission = update_related_object(old_egy.admissioncondition, "education_group_year", new_egy)
 
-        for line in old_egy.admissioncondition.admissionconditionline_set.all():
-            update_related_object(line, "admission_condition", new_admission)
+        bulk_update_related_objects(
+            AdmissionConditionLine.objects.filter(admission_condition=old_egy.admissioncondition),
+            "admission_condition",
+            new_admission
+        )
@@ -28,6 +28,7 @@ from django.utils import timezone
 
 from base.models import entity_calendar, entity_version
 from base.models.entity import Entity
+from base.models.entity_closure import EntityClosure
 from base.models.entity_version import EntityVersion
 from base.models.enums import academic_calendar_type
 from base.models.enums.entity_container_year_link_type import REQUIREMENT_ENTITY, ALLOCATION_ENTITY, \
@@ -39,13 +40,12 @@ def get_entities_ids(entity_acronym, with_entity_subordinated):
         entity_versions = EntityVersion.objects.filter(acronym__iregex=entity_acronym)
         entities_ids = set(entity_versions.values_list('entity', flat=True))
 
-        if with_entity_subordinated and entity_versions:
-            # it is not possible to have the list of descendants
-            # when the entity_version is empty
-            list_descendants = EntityVersion.objects.get_tree(
-                Entity.objects.filter(entityversion__acronym__iregex=entity_acronym)
+        if with_entity_subordinated and entities_ids:
+            entities_ids |= set(
+                EntityClosure.objects.current(timezone.now()).filter(
+                    ancestor_id__in=entities_ids
+                ).values_list('descendant_id', flat=True)
             )
-            entities_ids |= {row["entity_id"] for row in list_descendants}
 
         return list(entities_ids)
     return []
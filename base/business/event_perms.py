@@ -24,6 +24,7 @@
 #
 ##############################################################################
 from abc import ABC
+from typing import Iterable, List
 
 from django.core.exceptions import PermissionDenied
 from django.db.models.query import QuerySet
@@ -31,7 +32,7 @@ from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
-from base.models.academic_calendar import AcademicCalendar
+from base.models.academic_calendar import AcademicCalendar, get_academic_calendar_snapshot
 from base.models.academic_year import AcademicYear
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums import academic_calendar_type
@@ -65,10 +66,23 @@ class EventPerm(ABC):
             qs = qs.filter(reference=cls.event_reference)
         return qs
 
+    @classmethod
+    def get_open_academic_calendars(cls, data_year_id: int = None) -> List[AcademicCalendar]:
+        snapshot = get_academic_calendar_snapshot()
+        if snapshot is None:
+            qs = cls.get_open_academic_calendars_queryset()
+            if data_year_id:
+                qs = qs.filter(data_year_id=data_year_id)
+            return list(qs)
+        return snapshot.open_calendars(cls.event_reference, data_year_id=data_year_id)
+
     @cached_property
     def open_academic_calendars_for_specific_object(self) -> list:
-        obj_ac_year = getattr(self.obj, self.academic_year_field)
-        return list(self.get_open_academic_calendars_queryset().filter(data_year=obj_ac_year))
+        if get_academic_calendar_snapshot() is None:
+            obj_ac_year = getattr(self.obj, self.academic_year_field)
+            return list(self.get_open_academic_calendars_queryset().filter(data_year=obj_ac_year))
+        obj_ac_year_id = getattr(self.obj, "{}_id".format(self.academic_year_field))
+        return self.get_open_academic_calendars(data_year_id=obj_ac_year_id)
 
     def _is_open_for_specific_object(self) -> bool:
         if not self.open_academic_calendars_for_specific_object:
@@ -79,7 +93,9 @@ class EventPerm(ABC):
 
     @classmethod
     def _is_calendar_opened(cls) -> bool:
-        return cls.get_open_academic_calendars_queryset().exists()
+        if get_academic_calendar_snapshot() is None:
+            return cls.get_open_academic_calendars_queryset().exists()
+        return bool(cls.get_open_academic_calendars())
 
     @classmethod
     def get_academic_years(cls, min_academic_y=None, max_academic_y=None) -> QuerySet:
@@ -88,35 +104,48 @@ class EventPerm(ABC):
         )
 
     @classmethod
-    def get_academic_years_ids(cls, min_academic_y=None, max_academic_y=None) -> QuerySet:
-        qs = cls.get_open_academic_calendars_queryset()
-        if min_academic_y:
-            qs = qs.filter(data_year__year__gte=min_academic_y)
-        if max_academic_y:
-            qs = qs.filter(data_year__year__lte=max_academic_y)
-        return qs.values_list('data_year', flat=True)
+    def get_academic_years_ids(cls, min_academic_y=None, max_academic_y=None) -> Iterable[int]:
+        snapshot = get_academic_calendar_snapshot()
+        if snapshot is None:
+            qs = cls.get_open_academic_calendars_queryset()
+            if min_academic_y:
+                qs = qs.filter(data_year__year__gte=min_academic_y)
+            if max_academic_y:
+                qs = qs.filter(data_year__year__lte=max_academic_y)
+            return qs.values_list('data_year', flat=True)
+        data_years = [
+            snapshot.get_academic_year(calendar.data_year_id) for calendar in cls.get_open_academic_calendars()
+            if calendar.data_year_id
+        ]
+        return [
+            data_year.pk for data_year in data_years
+            if data_year and (not min_academic_y or data_year.year >= min_academic_y)
+            and (not max_academic_y or data_year.year <= max_academic_y)
+        ]
 
     @classmethod
     def get_previous_opened_calendar(cls, date=None) -> AcademicCalendar:
-        if not date:
-            date = timezone.now()
-        qs = AcademicCalendar.objects.filter(end_date__lte=date).order_by('end_date')
-
-        if cls.event_reference:
-            qs = qs.filter(reference=cls.event_reference)
-
-        return qs.last()
+        snapshot = get_academic_calendar_snapshot()
+        if snapshot is None:
+            if not date:
+                date = timezone.now()
+            qs = AcademicCalendar.objects.filter(end_date__lte=date).order_by('end_date')
+            if cls.event_reference:
+                qs = qs.filter(reference=cls.event_reference)
+            return qs.last()
+        return snapshot.get_previous_calendar(cls.event_reference, date=date)
 
     @classmethod
     def get_next_opened_calendar(cls, date=None) -> AcademicCalendar:
-        if not date:
-            date = timezone.now()
-        qs = AcademicCalendar.objects.filter(start_date__gte=date).order_by('start_date')
-
-        if cls.event_reference:
-            qs = qs.filter(reference=cls.event_reference)
-
-        return qs.first()
+        snapshot = get_academic_calendar_snapshot()
+        if snapshot is None:
+            if not date:
+                date = timezone.now()
+            qs = AcademicCalendar.objects.filter(start_date__gte=date).order_by('start_date')
+            if cls.event_reference:
+                qs = qs.filter(reference=cls.event_reference)
+            return qs.first()
+        return snapshot.get_next_calendar(cls.event_reference, date=date)
 
 
 class EventPermClosed(EventPerm):
@@ -127,6 +156,10 @@ class EventPermClosed(EventPerm):
     def get_open_academic_calendars_queryset(cls) -> QuerySet:
         return AcademicCalendar.objects.none()
 
+    @classmethod
+    def get_open_academic_calendars(cls, data_year_id: int = None) -> List[AcademicCalendar]:
+        return []
+
 
 class EventPermOpened(EventPerm):
     def is_open(self):
@@ -0,0 +1,196 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+import hashlib
+import re
+import uuid
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.db.models import Max
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone, translation
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
+from notifications.models import Notification
+from notifications.signals import notify
+
+from base.models.enums.export_job_status import ExportJobStatus
+from base.models.export_job import ExportJob
+from base.utils.notifications import invalidate_unread_notifications_count
+
+FILENAME_REGEX = re.compile(r'filename="?([^";]+)"?')
+
+
+class ExportRequest:
+    """ Request given to a search view rebuilt by a worker to generate an export """
+    is_export_job = True
+
+    def __init__(self, user, query_string: str, language: str):
+        self.user = user
+        self.GET = QueryDict(query_string)
+        self.LANGUAGE_CODE = language
+        self.headers = {}
+
+
+def must_be_exported_asynchronously(view_obj, context) -> bool:
+    min_rows = settings.EXPORT_ASYNC_MIN_ROWS
+    if not min_rows or getattr(view_obj.request, 'is_export_job', False):
+        return False
+    paginator = context.get('paginator')
+    count = paginator.count if paginator else context['filter'].qs.count()
+    return count >= min_rows
+
+
+def get_or_create_job(view_obj, name: str) -> (ExportJob, bool):
+    """
+        Return the job which generates the export of the current search.
+        The job of an identical request on the same data is reused instead of generating the file again.
+    """
+    request = view_obj.request
+    query_string = _get_normalized_query_string(request.GET)
+    language = translation.get_language()
+    return ExportJob.objects.get_or_create(
+        user=request.user,
+        view=_get_view_path(view_obj),
+        name=name,
+        filter_hash=hashlib.md5("{}|{}".format(language, query_string).encode()).hexdigest(),
+        data_revision=_get_data_revision(view_obj),
+        defaults={
+            'query_string': query_string,
+            'language': language,
+        }
+    )
+
+
+def generate(job: ExportJob) -> ExportJob:
+    job.status = ExportJobStatus.RUNNING.name
+    job.save(update_fields=['status'])
+    try:
+        with translation.override(job.language):
+            response = _render_export(job)
+            job.file.save(_get_filename(response, job), ContentFile(_get_content(response)), save=False)
+        job.status = ExportJobStatus.DONE.name
+    except Exception:
+        job.status = ExportJobStatus.FAILED.name
+        raise
+    finally:
+        job.finished = timezone.now()
+        job.save()
+        _notify(job)
+    return job
+
+
+def _render_export(job: ExportJob):
+    view_obj = import_string(job.view)()
+    view_obj.request = ExportRequest(job.user, job.query_string, job.language)
+    view_obj.args, view_obj.kwargs = (), {}
+    filterset = view_obj.get_filterset(view_obj.get_filterset_class())
+    context = {
+        'filter': filterset,
+        'form': filterset.form,
+        'object_list': filterset.qs,
+    }
+    return view_obj.render_to_response(context)
+
+
+def _notify(job: ExportJob):
+    with translation.override(job.language):
+        if job.is_done:
+            verb = _("Your export %(filename)s is available : %(url)s") % {
+                'filename': job.file.name.split('/')[-1],
+                'url': reverse('export_job_download', args=[job.pk]),
+            }
+        else:
+            verb = _("Your export has failed")
+    notify.send(job, recipient=job.user, verb=verb)
+    invalidate_unread_notifications_count([job.user_id])
+
+
+def _get_view_path(view_obj) -> str:
+    return "{}.{}".format(type(view_obj).__module__, type(view_obj).__name__)
+
+
+def _get_normalized_query_string(query_dict: QueryDict) -> str:
+    normalized = QueryDict(mutable=True)
+    for key in sorted(query_dict):
+        normalized.setlist(key, sorted(query_dict.getlist(key)))
+    return normalized.urlencode()
+
+
+def _get_data_revision(view_obj) -> str:
+    """
+        The revision changes with the last change of the rows of the view model and at least every
+        settings.EXPORT_JOB_TTL seconds : an export also reads other tables (attributions, proposals, ...)
+        whose changes are not tracked.
+    """
+    return "{}|{}".format(_get_last_change_of_view_model(view_obj), _get_time_to_live_period())
+
+
+def _get_last_change_of_view_model(view_obj) -> str:
+    model = getattr(view_obj, 'model', None)
+    if model is None or 'changed' not in {field.name for field in model._meta.get_fields()}:
+        return ''
+    last_change = model.objects.aggregate(last_change=Max('changed'))['last_change']
+    return last_change.isoformat() if last_change else ''
+
+
+def _get_time_to_live_period() -> str:
+    if not settings.EXPORT_JOB_TTL:
+        return uuid.uuid4().hex
+    return str(int(timezone.now().timestamp() // settings.EXPORT_JOB_TTL))
+
+
+def delete_expired_jobs() -> int:
+    """ Delete the jobs older than settings.EXPORT_JOB_RETENTION_DAYS, with their files and notifications """
+    expired_jobs = list(ExportJob.objects.filter(
+        created__lt=timezone.now() - datetime.timedelta(days=settings.EXPORT_JOB_RETENTION_DAYS)
+    ))
+    if not expired_jobs:
+        return 0
+    for job in expired_jobs:
+        if job.file:
+            job.file.delete(save=False)
+    Notification.objects.filter(
+        actor_content_type=ContentType.objects.get_for_model(ExportJob),
+        actor_object_id__in=[str(job.pk) for job in expired_jobs],
+    ).delete()
+    ExportJob.objects.filter(pk__in=[job.pk for job in expired_jobs]).delete()
+    invalidate_unread_notifications_count({job.user_id for job in expired_jobs})
+    return len(expired_jobs)
+
+
+def _get_filename(response, job: ExportJob) -> str:
+    match = FILENAME_REGEX.search(response.get('Content-Disposition', ''))
+    return match.group(1) if match else "{}.xlsx".format(job.name)
+
+
+def _get_content(response) -> bytes:
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
@@ -30,7 +30,7 @@ from typing import List, Dict, Callable, Any, Tuple
 from django.contrib.messages import ERROR, SUCCESS
 from django.contrib.messages import INFO
 from django.core.exceptions import PermissionDenied
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.forms import model_to_dict
 from django.utils.translation import gettext_lazy as _
 
@@ -60,6 +60,16 @@ FOREIGN_KEY_NAME = (
     'language', 'campus', 'requirement_entity', 'allocation_entity', 'additional_entity_1', 'additional_entity_2',
 )
 
+CANCELLATION = "cancellation"
+CONSOLIDATION = "consolidation"
+PROPOSAL_RELATED_FIELDS = (
+    'entity',
+    'learning_unit_year__academic_year',
+    'learning_unit_year__learning_unit',
+    'learning_unit_year__learning_container_year__requirement_entity',
+    'learning_unit_year__externallearningunityear',
+)
+
 END_FOREIGN_KEY_NAME = "_id"
 NO_PREVIOUS_VALUE = '-'
 # TODO : VALUES_WHICH_NEED_TRANSLATION ?
@@ -295,11 +305,18 @@ def _apply_action_on_proposals(
         author: person.Person,
         permission_check: Callable[[proposal_learning_unit.ProposalLearningUnit, person.Person, bool], bool]
 ) -> List[Tuple[proposal_learning_unit.ProposalLearningUnit, Dict]]:
+    """ Apply the action on each proposal in its own savepoint : the changes of a failed action are rolled back """
     proposals_with_results = []
     for proposal in proposals:
         try:
-            permission_check(proposal, author, True)
-            proposal_with_result = (proposal, action_method(proposal))
+            with transaction.atomic():
+                permission_check(proposal, author, True)
+                results = action_method(proposal)
+                if results.get(ERROR):
+                    raise _ProposalActionFailed(results)
+            proposal_with_result = (proposal, results)
+        except _ProposalActionFailed as failure:
+            proposal_with_result = (proposal, failure.results)
         except PermissionDenied as perm_denied:
             proposal_with_result = (proposal, {ERROR: _(str(perm_denied))})
 
@@ -308,6 +325,58 @@ def _apply_action_on_proposals(
     return proposals_with_results
 
 
+class _ProposalActionFailed(Exception):
+    """ Raised to roll back the savepoint of a proposal when its action returns errors """
+    def __init__(self, results: Dict):
+        super().__init__()
+        self.results = results
+
+
+def find_proposals_with_related_data(proposal_ids: List[int]) -> List[proposal_learning_unit.ProposalLearningUnit]:
+    """ Load the proposals with the learning unit years, their containers and components read by the actions """
+    return list(
+        proposal_learning_unit.ProposalLearningUnit.objects.filter(pk__in=proposal_ids).select_related(
+            *PROPOSAL_RELATED_FIELDS
+        ).prefetch_related(
+            'learning_unit_year__learningcomponentyear_set'
+        ).order_by('pk')
+    )
+
+
+def apply_action_on_proposals_chunk(
+        action_name: str,
+        proposal_ids: List[int],
+        author: person.Person
+) -> List[Tuple]:
+    """
+        Apply the action (CANCELLATION or CONSOLIDATION) on a chunk of proposals and return the rows of the report.
+        The chunk is committed at once and each proposal has its own savepoint.
+    """
+    action_method, permission_check = {
+        CANCELLATION: (cancel_proposal, perms.is_eligible_for_cancel_of_proposal),
+        CONSOLIDATION: (consolidate_proposal, perms.is_eligible_to_consolidate_proposal),
+    }[action_name]
+    with transaction.atomic():
+        proposals_with_results = _apply_action_on_proposals(
+            find_proposals_with_related_data(proposal_ids),
+            action_method,
+            author,
+            permission_check
+        )
+        return [
+            send_mail_util.get_proposal_report_row(proposal, results) for proposal, results in proposals_with_results
+        ]
+
+
+def get_failed_proposals_report_rows(proposal_ids: List[int]) -> List[Tuple]:
+    """ Rows of the report of a chunk of proposals whose action has been rolled back """
+    results = {ERROR: [_("The action could not be applied on this proposal.")]}
+    return [
+        send_mail_util.get_proposal_report_row(proposal, results)
+        for proposal in find_proposals_with_related_data(proposal_ids)
+    ]
+
+
 def cancel_proposal(proposal):
     results = {}
     if proposal.type == ProposalType.CREATION.name:
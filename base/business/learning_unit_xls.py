@@ -23,20 +23,20 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from collections import defaultdict
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple
 
 from django.db.models import QuerySet
 from django.db.models import Subquery, OuterRef
 from django.db.models.expressions import RawSQL
 from django.template.defaultfilters import yesno
 from django.utils.translation import gettext_lazy as _
-from openpyxl.styles import Alignment, PatternFill, Color, Font
-from openpyxl.utils import get_column_letter
+from openpyxl.styles import Alignment, PatternFill, Color, Font, Border, Side
 
 from attribution.business import attribution_charge_new
 from attribution.models.enums.function import Functions
-from base.business.xls import get_name_or_username, _get_all_columns_reference
+from base.business.learning_units import xls_chunks
+from base.business.xls import get_name_or_username, _get_all_columns_reference, StreamedWorksheet, RowStyle, \
+    generate_streamed_xls
 from base.models.enums.learning_component_year_type import LECTURING, PRACTICAL_EXERCISES
 from base.models.enums.proposal_type import ProposalType
 from base.models.group_element_year import GroupElementYear
@@ -74,6 +74,9 @@ PROPOSAL_LINE_STYLES = {
 WRAP_TEXT_ALIGNMENT = Alignment(wrapText=True, vertical="top")
 WITH_ATTRIBUTIONS = 'with_attributions'
 WITH_GRP = 'with_grp'
+WHITE_FONT = Font(color=Color('00FFFFFF'))
+TOP_BORDER = Border(top=Side(style='medium'))
+NB_LEARNING_UNIT_COLUMNS = 24
 
 
 def learning_unit_titles_part1() -> List[str]:
@@ -93,26 +96,43 @@ def learning_unit_titles_part1() -> List[str]:
 
 
 def prepare_xls_content(learning_unit_years: QuerySet, with_grp=False, with_attributions=False) -> List:
+    return [
+        row for learning_unit_yr, row in _iter_xls_content(learning_unit_years, with_grp, with_attributions)
+    ]
+
+
+def _iter_xls_content(
+        learning_unit_years: QuerySet,
+        with_grp: bool,
+        with_attributions: bool
+) -> Iterator[Tuple[LearningUnitYear, List]]:
     qs = annotate_qs(learning_unit_years)
 
     if with_grp:
         qs = qs.annotate(
             closest_trainings=RawSQL(SQL_RECURSIVE_QUERY_EDUCATION_GROUP_TO_CLOSEST_TRAININGS, ())
-        ).prefetch_related('element')
-
-    result = []
+        )
 
-    for learning_unit_yr in qs:
-        lu_data_part1 = _get_data_part1(learning_unit_yr)
-        lu_data_part2 = _get_data_part2(learning_unit_yr, with_attributions)
+    for learning_unit_years_chunk in xls_chunks.iter_chunks(qs):
+        attributions_by_learning_unit_year = xls_chunks.prefetch_chunk(
+            learning_unit_years_chunk,
+            with_grp,
+            with_attributions
+        )
 
-        if with_grp:
-            lu_data_part2.append(_add_training_data(learning_unit_yr))
+        for learning_unit_yr in learning_unit_years_chunk:
+            lu_data_part1 = _get_data_part1(learning_unit_yr)
+            lu_data_part2 = _get_data_part2(
+                learning_unit_yr,
+                with_attributions,
+                attributions_by_learning_unit_year.get(learning_unit_yr.pk, {})
+            )
 
-        lu_data_part1.extend(lu_data_part2)
-        result.append(lu_data_part1)
+            if with_grp:
+                lu_data_part2.append(_add_training_data(learning_unit_yr))
 
-    return result
+            lu_data_part1.extend(lu_data_part2)
+            yield learning_unit_yr, lu_data_part1
 
 
 def annotate_qs(learning_unit_years: QuerySet) -> QuerySet:
@@ -152,36 +172,48 @@ def create_xls_with_parameters(user, learning_units, filters, extra_configuratio
     if with_attributions:
         titles_part1.append(str(HEADER_TEACHERS))
 
-    working_sheets_data = prepare_xls_content(learning_units, with_grp, with_attributions)
-
     titles_part1.extend(titles_part2)
 
-    ws_data = xls_build.prepare_xls_parameters_list(working_sheets_data,
-                                                    _get_parameters_configurable_list(learning_units,
-                                                                                      titles_part1,
-                                                                                      user))
-    ws_data.update({xls_build.WORKSHEETS_DATA: [ws_data.get(xls_build.WORKSHEETS_DATA)[0],
-                                                prepare_proposal_legend_ws_data()]})
-    return xls_build.generate_xls(ws_data, filters)
-
-
-def _get_parameters_configurable_list(learning_units, titles, user):
-    parameters = {
-        xls_build.DESCRIPTION: XLS_DESCRIPTION,
-        xls_build.USER: get_name_or_username(user),
-        xls_build.FILENAME: XLS_FILENAME,
-        xls_build.HEADER_TITLES: titles,
-        xls_build.WS_TITLE: WORKSHEET_TITLE,
-        xls_build.ALIGN_CELLS: {
-            WRAP_TEXT_ALIGNMENT: _get_wrapped_cells(
-                learning_units,
-                _get_col_letter(titles, HEADER_PROGRAMS),
-                _get_col_letter(titles, HEADER_TEACHERS)
-            )
-        },
-        xls_build.FONT_ROWS: _get_font_rows(learning_units),
-    }
-    return parameters
+    rows = (
+        (row, _get_proposal_row_style(learning_unit_yr))
+        for learning_unit_yr, row in _iter_xls_content(learning_units, with_grp, with_attributions)
+    )
+    worksheets = [
+        StreamedWorksheet(
+            WORKSHEET_TITLE,
+            titles_part1,
+            rows,
+            column_alignments=_get_wrapped_columns(titles_part1, HEADER_PROGRAMS, HEADER_TEACHERS)
+        ),
+        _get_proposal_legend_worksheet(),
+    ]
+    return generate_streamed_xls(worksheets, XLS_FILENAME, XLS_DESCRIPTION, user, filters)
+
+
+def _get_proposal_row_style(learning_unit_yr: LearningUnitYear):
+    proposal = getattr(learning_unit_yr, "proposallearningunit", None)
+    if proposal and proposal.type in PROPOSAL_LINE_STYLES:
+        return RowStyle(font=PROPOSAL_LINE_STYLES[proposal.type])
+    return None
+
+
+def _get_wrapped_columns(titles: List[str], *titles_search) -> Dict[int, Alignment]:
+    wrapped_titles = [str(title) for title in titles_search]
+    return {idx: WRAP_TEXT_ALIGNMENT for idx, title in enumerate(titles) if title in wrapped_titles}
+
+
+def _get_proposal_legend_worksheet() -> StreamedWorksheet:
+    legend_ws_data = prepare_proposal_legend_ws_data()
+    fill_by_cell = {cell: fill for fill, cells in DEFAULT_LEGEND_FILLS.items() for cell in cells}
+    rows = [
+        (row, RowStyle(fill=fill_by_cell.get("A{}".format(idx)), nb_columns=1))
+        for idx, row in enumerate(legend_ws_data[xls_build.CONTENT_KEY], start=2)
+    ]
+    return StreamedWorksheet(
+        legend_ws_data[xls_build.WORKSHEET_TITLE_KEY],
+        legend_ws_data[xls_build.HEADER_TITLES_KEY],
+        rows
+    )
 
 
 def get_significant_volume(volume):
@@ -206,26 +238,6 @@ def prepare_proposal_legend_ws_data():
     }
 
 
-def _get_wrapped_cells(learning_units, teachers_col_letter, programs_col_letter):
-    dict_wrapped_styled_cells = []
-
-    for idx, luy in enumerate(learning_units, start=2):
-        if teachers_col_letter:
-            dict_wrapped_styled_cells.append("{}{}".format(teachers_col_letter, idx))
-        if programs_col_letter:
-            dict_wrapped_styled_cells.append("{}{}".format(programs_col_letter, idx))
-
-    return dict_wrapped_styled_cells
-
-
-def _get_font_rows(learning_units):
-    colored_cells = defaultdict(list)
-    for idx, luy in enumerate(learning_units, start=1):
-        if getattr(luy, "proposallearningunit", None):
-            colored_cells[PROPOSAL_LINE_STYLES.get(luy.proposallearningunit.type)].append(idx)
-    return colored_cells
-
-
 def _get_attribution_line(an_attribution):
     return "{} - {} : {} - {} : {} - {} : {} - {} : {} - {} : {} - {} : {} ".format(
         an_attribution.get('person'),
@@ -244,13 +256,6 @@ def _get_attribution_line(an_attribution):
     )
 
 
-def _get_col_letter(titles, title_search):
-    for idx, title in enumerate(titles, start=1):
-        if title == title_search:
-            return get_column_letter(idx)
-    return None
-
-
 def _add_training_data(learning_unit_yr: LearningUnitYear) -> str:
     return ("\n".join([
         _concatenate_training_data(learning_unit_yr, group_element_year)
@@ -283,18 +288,18 @@ def _concatenate_training_data(learning_unit_year: LearningUnitYear, group_eleme
     return concatenated_string
 
 
-def _get_data_part2(learning_unit_yr: LearningUnitYear, with_attributions: bool) -> List[str]:
+def _get_data_part2(
+        learning_unit_yr: LearningUnitYear,
+        with_attributions: bool,
+        attributions: Dict = None
+) -> List[str]:
     lu_data_part2 = []
     if with_attributions:
-        lu_data_part2.append(
-            " \n".join(
-                [_get_attribution_line(value)
-                 for value in attribution_charge_new.find_attribution_charge_new_by_learning_unit_year_as_dict(
-                    learning_unit_yr
-                ).values()
-                ]
+        if attributions is None:
+            attributions = attribution_charge_new.find_attribution_charge_new_by_learning_unit_year_as_dict(
+                learning_unit_yr
             )
-        )
+        lu_data_part2.append(" \n".join([_get_attribution_line(value) for value in attributions.values()]))
     lu_data_part2.append(learning_unit_yr.get_periodicity_display())
     lu_data_part2.append(yesno(learning_unit_yr.status))
     lu_data_part2.extend(volume_information(learning_unit_yr))
@@ -400,53 +405,38 @@ def create_xls_attributions(user, found_learning_units, filters):
                                                                             str(_('Attrib. vol1')),
                                                                             str(_('Attrib. vol2')),
                                                                             ]
-    xls_data = prepare_xls_content_with_attributions(found_learning_units, len(titles))
-    working_sheets_data = xls_data.get('data')
-    cells_with_top_border = xls_data.get('cells_with_top_border')
-    cells_with_white_font = xls_data.get('cells_with_white_font')
-    parameters = {xls_build.DESCRIPTION: _('Learning units list with attributions'),
-                  xls_build.USER: get_name_or_username(user),
-                  xls_build.FILENAME: XLS_FILENAME,
-                  xls_build.HEADER_TITLES: titles,
-                  xls_build.WS_TITLE: WORKSHEET_TITLE,
-                  xls_build.BORDER_CELLS: {xls_build.BORDER_TOP: cells_with_top_border},
-                  xls_build.FONT_CELLS: {Font(color=Color('00FFFFFF')): cells_with_white_font},
-                  xls_build.FONT_ROWS: {BOLD_FONT: [0]}
-                  }
-
-    return xls_build.generate_xls(xls_build.prepare_xls_parameters_list(working_sheets_data, parameters), filters)
+    top_border_style = RowStyle(border=TOP_BORDER, nb_columns=len(titles))
+    white_font_style = RowStyle(font=WHITE_FONT, nb_columns=NB_LEARNING_UNIT_COLUMNS)
+    rows = (
+        (row, top_border_style if is_first_line else white_font_style)
+        for row, is_first_line in _iter_xls_content_with_attributions(found_learning_units)
+    )
+    worksheets = [StreamedWorksheet(WORKSHEET_TITLE, titles, rows)]
+    return generate_streamed_xls(
+        worksheets,
+        XLS_FILENAME,
+        _('Learning units list with attributions'),
+        user,
+        filters
+    )
 
 
 def prepare_xls_content_with_attributions(found_learning_units: QuerySet, nb_columns: int) -> Dict:
     data = []
-    qs = annotate_qs(found_learning_units)
     cells_with_top_border = []
     cells_with_white_font = []
-    line = 2
-
-    for learning_unit_yr in qs:
-        first = True
-        cells_with_top_border.extend(["{}{}".format(letter, line) for letter in _get_all_columns_reference(nb_columns)])
-
-        lu_data_part1 = _get_data_part1(learning_unit_yr)
-        lu_data_part2 = _get_data_part2(learning_unit_yr, False)
-
-        lu_data_part1.extend(lu_data_part2)
-
-        attributions_values = attribution_charge_new.find_attribution_charge_new_by_learning_unit_year_as_dict(
-            learning_unit_yr).values()
-        if attributions_values:
-            for value in attributions_values:
-                data.append(lu_data_part1+_get_attribution_detail(value))
-                line += 1
-                if not first:
-                    cells_with_white_font.extend(
-                        ["{}{}".format(letter, line-1) for letter in _get_all_columns_reference(24)]
-                    )
-                first = False
+
+    rows = _iter_xls_content_with_attributions(found_learning_units)
+    for line, (row, is_first_line) in enumerate(rows, start=2):
+        data.append(row)
+        if is_first_line:
+            cells_with_top_border.extend(
+                ["{}{}".format(letter, line) for letter in _get_all_columns_reference(nb_columns)]
+            )
         else:
-            data.append(lu_data_part1)
-            line += 1
+            cells_with_white_font.extend(
+                ["{}{}".format(letter, line) for letter in _get_all_columns_reference(NB_LEARNING_UNIT_COLUMNS)]
+            )
 
     return {
         'data': data,
@@ -455,6 +445,27 @@ def prepare_xls_content_with_attributions(found_learning_units: QuerySet, nb_col
     }
 
 
+def _iter_xls_content_with_attributions(found_learning_units: QuerySet) -> Iterator[Tuple[List, bool]]:
+    """ Yield one line by attribution of each learning unit, flagging the first line of each learning unit."""
+    qs = annotate_qs(found_learning_units)
+
+    for learning_unit_years_chunk in xls_chunks.iter_chunks(qs):
+        attributions_by_learning_unit_year = xls_chunks.prefetch_chunk(
+            learning_unit_years_chunk,
+            with_grp=False,
+            with_attributions=True
+        )
+
+        for learning_unit_yr in learning_unit_years_chunk:
+            lu_data = _get_data_part1(learning_unit_yr) + _get_data_part2(learning_unit_yr, False)
+            attributions_values = attributions_by_learning_unit_year.get(learning_unit_yr.pk, {}).values()
+            if attributions_values:
+                for idx, value in enumerate(attributions_values):
+                    yield lu_data + _get_attribution_detail(value), idx == 0
+            else:
+                yield lu_data, True
+
+
 def _get_attribution_detail(an_attribution):
     return [
         an_attribution.get('person').full_name,
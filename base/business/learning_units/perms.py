@@ -24,9 +24,11 @@
 #
 ##############################################################################
 import datetime
+from typing import Dict, Iterable, Union
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef, Q, QuerySet
 from django.utils.translation import gettext_lazy as _
 from waffle.models import Flag
 
@@ -41,6 +43,7 @@ from base.models.enums import learning_container_year_types
 from base.models.enums.proposal_state import ProposalState
 from base.models.enums.proposal_type import ProposalType
 from base.models.learning_unit_year import LearningUnitYear
+from base.models.prerequisite_item import PrerequisiteItem
 from base.models.proposal_learning_unit import ProposalLearningUnit
 from osis_common.utils.datetime import get_tzinfo, convert_date_to_datetime
 from osis_common.utils.perms import conjunction, disjunction, negation, BasePerm
@@ -124,9 +127,13 @@ def is_eligible_for_modification_end_date(learning_unit_year, person, raise_exce
 
 
 def _has_no_applications_this_year(learning_unit_year, raise_exception=False):
-    result = not TutorApplication.objects.filter(
-        learning_container_year=learning_unit_year.learning_container_year
-    ).exists()
+    result = not _get_permissions_data(
+        learning_unit_year,
+        'has_tutor_applications_this_year',
+        lambda: TutorApplication.objects.filter(
+            learning_container_year=learning_unit_year.learning_container_year
+        ).exists()
+    )
     can_raise_exception(
         raise_exception, result,
         MSG_LEARNING_UNIT_HAS_APPLICATION
@@ -254,10 +261,16 @@ def is_eligible_to_delete_learning_unit_year(learning_unit_year, person, raise_e
         msg = MSG_NOT_ELIGIBLE_TO_DELETE_LU
     elif not person.is_linked_to_entity_in_charge_of_learning_unit_year(learning_unit_year):
         msg = MSG_ONLY_IF_YOUR_ARE_LINK_TO_ENTITY
-    elif learning_unit_year.is_prerequisite():
+    elif _get_permissions_data(learning_unit_year, 'is_or_has_prerequisite', learning_unit_year.is_prerequisite):
         msg = MSG_LEARNING_UNIT_IS_OR_HAS_PREREQUISITE
-    elif LearningUnitYear.objects.filter(learning_unit=learning_unit_year.learning_unit,
-                                         academic_year__year__lt=settings.YEAR_LIMIT_LUE_MODIFICATION):
+    elif _get_permissions_data(
+            learning_unit_year,
+            'exists_before_modification_limit',
+            lambda: LearningUnitYear.objects.filter(
+                learning_unit=learning_unit_year.learning_unit,
+                academic_year__year__lt=settings.YEAR_LIMIT_LUE_MODIFICATION
+            ).exists()
+    ):
         msg = _("You cannot delete a learning unit which is existing before %(limit_year)s") % {
             "limit_year": settings.YEAR_LIMIT_LUE_MODIFICATION}
     elif not _has_no_applications_all_years(learning_unit_year, raise_exception):
@@ -274,9 +287,13 @@ def is_eligible_to_delete_learning_unit_year(learning_unit_year, person, raise_e
 
 
 def _has_no_applications_all_years(learning_unit_year, raise_exception=False):
-    result = not TutorApplication.objects.filter(
-        learning_container_year__learning_container=learning_unit_year.learning_container_year.learning_container
-    ).exists()
+    result = not _get_permissions_data(
+        learning_unit_year,
+        'has_tutor_applications_all_years',
+        lambda: TutorApplication.objects.filter(
+            learning_container_year__learning_container=learning_unit_year.learning_container_year.learning_container
+        ).exists()
+    )
     can_raise_exception(
         raise_exception, result,
         MSG_LEARNING_UNIT_HAS_APPLICATION
@@ -384,7 +401,11 @@ def is_learning_unit_year_a_partim(learning_unit_year, _, raise_exception=False)
 
 
 def is_learning_unit_year_in_proposal(learning_unit_year, _, raise_exception=False):
-    return proposal_learning_unit.is_learning_unit_in_proposal(learning_unit_year.learning_unit)
+    return _get_permissions_data(
+        learning_unit_year,
+        'is_learning_unit_in_proposal',
+        lambda: proposal_learning_unit.is_learning_unit_in_proposal(learning_unit_year.learning_unit)
+    )
 
 
 def _is_learning_unit_year_in_state_to_create_partim(learning_unit_year, person, raise_exception=False):
@@ -484,6 +505,70 @@ def learning_unit_year_permissions(learning_unit_year, person):
     }
 
 
+def learning_unit_years_permissions(
+        learning_unit_years: Union[QuerySet, Iterable[LearningUnitYear]],
+        person
+) -> Dict[int, Dict[str, bool]]:
+    """
+    Return the permissions of learning_unit_year_permissions for each learning unit year, by id.
+    The applications, proposals and prerequisites checked are loaded for all the learning unit years in one query.
+    The calendars are read from the academic calendar snapshot and the entities of the person are loaded once.
+    """
+    if isinstance(learning_unit_years, QuerySet):
+        ids = list(learning_unit_years.values_list('pk', flat=True))
+    else:
+        ids = [learning_unit_year.pk for learning_unit_year in learning_unit_years]
+    return {
+        learning_unit_year.id: learning_unit_year_permissions(learning_unit_year, person)
+        for learning_unit_year in annotate_permissions_data(LearningUnitYear.objects.filter(pk__in=ids))
+    }
+
+
+def annotate_permissions_data(queryset: QuerySet) -> QuerySet:
+    """ Annotate the learning unit years with the data read by the permissions instead of a query by check """
+    return queryset.select_related(
+        'academic_year',
+        'learning_unit',
+        'learning_container_year__requirement_entity',
+        'externallearningunityear',
+    ).annotate(
+        has_tutor_applications_this_year=Exists(
+            TutorApplication.objects.filter(learning_container_year=OuterRef('learning_container_year'))
+        ),
+        has_tutor_applications_all_years=Exists(
+            TutorApplication.objects.filter(
+                learning_container_year__learning_container=OuterRef('learning_container_year__learning_container')
+            )
+        ),
+        is_learning_unit_in_proposal=Exists(
+            ProposalLearningUnit.objects.filter(learning_unit_year__learning_unit=OuterRef('learning_unit'))
+        ),
+        has_proposal_until_this_year=Exists(
+            ProposalLearningUnit.objects.filter(
+                learning_unit_year__learning_unit=OuterRef('learning_unit'),
+                learning_unit_year__academic_year__year__lte=OuterRef('academic_year__year'),
+            )
+        ),
+        is_or_has_prerequisite=Exists(
+            PrerequisiteItem.objects.filter(
+                Q(learning_unit=OuterRef('learning_unit')) | Q(prerequisite__learning_unit_year=OuterRef('pk'))
+            )
+        ),
+        exists_before_modification_limit=Exists(
+            LearningUnitYear.objects.filter(
+                learning_unit=OuterRef('learning_unit'),
+                academic_year__year__lt=settings.YEAR_LIMIT_LUE_MODIFICATION,
+            )
+        ),
+    )
+
+
+def _get_permissions_data(learning_unit_year, name, query):
+    """ Return the value annotated by annotate_permissions_data, or query it """
+    data = vars(learning_unit_year)
+    return data[name] if name in data else query()
+
+
 def learning_unit_proposal_permissions(proposal, person, current_learning_unit_year):
     permissions = {'can_cancel_proposal': False, 'can_edit_learning_unit_proposal': False,
                    'can_consolidate_proposal': False}
@@ -631,10 +716,14 @@ def _is_container_type_course_dissertation_or_internship2(learning_unit_year, _,
 
 
 def _check_proposal_edition(learning_unit_year, raise_exception):
-    result = not ProposalLearningUnit.objects.filter(
-        learning_unit_year__learning_unit=learning_unit_year.learning_unit,
-        learning_unit_year__academic_year__year__lte=learning_unit_year.academic_year.year
-    ).exists()
+    result = not _get_permissions_data(
+        learning_unit_year,
+        'has_proposal_until_this_year',
+        lambda: ProposalLearningUnit.objects.filter(
+            learning_unit_year__learning_unit=learning_unit_year.learning_unit,
+            learning_unit_year__academic_year__year__lte=learning_unit_year.academic_year.year
+        ).exists()
+    )
 
     can_raise_exception(
         raise_exception,
@@ -0,0 +1,66 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import itertools
+from typing import Dict, Iterator, List
+
+from django.db.models import QuerySet, Prefetch, prefetch_related_objects
+
+from attribution.business import attribution_charge_new
+from base.models.group_element_year import GroupElementYear
+from base.models.learning_unit_year import LearningUnitYear
+
+CHUNK_SIZE = 2000
+
+
+def iter_chunks(qs: QuerySet) -> Iterator[List[LearningUnitYear]]:
+    """ Read the queryset through a server-side cursor, CHUNK_SIZE learning units at a time."""
+    learning_unit_years = qs.iterator(chunk_size=CHUNK_SIZE)
+    while True:
+        chunk = list(itertools.islice(learning_unit_years, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def prefetch_chunk(learning_unit_years: List[LearningUnitYear], with_grp: bool, with_attributions: bool) -> Dict:
+    """ Load the relations of a chunk (iterator() ignores prefetch_related) and return its attributions."""
+    prefetch_related_objects(learning_unit_years, 'academic_year', 'proposallearningunit')
+    if with_grp:
+        prefetch_related_objects(
+            learning_unit_years,
+            Prefetch(
+                'element__children_elements',
+                queryset=GroupElementYear.objects.select_related(
+                    'parent_element__group_year',
+                    'child_element__learning_unit_year'
+                )
+            )
+        )
+    if with_attributions:
+        return attribution_charge_new.find_attribution_charge_new_by_learning_unit_years_as_dict(
+            [learning_unit_yr.pk for learning_unit_yr in learning_unit_years]
+        )
+    return {}
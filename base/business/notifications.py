@@ -0,0 +1,88 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.utils import timezone
+from notifications.models import Notification
+
+from base.models import notification_run
+from base.models.academic_calendar import AcademicCalendar
+from base.utils.notifications import invalidate_unread_notifications_count
+
+ALERT_WEEK = 2
+NOTIFICATIONS_BATCH_SIZE = 1000
+ACADEMIC_CALENDAR_NOTIFICATIONS_PROCESS = "academic_calendar_notifications"
+
+
+def send_academic_calendar_notifications() -> int:
+    """
+        Notify all the users of the academic calendars starting within ALERT_WEEK weeks which are new or changed
+        since the previous run. The notifications are bulk inserted and the users already notified are skipped.
+    """
+    now = timezone.now()
+    academic_calendars = _find_academic_calendars_to_notify(
+        notification_run.get_last_sent_at(ACADEMIC_CALENDAR_NOTIFICATIONS_PROCESS)
+    )
+    recipient_ids = list(
+        User.objects.filter(is_active=True, last_login__isnull=False).values_list('pk', flat=True)
+    )
+    content_type = ContentType.objects.get_for_model(AcademicCalendar)
+
+    notifications = []
+    for academic_calendar in academic_calendars:
+        verb = "{} ({})".format(academic_calendar.title, academic_calendar.start_date.strftime("%d/%m"))
+        already_notified_ids = set(
+            Notification.objects.filter(
+                actor_content_type=content_type,
+                actor_object_id=str(academic_calendar.pk),
+                verb=verb
+            ).values_list('recipient_id', flat=True)
+        )
+        notifications += [
+            Notification(
+                recipient_id=recipient_id,
+                actor_content_type=content_type,
+                actor_object_id=str(academic_calendar.pk),
+                verb=verb
+            ) for recipient_id in recipient_ids if recipient_id not in already_notified_ids
+        ]
+
+    Notification.objects.bulk_create(notifications, batch_size=NOTIFICATIONS_BATCH_SIZE)
+    invalidate_unread_notifications_count({notification.recipient_id for notification in notifications})
+    notification_run.set_last_sent_at(ACADEMIC_CALENDAR_NOTIFICATIONS_PROCESS, now)
+    return len(notifications)
+
+
+def _find_academic_calendars_to_notify(last_sent: datetime.datetime = None):
+    academic_calendars = AcademicCalendar.objects.starting_within(weeks=ALERT_WEEK).order_by("start_date", "end_date")
+    if last_sent:
+        academic_calendars = academic_calendars.filter(
+            Q(start_date__gt=(last_sent + datetime.timedelta(weeks=ALERT_WEEK)).date()) | Q(changed__gt=last_sent)
+        )
+    return academic_calendars
@@ -47,6 +47,14 @@ def update_related_object(obj, attribute_name, new_value, commit_save=True):
     return duplicated_obj
 
 
+def bulk_update_related_objects(objs, attribute_name, new_value) -> list:
+    """ Same as update_related_object for several objects of the same model, created by one bulk insert """
+    duplicated_objs = [update_related_object(obj, attribute_name, new_value, commit_save=False) for obj in objs]
+    if duplicated_objs:
+        duplicated_objs = type(duplicated_objs[0]).objects.bulk_create(duplicated_objs)
+    return duplicated_objs
+
+
 def duplicate_object(obj):
     new_obj = copy(obj)
     new_obj.pk = None
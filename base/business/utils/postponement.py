@@ -24,14 +24,20 @@
 #
 ############################################################################
 from abc import ABC
+from typing import List, Tuple, Optional
 
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 from django.db import transaction, Error
-from django.db.models import Max, Q
+from django.db.models import Max, Q, Model
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from base.business.education_groups.postponement import ConsistencyError
 from base.models.academic_year import AcademicYear
+from base.models.automatic_postponement import AutomaticPostponementRun, AutomaticPostponementCheckpoint
+
+# Errors of the postponement of one object, which must not stop the postponement of the others
+POSTPONEMENT_ERRORS = (Error, ObjectDoesNotExist, MultipleObjectsReturned, ConsistencyError)
 
 
 class AutomaticPostponement(ABC):
@@ -49,7 +55,7 @@ class AutomaticPostponement(ABC):
         self.to_not_duplicate = self.get_to_not_duplicated()
         self.ending_before_max_adjournment = self.get_ending_before_max_adjournment()
 
-        if self.already_duplicated or self.to_not_duplicate:
+        if self.already_duplicated.exists() or self.to_not_duplicate.exists():
             self.to_duplicate = self.queryset.difference(self.already_duplicated, self.to_not_duplicate)
         else:
             self.to_duplicate = self.queryset
@@ -96,6 +102,9 @@ class AutomaticPostponementToN6(AutomaticPostponement):
     # The model must have annualized data with a FK to AcademicYear
     annualized_set = ""
 
+    # Number of objects postponed by sub-task (see base.tasks)
+    chunk_size = 100
+
     # Callbacks
     # They should be call with __func__ to be staticmethod
     extend_method = None
@@ -123,23 +132,105 @@ class AutomaticPostponementToN6(AutomaticPostponement):
     def _extend_objects(self):
         for obj in self.to_duplicate:
             try:
-                with transaction.atomic():
-                    last_year = obj.end_year.year if obj.end_year else self.last_academic_year.year
-                    obj_to_copy = self.get_object_to_copy(obj)
-                    copied_objs = []
-                    last_object_copied = None
-                    for year in range(obj.last_year + 1, last_year + 1):
-                        new_obj = self.extend_obj(obj_to_copy, AcademicYear.objects.get(year=year))
-                        copied_objs.append(new_obj)
-                        last_object_copied = new_obj
-
-                    self.post_extend(obj_to_copy, copied_objs)
-                    if last_object_copied:
-                        self.result.append(last_object_copied)
-
+                last_object_copied = self._extend_object(obj)
             # General catch to be sure to not stop the rest of the duplication
-            except (Error, ObjectDoesNotExist, MultipleObjectsReturned, ConsistencyError) as err:
+            except POSTPONEMENT_ERRORS:
                 self.errors.append(obj)
+            else:
+                if last_object_copied:
+                    self.result.append(last_object_copied)
+
+    def _extend_object(self, obj) -> Optional[Model]:
+        """ Extend the object up to N+6 and return the last annualized object created """
+        with transaction.atomic():
+            last_year = obj.end_year.year if obj.end_year else self.last_academic_year.year
+            obj_to_copy = self.get_object_to_copy(obj)
+            copied_objs = []
+            last_object_copied = None
+            for year in range(obj.last_year + 1, last_year + 1):
+                new_obj = self.extend_obj(obj_to_copy, AcademicYear.objects.get(year=year))
+                copied_objs.append(new_obj)
+                last_object_copied = new_obj
+
+            self.post_extend(obj_to_copy, copied_objs)
+        return last_object_copied
+
+    @classmethod
+    def get_process_name(cls) -> str:
+        return cls.__name__
+
+    def start_run(self) -> Tuple[AutomaticPostponementRun, List[List[int]]]:
+        """
+            Start the run of the process up to N+6, or resume it when a previous run has not ended.
+            Return the run and the chunks of ids of the objects still to postpone.
+        """
+        run, created = AutomaticPostponementRun.objects.get_or_create(
+            process=self.get_process_name(),
+            academic_year=self.last_academic_year,
+        )
+        if run.ended_at:
+            return run, []
+
+        processed_ids = set(run.checkpoints.values_list('object_id', flat=True))
+        ids_to_postpone = [obj.pk for obj in self.to_duplicate if obj.pk not in processed_ids]
+        if created:
+            run.total = len(ids_to_postpone)
+            run.save()
+            # send statistics to the managers
+            self.send_before.__func__(self.get_statistics_context())
+
+        chunks = [
+            ids_to_postpone[index:index + self.chunk_size] for index in range(0, len(ids_to_postpone), self.chunk_size)
+        ]
+        return run, chunks
+
+    def postpone_chunk(self, run: AutomaticPostponementRun, object_ids: List[int]) -> None:
+        """
+            Postpone the objects of the chunk in one transaction : each object has its own savepoint and its checkpoint.
+            The objects which already have a checkpoint in the run are skipped.
+        """
+        objects_to_postpone = self.queryset.filter(
+            pk__in=object_ids
+        ).exclude(
+            pk__in=run.checkpoints.values('object_id')
+        )
+        with transaction.atomic():
+            checkpoints = []
+            for obj in objects_to_postpone:
+                try:
+                    last_object_copied = self._extend_object(obj)
+                except POSTPONEMENT_ERRORS:
+                    self.errors.append(obj)
+                    checkpoints.append(AutomaticPostponementCheckpoint(run=run, object_id=obj.pk, has_error=True))
+                    continue
+                if last_object_copied:
+                    self.result.append(last_object_copied)
+                checkpoints.append(
+                    AutomaticPostponementCheckpoint(
+                        run=run,
+                        object_id=obj.pk,
+                        result_id=last_object_copied.pk if last_object_copied else None
+                    )
+                )
+            AutomaticPostponementCheckpoint.objects.bulk_create(checkpoints)
+
+    def end_run(self, run: AutomaticPostponementRun) -> dict:
+        """ Send the results of all the chunks of the run to the managers """
+        checkpoints = list(run.checkpoints.all())
+        annualized_model = self.model._meta.get_field(self.annualized_set).related_model
+        self.result = list(annualized_model.objects.filter(
+            pk__in=[checkpoint.result_id for checkpoint in checkpoints if checkpoint.result_id]
+        ))
+        self.errors = list(self.model.objects.filter(
+            pk__in=[checkpoint.object_id for checkpoint in checkpoints if checkpoint.has_error]
+        ))
+
+        # send statistics with results to the managers
+        self.send_after.__func__(self.get_statistics_context(), self.result, self.errors)
+
+        run.ended_at = timezone.now()
+        run.save()
+        return self.serialize_postponement_results()
 
     def get_object_to_copy(self, object_to_duplicate):
         return getattr(object_to_duplicate, self.annualized_set + "_set").latest('academic_year__year')
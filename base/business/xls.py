@@ -23,10 +23,22 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.functional import Promise
 from django.utils.translation import gettext_lazy as _
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill
 from openpyxl.utils import get_column_letter
+from openpyxl.writer.write_only import WriteOnlyCell
 
 from base import models as mdl_base
+from osis_common.document.xls_build import CONTENT_TYPE_XLS
+
+BOLD_FONT = Font(bold=True)
 
 
 def get_name_or_username(a_user):
@@ -45,3 +57,113 @@ def _get_all_columns_reference(nb_columns):
         letters.append(get_column_letter(nb_col))
         nb_col += 1
     return letters
+
+
+class RowStyle:
+    """ Styles applied to the first nb_columns cells of a streamed row (to all of them if nb_columns is None) """
+    __slots__ = ('font', 'border', 'fill', 'nb_columns')
+
+    def __init__(self, font: Font = None, border: Border = None, fill: PatternFill = None, nb_columns: int = None):
+        self.font = font
+        self.border = border
+        self.fill = fill
+        self.nb_columns = nb_columns
+
+    def applies_to(self, column_index: int) -> bool:
+        return self.nb_columns is None or column_index < self.nb_columns
+
+
+class StreamedWorksheet:
+    """
+        Worksheet written row by row into a write-only workbook.
+
+        rows: iterable of (values, RowStyle or None), consumed only once while the workbook is written.
+        column_alignments: alignment of the data cells by column index (starting at 0).
+    """
+    def __init__(
+            self,
+            title: str,
+            header_titles: List[str],
+            rows: Iterable[Tuple[List, Optional[RowStyle]]],
+            column_alignments: Dict[int, Alignment] = None
+    ):
+        self.title = title
+        self.header_titles = header_titles
+        self.rows = rows
+        self.column_alignments = column_alignments or {}
+
+    def write_to(self, workbook: Workbook) -> None:
+        worksheet = workbook.create_sheet(title=str(self.title))
+        if self.header_titles:
+            worksheet.append([_get_cell(worksheet, title, font=BOLD_FONT) for title in self.header_titles])
+        for values, row_style in self.rows:
+            worksheet.append(
+                [self._get_data_cell(worksheet, idx, value, row_style) for idx, value in enumerate(values)]
+            )
+
+    def _get_data_cell(self, worksheet, column_index: int, value, row_style: Optional[RowStyle]):
+        alignment = self.column_alignments.get(column_index)
+        if row_style and row_style.applies_to(column_index):
+            return _get_cell(
+                worksheet,
+                value,
+                font=row_style.font,
+                border=row_style.border,
+                fill=row_style.fill,
+                alignment=alignment
+            )
+        if alignment:
+            return _get_cell(worksheet, value, alignment=alignment)
+        return _get_cell_value(value)
+
+
+def generate_streamed_xls(
+        worksheets: List[StreamedWorksheet],
+        filename: str,
+        description: str,
+        user,
+        filters: Dict = None
+) -> FileResponse:
+    """
+        Write the worksheets in an openpyxl write-only workbook so as the rows are never held in memory
+        and stream the resulting file spooled on disk.
+    """
+    workbook = Workbook(write_only=True)
+    for worksheet in worksheets:
+        worksheet.write_to(workbook)
+    _get_parameters_worksheet(description, user, filters).write_to(workbook)
+
+    xls_file = tempfile.TemporaryFile()
+    workbook.save(xls_file)
+    xls_file.seek(0)
+
+    response = FileResponse(xls_file, content_type=CONTENT_TYPE_XLS)
+    response['Content-Disposition'] = "%s%s" % ("attachment; filename=", "{}.xlsx".format(filename))
+    return response
+
+
+def _get_parameters_worksheet(description: str, user, filters: Optional[Dict]) -> StreamedWorksheet:
+    rows = [
+        ([str(_('Description')), str(description)], None),
+        ([str(_('User')), get_name_or_username(user)], None),
+        ([str(_('Date')), timezone.now().strftime('%d/%m/%Y %H:%M')], None),
+    ]
+    rows.extend(([str(key), str(value)], None) for key, value in (filters or {}).items())
+    return StreamedWorksheet(_('Parameters'), [], rows)
+
+
+def _get_cell(worksheet, value, font=None, border=None, fill=None, alignment=None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(worksheet, value=_get_cell_value(value))
+    if font:
+        cell.font = font
+    if border:
+        cell.border = border
+    if fill:
+        cell.fill = fill
+    if alignment:
+        cell.alignment = alignment
+    return cell
+
+
+def _get_cell_value(value):
+    return str(value) if isinstance(value, Promise) else value
@@ -95,11 +95,12 @@ def filter_is_borrowed_learning_unit_year(
         faculty_borrowing_id: int = None
 ):
     entities = build_current_entity_version_structure_in_memory(academic_year.start_date)
-    entities_borrowing_allowed = []
+    entities_borrowing_allowed = set()
     if faculty_borrowing_id in entities:
-        entities_borrowing_allowed.extend(entities[faculty_borrowing_id]["all_children"])
-        entities_borrowing_allowed.append(entities[faculty_borrowing_id]["entity_version"])
-        entities_borrowing_allowed = [entity_version.entity.id for entity_version in entities_borrowing_allowed]
+        entities_borrowing_allowed = {
+            entity_id for entity_id in entities
+            if entities.is_under(entity_id, faculty_borrowing_id, include_itself=True)
+        }
 
     entities_faculty = compute_faculty_for_entities(entities)
     map_luy_entity = map_learning_unit_year_with_requirement_entity(learning_unit_year_qs)
@@ -23,41 +23,17 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import datetime
-
-from django.db.models import Q
-from notifications.signals import notify
-
-from base.models.academic_calendar import AcademicCalendar
-from base.utils.notifications import get_notifications_last_time_read_for_user, \
-    set_notifications_last_read_as_now_for_user, apply_function_if_data_not_in_cache
-
-ALERT_WEEK = 2
+from base.utils.notifications import get_user_unread_notifications_count
 
 
 class NotificationMiddleware(object):
+    """ Read the unread notifications counter of the user, the notifications are sent by a scheduled task """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            send_academic_calendar_notifications(request.user)
+            request.unread_notifications_count = get_user_unread_notifications_count(request.user)
 
         response = self.get_response(request)
         return response
-
-
-@apply_function_if_data_not_in_cache
-def send_academic_calendar_notifications(user):
-    time_last_read = get_notifications_last_time_read_for_user(user)
-    ac_qs = AcademicCalendar.objects.starting_within(weeks=ALERT_WEEK).order_by("start_date", "end_date")
-
-    if time_last_read:
-        ac_qs = ac_qs.filter(Q(start_date__gt=time_last_read+datetime.timedelta(weeks=ALERT_WEEK))
-                             | Q(changed__gt=time_last_read))
-
-    for ac_obj in ac_qs:
-        verb = "{} ({})".format(ac_obj.title, ac_obj.start_date.strftime("%d/%m"))
-        notify.send(ac_obj, recipient=user, verb=verb)
-
-    set_notifications_last_read_as_now_for_user(user)
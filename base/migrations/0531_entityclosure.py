@@ -0,0 +1,125 @@
+from django.db import migrations, models
+import django.contrib.postgres.fields
+import django.db.models.deletion
+
+ENTITY_CLOSURE_PATHS_SQL = """
+    WITH RECURSIVE paths AS (
+        SELECT entity_version.parent_id AS ancestor_id, entity_version.entity_id AS descendant_id,
+               entity_version.id AS descendant_version_id, 1 AS depth, ARRAY[entity_version.parent_id] AS parents,
+               entity_version.start_date, entity_version.end_date
+        FROM base_entityversion entity_version
+        WHERE entity_version.parent_id IS NOT NULL
+            AND entity_version.parent_id <> entity_version.entity_id
+            AND {seed_condition}
+
+        UNION ALL
+
+        SELECT parent_version.parent_id, paths.descendant_id,
+               paths.descendant_version_id, paths.depth + 1, parent_version.parent_id || paths.parents,
+               GREATEST(paths.start_date, parent_version.start_date), LEAST(paths.end_date, parent_version.end_date)
+        FROM paths
+        INNER JOIN base_entityversion parent_version ON parent_version.entity_id = paths.ancestor_id
+        WHERE parent_version.parent_id IS NOT NULL
+            AND parent_version.parent_id <> paths.descendant_id
+            AND NOT parent_version.parent_id = ANY(paths.parents)
+            AND parent_version.start_date <= COALESCE(paths.end_date, 'infinity'::date)
+            AND COALESCE(parent_version.end_date, 'infinity'::date) >= paths.start_date
+    )
+    SELECT ancestor_id, descendant_id, descendant_version_id, depth, parents, start_date, end_date
+    FROM paths
+"""
+
+INSERT_ENTITY_CLOSURE_SQL = """
+    INSERT INTO base_entityclosure (
+        ancestor_id, descendant_id, descendant_version_id, depth, parents, start_date, end_date
+    )
+"""
+
+CREATE_FUNCTIONS_AND_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION refresh_entity_closure(changed_entity_ids integer[], changed_version_ids integer[])
+RETURNS void AS $$
+DECLARE
+    affected_version_ids integer[];
+BEGIN
+    -- The paths of the versions of the changed entities and of all the versions having them as ancestor
+    SELECT ARRAY(
+        SELECT id FROM base_entityversion WHERE entity_id = ANY(changed_entity_ids)
+        UNION
+        SELECT unnest(changed_version_ids)
+        UNION
+        SELECT descendant_version_id FROM base_entityclosure WHERE parents && changed_entity_ids
+    ) INTO affected_version_ids;
+
+    DELETE FROM base_entityclosure WHERE descendant_version_id = ANY(affected_version_ids);
+
+    {insert_sql}
+    {paths_sql};
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_entity_closure()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_entity_closure(ARRAY[NEW.entity_id], ARRAY[NEW.id]);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_entity_closure(ARRAY[OLD.entity_id], ARRAY[OLD.id]);
+    ELSE
+        PERFORM refresh_entity_closure(ARRAY[OLD.entity_id, NEW.entity_id], ARRAY[OLD.id, NEW.id]);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER maintain_entity_closure_on_insert_or_delete
+AFTER INSERT OR DELETE ON base_entityversion
+FOR EACH ROW EXECUTE PROCEDURE maintain_entity_closure();
+
+CREATE TRIGGER maintain_entity_closure_on_update
+AFTER UPDATE OF entity_id, parent_id, start_date, end_date ON base_entityversion
+FOR EACH ROW
+WHEN (
+    OLD.entity_id IS DISTINCT FROM NEW.entity_id OR
+    OLD.parent_id IS DISTINCT FROM NEW.parent_id OR
+    OLD.start_date IS DISTINCT FROM NEW.start_date OR
+    OLD.end_date IS DISTINCT FROM NEW.end_date
+)
+EXECUTE PROCEDURE maintain_entity_closure();
+""".format(
+    insert_sql=INSERT_ENTITY_CLOSURE_SQL,
+    paths_sql=ENTITY_CLOSURE_PATHS_SQL.format(seed_condition="entity_version.id = ANY(affected_version_ids)"),
+)
+
+DROP_FUNCTIONS_AND_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS maintain_entity_closure_on_insert_or_delete ON base_entityversion;
+DROP TRIGGER IF EXISTS maintain_entity_closure_on_update ON base_entityversion;
+DROP FUNCTION IF EXISTS maintain_entity_closure();
+DROP FUNCTION IF EXISTS refresh_entity_closure(integer[], integer[]);
+"""
+
+FILL_ENTITY_CLOSURE_SQL = INSERT_ENTITY_CLOSURE_SQL + ENTITY_CLOSURE_PATHS_SQL.format(seed_condition="TRUE") + ";"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0530_auto_20200818_0805'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntityClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('parents', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_closures', to='base.Entity')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_closures', to='base.Entity')),
+                ('descendant_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_closures', to='base.EntityVersion')),
+            ],
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS_AND_TRIGGERS_SQL, reverse_sql=DROP_FUNCTIONS_AND_TRIGGERS_SQL),
+        migrations.RunSQL(FILL_ENTITY_CLOSURE_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
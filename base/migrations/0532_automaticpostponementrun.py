@@ -0,0 +1,39 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0531_entityclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutomaticPostponementRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('process', models.CharField(max_length=100)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='base.AcademicYear')),
+            ],
+            options={
+                'unique_together': {('process', 'academic_year')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AutomaticPostponementCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.IntegerField()),
+                ('result_id', models.IntegerField(blank=True, null=True)),
+                ('has_error', models.BooleanField(default=False)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='base.AutomaticPostponementRun')),
+            ],
+            options={
+                'unique_together': {('run', 'object_id')},
+            },
+        ),
+    ]
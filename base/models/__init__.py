@@ -2,6 +2,7 @@ from base.models import academic_calendar
 from base.models import academic_year
 from base.models import admission_condition
 from base.models import authorized_relationship
+from base.models import automatic_postponement
 from base.models import campus
 from base.models import certificate_aim
 from base.models import education_group
@@ -14,8 +15,10 @@ from base.models import education_group_year
 from base.models import education_group_year_domain
 from base.models import entity
 from base.models import entity_calendar
+from base.models import entity_closure
 from base.models import entity_version
 from base.models import entity_version_address
+from base.models import export_job
 from base.models import exam_enrollment
 from base.models import external_learning_unit_year
 from base.models import external_learning_unit_year
@@ -31,6 +34,7 @@ from base.models import learning_unit_enrollment
 from base.models import learning_unit_year
 from base.models import mandatary
 from base.models import mandate
+from base.models import notification_run
 from base.models import offer
 from base.models import offer_enrollment
 from base.models import offer_type
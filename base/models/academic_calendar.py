@@ -23,7 +23,15 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import bisect
+import datetime
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from reversion.admin import VersionAdmin
@@ -33,9 +41,12 @@ from base.models.enums import academic_calendar_type
 from base.models.exceptions import StartDateHigherThanEndDateException
 from base.models.utils.admin_extentions import remove_delete_action
 from base.signals.publisher import compute_all_scores_encodings_deadlines
+from base.utils.revisioned_cache import CacheRevision, InMemoryCache
 from osis_common.models.serializable_model import SerializableModel, SerializableModelAdmin
 from osis_common.utils.models import get_object_or_none
 
+SNAPSHOT_TIMEOUT = 300  # seconds
+
 
 class AcademicCalendarAdmin(VersionAdmin, SerializableModelAdmin):
     list_display = ('academic_year', 'title', 'start_date', 'end_date', 'data_year')
@@ -162,3 +173,140 @@ def get_academic_calendar_by_date_and_reference_and_data_year(data_year, referen
         )
     except AcademicCalendar.DoesNotExist:
         return None
+
+
+class AcademicCalendarSnapshot:
+    """
+        The academic years and the academic calendars, indexed by reference and data year and sorted by dates,
+        so as to answer "is the event open for this year today" and "which academic year is current" without SQL.
+        The dates follow the querysets : a calendar is open from its start date included to its end date excluded.
+    """
+    def __init__(self, academic_years: Iterable['AcademicYear'], academic_calendars: Iterable[AcademicCalendar]):
+        self.academic_years = sorted(academic_years, key=lambda ac_year: ac_year.year)
+        self._academic_year_by_id = {ac_year.pk: ac_year for ac_year in self.academic_years}
+
+        calendars = [calendar for calendar in academic_calendars if calendar.start_date and calendar.end_date]
+        calendars_by_reference = defaultdict(list)
+        calendars_by_reference_and_data_year = defaultdict(list)
+        for calendar in calendars:
+            calendars_by_reference[calendar.reference].append(calendar)
+            calendars_by_reference_and_data_year[(calendar.reference, calendar.data_year_id)].append(calendar)
+        self._index = _CalendarIndex(calendars)
+        self._index_by_reference = {
+            reference: _CalendarIndex(reference_calendars)
+            for reference, reference_calendars in calendars_by_reference.items()
+        }
+        self._index_by_reference_and_data_year = {
+            key: _CalendarIndex(data_year_calendars)
+            for key, data_year_calendars in calendars_by_reference_and_data_year.items()
+        }
+
+    def get_academic_year(self, academic_year_id: int) -> Optional['AcademicYear']:
+        return self._academic_year_by_id.get(academic_year_id)
+
+    def current_academic_years(self, date=None) -> List['AcademicYear']:
+        date = _to_date(date)
+        return [
+            ac_year for ac_year in self.academic_years
+            if ac_year.start_date and ac_year.end_date and ac_year.start_date <= date <= ac_year.end_date
+        ]
+
+    def current_academic_year(self, date=None) -> Optional['AcademicYear']:
+        """ If we have two academic year [2015-2016] [2016-2017]. It will return [2015-2016] """
+        return next(iter(self.current_academic_years(date)), None)
+
+    def starting_academic_year(self, date=None) -> Optional['AcademicYear']:
+        """ If we have two academic year [2015-2016] [2016-2017]. It will return [2016-2017] """
+        return next(reversed(self.current_academic_years(date)), None)
+
+    def open_calendars(self, reference: str = None, data_year_id: int = None, date=None) -> List[AcademicCalendar]:
+        return self._get_index(reference, data_year_id).open_at(_to_date(date))
+
+    def is_open(self, reference: str, data_year_id: int = None, date=None) -> bool:
+        return bool(self.open_calendars(reference, data_year_id, date))
+
+    def get_previous_calendar(self, reference: str = None, date=None) -> Optional[AcademicCalendar]:
+        """ Return the calendar ended at date which ends the last """
+        return self._get_index(reference).last_ended_at(_to_date(date))
+
+    def get_next_calendar(self, reference: str = None, date=None) -> Optional[AcademicCalendar]:
+        """ Return the calendar not started before date which starts the first """
+        return self._get_index(reference).first_starting_from(_to_date(date))
+
+    def _get_index(self, reference: str = None, data_year_id: int = None) -> '_CalendarIndex':
+        if reference is None and data_year_id is None:
+            return self._index
+        if data_year_id is None:
+            return self._index_by_reference.get(reference, _EMPTY_CALENDAR_INDEX)
+        if reference is None:
+            return _CalendarIndex(
+                calendar for calendar in self._index.calendars if calendar.data_year_id == data_year_id
+            )
+        return self._index_by_reference_and_data_year.get((reference, data_year_id), _EMPTY_CALENDAR_INDEX)
+
+
+class _CalendarIndex:
+    """ Calendars sorted by start date, and by end date, for bisection on a date """
+    def __init__(self, calendars: Iterable[AcademicCalendar] = ()):
+        self.calendars = sorted(calendars, key=lambda calendar: calendar.start_date)
+        self._start_dates = [calendar.start_date for calendar in self.calendars]
+        self._calendars_by_end_date = sorted(self.calendars, key=lambda calendar: calendar.end_date)
+        self._end_dates = [calendar.end_date for calendar in self._calendars_by_end_date]
+
+    def open_at(self, date: datetime.date) -> List[AcademicCalendar]:
+        started = self.calendars[:bisect.bisect_right(self._start_dates, date)]
+        return [calendar for calendar in started if calendar.end_date > date]
+
+    def last_ended_at(self, date: datetime.date) -> Optional[AcademicCalendar]:
+        index = bisect.bisect_right(self._end_dates, date)
+        return self._calendars_by_end_date[index - 1] if index else None
+
+    def first_starting_from(self, date: datetime.date) -> Optional[AcademicCalendar]:
+        index = bisect.bisect_left(self._start_dates, date)
+        return self.calendars[index] if index < len(self.calendars) else None
+
+
+_EMPTY_CALENDAR_INDEX = _CalendarIndex()
+
+snapshot_revision = CacheRevision('academic_calendar_snapshot')
+_snapshot_in_memory = InMemoryCache(snapshot_revision, timeout=SNAPSHOT_TIMEOUT)
+
+
+def bump_snapshot_revision() -> None:
+    snapshot_revision.bump()
+
+
+def get_academic_calendar_snapshot() -> Optional[AcademicCalendarSnapshot]:
+    """
+    Return the snapshot of the academic years and calendars, kept in memory until an academic year or calendar is
+    saved or deleted, or at most SNAPSHOT_TIMEOUT seconds (for the changes made without signals).
+    Return None when settings.ACADEMIC_CALENDAR_SNAPSHOT is disabled or when the current transaction has uncommitted
+    changes of the academic years and calendars : the callers query the database instead.
+    """
+    if not settings.ACADEMIC_CALENDAR_SNAPSHOT or snapshot_revision.is_bump_pending():
+        return None
+    return _snapshot_in_memory.get_or_build(None, _build_academic_calendar_snapshot)
+
+
+def _build_academic_calendar_snapshot() -> AcademicCalendarSnapshot:
+    return AcademicCalendarSnapshot(
+        academic_year.AcademicYear.objects.all(),
+        AcademicCalendar.objects.select_related('academic_year', 'data_year'),
+    )
+
+
+def _to_date(date=None) -> datetime.date:
+    """ Convert the date as Django does for the lookups on a DateField (default: today) """
+    if date is None:
+        date = timezone.now()
+    if isinstance(date, datetime.datetime):
+        return timezone.localtime(date).date() if timezone.is_aware(date) else date.date()
+    return date
+
+
+@receiver(post_save, sender=AcademicCalendar)
+@receiver(post_delete, sender=AcademicCalendar)
+@receiver(post_save, sender=academic_year.AcademicYear)
+@receiver(post_delete, sender=academic_year.AcademicYear)
+def _academic_calendar_snapshot_changed(sender, instance, **kwargs):
+    bump_snapshot_revision()
@@ -148,13 +148,25 @@ def current_academic_years():
 
 def current_academic_year():
     """ If we have two academic year [2015-2016] [2016-2017]. It will return [2015-2016] """
+    snapshot = _get_academic_calendar_snapshot()
+    if snapshot is not None:
+        return snapshot.current_academic_year()
     return current_academic_years().first()
 
 
 def starting_academic_year():
     """ If we have two academic year [2015-2016] [2016-2017]. It will return [2016-2017] """
+    snapshot = _get_academic_calendar_snapshot()
+    if snapshot is not None:
+        return snapshot.starting_academic_year()
     return current_academic_years().last()
 
 
+def _get_academic_calendar_snapshot():
+    # Imported here because the academic calendar module imports this one
+    from base.models.academic_calendar import get_academic_calendar_snapshot
+    return get_academic_calendar_snapshot()
+
+
 def compute_max_academic_year_adjournment():
     return starting_academic_year().year + LEARNING_UNIT_CREATION_SPAN_YEARS
@@ -0,0 +1,75 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.db import models
+
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class AutomaticPostponementRunAdmin(OsisModelAdmin):
+    list_display = ('process', 'academic_year', 'total', 'started_at', 'ended_at')
+    list_filter = ('process', )
+    raw_id_fields = ('academic_year', )
+
+
+class AutomaticPostponementRun(models.Model):
+    """
+        A run of an automatic postponement process up to an academic year (N+6).
+        A run which is not ended is resumed instead of started again : each object processed has a checkpoint.
+    """
+    process = models.CharField(max_length=100)
+    academic_year = models.ForeignKey('AcademicYear', on_delete=models.PROTECT)
+    total = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    ended_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('process', 'academic_year')
+
+    def __str__(self):
+        return "{} - {}".format(self.process, self.academic_year)
+
+    def get_progress(self) -> dict:
+        counts = self.checkpoints.aggregate(
+            processed=models.Count('pk'),
+            errors=models.Count('pk', filter=models.Q(has_error=True)),
+        )
+        return {
+            'total': self.total,
+            'processed': counts['processed'],
+            'errors': counts['errors'],
+            'ended': self.ended_at is not None,
+        }
+
+
+class AutomaticPostponementCheckpoint(models.Model):
+    """ Result of the postponement of one object, saved in the same transaction as its postponement """
+    run = models.ForeignKey(AutomaticPostponementRun, related_name='checkpoints', on_delete=models.CASCADE)
+    object_id = models.IntegerField()
+    result_id = models.IntegerField(blank=True, null=True)  # Last annualized object created
+    has_error = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('run', 'object_id')
@@ -0,0 +1,69 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import Q
+
+
+class EntityClosureQuerySet(models.QuerySet):
+    def current(self, date: datetime.date):
+        return self.filter(Q(end_date__gte=date) | Q(end_date__isnull=True), start_date__lte=date)
+
+
+class EntityClosure(models.Model):
+    """
+        Ancestor/descendant pairs of the entity hierarchy built by EntityVersion.parent.
+        A row is valid between 'start_date' and 'end_date' : the period where the versions of the descendant
+        and of the entities between both (the version of the ancestor itself is not considered) overlap.
+        'parents' are the entities from the ancestor down to the direct parent of the descendant.
+        Rows are maintained by database triggers on base_entityversion (see migrations).
+    """
+    ancestor = models.ForeignKey(
+        'Entity',
+        related_name='descendant_closures',
+        on_delete=models.CASCADE,
+    )
+    descendant = models.ForeignKey(
+        'Entity',
+        related_name='ancestor_closures',
+        on_delete=models.CASCADE,
+    )
+    descendant_version = models.ForeignKey(
+        'EntityVersion',
+        related_name='ancestor_closures',
+        on_delete=models.CASCADE,
+    )
+    depth = models.PositiveSmallIntegerField()
+    parents = ArrayField(models.IntegerField())
+    start_date = models.DateField()
+    end_date = models.DateField(blank=True, null=True)
+
+    objects = EntityClosureQuerySet.as_manager()
+
+    def __str__(self):
+        return "{} - {}".format(self.ancestor, self.descendant)
@@ -25,14 +25,18 @@
 ##############################################################################
 import collections
 import datetime
+import itertools
 from collections import OrderedDict
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional
 
+from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.db.models import Q
-from django.db.models.expressions import F, Func, RawSQL, Value
+from django.db.models.expressions import F, Func, RawSQL
 from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.timezone import now
@@ -41,10 +45,12 @@ from django_cte import CTEManager, CTEQuerySet, With
 from reversion.admin import VersionAdmin
 
 from base.models.entity import Entity
+from base.models.entity_closure import EntityClosure
 from base.models.enums import entity_type
 from base.models.enums.entity_type import PEDAGOGICAL_ENTITY_TYPES
 from base.models.enums.organization_type import ACADEMIC_PARTNER, MAIN
 from base.models.utils.func import ArrayConcat
+from base.utils.revisioned_cache import CacheRevision, InMemoryCache
 from osis_common.models.serializable_model import SerializableModel, SerializableModelAdmin
 from osis_common.utils.datetime import get_tzinfo
 
@@ -54,6 +60,8 @@ PEDAGOGICAL_ENTITY_ADDED_EXCEPTIONS = [
     "CCR"
 ]
 
+MAX_STRUCTURES_IN_MEMORY = 16
+
 
 class Node:
     """ Node used to create an hierarchy between the entity_version """
@@ -85,6 +93,25 @@ class EntityVersionAdmin(VersionAdmin, SerializableModelAdmin):
 
 
 class EntityVersionQuerySet(CTEQuerySet):
+    """
+    Bulk operations don't send the model signals : they bump the revision of the structure themselves
+    (see build_current_entity_version_structure_in_memory).
+    """
+    def update(self, **kwargs):
+        result = super().update(**kwargs)
+        bump_structure_revision()
+        return result
+
+    def bulk_create(self, *args, **kwargs):
+        result = super().bulk_create(*args, **kwargs)
+        bump_structure_revision()
+        return result
+
+    def bulk_update(self, *args, **kwargs):
+        result = super().bulk_update(*args, **kwargs)
+        bump_structure_revision()
+        return result
+
     def current(self, date):
         if date:
             return self.filter(Q(end_date__gte=date) | Q(end_date__isnull=True), start_date__lte=date, )
@@ -174,56 +201,6 @@ class EntityVersionQuerySet(CTEQuerySet):
 
         return With.recursive(children_entities)
 
-    def with_parents(self, *extra_fields, date=None, **filter_kwargs):
-        """
-        Use a Common Table Expression to construct the hierarchy of parent entities
-        The Union is made recursively on LEFT.parent_id = CTE.children_id
-
-        :param date: Date to filter the entity versions on (default: now)
-        :param extra_fields: Any field to add on the cte query
-        :param filter_kwargs: Any filter to add on the original query
-        :return: a CTE queryset
-        :rtype: With
-        """
-        if date is None:
-            date = now()
-
-        def parent_entities(cte):
-            """ This function is used for the recursive SQL query """
-            # self here is an EntityVersion queryset
-            return self.filter(
-                **filter_kwargs,
-            ).values(
-                'id',
-                'parent_id',
-                'entity_id',
-                *extra_fields,
-                parents=Value(
-                    # empty array filled by union
-                    "{}",
-                    output_field=ArrayField(models.IntegerField())
-                ),
-            ).union(
-                # recursive union: get parents with entity_id = parent_id
-                cte.join(EntityVersion, parent_id=cte.col.entity_id).filter(
-                    Q(end_date__gte=date) | Q(end_date__isnull=True),
-                    start_date__lte=date,
-                ).values(
-                    'id',
-                    'parent_id',
-                    'entity_id',
-                    *extra_fields,
-                    parents=ArrayConcat(
-                        # Append the parent to the array
-                        cte.col.parents, F("parent_id"),
-                        output_field=ArrayField(models.IntegerField()),
-                    ),
-                ),
-                all=True,
-            )
-
-        return With.recursive(parent_entities)
-
     def get_tree(self, entity_ids, date=None):
         """
         :return: a list of dictionaries returning
@@ -252,20 +229,30 @@ class EntityVersionQuerySet(CTEQuerySet):
                 if isinstance(entity, Entity):
                     entity_ids[i] = entity.pk
 
-        cte = self.with_parents('acronym', date=date, entity_id__in=entity_ids)
-        qs = cte.queryset().with_cte(cte).annotate(
-            level=Func('parents', function='cardinality'),
-            date=Value(date, models.DateField()),
-        )
-        return qs.values(
-            'id',
-            'acronym',
-            'parent_id',
-            'entity_id',
+        roots = self.filter(entity_id__in=entity_ids).values('id', 'acronym', 'parent_id', 'entity_id')
+        descendants = EntityClosure.objects.current(date or now()).filter(
+            ancestor_id__in=entity_ids
+        ).order_by('depth').values(
+            'descendant_version_id',
+            'descendant_version__acronym',
+            'descendant_version__parent_id',
+            'descendant_id',
             'parents',
-            'date',
-            'level',
+            'depth',
         )
+        return [
+            dict(root, parents=[], date=date, level=0) for root in roots
+        ] + [
+            {
+                'id': row['descendant_version_id'],
+                'acronym': row['descendant_version__acronym'],
+                'parent_id': row['descendant_version__parent_id'],
+                'entity_id': row['descendant_id'],
+                'parents': row['parents'],
+                'date': date,
+                'level': row['depth'],
+            } for row in descendants
+        ]
 
     def with_acronym_path(self, **kwargs):
         cte = self.with_children('start_date', **kwargs)
@@ -278,12 +265,10 @@ class EntityVersionQuerySet(CTEQuerySet):
             ),
         ).filter(parent__isnull=True).order_by('-start_date')
 
-    def descendants(self, entity, date=None):
-        """ Return the children entities """
-        tree_qs = self.get_tree(entity, date)
-
-        # Children contain the asked entity as first element, ignore it
-        return self.filter(pk__in=tree_qs.values('id')[1:]).order_by('acronym')
+    def descendants(self, entities, date=None):
+        """ Return the versions of the children entities """
+        descendants = EntityClosure.objects.current(date or now()).filter(ancestor__in=entities)
+        return self.filter(pk__in=descendants.values('descendant_version_id')).order_by('acronym')
 
     def pedagogical_entities(self):
         return self.filter(
@@ -606,30 +591,100 @@ def find_all_current_entities_version() -> EntityVersionQuerySet:
     return find_latest_version(date=now)
 
 
-# TODO Use recursive query instead
-def build_current_entity_version_structure_in_memory(date: datetime.date = None) -> Dict[int, Dict]:
+class EntityVersionStructure(dict):
+    """
+    Structure of the entity versions by entity id, indexed by acronym.
+    Each entity is numbered when entering and leaving it in a depth-first traversal of the hierarchy,
+    so as knowing whether an entity is under another one is a comparison of numbers.
+    The structure is shared between callers (see build_current_entity_version_structure_in_memory) :
+    it must not be modified.
+    """
+
+    def __init__(self, entity_versions: Iterable[EntityVersion]):
+        super().__init__()
+        entity_version_by_entity_id = _build_entity_version_by_entity_id(entity_versions)
+        direct_children_by_entity_version_id = _build_direct_children_by_entity_version_id(
+            entity_version_by_entity_id
+        )
+        all_children_by_entity_version_id = _build_all_children_by_entity_version_id(
+            direct_children_by_entity_version_id
+        )
+
+        self._structure_by_acronym = {}
+        for entity_version in entity_version_by_entity_id.values():
+            self[entity_version.entity_id] = {
+                'entity_version_parent': entity_version_by_entity_id.get(entity_version.parent_id),
+                'direct_children': direct_children_by_entity_version_id.get(entity_version.id, []),
+                'all_children': all_children_by_entity_version_id.get(entity_version.id, []),
+                'entity_version': entity_version
+            }
+            self._structure_by_acronym.setdefault(entity_version.acronym, self[entity_version.entity_id])
+
+        self._enter_number_by_entity_id = {}
+        self._exit_number_by_entity_id = {}
+        self._number_hierarchy(direct_children_by_entity_version_id)
+
+    def _number_hierarchy(self, direct_children_by_entity_version_id: Dict[int, List[EntityVersion]]) -> None:
+        numbers = itertools.count()
+        to_visit = [(root, False) for root in reversed(direct_children_by_entity_version_id.get(None, []))]
+        while to_visit:
+            entity_version, is_leaving = to_visit.pop()
+            if is_leaving:
+                self._exit_number_by_entity_id[entity_version.entity_id] = next(numbers)
+                continue
+            self._enter_number_by_entity_id[entity_version.entity_id] = next(numbers)
+            to_visit.append((entity_version, True))
+            to_visit.extend(
+                (child, False) for child in reversed(direct_children_by_entity_version_id.get(entity_version.id, []))
+            )
+
+    def get_by_acronym(self, acronym: str) -> Optional[Dict]:
+        return self._structure_by_acronym.get(acronym.upper())
+
+    def is_under(self, entity_id: int, ancestor_entity_id: int, include_itself: bool = False) -> bool:
+        if entity_id not in self._enter_number_by_entity_id or \
+                ancestor_entity_id not in self._enter_number_by_entity_id:
+            return False
+        if entity_id == ancestor_entity_id:
+            return include_itself
+        return self._enter_number_by_entity_id[ancestor_entity_id] < self._enter_number_by_entity_id[entity_id] \
+            and self._exit_number_by_entity_id[entity_id] < self._exit_number_by_entity_id[ancestor_entity_id]
+
+
+structure_revision = CacheRevision('entity_version_structure')
+_structures_in_memory = InMemoryCache(structure_revision, max_size=MAX_STRUCTURES_IN_MEMORY)
+
+
+def bump_structure_revision() -> None:
+    structure_revision.bump()
+
+
+def build_current_entity_version_structure_in_memory(date: datetime.date = None) -> EntityVersionStructure:
+    """
+    Return the structure of the entity versions current at date (default: now).
+    When settings.ENTITY_VERSION_STRUCTURE_CACHE is enabled, the structures are kept in memory by date
+    until entity versions are saved, deleted or updated. A transaction which has changed entity versions
+    builds its own structures until it is committed.
+    """
+    if not settings.ENTITY_VERSION_STRUCTURE_CACHE:
+        return _build_entity_version_structure(date)
+    key = date or datetime.datetime.now(get_tzinfo()).date()
+    return _structures_in_memory.get_or_build(key, lambda: _build_entity_version_structure(date))
+
+
+def _build_entity_version_structure(date: datetime.date = None) -> EntityVersionStructure:
     if date:
         all_current_entities_version = find_latest_version(date=date)
     else:
         all_current_entities_version = find_all_current_entities_version()
-    entity_version_by_entity_id = _build_entity_version_by_entity_id(all_current_entities_version)
-    direct_children_by_entity_version_id = _build_direct_children_by_entity_version_id(entity_version_by_entity_id)
-    all_children_by_entity_version_id = _build_all_children_by_entity_version_id(direct_children_by_entity_version_id)
-
-    entity_versions = {}
-    for entity_version in all_current_entities_version:
-        entity_versions[entity_version.entity_id] = {
-            'entity_version_parent': entity_version_by_entity_id.get(entity_version.parent_id),
-            'direct_children': direct_children_by_entity_version_id.get(entity_version.id, []),
-            'all_children': all_children_by_entity_version_id.get(entity_version.id, []),
-            'entity_version': entity_version
-        }
-    return entity_versions
+    return EntityVersionStructure(all_current_entities_version)
 
 
 def get_structure_of_entity_version(entity_versions: dict, root: str = None) -> dict:
     if not root:
         return entity_versions
+    if isinstance(entity_versions, EntityVersionStructure):
+        return entity_versions.get_by_acronym(root)
     for ev in entity_versions:
         if entity_versions[ev]['entity_version'].acronym == root.upper():
             return entity_versions[ev]
@@ -703,3 +758,9 @@ def find_by_acronym_and_year(acronym: str, year: int):
         Q(acronym=acronym, start_date__year__lte=year),
         Q(end_date__isnull=True) | Q(end_date__year__gt=year)
     ).order_by('start_date').last()
+
+
+@receiver(post_save, sender=EntityVersion)
+@receiver(post_delete, sender=EntityVersion)
+def _entity_version_changed(sender, instance, **kwargs):
+    bump_structure_revision()
@@ -160,33 +160,74 @@ class ExamEnrollment(models.Model):
 
 
 def get_session_exam_deadline(enrollment):
-    if hasattr(enrollment.learning_unit_enrollment.offer_enrollment, 'session_exam_deadlines') and \
-            enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines:
-        # Prefetch related
-        return enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines[0]
+    offer_enrollment = enrollment.learning_unit_enrollment.offer_enrollment
+    if hasattr(offer_enrollment, 'session_exam_deadlines'):
+        # Prefetch related or resolved by resolve_session_exam_deadlines()
+        return offer_enrollment.session_exam_deadlines[0] if offer_enrollment.session_exam_deadlines else None
     else:
         # No prefetch
-        offer_enrollment = enrollment.learning_unit_enrollment.offer_enrollment
         nb_session = enrollment.session_exam.number_session
         return session_exam_deadline.get_by_offer_enrollment_nb_session(offer_enrollment, nb_session)
 
 
+def resolve_session_exam_deadlines(enrollments):
+    """
+    Load the session exam deadlines missing on the enrollments in one query,
+    then set deadline, deadline_reached and deadline_tutor_reached on each enrollment.
+    """
+    enrollments_without_deadlines = [
+        enrollment for enrollment in enrollments
+        if not hasattr(enrollment.learning_unit_enrollment.offer_enrollment, 'session_exam_deadlines')
+    ]
+    if enrollments_without_deadlines:
+        exam_deadlines = session_exam_deadline.find_by_offer_enrollments_nb_sessions(
+            {enrollment.learning_unit_enrollment.offer_enrollment_id for enrollment in enrollments_without_deadlines},
+            {enrollment.session_exam.number_session for enrollment in enrollments_without_deadlines},
+        )
+        deadlines_by_key = {
+            (exam_deadline.offer_enrollment_id, exam_deadline.number_session): exam_deadline
+            for exam_deadline in exam_deadlines
+        }
+        for enrollment in enrollments_without_deadlines:
+            exam_deadline = deadlines_by_key.get(
+                (enrollment.learning_unit_enrollment.offer_enrollment_id, enrollment.session_exam.number_session)
+            )
+            enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines = \
+                [exam_deadline] if exam_deadline else []
+
+    for enrollment in enrollments:
+        exam_deadline = get_session_exam_deadline(enrollment)
+        enrollment.deadline = _get_deadline(exam_deadline)
+        enrollment.deadline_reached = _is_deadline_reached(exam_deadline)
+        enrollment.deadline_tutor_reached = _is_deadline_tutor_reached(exam_deadline)
+    return enrollments
+
+
 def is_deadline_reached(enrollment):
-    exam_deadline = get_session_exam_deadline(enrollment)
+    return _is_deadline_reached(get_session_exam_deadline(enrollment))
+
+
+def is_deadline_tutor_reached(enrollment):
+    return _is_deadline_tutor_reached(get_session_exam_deadline(enrollment))
+
+
+def get_deadline(enrollment):
+    return _get_deadline(get_session_exam_deadline(enrollment))
+
+
+def _is_deadline_reached(exam_deadline):
     if exam_deadline:
         return exam_deadline.is_deadline_reached
     return False
 
 
-def is_deadline_tutor_reached(enrollment):
-    exam_deadline = get_session_exam_deadline(enrollment)
+def _is_deadline_tutor_reached(exam_deadline):
     if exam_deadline:
         return exam_deadline.is_deadline_tutor_reached
     return False
 
 
-def get_deadline(enrollment):
-    exam_deadline = get_session_exam_deadline(enrollment)
+def _get_deadline(exam_deadline):
     if exam_deadline:
         return exam_deadline.deadline_tutor_computed if exam_deadline.deadline_tutor_computed else \
             exam_deadline.deadline
@@ -249,6 +290,18 @@ def create_exam_enrollment_historic(user, enrollment):
     exam_enrollment_history.save()
 
 
+def bulk_create_exam_enrollment_historic(user, enrollments):
+    author = person.find_by_user(user)
+    ExamEnrollmentHistory.objects.bulk_create([
+        ExamEnrollmentHistory(
+            exam_enrollment=enrollment,
+            score_final=enrollment.score_final,
+            justification_final=enrollment.justification_final,
+            person=author,
+        ) for enrollment in enrollments
+    ])
+
+
 def get_progress_by_learning_unit_years_and_offer_years(user,
                                                         session_exam_number,
                                                         learning_unit_year_id=None,
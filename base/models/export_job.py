@@ -0,0 +1,69 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.conf import settings
+from django.db import models
+
+from base.models.enums.export_job_status import ExportJobStatus
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class ExportJobAdmin(OsisModelAdmin):
+    list_display = ('user', 'view', 'name', 'status', 'created', 'finished')
+    list_filter = ('status', 'name')
+    search_fields = ('user__username', 'view')
+    raw_id_fields = ('user', )
+
+
+class ExportJob(models.Model):
+    """
+        An excel export of a search view generated by a worker.
+        A job is shared by the identical requests of a user (same view, export, filter and data revision).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    view = models.CharField(max_length=255)  # Import path of the search view
+    name = models.CharField(max_length=100)  # Value of the xls_status parameter
+    query_string = models.TextField()
+    language = models.CharField(max_length=30)
+    filter_hash = models.CharField(max_length=32)
+    data_revision = models.CharField(max_length=50, blank=True)
+    status = models.CharField(max_length=20, choices=ExportJobStatus.choices(), default=ExportJobStatus.PENDING.name)
+    file = models.FileField(upload_to='exports/', blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('user', 'view', 'name', 'filter_hash', 'data_revision')
+
+    def __str__(self):
+        return "{} - {} - {}".format(self.user, self.name, self.status)
+
+    @property
+    def is_done(self) -> bool:
+        return self.status == ExportJobStatus.DONE.name
+
+    @property
+    def is_failed(self) -> bool:
+        return self.status == ExportJobStatus.FAILED.name
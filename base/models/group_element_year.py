@@ -86,52 +86,29 @@ class GroupElementYearManager(models.Manager):
             return []
 
         adjacency_query_template = """
-            WITH RECURSIVE
-                adjacency_query AS (
-                    SELECT
-                        parent_element_id as starting_node_id,
-                        id,
-                        child_element_id,
-                        parent_element_id,
-                        "order",
-                        0 AS level,
-                        CAST(parent_element_id || '|' ||
-                            (
-                                child_element_id
-                            ) as varchar(1000)
-                        ) As path
-                    FROM base_groupelementyear
-                    WHERE parent_element_id IN %(root_element_ids)s
+            WITH roots_with_descendants AS (
+                SELECT ancestor_id AS starting_node_id, descendant_id AS element_id
+                FROM program_management_elementclosure
+                WHERE ancestor_id IN %(root_element_ids)s
 
-                    UNION ALL
+                UNION ALL
 
-                    SELECT parent.starting_node_id,
-                           child.id,
-                           child.child_element_id,
-                           child.parent_element_id,
-                           child.order,
-                           parent.level + 1,
-                           CAST(
-                                parent.path || '|' ||
-                                    (
-                                        child.child_element_id
-                                    ) as varchar(1000)
-                               ) as path
-                    FROM base_groupelementyear AS child
-                    INNER JOIN adjacency_query AS parent on parent.child_element_id = child.parent_element_id
-                )
-            SELECT distinct starting_node_id, adjacency_query.id, parent_element_id as parent_id,
-                   child_element_id AS child_id, "order", level, path
-            FROM adjacency_query
-            JOIN program_management_element elem on elem.id = adjacency_query.child_element_id
+                SELECT id AS starting_node_id, id AS element_id
+                FROM program_management_element
+                WHERE id IN %(root_element_ids)s
+            )
+            SELECT starting_node_id, gey.id, gey.parent_element_id AS parent_id, gey.child_element_id AS child_id,
+                   gey."order"
+            FROM roots_with_descendants
+            JOIN base_groupelementyear gey on gey.parent_element_id = roots_with_descendants.element_id
+            JOIN program_management_element elem on elem.id = gey.child_element_id
             LEFT JOIN base_learningunityear bl on bl.id = elem.learning_unit_year_id
             WHERE bl.id is null or bl.learning_container_year_id is not null
-            ORDER BY starting_node_id, level, "order";
         """
         parameters = {
             "root_element_ids": tuple(root_elements_ids)
         }
-        return self.fetch_all(adjacency_query_template, parameters)
+        return _build_adjacency_list(self.fetch_all(adjacency_query_template, parameters))
 
     def get_reverse_adjacency_list(
             self,
@@ -144,53 +121,37 @@ class GroupElementYearManager(models.Manager):
         if not child_element_ids:
             return []
 
-        where_statement = self.__build_where_statement(None, child_element_ids)
-
-        reverse_adjacency_query_template = """
-            WITH RECURSIVE
-                reverse_adjacency_query AS (
-                    SELECT
-                           gey.child_element_id as starting_node_id,
-                           gey.id,
-                           gey.child_element_id,
-                           gey.parent_element_id,
-                           gey.order,
-                           gpyc.academic_year_id,
-                           0 AS level
-                    FROM base_groupelementyear gey
-                    INNER JOIN program_management_element elem on elem.id = gey.parent_element_id
-                    INNER JOIN education_group_groupyear AS gpyc on elem.group_year_id = gpyc.id
-                    WHERE {where_statement}
-                    AND (%(link_type)s IS NULL or gey.link_type = %(link_type)s)
-
-                    UNION ALL
-
-                    SELECT 	child.starting_node_id,
-                            parent.id,
-                            parent.child_element_id,
-                            parent.parent_element_id,
-                            parent.order,
-                            gpyp.academic_year_id,
-                            child.level + 1
-                    FROM base_groupelementyear AS parent
-                    INNER JOIN reverse_adjacency_query AS child on parent.child_element_id = child.parent_element_id
-                    INNER JOIN program_management_element elem on elem.id = parent.parent_element_id
-                    INNER JOIN education_group_groupyear AS gpyp on elem.group_year_id = gpyp.id
-                )
-
-            SELECT distinct starting_node_id, id, parent_element_id AS parent_id, child_element_id AS child_id, 
-                            "order", level
-            FROM reverse_adjacency_query
-            WHERE %(academic_year_id)s IS NULL OR academic_year_id = %(academic_year_id)s
-            ORDER BY starting_node_id,  level DESC, "order";
-        """.format(where_statement=where_statement)
-
-        parameters = {
-            "child_element_ids": tuple(child_element_ids),
-            "link_type": link_type.name if link_type else None,
-            "academic_year_id": academic_year_id,
-        }
-        return self.fetch_all(reverse_adjacency_query_template, parameters)
+        links_by_child_id = self.__get_ancestor_links_by_child_id(child_element_ids)
+        reverse_adjacency_list = []
+        for starting_node_id in set(child_element_ids):
+            level_links = [
+                link for link in links_by_child_id.get(starting_node_id, [])
+                if link_type is None or link['link_type'] == link_type.name
+            ]
+            visited = set()
+            level = 0
+            while level_links:
+                next_level_links = []
+                for link in level_links:
+                    if (link['id'], level) in visited:
+                        continue
+                    visited.add((link['id'], level))
+                    if academic_year_id is None or link['academic_year_id'] == academic_year_id:
+                        reverse_adjacency_list.append({
+                            'starting_node_id': starting_node_id,
+                            'id': link['id'],
+                            'parent_id': link['parent_id'],
+                            'child_id': link['child_id'],
+                            'order': link['order'],
+                            'level': level,
+                        })
+                    next_level_links += links_by_child_id.get(link['parent_id'], [])
+                level_links = next_level_links
+                level += 1
+        return sorted(
+            reverse_adjacency_list,
+            key=lambda row: (row['starting_node_id'], -row['level'], row['order'] or 0)
+        )
 
     def get_root_list(
             self,
@@ -207,6 +168,9 @@ class GroupElementYearManager(models.Manager):
         if not len(child_element_ids) and not academic_year_id:
             return []
 
+        if not academic_year_id:
+            return self.__get_root_list_from_closure(child_element_ids, link_type, root_category_name)
+
         where_statement = self.__build_where_statement(academic_year_id, child_element_ids)
         root_query_template = """
             WITH RECURSIVE
@@ -269,6 +233,48 @@ class GroupElementYearManager(models.Manager):
         }
         return self.fetch_all(root_query_template, parameters)
 
+    def __get_root_list_from_closure(self, child_element_ids, link_type: LinkTypes, root_category_name):
+        links_by_child_id = self.__get_ancestor_links_by_child_id(child_element_ids)
+        root_list = set()
+        for starting_node_id in set(child_element_ids):
+            links = [
+                link for link in links_by_child_id.get(starting_node_id, [])
+                if link_type is None or link['link_type'] == link_type.name
+            ]
+            visited_link_ids = set()
+            while links:
+                link = links.pop()
+                if link['id'] in visited_link_ids:
+                    continue
+                visited_link_ids.add(link['id'])
+                if link['parent_type_name'] in root_category_name:
+                    root_list.add((starting_node_id, link['parent_id']))
+                else:
+                    links += links_by_child_id.get(link['parent_id'], [])
+        return [{'child_id': child_id, 'root_id': root_id} for child_id, root_id in sorted(root_list)]
+
+    def __get_ancestor_links_by_child_id(self, child_element_ids):
+        ancestor_links_query_template = """
+            SELECT gey.id, gey.parent_element_id AS parent_id, gey.child_element_id AS child_id, gey."order",
+                   gey.link_type, gpyp.academic_year_id, egt.name AS parent_type_name
+            FROM base_groupelementyear gey
+            INNER JOIN program_management_element parent_elem on parent_elem.id = gey.parent_element_id
+            INNER JOIN education_group_groupyear AS gpyp on parent_elem.group_year_id = gpyp.id
+            INNER JOIN base_educationgrouptype AS egt on gpyp.education_group_type_id = egt.id
+            WHERE gey.child_element_id IN %(child_element_ids)s OR gey.child_element_id IN (
+                SELECT ancestor_id
+                FROM program_management_elementclosure
+                WHERE descendant_id IN %(child_element_ids)s
+            )
+        """
+        parameters = {
+            "child_element_ids": tuple(child_element_ids),
+        }
+        links_by_child_id = {}
+        for link in self.fetch_all(ancestor_links_query_template, parameters):
+            links_by_child_id.setdefault(link['child_id'], []).append(link)
+        return links_by_child_id
+
     def fetch_all(self, query_template, parameters):
         with connection.cursor() as cursor:
             cursor.execute(query_template, parameters)
@@ -403,5 +409,30 @@ class GroupElementYear(OrderedModel):
         return self.child_branch or self.child_leaf
 
 
+def _build_adjacency_list(links):
+    """
+    Compute the level and the path of each link from the starting node of its tree.
+    A link used by several paths appears once by path.
+    """
+    links_by_parent_id = {}
+    for link in sorted(links, key=lambda row: row['order'] or 0):
+        links_by_parent_id.setdefault((link['starting_node_id'], link['parent_id']), []).append(link)
+
+    adjacency_list = []
+    for starting_node_id in sorted(set(link['starting_node_id'] for link in links)):
+        level_paths = [(starting_node_id, str(starting_node_id))]
+        level = 0
+        while level_paths:
+            next_level_paths = []
+            for parent_id, parent_path in level_paths:
+                for link in links_by_parent_id.get((starting_node_id, parent_id), []):
+                    path = '|'.join([parent_path, str(link['child_id'])])
+                    adjacency_list.append({**link, 'level': level, 'path': path})
+                    next_level_paths.append((link['child_id'], path))
+            level_paths = next_level_paths
+            level += 1
+    return sorted(adjacency_list, key=lambda row: (row['starting_node_id'], row['level'], row['order'] or 0))
+
+
 def fetch_row_sql(root_ids):
     return GroupElementYear.objects.get_adjacency_list(root_ids)
@@ -0,0 +1,52 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.db import models
+
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class NotificationRunAdmin(OsisModelAdmin):
+    list_display = ('process', 'sent_at')
+
+
+class NotificationRun(models.Model):
+    """
+        Last run of a notification process : the next run only notifies the objects new or changed since.
+        Kept in the database (not in the cache, which can be evicted) so as the users are not notified twice.
+    """
+    process = models.CharField(max_length=100, unique=True)
+    sent_at = models.DateTimeField()
+
+    def __str__(self):
+        return "{} - {}".format(self.process, self.sent_at)
+
+
+def get_last_sent_at(process: str):
+    return NotificationRun.objects.filter(process=process).values_list('sent_at', flat=True).first()
+
+
+def set_last_sent_at(process: str, sent_at) -> None:
+    NotificationRun.objects.update_or_create(process=process, defaults={'sent_at': sent_at})
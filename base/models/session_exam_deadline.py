@@ -90,3 +90,8 @@ def get_by_offer_enrollment_nb_session(offer_enrollment, nb_session):
                                                number_session=nb_session)
     except SessionExamDeadline.DoesNotExist:
         return None
+
+
+def find_by_offer_enrollments_nb_sessions(offer_enrollment_ids, nb_sessions):
+    return SessionExamDeadline.objects.filter(offer_enrollment_id__in=offer_enrollment_ids,
+                                              number_session__in=nb_sessions)
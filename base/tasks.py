@@ -1,14 +1,26 @@
 from datetime import datetime
+from typing import List
 
+from celery import chord
 from celery.schedules import crontab
+from celery.utils import uuid
+from django.utils import translation
 
 from backoffice.celery import app as celery_app
+from base.business import export_job, learning_unit_proposal, notifications
 from base.business.education_groups.automatic_postponement import EducationGroupAutomaticPostponementToN6, \
     ReddotEducationGroupAutomaticPostponement
 from base.business.learning_units.automatic_postponement import LearningUnitAutomaticPostponementToN6
+from base.business.utils.postponement import AutomaticPostponementToN6
 from base.models.academic_calendar import AcademicCalendar
+from base.models.automatic_postponement import AutomaticPostponementRun
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums.academic_calendar_type import EDUCATION_GROUP_EDITION
+from base.models.export_job import ExportJob
+from base.models.person import Person
+from base.utils import send_mail as send_mail_util
+
+PROPOSALS_CHUNK_SIZE = 50
 
 celery_app.conf.beat_schedule.update({
     'Extend learning units': {
@@ -23,23 +35,63 @@ celery_app.conf.beat_schedule.update({
         'task': 'base.tasks.check_academic_calendar',
         'schedule': crontab(minute=0, hour=1)
     },
+    'Send academic calendar notifications': {
+        'task': 'base.tasks.send_academic_calendar_notifications',
+        'schedule': crontab(minute=0)
+    },
+    'Delete expired export jobs': {
+        'task': 'base.tasks.delete_expired_export_jobs',
+        'schedule': crontab(minute=30, hour=3)
+    },
 })
 
 
+POSTPONEMENT_PROCESSES = {
+    process_class.get_process_name(): process_class
+    for process_class in (LearningUnitAutomaticPostponementToN6, EducationGroupAutomaticPostponementToN6)
+}
+
+
 @celery_app.task
 def extend_learning_units():
-    process = LearningUnitAutomaticPostponementToN6()
-    process.postpone()
-    return process.serialize_postponement_results()
+    return _start_postponement(LearningUnitAutomaticPostponementToN6)
 
 
 @celery_app.task
 def extend_education_groups():
-    process = EducationGroupAutomaticPostponementToN6()
-    process.postpone()
+    return _start_postponement(EducationGroupAutomaticPostponementToN6)
+
+
+def _start_postponement(process_class) -> dict:
+    """
+        Split the postponement in chunks postponed in parallel, the results are sent when all chunks are done.
+        Run the task again to resume a run which has crashed : the objects already processed are skipped.
+    """
+    process = process_class()  # type: AutomaticPostponementToN6
+    run, chunks = process.start_run()
+    if run.ended_at:
+        return run.get_progress()
+    if not chunks:
+        return end_postponement(process.get_process_name(), run.pk)
+    chord(
+        postpone_chunk.si(process.get_process_name(), run.pk, chunk) for chunk in chunks
+    )(end_postponement.si(process.get_process_name(), run.pk))
+    return run.get_progress()
+
+
+@celery_app.task
+def postpone_chunk(process_name: str, run_id: int, object_ids: List[int]) -> dict:
+    process = POSTPONEMENT_PROCESSES[process_name]()
+    process.postpone_chunk(AutomaticPostponementRun.objects.get(pk=run_id), object_ids)
     return process.serialize_postponement_results()
 
 
+@celery_app.task
+def end_postponement(process_name: str, run_id: int) -> dict:
+    process = POSTPONEMENT_PROCESSES[process_name]()
+    return process.end_run(AutomaticPostponementRun.objects.get(pk=run_id))
+
+
 @celery_app.task
 def check_academic_calendar() -> dict:
     open_calendar = AcademicCalendar.objects.filter(start_date=datetime.now().date()).first()
@@ -52,3 +104,81 @@ def check_academic_calendar() -> dict:
         return {"Copy of Reddot data": process.serialize_postponement_results()}
 
     return {}
+
+
+@celery_app.task
+def send_academic_calendar_notifications() -> dict:
+    return {'notifications': notifications.send_academic_calendar_notifications()}
+
+
+@celery_app.task
+def generate_export(export_job_id: int) -> dict:
+    job = export_job.generate(ExportJob.objects.get(pk=export_job_id))
+    return {'status': job.status, 'file': job.file.name}
+
+
+@celery_app.task
+def delete_expired_export_jobs() -> dict:
+    return {'deleted': export_job.delete_expired_jobs()}
+
+
+def start_action_on_proposals(action_name: str, author_id: int, proposal_ids: List[int], research_criteria: List):
+    """
+        Apply the action on the proposals by chunks in parallel, then send the report to the author.
+    """
+    _build_proposals_chord(action_name, author_id, proposal_ids, research_criteria).apply_async()
+
+
+def _build_proposals_chord(action_name: str, author_id: int, proposal_ids: List[int], research_criteria: List) -> chord:
+    """
+        When a chunk fails, the report is sent anyway by the error callback linked to the body of the chord, with the
+        proposals of the chunk as failures. The callback is called by the celery.chord_unlock task, inside the worker
+        which detects the failure : it is immutable (the id of the body is ignored) and reads the results of the
+        chunks stored by the result backend (django-db) under the ids given to the chunks.
+    """
+    chunks = [
+        (uuid(), proposal_ids[index:index + PROPOSALS_CHUNK_SIZE])
+        for index in range(0, len(proposal_ids), PROPOSALS_CHUNK_SIZE)
+    ]
+    research_criteria = [(str(key), str(value)) for key, value in research_criteria]
+    report = send_proposals_report.s(action_name, author_id, research_criteria)
+    report.link_error(send_partial_proposals_report.si(action_name, author_id, research_criteria, chunks))
+    return chord(
+        [apply_action_on_proposals_chunk.si(action_name, author_id, chunk).set(task_id=task_id)
+         for task_id, chunk in chunks],
+        report
+    )
+
+
+@celery_app.task
+def apply_action_on_proposals_chunk(action_name: str, author_id: int, proposal_ids: List[int]) -> List:
+    author = Person.objects.get(pk=author_id)
+    with translation.override(author.language):
+        return learning_unit_proposal.apply_action_on_proposals_chunk(action_name, proposal_ids, author)
+
+
+@celery_app.task
+def send_proposals_report(chunks_report_rows: List[List], action_name: str, author_id: int, research_criteria: List):
+    report_rows = [row for chunk_report_rows in chunks_report_rows for row in chunk_report_rows]
+    return _send_proposals_report(Person.objects.get(pk=author_id), action_name, report_rows, research_criteria)
+
+
+@celery_app.task
+def send_partial_proposals_report(action_name: str, author_id: int, research_criteria: List, chunks: List):
+    """ Error callback of the chord : the rows of the failed chunks are built from the proposals left unchanged """
+    author = Person.objects.get(pk=author_id)
+    report_rows = []
+    with translation.override(author.language):
+        for task_id, proposal_ids in chunks:
+            result = celery_app.AsyncResult(task_id)
+            if result.successful():
+                report_rows += result.result
+            else:
+                report_rows += learning_unit_proposal.get_failed_proposals_report_rows(proposal_ids)
+    return _send_proposals_report(author, action_name, report_rows, research_criteria)
+
+
+def _send_proposals_report(author: Person, action_name: str, report_rows: List, research_criteria: List) -> dict:
+    with translation.override(author.language):
+        send_mail_util.send_mail_proposal_report(author, action_name, report_rows, research_criteria)
+    return {'proposals': len(report_rows)}
@@ -25,7 +25,7 @@
 ##############################################################################
 from django import template
 
-from base.utils.notifications import get_user_notifications
+from base.utils.notifications import get_user_notifications, get_user_unread_notifications_count
 
 register = template.Library()
 
@@ -37,8 +37,10 @@ def get_notifications(context):
     return get_user_notifications(user)
 
 
-@register.simple_tag()
-def get_number_unread_notifications(notifications):
-    return len(
-        [notification for notification in notifications if notification.unread]
-    )
+@register.simple_tag(takes_context=True)
+def get_number_unread_notifications(context):
+    request = context["request"]
+    unread_notifications_count = getattr(request, "unread_notifications_count", None)
+    if unread_notifications_count is None:
+        unread_notifications_count = get_user_unread_notifications_count(request.user)
+    return unread_notifications_count
@@ -103,6 +103,65 @@ class TestFetchLearningUnitToPostpone(TestCase):
         self.assertEqual(len(result), 0)
 
 
+class TestPostponementRun(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        current_year = get_current_year()
+        cls.academic_years = [AcademicYearFactory(year=i) for i in range(current_year, current_year + 7)]
+        cls.learning_unit = LearningUnitFactory(end_year=None)
+        LearningUnitYearFactory(
+            learning_unit=cls.learning_unit,
+            academic_year=cls.academic_years[-2],
+            learning_container_year__requirement_entity=None,
+            learning_container_year__allocation_entity=None
+        )
+
+    def test_should_return_chunks_of_objects_to_postpone(self):
+        run, chunks = LearningUnitAutomaticPostponementToN6().start_run()
+
+        self.assertEqual(chunks, [[self.learning_unit.pk]])
+        self.assertEqual(run.total, 1)
+        self.assertEqual(run.academic_year, self.academic_years[-1])
+
+    def test_should_record_a_checkpoint_by_object_postponed(self):
+        postponement = LearningUnitAutomaticPostponementToN6()
+        run, chunks = postponement.start_run()
+
+        postponement.postpone_chunk(run, chunks[0])
+
+        checkpoint = run.checkpoints.get()
+        self.assertEqual(checkpoint.object_id, self.learning_unit.pk)
+        self.assertEqual(checkpoint.result_id, postponement.result[0].pk)
+        self.assertFalse(checkpoint.has_error)
+        self.assertDictEqual(run.get_progress(), {'total': 1, 'processed': 1, 'errors': 0, 'ended': False})
+
+    @mock.patch('base.business.learning_units.automatic_postponement.LearningUnitAutomaticPostponementToN6.extend_obj')
+    def test_should_skip_objects_already_processed_when_run_resumed(self, mock_method):
+        mock_method.side_effect = Mock(side_effect=Error("test error"))
+        postponement = LearningUnitAutomaticPostponementToN6()
+        run, chunks = postponement.start_run()
+        postponement.postpone_chunk(run, chunks[0])
+
+        run, chunks = LearningUnitAutomaticPostponementToN6().start_run()
+
+        self.assertEqual(chunks, [])
+        self.assertTrue(run.checkpoints.get().has_error)
+
+    def test_should_end_run_with_results_of_all_chunks(self):
+        postponement = LearningUnitAutomaticPostponementToN6()
+        run, chunks = postponement.start_run()
+        postponement.postpone_chunk(run, chunks[0])
+
+        result_dict = LearningUnitAutomaticPostponementToN6().end_run(run)
+
+        run.refresh_from_db()
+        self.assertIsNotNone(run.ended_at)
+        self.assertEqual(
+            result_dict['msg'],
+            postponement.msg_result % {"number_extended": 1, "number_error": 0}
+        )
+
+
 class TestSerializePostponement(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -26,13 +26,17 @@
 from unittest import mock
 
 from django.core.exceptions import PermissionDenied
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import override_settings, CaptureQueriesContext
 
+from attribution.tests.factories.tutor_application import TutorApplicationFactory
 from base.business.learning_units.perms import MSG_NOT_ELIGIBLE_TO_MODIFY_END_YEAR_PROPOSAL_ON_THIS_YEAR, \
     is_eligible_for_modification, can_update_learning_achievement, is_eligible_to_update_learning_unit_pedagogy
 from base.business.learning_units.perms import is_eligible_to_modify_end_year_by_proposal, \
     is_eligible_to_modify_by_proposal, MSG_NOT_ELIGIBLE_TO_PUT_IN_PROPOSAL_ON_THIS_YEAR
+from base.business.learning_units.perms import learning_unit_year_permissions, learning_unit_years_permissions
+from base.models.academic_calendar import snapshot_revision
 from base.models.enums import learning_container_year_types
 from base.models.enums import learning_unit_year_subtypes
 from base.tests.factories.academic_calendar import generate_creation_or_end_date_proposal_calendars, \
@@ -43,6 +47,7 @@ from base.tests.factories.learning_container_year import LearningContainerYearFa
 from base.tests.factories.learning_unit import LearningUnitFactory
 from base.tests.factories.learning_unit_year import LearningUnitYearFactory
 from base.tests.factories.person import FacultyManagerForUEFactory, AdministrativeManagerFactory, CentralManagerForUEFactory
+from base.tests.factories.proposal_learning_unit import ProposalLearningUnitFactory
 
 
 class TestPerms(TestCase):
@@ -137,3 +142,48 @@ class TestPerms(TestCase):
     def test_is_eligible_to_update_learning_pedagogy_after_2017(self):
         self.luy.academic_year = AcademicYearFactory(year=2019)
         self.assertTrue(is_eligible_to_update_learning_unit_pedagogy(self.luy, self.central_manager))
+
+
+class TestLearningUnitYearsPermissions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.current_academic_year = create_current_academic_year()
+        cls.next_academic_year = AcademicYearFactory(year=cls.current_academic_year.year + 1)
+        generate_creation_or_end_date_proposal_calendars([cls.current_academic_year, cls.next_academic_year])
+        generate_modification_transformation_proposal_calendars([cls.current_academic_year, cls.next_academic_year])
+        cls.requirement_entity = EntityVersionFactory().entity
+        cls.learning_unit_years = [
+            LearningUnitYearFactory(
+                academic_year=cls.next_academic_year,
+                subtype=learning_unit_year_subtypes.FULL,
+                learning_container_year__academic_year=cls.next_academic_year,
+                learning_container_year__container_type=learning_container_year_types.COURSE,
+                learning_container_year__requirement_entity=cls.requirement_entity,
+            ) for _ in range(3)
+        ]
+        TutorApplicationFactory(learning_container_year=cls.learning_unit_years[1].learning_container_year)
+        ProposalLearningUnitFactory(learning_unit_year=cls.learning_unit_years[2])
+        cls.person = CentralManagerForUEFactory()
+
+    def setUp(self):
+        self.person.linked_entities = {self.requirement_entity.id}
+
+    def test_same_permissions_as_for_one_learning_unit_year(self):
+        permissions = learning_unit_years_permissions(self.learning_unit_years, self.person)
+        self.assertDictEqual(
+            permissions,
+            {luy.id: learning_unit_year_permissions(luy, self.person) for luy in self.learning_unit_years}
+        )
+        self.assertFalse(permissions[self.learning_unit_years[1].id]['can_edit_date'])
+        self.assertFalse(permissions[self.learning_unit_years[2].id]['can_propose'])
+
+    @override_settings(ACADEMIC_CALENDAR_SNAPSHOT=True)
+    @mock.patch.object(snapshot_revision, 'is_bump_pending', return_value=False)
+    def test_number_of_queries_does_not_depend_on_the_number_of_learning_unit_years(self, mock_is_bump_pending):
+        snapshot_revision.bump_all()
+        learning_unit_years_permissions(self.learning_unit_years[:1], self.person)
+        with CaptureQueriesContext(connection) as one_learning_unit_year:
+            learning_unit_years_permissions(self.learning_unit_years[:1], self.person)
+        with CaptureQueriesContext(connection) as all_learning_unit_years:
+            learning_unit_years_permissions(self.learning_unit_years, self.person)
+        self.assertEqual(len(all_learning_unit_years), len(one_learning_unit_year))
@@ -0,0 +1,147 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+import os
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.http import HttpResponse, QueryDict
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from notifications.models import Notification
+
+from base.business import export_job
+from base.models.enums.export_job_status import ExportJobStatus
+from base.models.export_job import ExportJob
+from base.tests.factories.export_job import ExportJobFactory
+from base.tests.factories.user import UserFactory
+
+
+class TestMustBeExportedAsynchronously(TestCase):
+    def setUp(self):
+        self.view_obj = mock.Mock(request=mock.Mock(spec=['user', 'GET']))
+        self.context = {'paginator': mock.Mock(count=100)}
+
+    @override_settings(EXPORT_ASYNC_MIN_ROWS=0)
+    def test_when_disabled(self):
+        self.assertFalse(export_job.must_be_exported_asynchronously(self.view_obj, self.context))
+
+    @override_settings(EXPORT_ASYNC_MIN_ROWS=101)
+    def test_when_less_results_than_threshold(self):
+        self.assertFalse(export_job.must_be_exported_asynchronously(self.view_obj, self.context))
+
+    @override_settings(EXPORT_ASYNC_MIN_ROWS=100)
+    def test_when_results_reach_threshold(self):
+        self.assertTrue(export_job.must_be_exported_asynchronously(self.view_obj, self.context))
+
+    @override_settings(EXPORT_ASYNC_MIN_ROWS=100)
+    def test_never_when_generated_by_worker(self):
+        self.view_obj.request = export_job.ExportRequest(UserFactory(), '', 'fr-be')
+        self.assertFalse(export_job.must_be_exported_asynchronously(self.view_obj, self.context))
+
+
+class TestGetOrCreateJob(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def _get_view_obj(self, query_string):
+        return mock.Mock(request=mock.Mock(user=self.user, GET=QueryDict(query_string)), model=None)
+
+    def test_identical_requests_share_the_same_job(self):
+        job, created = export_job.get_or_create_job(self._get_view_obj('acronym=LDROI&xls_status=xls'), 'xls')
+        same_job, same_created = export_job.get_or_create_job(self._get_view_obj('xls_status=xls&acronym=LDROI'), 'xls')
+
+        self.assertTrue(created)
+        self.assertFalse(same_created)
+        self.assertEqual(job, same_job)
+        self.assertEqual(job.query_string, 'acronym=LDROI&xls_status=xls')
+
+    def test_other_filter_creates_another_job(self):
+        job, _ = export_job.get_or_create_job(self._get_view_obj('acronym=LDROI&xls_status=xls'), 'xls')
+        other_job, created = export_job.get_or_create_job(self._get_view_obj('acronym=LBIR&xls_status=xls'), 'xls')
+
+        self.assertTrue(created)
+        self.assertNotEqual(job, other_job)
+
+    @override_settings(EXPORT_JOB_TTL=600)
+    def test_identical_request_after_time_to_live_creates_another_job(self):
+        now = timezone.now().replace(minute=0, second=0)
+        with mock.patch('base.business.export_job.timezone.now', return_value=now):
+            job, _ = export_job.get_or_create_job(self._get_view_obj('acronym=LDROI&xls_status=xls'), 'xls')
+        with mock.patch('base.business.export_job.timezone.now', return_value=now + datetime.timedelta(minutes=10)):
+            other_job, created = export_job.get_or_create_job(self._get_view_obj('acronym=LDROI&xls_status=xls'), 'xls')
+
+        self.assertTrue(created)
+        self.assertNotEqual(job, other_job)
+
+
+@override_settings(MEDIA_ROOT='/tmp/osis_tests/')
+class TestGenerate(TestCase):
+    def setUp(self):
+        self.job = ExportJobFactory()
+
+    @mock.patch('base.business.export_job._render_export')
+    def test_file_is_saved_and_user_notified(self, mock_render):
+        response = HttpResponse(b'content')
+        response['Content-Disposition'] = 'attachment; filename="learning_units.xlsx"'
+        mock_render.return_value = response
+
+        export_job.generate(self.job)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ExportJobStatus.DONE.name)
+        self.assertIsNotNone(self.job.finished)
+        self.assertTrue(self.job.file.name.startswith('exports/learning_units'))
+        self.assertEqual(self.job.file.read(), b'content')
+        self.assertEqual(Notification.objects.filter(recipient=self.job.user).count(), 1)
+
+    @mock.patch('base.business.export_job._render_export', side_effect=ValueError)
+    def test_failed_job(self, mock_render):
+        with self.assertRaises(ValueError):
+            export_job.generate(self.job)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ExportJobStatus.FAILED.name)
+        self.assertFalse(self.job.file)
+        self.assertEqual(Notification.objects.filter(recipient=self.job.user).count(), 1)
+
+
+@override_settings(MEDIA_ROOT='/tmp/osis_tests/', EXPORT_JOB_RETENTION_DAYS=7)
+class TestDeleteExpiredJobs(TestCase):
+    def setUp(self):
+        self.expired_job = ExportJobFactory(status=ExportJobStatus.DONE.name)
+        self.expired_job.file.save('expired.xlsx', ContentFile(b'content'))
+        ExportJob.objects.filter(pk=self.expired_job.pk).update(created=timezone.now() - datetime.timedelta(days=8))
+        self.recent_job = ExportJobFactory(status=ExportJobStatus.DONE.name)
+
+    def test_should_delete_expired_jobs_with_their_files(self):
+        file_path = self.expired_job.file.path
+
+        self.assertEqual(export_job.delete_expired_jobs(), 1)
+
+        self.assertFalse(ExportJob.objects.filter(pk=self.expired_job.pk).exists())
+        self.assertTrue(ExportJob.objects.filter(pk=self.recent_job.pk).exists())
+        self.assertFalse(os.path.exists(file_path))
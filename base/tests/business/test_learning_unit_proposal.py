@@ -290,6 +290,39 @@ class TestConsolidateProposals(TestCase):
             )
         )
 
+    def test_apply_action_on_proposals_should_rollback_changes_of_failed_action(self):
+        def failing_action(proposal):
+            proposal.state = proposal_state.ProposalState.ACCEPTED.name
+            proposal.save()
+            return {ERROR: ["msg_error"]}
+
+        proposal = ProposalLearningUnitFactory(state=proposal_state.ProposalState.FACULTY.name)
+        proposals_with_results = _apply_action_on_proposals(
+            [proposal],
+            failing_action,
+            self.author,
+            lambda proposal, person, raise_exception: True
+        )
+
+        self.assertEqual(proposals_with_results, [(proposal, {ERROR: ["msg_error"]})])
+        proposal.refresh_from_db()
+        self.assertEqual(proposal.state, proposal_state.ProposalState.FACULTY.name)
+
+    @mock.patch("base.business.learning_units.perms.is_eligible_to_consolidate_proposal",
+                side_effect=lambda proposal, person, raise_exception: True)
+    @mock.patch("base.business.learning_unit_proposal.consolidate_proposal",
+                side_effect=lambda prop: {SUCCESS: ["msg_success"]})
+    def test_apply_action_on_proposals_chunk_should_return_report_rows(self, mock_consolidate_proposal, mock_perm):
+        rows = lu_proposal_business.apply_action_on_proposals_chunk(
+            lu_proposal_business.CONSOLIDATION,
+            [proposal.pk for proposal in self.proposals],
+            self.author
+        )
+
+        self.assertEqual(mock_consolidate_proposal.call_count, len(self.proposals))
+        self.assertEqual(len(rows), len(self.proposals))
+        self.assertEqual(rows[0][1], self.proposals[0].learning_unit_year.acronym)
+
 
 def mock_message_by_level(*args, **kwargs):
     return {SUCCESS: ["this is a mock"]}
@@ -24,11 +24,15 @@
 #
 ##############################################################################
 import datetime
+import io
 
+from django.db import connection
 from django.db.models.expressions import RawSQL, Subquery, OuterRef
 from django.template.defaultfilters import yesno
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import gettext_lazy as _
+from openpyxl import load_workbook
 
 from attribution.business import attribution_charge_new
 from attribution.models.enums.function import COORDINATOR
@@ -36,12 +40,11 @@ from attribution.models.enums.function import Functions
 from attribution.tests.factories.attribution_charge_new import AttributionChargeNewFactory
 from attribution.tests.factories.attribution_new import AttributionNewFactory
 from base.business.learning_unit_xls import DEFAULT_LEGEND_FILLS, SPACES, PROPOSAL_LINE_STYLES, \
-    prepare_proposal_legend_ws_data, _get_wrapped_cells, \
-    _get_font_rows, _get_attribution_line, _add_training_data, \
-    _get_data_part1, _get_parameters_configurable_list, WRAP_TEXT_ALIGNMENT, HEADER_PROGRAMS, XLS_DESCRIPTION, \
+    prepare_proposal_legend_ws_data, _get_wrapped_columns, \
+    _get_proposal_row_style, _get_attribution_line, _add_training_data, \
+    _get_data_part1, WRAP_TEXT_ALIGNMENT, HEADER_PROGRAMS, HEADER_TEACHERS, WORKSHEET_TITLE, \
     _get_data_part2, annotate_qs, learning_unit_titles_part1, prepare_xls_content, _get_attribution_detail, \
-    prepare_xls_content_with_attributions
-from base.business.learning_unit_xls import _get_col_letter
+    prepare_xls_content_with_attributions, create_xls_with_parameters, WITH_GRP, WITH_ATTRIBUTIONS
 from base.business.learning_unit_xls import get_significant_volume
 from base.models.entity_version import EntityVersion
 from base.models.enums import education_group_categories
@@ -69,8 +72,6 @@ from program_management.tests.factories.education_group_version import \
     ParticularTransitionEducationGroupVersionFactory, StandardEducationGroupVersionFactory
 from program_management.tests.factories.element import ElementFactory
 
-COL_TEACHERS_LETTER = 'L'
-COL_PROGRAMS_LETTER = 'Z'
 PARENT_PARTIAL_ACRONYM = 'LDROI'
 PARENT_ACRONYM = 'LBIR'
 PARENT_TITLE = 'TITLE 1'
@@ -232,37 +233,20 @@ class TestLearningUnitXls(TestCase):
             child_element=cls.learning_unit_yr_version_element
         )
 
-    def test_get_wrapped_cells_with_teachers_and_programs(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2],
-                                    COL_TEACHERS_LETTER,
-                                    COL_PROGRAMS_LETTER)
-        self.assertCountEqual(styles, ['{}2'.format(COL_TEACHERS_LETTER),
-                                       '{}2'.format(COL_PROGRAMS_LETTER),
-                                       '{}3'.format(COL_TEACHERS_LETTER),
-                                       '{}3'.format(COL_PROGRAMS_LETTER)])
-
-    def test_get_wrapped_cells_with_teachers(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2], COL_TEACHERS_LETTER, None)
-        self.assertCountEqual(styles, ['{}2'.format(COL_TEACHERS_LETTER),
-                                       '{}3'.format(COL_TEACHERS_LETTER)])
-
-    def test_get_wrapped_cells_with_programs(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2], None, COL_PROGRAMS_LETTER)
-        self.assertCountEqual(styles, ['{}2'.format(COL_PROGRAMS_LETTER),
-                                       '{}3'.format(COL_PROGRAMS_LETTER)])
-
-    def test_get_col_letter(self):
-        title_searched = 'title 2'
-        titles = ['title 1', title_searched, 'title 3']
-        self.assertEqual(_get_col_letter(titles, title_searched), 'B')
-        self.assertIsNone(_get_col_letter(titles, 'whatever'))
-
-    def test_get_colored_rows(self):
-        self.assertEqual(_get_font_rows([self.learning_unit_yr_1,
-                                         self.learning_unit_yr_2,
-                                         self.proposal_creation_1.learning_unit_year,
-                                         self.proposal_creation_2.learning_unit_year]),
-                         {PROPOSAL_LINE_STYLES.get(self.proposal_creation_1.type): [3, 4]})
+    def test_get_wrapped_columns(self):
+        titles = ['title 1', str(HEADER_TEACHERS), 'title 3', str(HEADER_PROGRAMS)]
+        self.assertDictEqual(
+            _get_wrapped_columns(titles, HEADER_PROGRAMS, HEADER_TEACHERS),
+            {1: WRAP_TEXT_ALIGNMENT, 3: WRAP_TEXT_ALIGNMENT}
+        )
+        self.assertDictEqual(_get_wrapped_columns(['title 1'], HEADER_PROGRAMS), {})
+
+    def test_get_proposal_row_style(self):
+        self.assertIsNone(_get_proposal_row_style(self.learning_unit_yr_2))
+        self.assertEqual(
+            _get_proposal_row_style(self.proposal_creation_1.learning_unit_year).font,
+            PROPOSAL_LINE_STYLES.get(self.proposal_creation_1.type)
+        )
 
     def test_get_attributions_line(self):
         a_person = PersonFactory(last_name="Smith", first_name='Aaron')
@@ -331,23 +315,6 @@ class TestLearningUnitXls(TestCase):
         self.assertEqual(data[6], _(self.proposal_creation_1.type.title()))
         self.assertEqual(data[7], _(self.proposal_creation_1.state.title()))
 
-    def test_get_parameters_configurable_list(self):
-        user_name = 'Ducon'
-        an_user = UserFactory(username=user_name)
-        titles = ['title1', 'title2']
-        learning_units = [self.learning_unit_yr_1, self.learning_unit_yr_2]
-        param = _get_parameters_configurable_list(learning_units, titles, an_user)
-        self.assertEqual(param.get(xls_build.DESCRIPTION), XLS_DESCRIPTION)
-        self.assertEqual(param.get(xls_build.USER), user_name)
-        self.assertEqual(param.get(xls_build.HEADER_TITLES), titles)
-        self.assertEqual(param.get(xls_build.ALIGN_CELLS), {WRAP_TEXT_ALIGNMENT: []})
-        self.assertEqual(param.get(xls_build.FONT_ROWS), {})
-
-        titles.append(HEADER_PROGRAMS)
-
-        param = _get_parameters_configurable_list(learning_units, titles, an_user)
-        self.assertEqual(param.get(xls_build.ALIGN_CELLS), {WRAP_TEXT_ALIGNMENT: ['C2', 'C3']})
-
     def test_get_data_part2(self):
         learning_container_luy = LearningContainerYearFactory(academic_year=self.academic_year)
         luy = LearningUnitYearFactory(academic_year=self.academic_year,
@@ -549,6 +516,41 @@ class TestLearningUnitXls(TestCase):
         )
         self.assertEqual(formations, expected)
 
+    def test_prepare_xls_content_number_of_queries_does_not_depend_on_number_of_rows(self):
+        def count_queries(learning_unit_year_ids):
+            qs = LearningUnitYear.objects.filter(pk__in=learning_unit_year_ids).annotate(
+                entity_requirement=Subquery(self.entity_requirement),
+                entity_allocation=Subquery(self.entity_allocation),
+            )
+            with CaptureQueriesContext(connection) as context:
+                prepare_xls_content(qs, with_grp=True, with_attributions=True)
+            return len(context.captured_queries)
+
+        self.assertEqual(
+            count_queries([self.learning_unit_yr_1.pk]),
+            count_queries([self.learning_unit_yr_1.pk, self.luy_with_attribution.pk, self.learning_unit_yr_version.pk])
+        )
+
+    def test_create_xls_with_parameters(self):
+        qs = LearningUnitYear.objects.filter(pk=self.learning_unit_yr_1.pk).annotate(
+            entity_requirement=Subquery(self.entity_requirement),
+            entity_allocation=Subquery(self.entity_allocation),
+        )
+        response = create_xls_with_parameters(
+            UserFactory(),
+            qs,
+            {},
+            {WITH_GRP: True, WITH_ATTRIBUTIONS: True}
+        )
+
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        worksheet = workbook.get_sheet_by_name(str(WORKSHEET_TITLE))
+        rows = list(worksheet.rows)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][0].value, str(_('Code')))
+        self.assertEqual(rows[1][0].value, self.learning_unit_yr_1.acronym)
+        self.assertTrue(rows[1][-1].alignment.wrap_text)
+
 
 def expected_attribution_data(attribution_charge_new_lecturing, attribution_charge_new_practical, expected, luy):
     expected_attribution = None
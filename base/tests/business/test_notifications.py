@@ -0,0 +1,103 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from base.business import notifications
+from base.tests.factories.academic_calendar import AcademicCalendarFactory
+from base.tests.factories.user import UserFactory
+from base.utils.cache import cache
+from base.utils.notifications import get_user_unread_notifications_count
+
+
+class TestSendAcademicCalendarNotifications(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.inactive_user = UserFactory(is_active=False)
+        cls.today = datetime.date.today()
+        cls.academic_calendar_today = AcademicCalendarFactory(start_date=cls.today,
+                                                              end_date=cls.today)
+        cls.academic_calendar_in_1_week = AcademicCalendarFactory(start_date=cls.today+datetime.timedelta(weeks=1),
+                                                                  end_date=cls.today+datetime.timedelta(weeks=1))
+        cls.academic_calendar_in_3_weeks = AcademicCalendarFactory(start_date=cls.today + datetime.timedelta(weeks=3),
+                                                                   end_date=cls.today + datetime.timedelta(weeks=3))
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    def test_create_notifications_of_academic_calendar_events_within_2_weeks_for_active_users(self):
+        notifications.send_academic_calendar_notifications()
+
+        self.assertCountEqual(
+            [notif.verb for notif in self.user.notifications.unread()],
+            [self._get_verb(self.academic_calendar_today), self._get_verb(self.academic_calendar_in_1_week)]
+        )
+        self.assertFalse(self.inactive_user.notifications.exists())
+
+    def test_create_no_notifications_if_already_sent_since_last_change(self):
+        notifications.send_academic_calendar_notifications()
+
+        self.assertEqual(notifications.send_academic_calendar_notifications(), 0)
+        self.assertEqual(self.user.notifications.count(), 2)
+
+    def test_create_no_duplicate_notifications_when_last_sent_date_is_lost(self):
+        notifications.send_academic_calendar_notifications()
+        cache.clear()
+
+        self.assertEqual(notifications.send_academic_calendar_notifications(), 0)
+
+    def test_create_no_notifications_again_for_users_who_cleared_them_when_cache_is_cleared(self):
+        notifications.send_academic_calendar_notifications()
+        self.user.notifications.all().delete()
+        cache.clear()
+
+        self.assertEqual(notifications.send_academic_calendar_notifications(), 0)
+        self.assertFalse(self.user.notifications.exists())
+
+    def test_should_invalidate_unread_notifications_count_of_recipients(self):
+        self.assertEqual(get_user_unread_notifications_count(self.user), 0)
+
+        notifications.send_academic_calendar_notifications()
+
+        self.assertEqual(get_user_unread_notifications_count(self.user), 2)
+
+    def test_find_academic_calendars_changed_since_last_sent(self):
+        last_sent = timezone.now()
+        self.assertFalse(notifications._find_academic_calendars_to_notify(last_sent).exists())
+
+        self.academic_calendar_today.save()
+        self.assertQuerysetEqual(
+            notifications._find_academic_calendars_to_notify(last_sent),
+            [self.academic_calendar_today],
+            transform=lambda obj: obj
+        )
+
+    @staticmethod
+    def _get_verb(academic_calendar):
+        return "{} ({})".format(academic_calendar.title, academic_calendar.start_date.strftime("%d/%m"))
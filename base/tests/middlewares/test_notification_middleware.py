@@ -23,55 +23,48 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import datetime
-from unittest.mock import Mock
+from unittest import mock
 
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory
 
-from base.middlewares import notification_middleware
-from base.tests.factories.academic_calendar import AcademicCalendarFactory
+from base.middlewares.notification_middleware import NotificationMiddleware
+from base.tests.factories.notifications import NotificationFactory
 from base.tests.factories.user import UserFactory
+from base.utils.cache import cache
 
 
-class TestSendAcademicCalendarNotifications(TestCase):
+class TestNotificationMiddleware(TestCase):
     @classmethod
     def setUpTestData(cls):
         cls.user = UserFactory()
-        cls.today = datetime.date.today()
-        cls.academic_calendar_today = AcademicCalendarFactory(start_date=cls.today,
-                                                              end_date=cls.today)
-        cls.academic_calendar_in_1_week = AcademicCalendarFactory(start_date=cls.today+datetime.timedelta(weeks=1),
-                                                                  end_date=cls.today+datetime.timedelta(weeks=1))
-        cls.academic_calendar_in_3_weeks = AcademicCalendarFactory(start_date=cls.today + datetime.timedelta(weeks=3),
-                                                                   end_date=cls.today + datetime.timedelta(weeks=3))
+        NotificationFactory.create_batch(2, recipient=cls.user)
+        NotificationFactory(recipient=cls.user, unread=False)
 
     def setUp(self):
-        self.method_set = notification_middleware.set_notifications_last_read_as_now_for_user
-        self.method_get = notification_middleware.get_notifications_last_time_read_for_user
+        self.middleware = NotificationMiddleware(lambda request: HttpResponse())
+        self.request = RequestFactory().get("/")
+        self.addCleanup(cache.clear)
 
-        notification_middleware.set_notifications_last_read_as_now_for_user = Mock()
-        notification_middleware.get_notifications_last_time_read_for_user = Mock()
+    def test_should_set_unread_notifications_count_of_user(self):
+        self.request.user = self.user
+        self.middleware(self.request)
 
-    def tearDown(self):
-        notification_middleware.set_notifications_last_read_as_now_for_user = self.method_set
-        notification_middleware.get_notifications_last_time_read_for_user = self.method_get
+        self.assertEqual(self.request.unread_notifications_count, 2)
 
-    def test_create_no_notifications_if_date_last_read_is_today(self):
-        notification_middleware.get_notifications_last_time_read_for_user.return_value = self.today
-        notification_middleware.send_academic_calendar_notifications(self.user)
+    def test_should_read_unread_notifications_count_from_cache(self):
+        self.request.user = self.user
+        self.middleware(self.request)
 
-        self.assertQuerysetEqual(self.user.notifications.unread(), [])
-        notification_middleware.set_notifications_last_read_as_now_for_user.assert_called_once_with(self.user)
-        notification_middleware.get_notifications_last_time_read_for_user.assert_called_once_with(self.user)
+        with self.assertNumQueries(0):
+            self.middleware(self.request)
+        self.assertEqual(self.request.unread_notifications_count, 2)
 
-    def test_create_notifications_of_academic_calendar_events_within_2_weeks_if_no_last_read(self):
-        notification_middleware.get_notifications_last_time_read_for_user.return_value = None
-        notification_middleware.send_academic_calendar_notifications(self.user)
+    @mock.patch("base.middlewares.notification_middleware.get_user_unread_notifications_count")
+    def test_should_not_read_count_when_user_is_anonymous(self, mock_get_count):
+        self.request.user = AnonymousUser()
+        self.middleware(self.request)
 
-        self.assertCountEqual(
-            [notif.verb for notif in self.user.notifications.unread()],
-            [str(self.academic_calendar_today), str(self.academic_calendar_in_1_week)]
-        )
-
-        notification_middleware.set_notifications_last_read_as_now_for_user.assert_called_once_with(self.user)
-        notification_middleware.get_notifications_last_time_read_for_user.assert_called_once_with(self.user)
+        self.assertFalse(mock_get_count.called)
+        self.assertFalse(hasattr(self.request, "unread_notifications_count"))
@@ -0,0 +1,44 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase, RequestFactory
+
+from base.middlewares.tree_identity_map_middleware import TreeIdentityMapMiddleware
+from program_management.ddd.repositories import load_tree
+
+
+class TestTreeIdentityMapMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.get_response = Mock(side_effect=lambda request: load_tree._identity_map.is_active)
+        self.middleware = TreeIdentityMapMiddleware(self.get_response)
+
+    def test_should_share_trees_during_read_request(self):
+        self.assertTrue(self.middleware(RequestFactory().get('/')))
+        self.assertFalse(load_tree._identity_map.is_active)
+
+    def test_should_not_share_trees_during_write_request(self):
+        self.assertFalse(self.middleware(RequestFactory().post('/')))
@@ -26,7 +26,7 @@
 import datetime
 from unittest import mock
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.translation import gettext_lazy as _
 from faker import Faker
 
@@ -174,3 +174,94 @@ class TestGetStartingAcademicCalendar(TestCase):
         qs = academic_calendar.AcademicCalendar.objects.starting_within(weeks=1, days=5)
         self.assertCountEqual(list(qs),
                               self.academic_calendars_in_4_day + self.academic_calendars_in_1_week_and_3_days)
+
+
+class TestAcademicCalendarSnapshot(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_years = [
+            AcademicYearFactory(
+                year=year,
+                start_date=datetime.date(year, 9, 15),
+                end_date=datetime.date(year + 1, 9, 30)
+            ) for year in (2018, 2019, 2020)
+        ]
+        cls.open_calendar = AcademicCalendarFactory(
+            reference=EXAM_ENROLLMENTS,
+            data_year=cls.academic_years[1],
+            start_date=datetime.date(2019, 10, 1),
+            end_date=datetime.date(2019, 11, 1),
+        )
+        cls.previous_calendar = AcademicCalendarFactory(
+            reference=EXAM_ENROLLMENTS,
+            data_year=cls.academic_years[0],
+            start_date=datetime.date(2018, 10, 1),
+            end_date=datetime.date(2018, 11, 1),
+        )
+        cls.next_calendar = AcademicCalendarFactory(
+            reference=EXAM_ENROLLMENTS,
+            data_year=cls.academic_years[2],
+            start_date=datetime.date(2020, 10, 1),
+            end_date=datetime.date(2020, 11, 1),
+        )
+
+    def setUp(self):
+        self.snapshot = academic_calendar._build_academic_calendar_snapshot()
+
+    def test_open_calendars(self):
+        date = datetime.date(2019, 10, 15)
+        self.assertEqual(self.snapshot.open_calendars(EXAM_ENROLLMENTS, date=date), [self.open_calendar])
+        self.assertEqual(
+            self.snapshot.open_calendars(EXAM_ENROLLMENTS, data_year_id=self.academic_years[1].pk, date=date),
+            [self.open_calendar]
+        )
+        self.assertFalse(self.snapshot.is_open(EXAM_ENROLLMENTS, data_year_id=self.academic_years[0].pk, date=date))
+        self.assertFalse(self.snapshot.is_open(SCORES_EXAM_SUBMISSION, date=date))
+
+    def test_calendar_is_open_from_start_date_until_the_day_before_end_date(self):
+        self.assertTrue(self.snapshot.is_open(EXAM_ENROLLMENTS, date=datetime.date(2019, 10, 1)))
+        self.assertFalse(self.snapshot.is_open(EXAM_ENROLLMENTS, date=datetime.date(2019, 11, 1)))
+
+    def test_previous_and_next_calendars(self):
+        date = datetime.date(2019, 10, 15)
+        self.assertEqual(self.snapshot.get_previous_calendar(EXAM_ENROLLMENTS, date=date), self.previous_calendar)
+        self.assertEqual(self.snapshot.get_next_calendar(EXAM_ENROLLMENTS, date=date), self.next_calendar)
+        self.assertIsNone(self.snapshot.get_next_calendar(SCORES_EXAM_SUBMISSION, date=date))
+
+    def test_current_and_starting_academic_years(self):
+        date = datetime.date(2019, 9, 20)
+        self.assertEqual(self.snapshot.current_academic_year(date), self.academic_years[0])
+        self.assertEqual(self.snapshot.starting_academic_year(date), self.academic_years[1])
+
+    def test_no_query(self):
+        with self.assertNumQueries(0):
+            self.snapshot.is_open(EXAM_ENROLLMENTS, data_year_id=self.academic_years[1].pk)
+            self.snapshot.starting_academic_year()
+
+    @override_settings(ACADEMIC_CALENDAR_SNAPSHOT=True)
+    @mock.patch.object(academic_calendar.snapshot_revision, 'is_bump_pending', return_value=False)
+    def test_snapshot_kept_in_memory_until_a_calendar_is_saved(self, mock_is_bump_pending):
+        academic_calendar.snapshot_revision.bump_all()
+        snapshot = academic_calendar.get_academic_calendar_snapshot()
+        with self.assertNumQueries(0):
+            self.assertIs(academic_calendar.get_academic_calendar_snapshot(), snapshot)
+
+        self.open_calendar.end_date = datetime.date(2019, 12, 1)
+        self.open_calendar.save()
+        academic_calendar.snapshot_revision.flush()  # Changes are committed
+
+        new_snapshot = academic_calendar.get_academic_calendar_snapshot()
+        self.assertIsNot(new_snapshot, snapshot)
+        self.assertTrue(new_snapshot.is_open(EXAM_ENROLLMENTS, date=datetime.date(2019, 11, 15)))
+
+    @override_settings(ACADEMIC_CALENDAR_SNAPSHOT=False)
+    @mock.patch.object(academic_calendar.snapshot_revision, 'is_bump_pending', return_value=False)
+    def test_no_snapshot_when_disabled(self, mock_is_bump_pending):
+        self.assertIsNone(academic_calendar.get_academic_calendar_snapshot())
+
+    @override_settings(ACADEMIC_CALENDAR_SNAPSHOT=True)
+    def test_no_snapshot_when_changes_of_calendars_are_not_committed(self):
+        self.open_calendar.end_date = datetime.date(2019, 12, 1)
+        self.open_calendar.save()
+
+        self.assertIsNone(academic_calendar.get_academic_calendar_snapshot())
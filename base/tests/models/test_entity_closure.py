@@ -0,0 +1,81 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+
+from django.test import TestCase
+
+from base.models.entity_closure import EntityClosure
+from base.tests.factories.entity_version import EntityVersionFactory
+
+
+class TestEntityClosure(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+            SST
+            |-SC (2015 - 2018)
+              |-MATH
+        """
+        cls.sst = EntityVersionFactory(acronym="SST", parent=None)
+        cls.sc = EntityVersionFactory(
+            acronym="SC",
+            parent=cls.sst.entity,
+            start_date=datetime.date(2015, 1, 1),
+            end_date=datetime.date(2018, 12, 31),
+        )
+        cls.math = EntityVersionFactory(acronym="MATH", parent=cls.sc.entity)
+
+    def _get_descendant_ids(self, ancestor, date):
+        return set(
+            EntityClosure.objects.current(date).filter(ancestor=ancestor.entity).values_list('descendant_id', flat=True)
+        )
+
+    def test_should_add_all_descendants_of_entity(self):
+        self.assertSetEqual(
+            self._get_descendant_ids(self.sst, datetime.date(2016, 1, 1)),
+            {self.sc.entity_id, self.math.entity_id}
+        )
+
+    def test_should_keep_parents_from_ancestor_to_direct_parent(self):
+        closure = EntityClosure.objects.get(ancestor=self.sst.entity, descendant_version=self.math)
+        self.assertEqual(closure.depth, 2)
+        self.assertListEqual(closure.parents, [self.sst.entity_id, self.sc.entity_id])
+
+    def test_should_limit_descendants_to_the_period_of_the_intermediate_versions(self):
+        self.assertSetEqual(self._get_descendant_ids(self.sst, datetime.date(2020, 1, 1)), set())
+        self.assertSetEqual(self._get_descendant_ids(self.sc, datetime.date(2020, 1, 1)), {self.math.entity_id})
+
+    def test_should_update_descendants_when_parent_changed(self):
+        self.math.parent = self.sst.entity
+        self.math.save()
+
+        self.assertSetEqual(self._get_descendant_ids(self.sc, datetime.date(2016, 1, 1)), set())
+        self.assertSetEqual(self._get_descendant_ids(self.sst, datetime.date(2020, 1, 1)), {self.math.entity_id})
+
+    def test_should_remove_descendants_of_deleted_version(self):
+        self.sc.delete()
+
+        self.assertSetEqual(self._get_descendant_ids(self.sst, datetime.date(2016, 1, 1)), set())
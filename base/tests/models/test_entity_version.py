@@ -24,10 +24,11 @@
 #
 ##############################################################################
 import datetime
+from unittest import mock
 
 import factory
 import factory.fuzzy
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from base.business.learning_units.perms import find_last_requirement_entity_version
@@ -641,6 +642,56 @@ class EntityVersionLoadInMemoryTest(TestCase):
                                                                         entity_type=case.get('entity_type'))
                 self.assertEqual(case.get('expected_result'), to_test)
 
+    def test_get_by_acronym(self):
+        structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertEqual(structure.get_by_acronym("loci")['entity_version'], self.LOCI)
+        self.assertIsNone(structure.get_by_acronym("UNKNOWN"))
+
+    def test_is_under(self):
+        structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertTrue(structure.is_under(self.MATH.entity_id, self.SC.entity_id))
+        self.assertTrue(structure.is_under(self.BARC.entity_id, self.root.entity_id))
+        self.assertFalse(structure.is_under(self.URBA.entity_id, self.SC.entity_id))
+        self.assertFalse(structure.is_under(self.SC.entity_id, self.MATH.entity_id))
+        self.assertFalse(structure.is_under(self.SC.entity_id, self.SC.entity_id))
+        self.assertTrue(structure.is_under(self.SC.entity_id, self.SC.entity_id, include_itself=True))
+
+    @override_settings(ENTITY_VERSION_STRUCTURE_CACHE=True)
+    @mock.patch.object(entity_version.structure_revision, 'is_bump_pending', return_value=False)
+    def test_structure_kept_in_memory_until_an_entity_version_is_saved(self, mock_is_bump_pending):
+        entity_version.structure_revision.bump_all()
+        structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertIs(entity_version.build_current_entity_version_structure_in_memory(), structure)
+
+        self.MATH.parent = self.LOCI.entity
+        self.MATH.save()
+        entity_version.structure_revision.flush()  # Changes are committed
+
+        new_structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertIsNot(new_structure, structure)
+        self.assertTrue(new_structure.is_under(self.MATH.entity_id, self.LOCI.entity_id))
+
+    @override_settings(ENTITY_VERSION_STRUCTURE_CACHE=True)
+    def test_structure_not_kept_in_memory_while_changes_are_not_committed(self):
+        self.MATH.parent = self.LOCI.entity
+        self.MATH.save()
+
+        structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertIsNot(entity_version.build_current_entity_version_structure_in_memory(), structure)
+        self.assertTrue(structure.is_under(self.MATH.entity_id, self.LOCI.entity_id))
+
+    def test_revision_bumped_by_bulk_update(self):
+        revision = entity_version.structure_revision.get()
+        EntityVersion.objects.filter(pk=self.MATH.pk).update(parent=self.LOCI.entity)
+        self.assertTrue(entity_version.structure_revision.is_bump_pending())
+        entity_version.structure_revision.flush()  # Changes are committed
+        self.assertNotEqual(entity_version.structure_revision.get(), revision)
+
+    @override_settings(ENTITY_VERSION_STRUCTURE_CACHE=False)
+    def test_structure_not_kept_in_memory_when_disabled(self):
+        structure = entity_version.build_current_entity_version_structure_in_memory()
+        self.assertIsNot(entity_version.build_current_entity_version_structure_in_memory(), structure)
+
 
 class TestFindLastEntityVersionByLearningUnitYearId(TestCase):
     def test_when_entity_version(self):
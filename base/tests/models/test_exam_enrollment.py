@@ -147,6 +147,28 @@ class ExamEnrollmentTest(TestCase):
                                    offer_enrollment=self.offer_enrollment)
         self.assertTrue(exam_enrollment.is_deadline_tutor_reached(self.exam_enrollment))
 
+    def test_resolve_session_exam_deadlines_in_one_query(self):
+        SessionExamDeadlineFactory(deadline=datetime.date.today() + datetime.timedelta(days=3),
+                                   deadline_tutor=5,
+                                   number_session=self.session_exam.number_session,
+                                   offer_enrollment=self.offer_enrollment)
+        enrollments = list(exam_enrollment.find_for_score_encodings(session_exam_number=1,
+                                                                    with_session_exam_deadline=False))
+
+        with self.assertNumQueries(1):
+            exam_enrollment.resolve_session_exam_deadlines(enrollments)
+            self.assertTrue(all(exam_enrollment.is_deadline_tutor_reached(enrollment) is not None
+                                for enrollment in enrollments))
+
+        enrollment_with_deadline = next(e for e in enrollments if e.pk == self.exam_enrollment.pk)
+        self.assertFalse(enrollment_with_deadline.deadline_reached)
+        self.assertTrue(enrollment_with_deadline.deadline_tutor_reached)
+        self.assertEqual(enrollment_with_deadline.deadline, datetime.date.today() - datetime.timedelta(days=2))
+
+        enrollment_without_deadline = next(e for e in enrollments if e.pk == self.exam_enrollment_2.pk)
+        self.assertIsNone(enrollment_without_deadline.deadline)
+        self.assertFalse(enrollment_without_deadline.deadline_reached)
+
     def test_find_for_score_encodings_for_all_enrollement_state(self):
         self.assertCountEqual(exam_enrollment.find_for_score_encodings(
             session_exam_number=1,
@@ -105,6 +105,34 @@ class TestManagerGetAdjacencyList(TestCase):
         adjacency_list = GroupElementYear.objects.get_adjacency_list([self.root_element_a.pk, self.root_element_b.pk])
         self.assertEqual(len(adjacency_list), 4)
 
+    def test_case_child_used_twice_in_tree_appears_once_by_path(self):
+        link_to_shared_child = GroupElementYearFactory(
+            parent_element=self.level_2.child_element,
+            child_element=self.level_11.child_element,
+        )
+        adjacency_list = GroupElementYear.objects.get_adjacency_list([self.root_element_a.pk])
+
+        shared_child_paths = [
+            row['path'] for row in adjacency_list if row['child_id'] == self.level_11.child_element_id
+        ]
+        self.assertCountEqual(
+            shared_child_paths,
+            [
+                "|".join(
+                    str(element_id)
+                    for element_id in (
+                        self.root_element_a.pk, self.level_1.child_element_id, self.level_11.child_element_id
+                    )
+                ),
+                "|".join(
+                    str(element_id)
+                    for element_id in (
+                        self.root_element_a.pk, link_to_shared_child.parent_element_id, self.level_11.child_element_id
+                    )
+                ),
+            ]
+        )
+
 
 class TestManagerGetReverseAdjacencyList(TestCase):
     @classmethod
@@ -22,15 +22,22 @@
 #  see http://www.gnu.org/licenses/.
 # ############################################################################
 from datetime import datetime
+from unittest import mock
 
+from celery.utils import uuid
 from django.test import TestCase
 from django.utils.translation import gettext
 
+from base import tasks
+from base.business import learning_unit_proposal
 from base.models.enums.academic_calendar_type import EDUCATION_GROUP_EDITION
-from base.tasks import check_academic_calendar
+from base.models.enums.proposal_type import ProposalType
+from base.tasks import check_academic_calendar, send_partial_proposals_report
 from base.tests.factories.academic_calendar import AcademicCalendarFactory
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.education_group_year import EducationGroupYearFactory
+from base.tests.factories.person import PersonFactory
+from base.tests.factories.proposal_learning_unit import ProposalLearningUnitFactory
 
 
 class TestCheckAcademicCalendar(TestCase):
@@ -57,3 +64,73 @@ class TestCheckAcademicCalendar(TestCase):
                 "number_extended": 1,
                 "number_error": 0
             })
+
+
+class TestSendPartialProposalsReport(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = PersonFactory(language='en')
+        cls.applied_proposal = ProposalLearningUnitFactory()
+        cls.failed_proposal = ProposalLearningUnitFactory(type=ProposalType.MODIFICATION.name)
+
+    @mock.patch('base.utils.send_mail.send_mail_proposal_report')
+    @mock.patch('base.tasks.celery_app.AsyncResult')
+    def test_should_send_the_rows_of_the_applied_chunks_and_the_proposals_of_the_failed_chunks(
+            self,
+            mock_async_result,
+            mock_send_mail
+    ):
+        applied_row = ['2019-20', self.applied_proposal.learning_unit_year.acronym]
+        mock_async_result.side_effect = lambda task_id: {
+            'applied': mock.Mock(successful=lambda: True, result=[applied_row]),
+            'failed': mock.Mock(successful=lambda: False),
+        }[task_id]
+
+        result = send_partial_proposals_report(
+            learning_unit_proposal.CONSOLIDATION,
+            self.author.pk,
+            [],
+            [('applied', [self.applied_proposal.pk]), ('failed', [self.failed_proposal.pk])]
+        )
+
+        self.assertEqual(result, {'proposals': 2})
+        author, action_name, report_rows, research_criteria = mock_send_mail.call_args[0]
+        self.assertEqual(author, self.author)
+        self.assertEqual(report_rows[0], applied_row)
+        self.assertEqual(report_rows[1][1], self.failed_proposal.learning_unit_year.acronym)
+        self.assertEqual(report_rows[1][-1], "The action could not be applied on this proposal.")
+
+    @mock.patch('base.utils.send_mail.send_mail_proposal_report')
+    @mock.patch('base.business.learning_unit_proposal.apply_action_on_proposals_chunk')
+    @mock.patch('base.tasks.PROPOSALS_CHUNK_SIZE', 1)
+    def test_should_send_the_report_when_a_chunk_of_the_chord_fails(self, mock_apply_action, mock_send_mail):
+        """
+            Run the chord eagerly as the workers do : the chunks store their results in the result backend, then the
+            celery.chord_unlock task detects the failed chunk and calls the error callback inline.
+        """
+        applied_row = ['2019-20', self.applied_proposal.learning_unit_year.acronym]
+        mock_apply_action.side_effect = [[applied_row], Exception('Chunk failed')]
+        proposals_chord = tasks._build_proposals_chord(
+            learning_unit_proposal.CONSOLIDATION,
+            self.author.pk,
+            [self.applied_proposal.pk, self.failed_proposal.pk],
+            []
+        )
+        proposals_chord.body.freeze()
+
+        chunks_results = []
+        for chunk in proposals_chord.tasks:
+            result = chunk.apply(throw=False)
+            tasks.celery_app.backend.store_result(result.id, result.result, result.state)
+            chunks_results.append(result)
+        self.addCleanup(setattr, tasks.celery_app.conf, 'task_always_eager', tasks.celery_app.conf.task_always_eager)
+        tasks.celery_app.conf.task_always_eager = True
+        tasks.celery_app.tasks['celery.chord_unlock'].apply(
+            args=(uuid(), proposals_chord.body),
+            kwargs={'result': [result.as_tuple() for result in chunks_results]},
+        )
+
+        author, action_name, report_rows, research_criteria = mock_send_mail.call_args[0]
+        self.assertEqual(report_rows[0], applied_row)
+        self.assertEqual(report_rows[1][1], self.failed_proposal.learning_unit_year.acronym)
+        self.assertEqual(report_rows[1][-1], "The action could not be applied on this proposal.")
@@ -24,13 +24,16 @@
 #
 ##############################################################################
 
+from unittest import mock
+
 from django.test import TestCase
 
 from base.tests.factories.notifications import NotificationFactory
 from base.tests.factories.user import UserFactory
 from base.utils.cache import cache
 from base.utils.notifications import clear_user_notifications, \
-    get_user_notifications, mark_notifications_as_read, get_user_unread_notifications, get_user_read_notifications
+    get_user_notifications, mark_notifications_as_read, get_user_unread_notifications, get_user_read_notifications, \
+    get_user_unread_notifications_count, invalidate_unread_notifications_count
 
 
 class TestNotificationsBaseClass(TestCase):
@@ -67,6 +70,12 @@ class TestGetUserNotifications(TestNotificationsBaseClass):
         self.assertCountEqual(returned_notifications[:5],
                               self.unread_notifications)
 
+    @mock.patch('base.utils.notifications.NOTIFICATIONS_DROPDOWN_SIZE', 6)
+    def test_should_return_latest_notifications_only(self):
+        returned_notifications = list(get_user_notifications(self.user_with_notifications))
+        self.assertEqual(len(returned_notifications), 6)
+        self.assertCountEqual(returned_notifications[:5], self.unread_notifications)
+
 
 class TestClearNotifications(TestNotificationsBaseClass):
     def test_user_should_have_no_notifications_after_clear(self):
@@ -100,3 +109,26 @@ class TestMarkNotificationsAsRead(TestNotificationsBaseClass):
             get_user_read_notifications(self.user_with_notifications),
             list(self.user_with_notifications.notifications.all())
         )
+
+
+class TestGetUserUnreadNotificationsCount(TestNotificationsBaseClass):
+    def test_should_return_number_of_unread_notifications(self):
+        self.assertEqual(get_user_unread_notifications_count(self.user_with_notifications), 5)
+        self.assertEqual(get_user_unread_notifications_count(self.user_without_notifications), 0)
+
+    def test_should_cache_count_until_invalidated(self):
+        get_user_unread_notifications_count(self.user_with_notifications)
+        NotificationFactory(recipient=self.user_with_notifications)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_unread_notifications_count(self.user_with_notifications), 5)
+
+        invalidate_unread_notifications_count([self.user_with_notifications.pk])
+        self.assertEqual(get_user_unread_notifications_count(self.user_with_notifications), 6)
+
+    def test_count_should_be_reset_after_mark_as_read(self):
+        get_user_unread_notifications_count(self.user_with_notifications)
+
+        mark_notifications_as_read(self.user_with_notifications)
+
+        self.assertEqual(get_user_unread_notifications_count(self.user_with_notifications), 0)
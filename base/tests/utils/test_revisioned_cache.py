@@ -0,0 +1,87 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import mock
+from django.db import connection
+from django.test import TestCase
+
+from base.utils.revisioned_cache import CacheRevision, InMemoryCache
+
+
+class TestCacheRevision(TestCase):
+    def setUp(self):
+        self.resolve_keys = mock.Mock(side_effect=lambda keys: keys | {'ancestor'})
+        self.revision = CacheRevision('test_revision', resolve_keys=self.resolve_keys)
+
+    def test_should_register_one_callback_by_transaction(self):
+        self.revision.bump(['a'])
+        self.revision.bump(['b'])
+        self.assertTrue(self.revision.is_bump_pending())
+        callbacks = [callback for savepoint_ids, callback in connection.run_on_commit]
+        self.assertEqual(callbacks.count(self.revision.flush), 1)
+
+    def test_should_bump_revisions_once_on_commit(self):
+        revision_a = self.revision.get('a')
+        revision_ancestor = self.revision.get('ancestor')
+        revision_c = self.revision.get('c')
+
+        self.revision.bump(['a'])
+        self.revision.bump(['b'])
+        self.assertEqual(self.revision.get('a'), revision_a)
+
+        self.revision.flush()  # Changes are committed
+        self.resolve_keys.assert_called_once_with({'a', 'b'})
+        self.assertNotEqual(self.revision.get('a'), revision_a)
+        self.assertNotEqual(self.revision.get('ancestor'), revision_ancestor)
+        self.assertEqual(self.revision.get('c'), revision_c)
+
+    def test_should_bump_all_revisions(self):
+        revision_a = self.revision.get('a')
+        self.revision.bump()
+        self.revision.flush()
+        self.assertNotEqual(self.revision.get('a'), revision_a)
+        self.resolve_keys.assert_not_called()
+
+
+class TestInMemoryCache(TestCase):
+    def setUp(self):
+        self.revision = CacheRevision('test_in_memory')
+        self.in_memory_cache = InMemoryCache(self.revision, max_size=1)
+
+    def test_should_build_once_by_revision(self):
+        build = mock.Mock(side_effect=object)
+        value = self.in_memory_cache.get_or_build('key', build)
+        self.assertIs(self.in_memory_cache.get_or_build('key', build), value)
+
+        self.revision.bump_all()
+        self.assertIsNot(self.in_memory_cache.get_or_build('key', build), value)
+        self.assertEqual(build.call_count, 2)
+
+    def test_should_always_build_while_bump_is_pending(self):
+        build = mock.Mock(side_effect=object)
+        self.revision.bump()
+        self.in_memory_cache.get_or_build('key', build)
+        self.in_memory_cache.get_or_build('key', build)
+        self.assertEqual(build.call_count, 2)
@@ -24,7 +24,7 @@
 from django.test import SimpleTestCase
 from django.urls import reverse
 
-from base.utils.urls import reverse_with_get
+from base.utils.urls import reverse_with_get, UrlTemplate
 
 
 class TestReverseUrlWithGet(SimpleTestCase):
@@ -39,3 +39,20 @@ class TestReverseUrlWithGet(SimpleTestCase):
             reverse("home") + "?name=value&other=slop",
             reverse_with_get("home", get={"name": "value", "other": "slop"})
         )
+
+
+class TestUrlTemplate(SimpleTestCase):
+    def test_should_return_reverse_url_when_no_arguments(self):
+        self.assertEqual(UrlTemplate("home").format(), reverse("home"))
+
+    def test_should_return_reverse_url_with_arguments(self):
+        self.assertEqual(
+            UrlTemplate("element_identification", nb_args=2).format(2020, "LDROI1001"),
+            reverse("element_identification", args=[2020, "LDROI1001"])
+        )
+
+    def test_should_append_get_parameters_when_get_parameter_are_set(self):
+        self.assertURLEqual(
+            UrlTemplate("element_identification", nb_args=2).format(2020, "LDROI1001", get={"path": "1|2"}),
+            reverse_with_get("element_identification", args=[2020, "LDROI1001"], get={"path": "1|2"})
+        )
@@ -0,0 +1,50 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import TestCase
+from django.urls import reverse
+
+from base.models.enums.export_job_status import ExportJobStatus
+from base.tests.factories.export_job import ExportJobFactory
+from base.tests.factories.user import UserFactory
+
+
+class TestExportJobViews(TestCase):
+    def setUp(self):
+        self.job = ExportJobFactory(status=ExportJobStatus.PENDING.name)
+        self.client.force_login(self.job.user)
+
+    def test_status(self):
+        response = self.client.get(reverse('export_job_status', args=[self.job.pk]))
+        self.assertEqual(response.json(), {'status': ExportJobStatus.PENDING.name, 'download_url': None})
+
+    def test_job_of_another_user(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(reverse('export_job_status', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_of_pending_job(self):
+        response = self.client.get(reverse('export_job_download', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 404)
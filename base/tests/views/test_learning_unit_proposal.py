@@ -31,7 +31,7 @@ from django.contrib.auth.models import Permission
 from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.http import HttpResponseNotFound, HttpResponse, HttpResponseForbidden
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from waffle.testutils import override_flag
@@ -510,6 +510,24 @@ class TestGroupActionsOnProposals(TestCase):
         self.assertEqual(author, self.person)
         self.assertFalse(research_criteria)
 
+    @override_settings(PROPOSALS_ACTION_ASYNC_MIN_ROWS=1)
+    @mock.patch("base.tasks.start_action_on_proposals")
+    def test_when_action_is_consolidate_above_asynchronous_threshold(self, mock_start_action):
+        post_data = {
+            "action": ACTION_CONSOLIDATE,
+            "selected_action": [self.proposals[0].learning_unit_year.acronym]
+        }
+        response = self.client.post(self.url, data=post_data, follow=True)
+
+        mock_start_action.assert_called_once_with(
+            proposal_business.CONSOLIDATION,
+            self.person.pk,
+            [self.proposals[0].pk],
+            mock.ANY
+        )
+        messages = [str(message) for message in response.context["messages"]]
+        self.assertIn(_("The proposals are being processed. A report will be sent."), messages)
+
     @mock.patch("base.business.learning_unit_proposal.force_state_of_proposals",
                 side_effect=lambda proposals, author, research_criteria: {})
     def test_when_action_is_force_state_but_no_new_state(self, mock_force_state):
@@ -45,7 +45,7 @@ import base.views.learning_units.update
 from attribution.views import attribution, tutor_application
 from base.views import learning_achievement, search, user_list
 from base.views import learning_unit, offer, common, institution, organization, academic_calendar, \
-    my_osis, entity, student, notifications
+    my_osis, entity, student, notifications, export_job
 from base.views import geocoding
 from base.views import teaching_material
 from base.views.education_groups import urls as education_groups_urls
@@ -308,6 +308,11 @@ urlpatterns = [
         url(r'^clear/$', base.views.notifications.clear_user_notifications, name="clear_notifications"),
         url(r'^mark_as_read/$', base.views.notifications.mark_notifications_as_read, name="mark_notifications_as_read"),
     ])),
+    path('export_jobs/<int:export_job_id>/', include([
+        path('', export_job.export_job_read, name="export_job_read"),
+        path('status/', export_job.export_job_status, name="export_job_status"),
+        path('download/', export_job.export_job_download, name="export_job_download"),
+    ])),
 
 ]
 
@@ -23,6 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ############################################################################
+from django.db import transaction
 from django.db.models import F
 
 
@@ -44,3 +45,13 @@ def dict_fetchall(cursor):  # Inspired from https://docs.djangoproject.com
     desc = cursor.description
     columns = [col[0] for col in desc]
     return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def is_on_commit_pending(func, using=None) -> bool:
+    """
+    Return True when func has been registered by transaction.on_commit() in the current transaction and waits for
+    the commit, i.e. when the current transaction has uncommitted changes notified by func.
+    The callbacks of the savepoints rolled back are discarded by Django.
+    """
+    connection = transaction.get_connection(using)
+    return any(callback is func for savepoint_ids, callback in connection.run_on_commit)
@@ -23,51 +23,24 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import datetime
-import pickle
-import time
-
 from base.utils.cache import cache
 
 CACHE_NOTIFICATIONS_TIMEOUT = 300  # seconds -> 5 min
-NOTIFICATIONS_KEY = "notifications_unread_user_{}"
-NOTIFICATIONS_TIMESTAMP = "notifications_last_read_user_{}"
-
-
-def cache_queryset_function(function):
-    def wrapper(user, *args, **kwargs):
-        cache_key = make_notifications_cache_key(user)
-
-        pickled_qs = cache.get(cache_key)
-        if pickled_qs:
-            return pickle.loads(pickled_qs)
-
-        qs = function(user, *args, **kwargs)
-        cache.set(cache_key, pickle.dumps(qs), CACHE_NOTIFICATIONS_TIMEOUT)
-        return qs
-    return wrapper
+NOTIFICATIONS_DROPDOWN_SIZE = 20
+NOTIFICATIONS_UNREAD_COUNT_KEY = "notifications_unread_count_user_{}"
 
 
 def invalidate_cache(function):
     def wrapper(user, *args, **kwargs):
-        cache_key = make_notifications_cache_key(user)
-        cache.delete(cache_key)
-        return function(user, *args, **kwargs)
-    return wrapper
-
-
-def apply_function_if_data_not_in_cache(function):
-    def wrapper(user, *args, **kwargs):
-        cache_key = make_notifications_cache_key(user)
-        if cache.get(cache_key) is not None:
-            return None
-        return function(user, *args, **kwargs)
+        result = function(user, *args, **kwargs)
+        cache.delete(make_notifications_cache_key(user))
+        return result
     return wrapper
 
 
-@cache_queryset_function
 def get_user_notifications(user):
-    return user.notifications.all().order_by("-unread")
+    """ The latest notifications shown in the dropdown, unread first """
+    return user.notifications.all().order_by("-unread", "-timestamp")[:NOTIFICATIONS_DROPDOWN_SIZE]
 
 
 def get_user_unread_notifications(user):
@@ -78,6 +51,19 @@ def get_user_read_notifications(user):
     return user.notifications.read()
 
 
+def get_user_unread_notifications_count(user) -> int:
+    cache_key = make_notifications_cache_key(user)
+    unread_count = cache.get(cache_key)
+    if unread_count is None:
+        unread_count = get_user_unread_notifications(user).count()
+        cache.set(cache_key, unread_count, CACHE_NOTIFICATIONS_TIMEOUT)
+    return unread_count
+
+
+def invalidate_unread_notifications_count(user_ids):
+    cache.delete_many([NOTIFICATIONS_UNREAD_COUNT_KEY.format(user_id) for user_id in user_ids])
+
+
 @invalidate_cache
 def mark_notifications_as_read(user):
     user.notifications.mark_all_as_read()
@@ -88,20 +74,5 @@ def clear_user_notifications(user):
     user.notifications.all().delete()
 
 
-def get_notifications_last_time_read_for_user(user):
-    cache_key = make_notifications_timestamp_cache_key(user)
-    timestamp_last_read = cache.get(cache_key)
-    return datetime.datetime.fromtimestamp(float(timestamp_last_read)) if timestamp_last_read else None
-
-
-def set_notifications_last_read_as_now_for_user(user):
-    cache_key = make_notifications_timestamp_cache_key(user)
-    cache.set(cache_key, str(time.time()), timeout=None)
-
-
-def make_notifications_timestamp_cache_key(user):
-    return NOTIFICATIONS_TIMESTAMP.format(user.pk)
-
-
 def make_notifications_cache_key(user):
-    return NOTIFICATIONS_KEY.format(user.pk)
+    return NOTIFICATIONS_UNREAD_COUNT_KEY.format(user.pk)
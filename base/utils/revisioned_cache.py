@@ -0,0 +1,151 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Set
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from base.utils.db import is_on_commit_pending
+
+_ALL_KEYS = object()
+
+
+class CacheRevision:
+    """
+        Revision of data shared by all processes through the cache, optionally by key (e.g. by root of a tree).
+        A revision is a random token (not a counter) : a revision evicted from the cache cannot be reused.
+        The changes notified during a transaction are collected and the revisions are bumped once, on commit.
+        Until then, is_bump_pending() is True : the transaction must bypass the caches, its changes may be rolled back.
+    """
+    def __init__(self, name: str, resolve_keys: Callable[[Set[Hashable]], Iterable[Hashable]] = None):
+        """
+        :param name: Prefix of the cache keys of the revisions
+        :param resolve_keys: Optional callable which converts the keys notified by bump() into the keys of the
+        revisions, called once by transaction
+        """
+        self.name = name
+        self.resolve_keys = resolve_keys
+        self._pending = threading.local()
+        self._flush_on_commit = self.flush  # Same callable for each bump, so as to find it with is_on_commit_pending
+        _revisions.append(self)
+
+    def get(self, key: Hashable = None) -> str:
+        cache_keys = [self._get_cache_key()]
+        if key is not None:
+            cache_keys.append(self._get_cache_key(key))
+        tokens = cache.get_many(cache_keys)
+        missing_keys = [cache_key for cache_key in cache_keys if cache_key not in tokens]
+        if missing_keys:
+            for cache_key in missing_keys:
+                cache.add(cache_key, uuid.uuid4().hex, timeout=None)
+            tokens.update(cache.get_many(missing_keys))
+        return '.'.join(tokens[cache_key] for cache_key in cache_keys)
+
+    def bump(self, keys: Iterable[Hashable] = None) -> None:
+        """
+        Bump on commit the revisions of the keys, or all the revisions when keys is None.
+        """
+        keys = {_ALL_KEYS} if keys is None else {key for key in keys if key is not None}
+        if not keys:
+            return
+        if self.is_bump_pending():
+            self._pending.keys |= keys
+            return
+        self._pending.keys = keys  # The keys of a rolled back transaction are discarded
+        transaction.on_commit(self._flush_on_commit)
+
+    def is_bump_pending(self) -> bool:
+        return is_on_commit_pending(self._flush_on_commit)
+
+    def flush(self) -> None:
+        """ Bump the revisions of the keys collected during the transaction """
+        keys, self._pending.keys = getattr(self._pending, 'keys', set()), set()
+        if _ALL_KEYS in keys:
+            self.bump_all()
+            return
+        if keys and self.resolve_keys:
+            keys = set(self.resolve_keys(keys))
+        if keys:
+            cache.set_many({self._get_cache_key(key): uuid.uuid4().hex for key in keys}, timeout=None)
+
+    def bump_all(self) -> None:
+        cache.set(self._get_cache_key(), uuid.uuid4().hex, timeout=None)
+
+    def _get_cache_key(self, key: Hashable = None) -> str:
+        if key is None:
+            return '{}_revision'.format(self.name)
+        return '{}_revision_{}'.format(self.name, key)
+
+
+class InMemoryCache:
+    """
+        Values built by the process, kept by key until the revision changes (and at most timeout seconds, if any).
+        The values are shared between threads : they must not be modified.
+    """
+    def __init__(self, revision: CacheRevision, max_size: int = 1, timeout: Optional[int] = None):
+        self.revision = revision
+        self.max_size = max_size
+        self.timeout = timeout
+        self._values = OrderedDict()
+        self._values_revision = None
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        if self.revision.is_bump_pending():
+            return build()
+
+        revision = self.revision.get()
+        with self._lock:
+            if revision != self._values_revision:
+                self._values.clear()
+                self._values_revision = revision
+            value, built_at = self._values.get(key, (None, None))
+            if value is not None and self.timeout is not None and time.monotonic() - built_at > self.timeout:
+                value = None
+        if value is None:
+            value = build()
+            with self._lock:
+                if revision == self._values_revision:
+                    self._values[key] = (value, time.monotonic())
+                    while len(self._values) > self.max_size:
+                        self._values.popitem(last=False)
+        return value
+
+
+_revisions = []  # type: List[CacheRevision]
+
+
+@receiver(post_migrate)
+def _database_migrated(sender, **kwargs):
+    """ Also sent when the tables are flushed (e.g. at the end of a TransactionTestCase) """
+    for revision in _revisions:
+        revision.bump_all()
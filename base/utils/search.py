@@ -25,9 +25,14 @@
 ##############################################################################
 import urllib
 
-from django.http import JsonResponse, QueryDict
+from django.db import transaction
+from django.http import JsonResponse, QueryDict, HttpResponseRedirect
+from django.urls import reverse
 from django_filters.views import FilterView
 
+from base import tasks
+from base.business import export_job
+from base.models.enums.export_job_status import ExportJobStatus
 from base.templatetags import pagination
 from base.utils.cache import SearchParametersCache
 
@@ -77,6 +82,9 @@ class RenderToExcel:
         name: value of xls_status so as to generate the excel
         render_method: function to generate the excel.
                        The function must have as signature f(view_obj, context, **response_kwargs)
+
+        When the search has at least settings.EXPORT_ASYNC_MIN_ROWS results, the excel is generated by a celery task
+        and the user is redirected to the page of the export job.
     """
     def __init__(self, name, render_method):
         self.name = name
@@ -86,6 +94,21 @@ class RenderToExcel:
         class Wrapped(filter_class):
             def render_to_response(obj, context, **response_kwargs):
                 if obj.request.GET.get('xls_status') == self.name:
+                    if export_job.must_be_exported_asynchronously(obj, context):
+                        return self._enqueue_export(obj)
                     return self.render_method(obj, context, **response_kwargs)
                 return super().render_to_response(context, **response_kwargs)
+
+        # The export jobs import the view from its module
+        Wrapped.__module__ = filter_class.__module__
+        Wrapped.__name__ = filter_class.__name__
+        Wrapped.__qualname__ = filter_class.__qualname__
         return Wrapped
+
+    def _enqueue_export(self, view_obj):
+        job, created = export_job.get_or_create_job(view_obj, self.name)
+        if created or job.is_failed:
+            job.status = ExportJobStatus.PENDING.name
+            job.save(update_fields=['status'])
+            transaction.on_commit(lambda: tasks.generate_export.delay(job.pk))
+        return HttpResponseRedirect(reverse('export_job_read', args=[job.pk]))
@@ -221,22 +221,25 @@ def __sort_education_group_type(egy):
     return (egy.education_group_type.name, egy.acronym)
 
 
+PROPOSAL_REPORT_TEMPLATES = {
+    "cancellation": ('learning_unit_proposal_canceled_html', 'learning_unit_proposal_canceled_txt'),
+    "consolidation": ('learning_unit_proposal_consolidated_html', 'learning_unit_proposal_consolidated_txt'),
+}
+
+
 def send_mail_cancellation_learning_unit_proposals(manager, tuple_proposals_results, research_criteria):
-    html_template_ref = 'learning_unit_proposal_canceled_html'
-    txt_template_ref = 'learning_unit_proposal_canceled_txt'
-    return _send_mail_action_learning_unit_proposal(manager, tuple_proposals_results, html_template_ref,
-                                                    txt_template_ref, "cancellation", research_criteria)
+    return send_mail_proposal_report(manager, "cancellation", _build_table_proposal_data(tuple_proposals_results),
+                                     research_criteria)
 
 
 def send_mail_consolidation_learning_unit_proposal(manager, tuple_proposals_results, research_criteria):
-    html_template_ref = 'learning_unit_proposal_consolidated_html'
-    txt_template_ref = 'learning_unit_proposal_consolidated_txt'
-    return _send_mail_action_learning_unit_proposal(manager, tuple_proposals_results, html_template_ref,
-                                                    txt_template_ref, "consolidation", research_criteria)
+    return send_mail_proposal_report(manager, "consolidation", _build_table_proposal_data(tuple_proposals_results),
+                                     research_criteria)
 
 
-def _send_mail_action_learning_unit_proposal(manager, tuple_proposals_results, html_template_ref, txt_template_ref,
-                                             operation, research_criteria):
+def send_mail_proposal_report(manager, operation, report_rows, research_criteria):
+    """ Send the report of an operation on proposals, made of rows built by get_proposal_report_row """
+    html_template_ref, txt_template_ref = PROPOSAL_REPORT_TEMPLATES[operation]
     receivers = [message_config.create_receiver(manager.id, manager.email, manager.language)]
     suject_data = {}
     template_base_data = {
@@ -244,7 +247,7 @@ def _send_mail_action_learning_unit_proposal(manager, tuple_proposals_results, h
         "last_name": manager.last_name
     }
     attachment = ("report.xlsx",
-                  build_proposal_report_attachment(manager, tuple_proposals_results, operation, research_criteria),
+                  _build_proposal_report_attachment_from_rows(manager, report_rows, operation, research_criteria),
                   "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
     message_content = message_config.create_message_content(html_template_ref, txt_template_ref, None, receivers,
                                                             template_base_data, suject_data, attachment=attachment)
@@ -253,8 +256,15 @@ def _send_mail_action_learning_unit_proposal(manager, tuple_proposals_results, h
 
 # FIXME should be moved to osis_common
 def build_proposal_report_attachment(manager, proposals_with_results, operation, research_criteria):
-    table_data = _build_table_proposal_data(proposals_with_results)
+    return _build_proposal_report_attachment_from_rows(
+        manager,
+        _build_table_proposal_data(proposals_with_results),
+        operation,
+        research_criteria
+    )
 
+
+def _build_proposal_report_attachment_from_rows(manager, table_data, operation, research_criteria):
     xls_parameters = {
         xls_build.LIST_DESCRIPTION_KEY: "Liste d'activités",
         xls_build.FILENAME_KEY: 'Learning_units',
@@ -275,19 +285,22 @@ def build_proposal_report_attachment(manager, proposals_with_results, operation,
 
 
 def _build_table_proposal_data(proposals_with_results):
-    return [
-        (
-            proposal.learning_unit_year.academic_year.name,
-            proposal.learning_unit_year.acronym,
-            proposal.learning_unit_year.get_learning_unit_previous_year().complete_title
-            if proposal.type == proposal_type.ProposalType.SUPPRESSION.name
-            else proposal.learning_unit_year.complete_title,
-            proposal.get_type_display(),
-            proposal.get_state_display(),
-            _("Success") if ERROR not in results else _("Failure"),
-            "".join([str(error_msg) for error_msg in results.get(ERROR, [])])
-        ) for (proposal, results) in proposals_with_results
-    ]
+    return [get_proposal_report_row(proposal, results) for (proposal, results) in proposals_with_results]
+
+
+def get_proposal_report_row(proposal, results):
+    """ Row of the report of a proposal, made of strings only so as it can be serialized """
+    return (
+        proposal.learning_unit_year.academic_year.name,
+        proposal.learning_unit_year.acronym,
+        proposal.learning_unit_year.get_learning_unit_previous_year().complete_title
+        if proposal.type == proposal_type.ProposalType.SUPPRESSION.name
+        else proposal.learning_unit_year.complete_title,
+        str(proposal.get_type_display()),
+        str(proposal.get_state_display()),
+        str(_("Success") if ERROR not in results else _("Failure")),
+        "".join([str(error_msg) for error_msg in results.get(ERROR, [])])
+    )
 
 
 # FIXME should be moved to osis_common
@@ -22,6 +22,7 @@
 #  see http://www.gnu.org/licenses/.
 # ############################################################################
 from typing import Union, Dict
+from urllib.parse import quote
 
 from django.urls import reverse
 from django.utils.datastructures import MultiValueDict
@@ -36,3 +37,27 @@ def reverse_with_get(*args, get: Union[Dict, MultiValueDict] = None, **kwargs):
             get_parameters=urlencode(get)
         )
     return url
+
+
+class UrlTemplate:
+    """
+    URL reversed once with placeholder arguments, then formatted with the arguments of each object.
+    Use it instead of reverse() when building the same URL for a lot of objects.
+    """
+    PLACEHOLDER_BASE = 987654320
+
+    def __init__(self, viewname: str, nb_args: int = 0):
+        placeholders = [str(self.PLACEHOLDER_BASE + index) for index in range(nb_args)]
+        url = reverse(viewname, args=placeholders).replace('{', '{{').replace('}', '}}')
+        for index, placeholder in enumerate(placeholders):
+            url = url.replace(placeholder, '{%d}' % index)
+        self.template = url
+
+    def format(self, *args, get: Union[Dict, MultiValueDict] = None) -> str:
+        url = self.template.format(*(quote(str(arg), safe="!$&'()*+,;=/~:@") for arg in args))
+        if get:
+            url = "{path}?{get_parameters}".format(
+                path=url,
+                get_parameters=urlencode(get)
+            )
+        return url
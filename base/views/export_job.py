@@ -0,0 +1,58 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from base.models.export_job import ExportJob
+
+
+@login_required
+@require_GET
+def export_job_read(request, export_job_id):
+    job = get_object_or_404(ExportJob, pk=export_job_id, user=request.user)
+    return render(request, "export_job.html", {'export_job': job})
+
+
+@login_required
+@require_GET
+def export_job_status(request, export_job_id):
+    job = get_object_or_404(ExportJob, pk=export_job_id, user=request.user)
+    return JsonResponse({
+        'status': job.status,
+        'download_url': reverse('export_job_download', args=[job.pk]) if job.is_done else None,
+    })
+
+
+@login_required
+@require_GET
+def export_job_download(request, export_job_id):
+    job = get_object_or_404(ExportJob, pk=export_job_id, user=request.user)
+    if not job.is_done:
+        raise Http404
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.split('/')[-1])
@@ -35,7 +35,7 @@ from reversion.models import Version
 from base.business.learning_unit import get_all_attributions, get_components_identification
 from base.business.learning_unit_proposal import get_difference_of_proposal
 from base.business.learning_units.perms import is_eligible_to_create_partim, learning_unit_year_permissions, \
-    learning_unit_proposal_permissions, is_eligible_for_modification
+    learning_unit_proposal_permissions, is_eligible_for_modification, annotate_permissions_data
 from base.models import proposal_learning_unit
 from base.models.academic_year import current_academic_year
 from base.models.entity_version import get_by_entity_and_date
@@ -91,7 +91,7 @@ class DetailLearningUnitYearView(PermissionRequiredMixin, DetailView):
         return current_academic_year()
 
     def get_queryset(self):
-        return super().get_queryset().select_related(
+        return annotate_permissions_data(super().get_queryset()).select_related(
             'learning_container_year__academic_year',
             'academic_year', 'learning_unit',
             'campus__organization', 'externallearningunityear',
@@ -1,8 +1,10 @@
-from django.contrib.messages import WARNING
+from django.conf import settings
+from django.contrib.messages import INFO, WARNING
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from base import tasks
 from base.business import learning_unit_proposal as proposal_business
 from base.forms.learning_unit.comparison import SelectComparisonYears
 from base.forms.proposal.learning_unit_proposal import ProposalStateModelForm, \
@@ -19,6 +21,10 @@ from learning_unit.api.serializers.learning_unit import LearningUnitDetailedSeri
 ACTION_BACK_TO_INITIAL = "back_to_initial"
 ACTION_CONSOLIDATE = "consolidate"
 ACTION_FORCE_STATE = "force_state"
+ASYNCHRONOUS_ACTIONS = {
+    ACTION_BACK_TO_INITIAL: proposal_business.CANCELLATION,
+    ACTION_CONSOLIDATE: proposal_business.CONSOLIDATION,
+}
 
 
 @RenderToExcel("xls", _create_xls_proposal)
@@ -59,7 +65,7 @@ class SearchLearningUnitProposal(BaseLearningUnitSearch):
         selected_proposals_acronym = request.POST.getlist("selected_action", default=[])
         selected_proposals = ProposalLearningUnit.objects.filter(
             learning_unit_year__acronym__in=selected_proposals_acronym
-        )
+        ).select_related(*proposal_business.PROPOSAL_RELATED_FIELDS)
         messages_by_level = apply_action_on_proposals(selected_proposals, user_person, request.POST, research_criteria)
         display_messages_by_level(request, messages_by_level)
         return redirect(reverse("learning_unit_proposal_search") + "?{}".format(request.GET.urlencode()))
@@ -71,7 +77,15 @@ def apply_action_on_proposals(proposals, author, post_data, research_criteria):
 
     action = post_data.get("action", "")
     messages_by_level = {}
-    if action == ACTION_BACK_TO_INITIAL:
+    if action in ASYNCHRONOUS_ACTIONS and _must_be_applied_asynchronously(proposals):
+        tasks.start_action_on_proposals(
+            ASYNCHRONOUS_ACTIONS[action],
+            author.pk,
+            [proposal.pk for proposal in proposals],
+            research_criteria
+        )
+        messages_by_level = {INFO: [_("The proposals are being processed. A report will be sent.")]}
+    elif action == ACTION_BACK_TO_INITIAL:
         messages_by_level = proposal_business.cancel_proposals_and_send_report(proposals, author, research_criteria)
     elif action == ACTION_CONSOLIDATE:
         messages_by_level = proposal_business.consolidate_proposals_and_send_report(proposals, author,
@@ -82,3 +96,7 @@ def apply_action_on_proposals(proposals, author, post_data, research_criteria):
             new_state = form.cleaned_data.get("state")
             messages_by_level = proposal_business.force_state_of_proposals(proposals, author, new_state)
     return messages_by_level
+
+
+def _must_be_applied_asynchronously(proposals):
+    return bool(settings.PROPOSALS_ACTION_ASYNC_MIN_ROWS) and len(proposals) >= settings.PROPOSALS_ACTION_ASYNC_MIN_ROWS
@@ -37,6 +37,7 @@ from osis_common.decorators.ajax import ajax_required
 def clear_user_notifications(request):
     user = request.user
     notifications.clear_user_notifications(user)
+    request.unread_notifications_count = notifications.get_user_unread_notifications_count(user)
     return render(request, "blocks/notifications_inner.html", {})
 
 
@@ -46,4 +47,5 @@ def clear_user_notifications(request):
 def mark_notifications_as_read(request):
     user = request.user
     notifications.mark_notifications_as_read(user)
+    request.unread_notifications_count = notifications.get_user_unread_notifications_count(user)
     return render(request, "blocks/notifications_inner.html", {})
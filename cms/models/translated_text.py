@@ -23,7 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 
 from ckeditor.fields import RichTextField
 from django.conf import settings
@@ -80,6 +80,28 @@ def search(entity, reference: int, text_labels_name: List[str] = None, language:
     return queryset.select_related('text_label')
 
 
+def bulk_load_texts(
+        entity: str,
+        references: Iterable[int],
+        text_labels_name: List[str] = None,
+        languages: List[str] = None
+) -> Dict[int, Dict[Tuple[str, str], str]]:
+    """
+        Load the texts of all the references in one query.
+        :return: the texts of each reference by (text label, language)
+    """
+    queryset = TranslatedText.objects.filter(entity=entity, reference__in=references)
+    if text_labels_name:
+        queryset = queryset.filter(text_label__label__in=text_labels_name)
+    if languages:
+        queryset = queryset.filter(language__in=languages)
+
+    texts_by_reference = {}
+    for reference, label, language, text in queryset.values_list('reference', 'text_label__label', 'language', 'text'):
+        texts_by_reference.setdefault(reference, {})[(label, language)] = text
+    return texts_by_reference
+
+
 def get_or_create(entity, reference, text_label, language):
     translated_text, _ = TranslatedText.objects.get_or_create(
         entity=entity,
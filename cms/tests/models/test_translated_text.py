@@ -23,9 +23,11 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from django.conf import settings
 from django.test import TestCase
 
-from cms.models.translated_text import TranslatedText
+from cms.enums.entity_name import LEARNING_UNIT_YEAR
+from cms.models.translated_text import TranslatedText, bulk_load_texts
 from cms.tests.factories.text_label import OfferTextLabelFactory, GroupTextLabelFactory, \
     LearningUnitYearTextLabelFactory
 from cms.tests.factories.translated_text import OfferTranslatedTextFactory, \
@@ -62,3 +64,45 @@ class TranslatedTextTest(TestCase):
             list(tt),
             [text_label_oy_1.label, text_label_oy_2.label, text_label_oy_3.label]
         )
+
+    def test_bulk_load_texts(self):
+        resume = LearningUnitYearTextLabelFactory(label='resume')
+        mobility = LearningUnitYearTextLabelFactory(label='mobility')
+        LearningUnitYearTranslatedTextFactory(text_label=resume, reference=REFERENCE, text='Résumé')
+        LearningUnitYearTranslatedTextFactory(
+            text_label=resume,
+            reference=REFERENCE,
+            language=settings.LANGUAGE_CODE_EN,
+            text='Summary'
+        )
+        LearningUnitYearTranslatedTextFactory(text_label=mobility, reference=REFERENCE + 1, text='Mobilité')
+        OfferTranslatedTextFactory(text_label=OfferTextLabelFactory(label='resume'), reference=REFERENCE)
+
+        result = bulk_load_texts(
+            LEARNING_UNIT_YEAR,
+            [REFERENCE, REFERENCE + 1],
+            text_labels_name=['resume', 'mobility']
+        )
+        expected_result = {
+            REFERENCE: {
+                ('resume', settings.LANGUAGE_CODE_FR): 'Résumé',
+                ('resume', settings.LANGUAGE_CODE_EN): 'Summary',
+            },
+            REFERENCE + 1: {
+                ('mobility', settings.LANGUAGE_CODE_FR): 'Mobilité',
+            },
+        }
+        self.assertDictEqual(result, expected_result)
+
+    def test_bulk_load_texts_filtered_by_language(self):
+        resume = LearningUnitYearTextLabelFactory(label='resume')
+        LearningUnitYearTranslatedTextFactory(text_label=resume, reference=REFERENCE, text='Résumé')
+        LearningUnitYearTranslatedTextFactory(
+            text_label=resume,
+            reference=REFERENCE,
+            language=settings.LANGUAGE_CODE_EN,
+            text='Summary'
+        )
+
+        result = bulk_load_texts(LEARNING_UNIT_YEAR, [REFERENCE], languages=[settings.LANGUAGE_CODE_EN])
+        self.assertDictEqual(result, {REFERENCE: {('resume', settings.LANGUAGE_CODE_EN): 'Summary'}})
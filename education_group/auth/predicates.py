@@ -1,7 +1,9 @@
+import collections
 from typing import Union
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import prefetch_related_objects
 from django.utils.translation import gettext_lazy as _, pgettext
 from rules import predicate
 
@@ -12,6 +14,7 @@ from base.models.enums.education_group_categories import Categories
 from education_group.auth.scope import Scope
 from education_group.models.group_year import GroupYear
 from osis_role import errors
+from osis_role.contrib.predicates import set_based
 from osis_role.errors import predicate_failed_msg, set_permission_error, get_permission_error
 
 
@@ -54,6 +57,15 @@ def is_not_orphan_group(self, user, education_group_year=None):
     return education_group_year is not None
 
 
+def _are_education_group_years_older_or_equals_than_limit_settings_year(user, education_group_years, context):
+    prefetch_related_objects(education_group_years, 'academic_year')
+    return {
+        education_group_year: education_group_year.academic_year.year >= settings.YEAR_LIMIT_EDG_MODIFICATION
+        for education_group_year in education_group_years
+    }
+
+
+@set_based(_are_education_group_years_older_or_equals_than_limit_settings_year)
 @predicate(bind=True)
 @predicate_failed_msg(
     message=_("You cannot change/delete a education group existing before %(limit_year)s") %
@@ -69,6 +81,19 @@ def is_education_group_year_older_or_equals_than_limit_settings_year(
     return None
 
 
+def _are_education_group_types_authorized_according_to_user_scope(user, egys, context):
+    allowed_types_by_entity_id = collections.defaultdict(set)
+    for role in context['role_qs']:
+        for entity_id in context['role_qs'].filter(pk=role.pk).get_entities_ids():
+            allowed_types_by_entity_id[entity_id].update(role.get_allowed_education_group_types())
+    prefetch_related_objects(egys, 'education_group_type')
+    return {
+        egy: egy.education_group_type.name in allowed_types_by_entity_id.get(egy.management_entity_id, set())
+        for egy in egys
+    }
+
+
+@set_based(_are_education_group_types_authorized_according_to_user_scope)
 @predicate(bind=True)
 @predicate_failed_msg(message=_("The user is not allowed to create/modify this type of education group"))
 def is_education_group_type_authorized_according_to_user_scope(
@@ -85,6 +110,15 @@ def is_education_group_type_authorized_according_to_user_scope(
     return None
 
 
+def _are_users_attached_to_management_entities(user, education_group_years, context):
+    user_entity_ids = context['role_qs'].get_entities_ids()
+    return {
+        education_group_year: education_group_year.management_entity_id in user_entity_ids
+        for education_group_year in education_group_years
+    }
+
+
+@set_based(_are_users_attached_to_management_entities)
 @predicate(bind=True)
 @predicate_failed_msg(message=_("The user is not attached to the management entity"))
 def is_user_attached_to_management_entity(
@@ -109,14 +143,27 @@ def is_continuing_education_group_year(self, user, education_group_year=None):
     return education_group_year and education_group_year.is_continuing_education_education_group_year
 
 
+def _are_users_linked_to_all_scopes_of_management_entities(user, education_group_years, context):
+    user_scopes = _get_user_scopes_by_entity_id(context['role_qs'])
+    return {
+        education_group_year: user_scopes.get(education_group_year.management_entity_id) == Scope.ALL.value
+        for education_group_year in education_group_years
+    }
+
+
+@set_based(_are_users_linked_to_all_scopes_of_management_entities)
 @predicate(bind=True)
 @predicate_failed_msg(message=_("The scope of the user is limited and prevents this action to be performed"))
 def is_user_linked_to_all_scopes_of_management_entity(self, user, education_group_year):
     if education_group_year:
-        user_scopes = {
-            entity_id: scope for role in self.context['role_qs']
-            for scope in role.scopes if hasattr(role, 'scopes')
-            for entity_id in self.context['role_qs'].filter(pk=role.pk).get_entities_ids()
-        }
+        user_scopes = _get_user_scopes_by_entity_id(self.context['role_qs'])
         return user_scopes.get(education_group_year.management_entity_id) == Scope.ALL.value
     return None
+
+
+def _get_user_scopes_by_entity_id(role_qs):
+    return {
+        entity_id: scope for role in role_qs
+        for scope in role.scopes if hasattr(role, 'scopes')
+        for entity_id in role_qs.filter(pk=role.pk).get_entities_ids()
+    }
@@ -60,14 +60,16 @@ class CentralManager(EducationGroupTypeScopeRoleMixin, osis_role_models.EntityRo
                 predicates.is_education_group_year_older_or_equals_than_limit_settings_year &
                 predicates.is_user_attached_to_management_entity &
                 predicates.is_education_group_type_authorized_according_to_user_scope,
-            'base.can_attach_node':
-                predicates.is_education_group_year_older_or_equals_than_limit_settings_year &
-                predicates.is_user_attached_to_management_entity &
+            'base.can_attach_node': osis_role_predicates.all_of(
+                predicates.is_education_group_year_older_or_equals_than_limit_settings_year,
+                predicates.is_user_attached_to_management_entity,
                 predicates.is_education_group_type_authorized_according_to_user_scope,
-            'base.can_detach_node':
-                predicates.is_education_group_year_older_or_equals_than_limit_settings_year &
-                predicates.is_user_attached_to_management_entity &
+            ),
+            'base.can_detach_node': osis_role_predicates.all_of(
+                predicates.is_education_group_year_older_or_equals_than_limit_settings_year,
+                predicates.is_user_attached_to_management_entity,
                 predicates.is_education_group_type_authorized_according_to_user_scope,
+            ),
             'base.change_educationgroupcertificateaim':
                 osis_role_predicates.always_deny(
                     message=_('Certificate aim can only be edited by program manager')
@@ -2,7 +2,6 @@ from unittest import skip
 
 import mock
 from django.test import TestCase, override_settings
-from mock import patch
 
 from base.models.enums.education_group_types import TrainingType
 from base.tests.factories.academic_year import AcademicYearFactory
@@ -333,11 +332,9 @@ class TestIsUserLinkedToAllScopes(TestCase):
             )
         )
 
-    @patch('base.models.entity_version.EntityVersionQuerySet.get_tree')
-    def test_case_is_linked_to_all_scopes_of_child_entities(self, mock_get_tree):
+    def test_case_is_linked_to_all_scopes_of_child_entities(self):
         parent_entity = EntityFactory()
         child_entity = EntityVersionFactory(parent=parent_entity).entity
-        mock_get_tree.return_value = [{'entity_id': parent_entity.pk}, {'entity_id': child_entity.pk}]
         self.education_group_year.management_entity_id = child_entity.pk
         person = FacultyManagerFactory(entity=parent_entity, with_child=True).person
         self.predicate_context_mock.target.context['role_qs'] = FacultyManager.objects.filter(person=person)
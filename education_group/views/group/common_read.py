@@ -50,10 +50,10 @@ from education_group.views.proxy import read
 from osis_role.contrib.views import PermissionRequiredMixin
 from program_management.ddd.business_types import *
 from program_management.ddd.domain.node import NodeIdentity, NodeNotFoundException
-from program_management.ddd.repositories import load_tree
+from program_management.ddd.repositories import tree_cache
 from program_management.forms.custom_xls import CustomXlsForm
 from program_management.models.element import Element
-from program_management.serializers.program_tree_view import program_tree_view_serializer
+from program_management.serializers.program_tree_view import program_tree_view_serializer, TREE_VIEW_DEPTH
 
 Tab = read.Tab  # FIXME :: fix imports (and remove this line)
 
@@ -78,7 +78,7 @@ class GroupRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, Template
     @functools.lru_cache()
     def get_tree(self):
         root_element_id = self.get_path().split("|")[0]
-        return load_tree.load(int(root_element_id))
+        return tree_cache.load(int(root_element_id))
 
     @cached_property
     def node_identity(self) -> 'NodeIdentity':
@@ -113,7 +113,11 @@ class GroupRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, Template
             "enums": mdl.enums.education_group_categories,
             "can_change_education_group": can_change_education_group,
             "form_xls_custom": CustomXlsForm(),
-            "tree":  json.dumps(program_tree_view_serializer(self.get_tree())),
+            "tree": json.dumps(tree_cache.get_or_build_view(
+                self.get_tree().root_node.pk,
+                'sidebar',
+                lambda: program_tree_view_serializer(self.get_tree(), depth=TREE_VIEW_DEPTH)
+            )),
             "group": self.get_group(),
             "node": self.get_object(),
             "node_path": self.get_path(),
@@ -48,10 +48,10 @@ from education_group.views.mixin import ElementSelectedClipBoardMixin
 from education_group.views.proxy import read
 from osis_role.contrib.views import PermissionRequiredMixin
 from program_management.ddd.domain.node import NodeIdentity, NodeNotFoundException
-from program_management.ddd.repositories import load_tree
+from program_management.ddd.repositories import tree_cache
 from program_management.models.education_group_version import EducationGroupVersion
 from program_management.models.element import Element
-from program_management.serializers.program_tree_view import program_tree_view_serializer
+from program_management.serializers.program_tree_view import program_tree_view_serializer, TREE_VIEW_DEPTH
 from education_group.forms.tree_version_choices import get_tree_versions_choices
 from program_management.ddd.repositories.program_tree_version import ProgramTreeVersionRepository
 from program_management.ddd.domain.service.identity_search import ProgramTreeVersionIdentitySearch
@@ -104,7 +104,7 @@ class MiniTrainingRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, T
     @functools.lru_cache()
     def get_tree(self):
         root_element_id = self.get_path().split("|")[0]
-        return load_tree.load(int(root_element_id))
+        return tree_cache.load(int(root_element_id))
 
     @functools.lru_cache()
     def get_object(self):
@@ -131,7 +131,11 @@ class MiniTrainingRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, T
             "node": self.get_object(),
             "node_path": self.get_path(),
             "tab_urls": self.get_tab_urls(),
-            "tree": json.dumps(program_tree_view_serializer(self.get_tree())),
+            "tree": json.dumps(tree_cache.get_or_build_view(
+                self.get_tree().root_node.pk,
+                'sidebar',
+                lambda: program_tree_view_serializer(self.get_tree(), depth=TREE_VIEW_DEPTH)
+            )),
             "education_group_version": self.get_education_group_version(),
             "academic_year_choices": get_academic_year_choices(
                 self.node_identity,
@@ -53,12 +53,12 @@ from osis_role.contrib.views import PermissionRequiredMixin
 from program_management.ddd.business_types import *
 from program_management.ddd.domain.node import NodeIdentity, NodeNotFoundException
 from program_management.ddd.domain.service.identity_search import ProgramTreeVersionIdentitySearch
-from program_management.ddd.repositories import load_tree
+from program_management.ddd.repositories import tree_cache
 from program_management.ddd.repositories.program_tree_version import ProgramTreeVersionRepository
 from program_management.forms.custom_xls import CustomXlsForm
 from program_management.models.education_group_version import EducationGroupVersion
 from program_management.models.element import Element
-from program_management.serializers.program_tree_view import program_tree_view_serializer
+from program_management.serializers.program_tree_view import program_tree_view_serializer, TREE_VIEW_DEPTH
 
 Tab = read.Tab  # FIXME :: fix imports (and remove this line)
 
@@ -109,7 +109,7 @@ class TrainingRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, Templ
     @functools.lru_cache()
     def get_tree(self):
         root_element_id = self.get_path().split("|")[0]
-        return load_tree.load(int(root_element_id))
+        return tree_cache.load(int(root_element_id))
 
     @functools.lru_cache()
     def get_object(self) -> 'Node':
@@ -134,7 +134,11 @@ class TrainingRead(PermissionRequiredMixin, ElementSelectedClipBoardMixin, Templ
             "tab_urls": self.get_tab_urls(),
             "node": self.get_object(),
             "node_path": self.get_path(),
-            "tree": json.dumps(program_tree_view_serializer(self.get_tree())),
+            "tree": json.dumps(tree_cache.get_or_build_view(
+                self.get_tree().root_node.pk,
+                'sidebar',
+                lambda: program_tree_view_serializer(self.get_tree(), depth=TREE_VIEW_DEPTH)
+            )),
             "form_xls_custom": CustomXlsForm(path=self.get_path()),
             "academic_year_choices": get_academic_year_choices(
                 self.node_identity,
@@ -24,10 +24,10 @@
 #
 ##############################################################################
 import itertools
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 from django.conf import settings
-from django.db.models import F, Subquery, OuterRef, QuerySet, Q
+from django.db.models import F, Subquery, OuterRef, Q
 
 from attribution.ddd.repositories.attribution_repository import AttributionRepository
 from base.business.learning_unit import CMS_LABEL_PEDAGOGY, CMS_LABEL_PEDAGOGY_FR_AND_EN, CMS_LABEL_SPECIFICATIONS
@@ -39,7 +39,7 @@ from base.models.enums.quadrimesters import DerogationQuadrimester
 from base.models.learning_component_year import LearningComponentYear
 from base.models.learning_unit_year import LearningUnitYear as LearningUnitYearModel
 from cms.enums.entity_name import LEARNING_UNIT_YEAR
-from cms.models.translated_text import TranslatedText
+from cms.models import translated_text
 from learning_unit.ddd.domain.description_fiche import DescriptionFiche
 from learning_unit.ddd.domain.learning_unit_year import LearningUnitYear, LecturingVolume, PracticalVolume, Entities
 from learning_unit.ddd.domain.learning_unit_year_identity import LearningUnitYearIdentity
@@ -148,7 +148,7 @@ def load_multiple(learning_unit_year_ids: List[int]) -> List['LearningUnitYear']
         'main_language'
     )
 
-    qs = _annotate_with_description_fiche_specifications(qs)
+    qs = _annotate_with_description_fiche_specifications(list(qs))
 
     results = []
 
@@ -194,41 +194,33 @@ def __convert_string_to_enum(learn_unit_data: dict) -> dict:
     return learn_unit_data
 
 
-def _annotate_with_description_fiche_specifications(original_qs1):
-    original_qs = original_qs1
-    qs = TranslatedText.objects.filter(
-        reference=OuterRef('pk'),
-        entity=LEARNING_UNIT_YEAR)
-
-    annotations = build_annotations(
-        qs,
-        CMS_LABEL_PEDAGOGY+CMS_LABEL_SPECIFICATIONS,
-        CMS_LABEL_PEDAGOGY_FR_AND_EN+CMS_LABEL_SPECIFICATIONS
+def _annotate_with_description_fiche_specifications(learning_units_data: List[dict]) -> List[dict]:
+    fr_labels = CMS_LABEL_PEDAGOGY + CMS_LABEL_SPECIFICATIONS
+    en_labels = CMS_LABEL_PEDAGOGY_FR_AND_EN + CMS_LABEL_SPECIFICATIONS
+    texts_by_learning_unit_year_id = translated_text.bulk_load_texts(
+        LEARNING_UNIT_YEAR,
+        [learning_unit_data['id'] for learning_unit_data in learning_units_data],
+        text_labels_name=fr_labels,
+        languages=[settings.LANGUAGE_CODE_FR, settings.LANGUAGE_CODE_EN],
     )
-    original_qs = original_qs.annotate(**annotations)
-
-    return original_qs
+    for learning_unit_data in learning_units_data:
+        learning_unit_data.update(
+            build_cms_fields(texts_by_learning_unit_year_id.get(learning_unit_data['id'], {}), fr_labels, en_labels)
+        )
+    return learning_units_data
 
 
-def build_annotations(qs: QuerySet, fr_labels: list, en_labels: list):
-    annotations = {
-        "cms_{}".format(lbl): Subquery(
-            _build_subquery_text_label(qs, lbl, settings.LANGUAGE_CODE_FR))
+def build_cms_fields(texts: Dict[Tuple[str, str], str], fr_labels: list, en_labels: list) -> Dict[str, str]:
+    fields = {
+        "cms_{}".format(lbl): texts.get((lbl, settings.LANGUAGE_CODE_FR))
         for lbl in fr_labels
     }
 
-    annotations.update({
-        "cms_{}_en".format(lbl): Subquery(
-            _build_subquery_text_label(qs, lbl, settings.LANGUAGE_CODE_EN))
+    fields.update({
+        "cms_{}_en".format(lbl): texts.get((lbl, settings.LANGUAGE_CODE_EN))
         for lbl in en_labels}
     )
-    return annotations
-
-
-def _build_subquery_text_label(qs, cms_text_label, lang):
-
-    return qs.filter(text_label__label="{}".format(cms_text_label), language=lang).values(
-        'text')[:1]
+    return fields
 
 
 def load_multiple_by_identity(learning_unit_year_identities: List['LearningUnitYearIdentity']) \
@@ -327,7 +319,7 @@ def load_multiple_by_identity(learning_unit_year_identities: List['LearningUnitY
         'main_language',
     )
 
-    qs = _annotate_with_description_fiche_specifications(qs)
+    qs = _annotate_with_description_fiche_specifications(list(qs))
     teaching_materials_by_learning_unit_identity = bulk_load_teaching_materials(learning_unit_year_identities)
     results = []
     for learning_unit_data in qs:
@@ -27,9 +27,10 @@ import rules
 from django.contrib.auth.models import Group, User
 from django.core.exceptions import ImproperlyConfigured
 from django.db import models
+from django.utils import timezone
 
 from base.models.entity import Entity
-from base.models.entity_version import EntityVersion
+from base.models.entity_closure import EntityClosure
 from base.models.person import Person
 
 
@@ -67,12 +68,14 @@ class RoleModel(models.Model, metaclass=RoleModelMeta):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         self._add_user_to_group()
+        self._invalidate_perms_cache()
         return self
 
     def delete(self, *args, **kwargs):
         person = self.person
         super().delete(*args, kwargs)
         self._remove_user_from_group(person)
+        self._invalidate_perms_cache()
 
     @classmethod
     def belong_to(cls, person):
@@ -89,6 +92,11 @@ class RoleModel(models.Model, metaclass=RoleModelMeta):
         except User.DoesNotExist:
             pass
 
+    @staticmethod
+    def _invalidate_perms_cache():
+        from osis_role.contrib.permissions import invalidate_perms_cache
+        invalidate_perms_cache()
+
     def _remove_user_from_group(self, person):
         if not self.belong_to(person):
             group, _ = Group.objects.get_or_create(name=self.group_name)
@@ -97,11 +105,18 @@ class RoleModel(models.Model, metaclass=RoleModelMeta):
 
 class EntityRoleModelQueryset(models.QuerySet):
     def get_entities_ids(self):
+        if getattr(self, '_entities_ids_cache', None) is None:
+            self._entities_ids_cache = self._compute_entities_ids()
+        return self._entities_ids_cache
+
+    def _compute_entities_ids(self):
         person_entities = self.values('entity_id', 'with_child')
         entities_with_child = {entity['entity_id'] for entity in person_entities if entity['with_child']}
-        entity_version_tree = EntityVersion.objects.get_tree(entities_with_child)
+        descendants = EntityClosure.objects.current(timezone.now()).filter(
+            ancestor_id__in=entities_with_child
+        ).values_list('descendant_id', flat=True)
         entities_without_child = {entity['entity_id'] for entity in person_entities if not entity['with_child']}
-        return entities_without_child | {node['entity_id'] for node in entity_version_tree}
+        return entities_with_child | entities_without_child | set(descendants)
 
 
 class EntityRoleModel(RoleModel):
@@ -23,9 +23,13 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import contextlib
+import threading
+
 import rules
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import Permission, Group
+from django.db import models
 
 from osis_role import role, errors
 
@@ -35,14 +39,39 @@ class ObjectPermissionBackend(ModelBackend):
         if not user_obj.is_active or user_obj.is_anonymous:
             return False
 
+        object_identity = _get_object_identity(*args, **kwargs)
+        cached_results = _get_cached_results() if object_identity is not _NOT_CACHEABLE else {}
+        cache_key = (user_obj.pk, perm, object_identity)
+        if cache_key in cached_results:
+            result, error = cached_results[cache_key]
+            errors.set_permission_error(user_obj, perm, error)
+            return result
+
         errors.clear_permission_error(user_obj, perm)
         results = set()
         for role_mdl in _get_relevant_roles(user_obj, perm):
-            rule_set = role_mdl.rule_set()
-            role_qs = role_mdl.objects.filter(person=getattr(user_obj, 'person', None))
-            _add_role_queryset_to_perms_context(rule_set, perm, role_qs)
-            results.add(rule_set.test_rule(perm, user_obj, *args, **kwargs))
-        return any(results) or super().has_perm(user_obj, perm, obj=kwargs.get('obj'))
+            results.add(_get_perm_predicate(role_mdl, perm).test(user_obj, *args, **kwargs))
+        result = any(results) or super().has_perm(user_obj, perm, obj=kwargs.get('obj'))
+        cached_results[cache_key] = (result, errors.get_permission_error(user_obj, perm))
+        return result
+
+    def has_perms_for_objects(self, user_obj, perm, objects):
+        """
+        Bulk variant of has_perm()
+        :return: A dict with the result of the perm for each object
+        """
+        objects = list(objects)
+        if not user_obj.is_active or user_obj.is_anonymous:
+            return {obj: False for obj in objects}
+        if super().has_perm(user_obj, perm):
+            return {obj: True for obj in objects}
+
+        results = {obj: False for obj in objects}
+        with perms_cache():
+            for role_mdl in _get_relevant_roles(user_obj, perm):
+                objects_to_test = [obj for obj, result in results.items() if not result]
+                results.update(_test_rule_for_objects(user_obj, role_mdl, perm, objects_to_test))
+        return results
 
     def has_module_perms(self, user_obj, app_label, *args, **kwargs):
         if not user_obj.is_active or user_obj.is_anonymous:
@@ -50,7 +79,7 @@ class ObjectPermissionBackend(ModelBackend):
         roles_assigned = _get_roles_assigned_to_user(user_obj)
         all_perms = []
         for r in roles_assigned:
-            all_perms += [key for key in r.rule_set().keys() if app_label in key]
+            all_perms += [key for key in _get_rule_set(r).keys() if app_label in key]
         return any(app_label in perm for perm in all_perms) or super().has_module_perms(user_obj, app_label)
 
     def _get_group_permissions(self, user_obj, obj=None):
@@ -65,7 +94,7 @@ class ObjectPermissionBackend(ModelBackend):
 
 def _get_relevant_roles(user_obj, perm):
     roles_assigned = _get_roles_assigned_to_user(user_obj)
-    return {r for r in roles_assigned if r.rule_set().rule_exists(perm)}
+    return {r for r in roles_assigned if _get_rule_set(r).rule_exists(perm)}
 
 
 def _get_roles_assigned_to_user(user_obj):
@@ -74,18 +103,126 @@ def _get_roles_assigned_to_user(user_obj):
     return {r for r in role.role_manager.roles if r.group_name in user_obj._group_cache}
 
 
-def _add_role_queryset_to_perms_context(rule_set, perm, qs):
+def _get_rule_set(role_mdl):
+    """
+    Rule sets are static : build them once by role
+    """
+    if role_mdl not in _rule_sets_by_role:
+        _rule_sets_by_role[role_mdl] = role_mdl.rule_set()
+    return _rule_sets_by_role[role_mdl]
+
+
+def _get_perm_predicate(role_mdl, perm):
     """
-    :param rule_set: Set of rules for a specific role
-    :param perm: Django permission name
-    :param qs: Queryset which represent the role found on database
-    :return: rule_set with cached predicate
+    :return: Predicate of the perm for a specific role, with the role queryset of the user added to the perms context.
+    Built once by role and by perm.
     """
-    if perm in rule_set:
+    key = (role_mdl, perm)
+    if key not in _perm_predicates:
         @rules.predicate(name='cache_role_qs')
-        def cache_role_qs_fn(*args, **kwargs):
+        def cache_role_qs_fn(user_obj, *args):
             cache_role_qs_fn.context['perm_name'] = perm
-            cache_role_qs_fn.context['role_qs'] = qs
+            cache_role_qs_fn.context['role_qs'] = _get_role_queryset(user_obj, role_mdl)
             return True
-        rule_set[perm] = cache_role_qs_fn & rule_set[perm]
-    return rule_set
+        _perm_predicates[key] = cache_role_qs_fn & _get_rule_set(role_mdl)[perm]
+    return _perm_predicates[key]
+
+
+def _test_rule_for_objects(user_obj, role_mdl, perm, objects):
+    """
+    Use the set-based implementation of the rule if declared (see osis_role.contrib.predicates.set_based),
+    otherwise test the rule object by object.
+    """
+    if not objects:
+        return {}
+    set_based_fn = getattr(_get_rule_set(role_mdl)[perm], 'set_based_fn', None)
+    if set_based_fn:
+        context = {'perm_name': perm, 'role_qs': _get_role_queryset(user_obj, role_mdl)}
+        return set_based_fn(user_obj, objects, context)
+    predicate = _get_perm_predicate(role_mdl, perm)
+    return {obj: predicate.test(user_obj, obj) for obj in objects}
+
+
+def _get_role_queryset(user_obj, role_mdl):
+    role_qs = role_mdl.objects.filter(person=getattr(user_obj, 'person', None))
+    if not _perms_cache.is_active:
+        return role_qs
+    _perms_cache.check_version()
+    return _perms_cache.role_querysets.setdefault((user_obj.pk, role_mdl), role_qs)
+
+
+def _get_cached_results():
+    if not _perms_cache.is_active:
+        return {}  # Nothing cached outside of a perms_cache() context
+    _perms_cache.check_version()
+    return _perms_cache.results
+
+
+def _get_object_identity(obj=None, *args, **kwargs):
+    """
+    Only saved model instances have a stable identity : the result for any other object is never memoised
+    (id() of an object can be reused by another one after garbage collection).
+    """
+    obj = kwargs.get('obj', obj)
+    if obj is None:
+        return None
+    if isinstance(obj, models.Model) and obj.pk is not None:
+        return obj.__class__, obj.pk
+    return _NOT_CACHEABLE
+
+
+def has_perms_for_objects(user_obj, perm, objects):
+    """
+    Check the perm for a list of objects at once.
+    Entity-scoped rules resolve the entities of the user once and test every object in memory.
+    :return: A dict with the result of the perm for each object
+    """
+    return ObjectPermissionBackend().has_perms_for_objects(user_obj, perm, objects)
+
+
+class _PermsCache(threading.local):
+    """
+    Results of permission checks by user, perm and object, and role querysets by user and role.
+    Invalidated as soon as a role is saved or deleted.
+    """
+    def __init__(self):
+        self.is_active = False
+        self.clear()
+
+    def clear(self):
+        self.version = _roles_version
+        self.results = {}
+        self.role_querysets = {}
+
+    def check_version(self):
+        if self.version != _roles_version:
+            self.clear()
+
+
+@contextlib.contextmanager
+def perms_cache():
+    """
+    Within this context, rules are evaluated once by user, perm and object.
+    """
+    if _perms_cache.is_active:  # Nested context : reuse the outer cache
+        yield
+        return
+    _perms_cache.is_active = True
+    _perms_cache.clear()
+    try:
+        yield
+    finally:
+        _perms_cache.is_active = False
+        _perms_cache.clear()
+
+
+def invalidate_perms_cache():
+    global _roles_version
+    _roles_version += 1
+
+
+_NOT_CACHEABLE = object()
+_roles_version = 0
+_perms_cache = _PermsCache()
+_rule_sets_by_role = {}
+_perm_predicates = {}
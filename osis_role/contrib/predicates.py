@@ -1,3 +1,6 @@
+import functools
+import operator
+
 import rules
 
 from osis_role.errors import predicate_failed_msg
@@ -9,3 +12,47 @@ def always_deny(message=''):
     def always_deny_fn(*args, **kwargs):
         return False
     return always_deny_fn
+
+
+def set_based(set_based_fn):
+    """
+    Declare a set-based implementation of a predicate, used by has_perms_for_objects().
+    set_based_fn(user, objects, context) must return a dict with the result for each object.
+    """
+    def predicate_decorator(predicate_obj):
+        predicate_obj.set_based_fn = set_based_fn
+        return predicate_obj
+    return predicate_decorator
+
+
+def all_of(*predicates):
+    """
+    Equivalent of predicate_1 & predicate_2 & ... which keeps the set-based implementations of its predicates.
+    Predicates without set-based implementation are tested object by object.
+    """
+    combined_predicate = functools.reduce(operator.and_, predicates)
+
+    def all_of_set_based_fn(user, objects, context):
+        results = {obj: True for obj in objects}
+        for predicate_obj in predicates:
+            objects_to_test = [obj for obj, result in results.items() if result]
+            if not objects_to_test:
+                break
+            results.update(__test_predicate_for_objects(predicate_obj, user, objects_to_test, context))
+        return results
+
+    return set_based(all_of_set_based_fn)(combined_predicate)
+
+
+def __test_predicate_for_objects(predicate_obj, user, objects, context):
+    set_based_fn = getattr(predicate_obj, 'set_based_fn', None)
+    if set_based_fn:
+        return {obj: bool(result) for obj, result in set_based_fn(user, objects, context).items()}
+
+    @rules.predicate
+    def add_context_fn(*args):
+        add_context_fn.context.update(context)
+        return True
+
+    predicate_with_context = add_context_fn & predicate_obj
+    return {obj: predicate_with_context.test(user, obj) for obj in objects}
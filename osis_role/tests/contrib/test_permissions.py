@@ -33,7 +33,9 @@ from rules import RuleSet
 
 from base.tests.factories.person import PersonFactory, PersonWithPermissionsFactory
 from base.tests.factories.user import UserFactory
-from osis_role.contrib.permissions import ObjectPermissionBackend, _add_role_queryset_to_perms_context
+from osis_role.contrib import predicates as osis_role_predicates
+from osis_role.contrib.permissions import ObjectPermissionBackend, _get_perm_predicate, invalidate_perms_cache, \
+    perms_cache, has_perms_for_objects
 
 
 class TestObjectPermissionBackend(TestCase):
@@ -92,7 +94,11 @@ class TestObjectPermissionBackend(TestCase):
         self.assertTrue(self.auth_class.has_perm(self.person.user, perm))
 
 
-class TestAddRoleQuerysetToRuleSet(TestCase):
+class TestGetPermPredicate(TestCase):
+    def setUp(self):
+        self.mock_role_model = mock.Mock()
+        self.mock_role_model.objects.filter.return_value = QuerySet()
+
     def test_ensure_cache_role_queryset_is_added_to_perms_context(self):
         @rules.predicate(bind=True, name='ensure_role_qs_exist')
         def ensure_role_qs_exist_fn(self, *args, **kwargs):
@@ -100,12 +106,9 @@ class TestAddRoleQuerysetToRuleSet(TestCase):
                 raise Exception
             return True
 
-        qs = QuerySet()
-        rule_set = RuleSet()
-        rule_set.add_rule('perm_allowed', ensure_role_qs_exist_fn)
-
-        _add_role_queryset_to_perms_context(rule_set, 'perm_allowed', qs)
-        self.assertTrue(rule_set.test_rule('perm_allowed', UserFactory()))
+        self.mock_role_model.rule_set.return_value = RuleSet({'perm_allowed': ensure_role_qs_exist_fn})
+        predicate = _get_perm_predicate(self.mock_role_model, 'perm_allowed')
+        self.assertTrue(predicate.test(UserFactory()))
 
     def test_ensure_perm_name_is_added_to_perms_context(self):
         @rules.predicate(bind=True, name='ensure_role_qs_exist')
@@ -114,10 +117,121 @@ class TestAddRoleQuerysetToRuleSet(TestCase):
                 raise Exception
             return True
 
-        rule_set = RuleSet()
-        rule_set.add_rule('perm_allowed', ensure_perm_name_exist_fn)
-        _add_role_queryset_to_perms_context(rule_set, 'perm_allowed', QuerySet())
-        self.assertTrue(rule_set.test_rule('perm_allowed', UserFactory()))
+        self.mock_role_model.rule_set.return_value = RuleSet({'perm_allowed': ensure_perm_name_exist_fn})
+        predicate = _get_perm_predicate(self.mock_role_model, 'perm_allowed')
+        self.assertTrue(predicate.test(UserFactory()))
+
+    def test_ensure_rule_set_and_predicate_are_built_once(self):
+        self.mock_role_model.rule_set.return_value = RuleSet({'perm_allowed': rules.always_allow})
+
+        predicate = _get_perm_predicate(self.mock_role_model, 'perm_allowed')
+        self.assertIs(_get_perm_predicate(self.mock_role_model, 'perm_allowed'), predicate)
+        self.mock_role_model.rule_set.assert_called_once_with()
+
+
+class TestPermsCache(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.auth_class = ObjectPermissionBackend()
+        cls.group, _ = Group.objects.get_or_create(name="concrete_role")
+
+    def setUp(self):
+        self.person = PersonFactory()
+        self.person.user.groups.add(self.group)
+        self.predicate = mock.Mock(return_value=True)
+        self.mock_role_model = mock.Mock()
+        type(self.mock_role_model).group_name = mock.PropertyMock(return_value=self.group.name)
+        self.mock_role_model.rule_set = mock.Mock(return_value=rules.RuleSet({
+            'perm_allowed': rules.predicate(lambda user, obj: self.predicate(user, obj)),
+        }))
+
+        patcher_role_manager = mock.patch("osis_role.role.role_manager", **{'roles': {self.mock_role_model}})
+        patcher_role_manager.start()
+        self.addCleanup(patcher_role_manager.stop)
+
+    def test_should_evaluate_rules_once_by_perm_and_object_within_perms_cache(self):
+        obj = PersonFactory()
+        with perms_cache():
+            self.assertTrue(self.auth_class.has_perm(self.person.user, 'perm_allowed', obj))
+            self.assertTrue(self.auth_class.has_perm(self.person.user, 'perm_allowed', obj))
+            self.assertEqual(self.predicate.call_count, 1)
+
+            self.auth_class.has_perm(self.person.user, 'perm_allowed', PersonFactory())
+            self.assertEqual(self.predicate.call_count, 2)
+
+    def test_should_evaluate_rules_each_time_outside_perms_cache(self):
+        obj = PersonFactory()
+        self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+        self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+        self.assertEqual(self.predicate.call_count, 2)
+
+    def test_should_not_memoise_rules_evaluated_on_objects_which_are_not_saved_models(self):
+        obj = {'acronym': 'LDROI1001'}
+        with perms_cache():
+            self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+            self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+        self.assertEqual(self.predicate.call_count, 2)
+
+    def test_should_evaluate_rules_again_when_a_role_changed(self):
+        obj = PersonFactory()
+        with perms_cache():
+            self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+            invalidate_perms_cache()
+            self.auth_class.has_perm(self.person.user, 'perm_allowed', obj)
+        self.assertEqual(self.predicate.call_count, 2)
+
+
+class TestHasPermsForObjects(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.auth_class = ObjectPermissionBackend()
+        cls.group, _ = Group.objects.get_or_create(name="concrete_role")
+
+    def setUp(self):
+        self.person = PersonFactory()
+        self.person.user.groups.add(self.group)
+        self.objects = [PersonFactory(), PersonFactory()]
+        self.set_based_fn = mock.Mock(return_value={self.objects[0]: True, self.objects[1]: False})
+        self.mock_role_model = mock.Mock()
+        type(self.mock_role_model).group_name = mock.PropertyMock(return_value=self.group.name)
+        self.mock_role_model.rule_set = mock.Mock(return_value=rules.RuleSet({
+            'perm_allowed': rules.always_allow,
+            'perm_denied': rules.always_deny,
+            'perm_set_based': osis_role_predicates.set_based(self.set_based_fn)(
+                rules.predicate(lambda user, obj: False)
+            ),
+        }))
+
+        patcher_role_manager = mock.patch("osis_role.role.role_manager", **{'roles': {self.mock_role_model}})
+        patcher_role_manager.start()
+        self.addCleanup(patcher_role_manager.stop)
+
+    def test_should_deny_all_objects_case_inactive_user(self):
+        self.person.user.is_active = False
+        results = has_perms_for_objects(self.person.user, 'perm_allowed', self.objects)
+        self.assertDictEqual(results, {obj: False for obj in self.objects})
+
+    def test_should_test_rule_for_each_object(self):
+        self.assertDictEqual(
+            has_perms_for_objects(self.person.user, 'perm_allowed', self.objects),
+            {obj: True for obj in self.objects}
+        )
+        self.assertDictEqual(
+            has_perms_for_objects(self.person.user, 'perm_denied', self.objects),
+            {obj: False for obj in self.objects}
+        )
+
+    def test_should_use_set_based_implementation_of_rule_when_declared(self):
+        results = has_perms_for_objects(self.person.user, 'perm_set_based', self.objects)
+
+        self.assertDictEqual(results, {self.objects[0]: True, self.objects[1]: False})
+        self.set_based_fn.assert_called_once()
+        user, objects, context = self.set_based_fn.call_args[0]
+        self.assertEqual(objects, self.objects)
+        self.assertEqual(context['perm_name'], 'perm_set_based')
+        self.assertIn('role_qs', context)
 
 
 class TestHasModulePerms(TestCase):
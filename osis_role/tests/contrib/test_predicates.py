@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 import mock
+import rules
 
 from base.tests.factories.user import UserFactory
 from osis_role import errors
@@ -31,3 +32,47 @@ class TestAlwaysDenyPredicate(TestCase):
             errors.get_permission_error(self.user, 'dummy-perm'),
             permission_message
         )
+
+
+class TestAllOfPredicate(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.user = UserFactory.build()
+
+    def setUp(self):
+        self.obj_allowed = 'obj_allowed'
+        self.obj_denied = 'obj_denied'
+        self.set_based_fn = mock.Mock(return_value={self.obj_allowed: True, self.obj_denied: False})
+        self.set_based_predicate = predicates.set_based(self.set_based_fn)(rules.predicate(lambda user, obj: True))
+        self.per_object_predicate = rules.predicate(lambda user, obj: obj == self.obj_allowed)
+
+    def test_should_behave_as_and_combination_when_tested_on_one_object(self):
+        predicate = predicates.all_of(self.per_object_predicate, rules.always_allow)
+        self.assertTrue(predicate.test(self.user, self.obj_allowed))
+        self.assertFalse(predicate.test(self.user, self.obj_denied))
+
+    def test_should_use_set_based_implementation_of_predicates(self):
+        predicate = predicates.all_of(self.set_based_predicate, rules.always_allow)
+        results = predicate.set_based_fn(self.user, [self.obj_allowed, self.obj_denied], {})
+
+        self.assertDictEqual(results, {self.obj_allowed: True, self.obj_denied: False})
+        self.set_based_fn.assert_called_once_with(self.user, [self.obj_allowed, self.obj_denied], {})
+
+    def test_should_only_test_remaining_objects_on_next_predicates(self):
+        next_predicate_fn = mock.Mock(return_value=True)
+        next_predicate = rules.predicate(lambda user, obj: next_predicate_fn(obj))
+        predicate = predicates.all_of(self.set_based_predicate, next_predicate)
+
+        results = predicate.set_based_fn(self.user, [self.obj_allowed, self.obj_denied], {})
+
+        self.assertDictEqual(results, {self.obj_allowed: True, self.obj_denied: False})
+        next_predicate_fn.assert_called_once_with(self.obj_allowed)
+
+    def test_should_give_context_to_predicates_without_set_based_implementation(self):
+        @rules.predicate(bind=True)
+        def ensure_role_qs_exist_fn(self, user, obj):
+            return self.context['role_qs'] == 'role_qs'
+
+        predicate = predicates.all_of(ensure_role_qs_exist_fn)
+        results = predicate.set_based_fn(self.user, [self.obj_allowed], {'role_qs': 'role_qs'})
+        self.assertDictEqual(results, {self.obj_allowed: True})
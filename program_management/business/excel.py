@@ -44,6 +44,7 @@ from program_management.ddd.domain import link
 from program_management.ddd.domain.node import NodeIdentity
 from program_management.ddd.domain.prerequisite import Prerequisite, PrerequisiteItem
 from program_management.ddd.domain.program_tree import ProgramTreeIdentity
+from program_management.ddd.repositories.load_node import SUMMARY_PROJECTION
 from program_management.ddd.repositories.program_tree import ProgramTreeRepository
 
 BORDER_BOTTOM = Border(
@@ -80,7 +81,7 @@ HeaderLinePrerequisiteOf = namedtuple('HeaderLinePrerequisiteOf', ['egy_acronym'
 
 class EducationGroupYearLearningUnitsPrerequisitesToExcel:
     def __init__(self, year: int, code: str):
-        self.tree = ProgramTreeRepository.get(ProgramTreeIdentity(code, year))
+        self.tree = ProgramTreeRepository.get(ProgramTreeIdentity(code, year), projection=SUMMARY_PROJECTION)
 
     def _to_workbook(self):
         return generate_prerequisites_workbook(self.tree)
@@ -250,7 +251,7 @@ def _add_hyperlink(excel_lines, workbook: Workbook, year):
 class EducationGroupYearLearningUnitsIsPrerequisiteOfToExcel:
 
     def __init__(self, year: int, code: str):
-        self.tree = ProgramTreeRepository.get(ProgramTreeIdentity(code, year))
+        self.tree = ProgramTreeRepository.get(ProgramTreeIdentity(code, year), projection=SUMMARY_PROJECTION)
         self.acronym = "{}-{}"
 
     def _to_workbook(self):
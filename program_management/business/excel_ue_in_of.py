@@ -428,11 +428,6 @@ def _build_description_fiche_cols(description_fiche: 'DescriptionFiche',
     )
 
 
-def _build_subquery_text_label(qs, cms_text_label, lang):
-    return qs.filter(text_label__label="{}".format(cms_text_label), language=lang).values(
-        'text')[:1]
-
-
 def _build_direct_gathering_label(direct_gathering_node: 'NodeGroupYear') -> str:
     return "{} - {}".format(direct_gathering_node.code,
                             direct_gathering_node.group_title_fr or '') if direct_gathering_node else ''
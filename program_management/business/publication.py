@@ -0,0 +1,131 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+PREFIX_CACHE_KEY = 'program_tree_publication'
+PREFIX_TASK_CACHE_KEY = 'program_tree_publication_task'
+PUBLICATION_TASK_TIMEOUT = 86400  # seconds -> 1 day
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class ProgramTreePublisher:
+    """
+    Call the publication urls of program trees on the ESB with a pooled HTTP session,
+    a bounded number of concurrent calls and retries with exponential backoff.
+    """
+    def __init__(self, max_workers: int = None, max_retries: int = None, backoff_factor: float = None,
+                 timeout: int = None):
+        self.max_workers = max_workers or settings.ESB_PUBLISH_MAX_WORKERS
+        self.max_retries = settings.ESB_PUBLISH_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = settings.ESB_PUBLISH_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.timeout = timeout or settings.REQUESTS_TIMEOUT or 20
+
+    def publish(self, publish_urls: List[str]) -> Dict[str, List[str]]:
+        results = {'published': [], 'failed': []}
+        with self._build_session() as session, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            publications = executor.map(lambda publish_url: self._publish(session, publish_url), publish_urls)
+            for publish_url, is_published in zip(publish_urls, publications):
+                results['published' if is_published else 'failed'].append(publish_url)
+        return results
+
+    def _publish(self, session: requests.Session, publish_url: str) -> bool:
+        try:
+            response = session.get(
+                publish_url,
+                headers={"Authorization": settings.ESB_AUTHORIZATION},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            logger.exception('Unable to publish program tree with url {}'.format(publish_url))
+            return False
+        return True
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            method_whitelist=frozenset(['GET']),
+        )
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+
+def exclude_recently_published(publish_urls: List[str], window: int = None) -> List[str]:
+    """
+    Remove duplicates and urls already published within the window (in seconds).
+    """
+    window = settings.ESB_PUBLISH_DEDUPLICATION_WINDOW if window is None else window
+    unique_publish_urls = list(dict.fromkeys(publish_urls))
+    if not window:
+        return unique_publish_urls
+    return [
+        publish_url for publish_url in unique_publish_urls
+        if cache.add(_get_cache_key(publish_url), True, timeout=window)
+    ]
+
+
+def forget_publications(publish_urls: List[str]) -> None:
+    cache.delete_many([_get_cache_key(publish_url) for publish_url in publish_urls])
+
+
+def store_publication_task(publish_urls: List[str], task_id: str) -> None:
+    """
+    Keep the id of the task publishing the urls, so as its result can be queried (see get_publication_task_id)
+    """
+    cache.set_many(
+        {_get_task_cache_key(publish_url): task_id for publish_url in publish_urls},
+        timeout=PUBLICATION_TASK_TIMEOUT
+    )
+
+
+def get_publication_task_id(publish_url: str) -> Optional[str]:
+    """
+    :return: The id of the last task which has published the url
+    """
+    return cache.get(_get_task_cache_key(publish_url))
+
+
+def _get_cache_key(publish_url: str) -> str:
+    return '{}_{}'.format(PREFIX_CACHE_KEY, publish_url)
+
+
+def _get_task_cache_key(publish_url: str) -> str:
+    return '{}_{}'.format(PREFIX_TASK_CACHE_KEY, publish_url)
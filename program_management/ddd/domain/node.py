@@ -24,6 +24,7 @@
 #
 ##############################################################################
 import copy
+import weakref
 from _decimal import Decimal
 from collections import OrderedDict
 from typing import List, Set, Dict, Optional
@@ -52,6 +53,88 @@ from program_management.ddd.domain.service.generate_node_code import GenerateNod
 from program_management.models.enums.node_type import NodeType
 
 
+class _StructureObservers:
+    """
+    Weak references to the objects notified once the children of a node are attached, detached or reordered
+    (e.g. the lookup indexes of the program trees using the node). They are bound to a node instance :
+    copies and unpickled nodes have no observer.
+    """
+    __slots__ = ('_references',)
+
+    def __init__(self):
+        self._references = []
+
+    def __reduce__(self):
+        return _StructureObservers, ()
+
+    def add(self, observer) -> None:
+        self._references.append(weakref.ref(observer))
+
+    def notify(self) -> None:
+        references, self._references = self._references, []
+        for reference in references:
+            observer = reference()
+            if observer is not None:
+                observer.structure_has_changed()
+
+
+class _Children(list):
+    """
+    Links to the children of a node : any link attached or detached, even directly on the list, is notified
+    to the structure observers of the node.
+    """
+    _node = None
+
+    def __init__(self, node: 'Node' = None, links: List['Link'] = ()):
+        super().__init__(links)
+        self._node = node
+
+    def __reduce__(self):
+        return _Children, (self._node, list(self))
+
+    def _has_changed(self) -> None:
+        if self._node is not None:
+            self._node._structure_has_changed()
+
+    def append(self, link: 'Link') -> None:
+        super().append(link)
+        self._has_changed()
+
+    def extend(self, links: List['Link']) -> None:
+        super().extend(links)
+        self._has_changed()
+
+    def insert(self, index: int, link: 'Link') -> None:
+        super().insert(index, link)
+        self._has_changed()
+
+    def remove(self, link: 'Link') -> None:
+        super().remove(link)
+        self._has_changed()
+
+    def pop(self, *args) -> 'Link':
+        link = super().pop(*args)
+        self._has_changed()
+        return link
+
+    def clear(self) -> None:
+        super().clear()
+        self._has_changed()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._has_changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._has_changed()
+
+    def __iadd__(self, links: List['Link']) -> '_Children':
+        super().__iadd__(links)
+        self._has_changed()
+        return self
+
+
 class NodeFactory:
 
     @classmethod
@@ -120,10 +203,10 @@ class NodeFactory:
         return copied_node
 
     def deepcopy_node_without_copy_children_recursively(self, original_node: 'Node') -> 'Node':
-        original_children = original_node.children
-        original_node.children = []  # To avoid recursive deep copy of all children behind
+        original_children = original_node._children
+        original_node._children = _Children(original_node)  # To avoid recursive deep copy of all children behind
         copied_node = copy.deepcopy(original_node)
-        original_node.children = original_children
+        original_node._children = original_children
         return copied_node
 
 
@@ -155,6 +238,7 @@ class Node(interface.Entity):
 
     _children = children
     _deleted_children = attr.ib(type=List, factory=list)
+    _structure_observers = attr.ib(type=_StructureObservers, factory=_StructureObservers, init=False, repr=False)
 
     _academic_year = None
     _has_changed = False
@@ -163,6 +247,9 @@ class Node(interface.Entity):
     def _entity_id(self) -> NodeIdentity:
         return NodeIdentity(self.code, self.year)
 
+    def __attrs_post_init__(self):
+        self._children = _Children(self, self._children)
+
     def __str__(self):
         return '%(code)s (%(year)s)' % {'code': self.code, 'year': self.year}
 
@@ -183,7 +270,18 @@ class Node(interface.Entity):
 
     @children.setter
     def children(self, new_children: List['Link']):
-        self._children = new_children
+        self._children = _Children(self, new_children)
+        self._structure_has_changed()
+
+    def observe_structure(self, observer) -> None:
+        """
+        The observer (weakly referenced) is notified once, through observer.structure_has_changed(), as soon as
+        children of the node are attached, detached or reordered.
+        """
+        self._structure_observers.add(observer)
+
+    def _structure_has_changed(self) -> None:
+        self._structure_observers.notify()
 
     def is_learning_unit(self):
         return self.type == NodeType.LEARNING_UNIT
@@ -379,6 +477,7 @@ class Node(interface.Entity):
 
         self.children[index].order_up()
         self.children[index-1].order_down()
+        self._structure_has_changed()
 
     def down_child(self, node_to_down: 'Node') -> None:
         index = self.children_as_nodes.index(node_to_down)
@@ -389,19 +488,23 @@ class Node(interface.Entity):
 
         self.children[index].order_down()
         self.children[index+1].order_up()
+        self._structure_has_changed()
 
 
-def _get_descendents(root_node: Node, current_path: 'Path' = None) -> Dict['Path', 'Node']:
-    _descendents = OrderedDict()
+def _get_descendents(
+        root_node: Node,
+        current_path: 'Path' = None,
+        _descendents: Dict['Path', 'Node'] = None
+) -> Dict['Path', 'Node']:
+    if _descendents is None:
+        _descendents = OrderedDict()
     if current_path is None:
         current_path = str(root_node.pk)
 
     for link in root_node.children:
         child_path = "|".join([current_path, str(link.child.pk)])
-        _descendents.update({
-            **{child_path: link.child},
-            **_get_descendents(link.child, current_path=child_path)
-        })
+        _descendents[child_path] = link.child
+        _get_descendents(link.child, current_path=child_path, _descendents=_descendents)
     return _descendents
 
 
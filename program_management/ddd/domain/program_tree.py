@@ -23,8 +23,8 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from collections import Counter
-from typing import List, Set, Optional
+from collections import Counter, OrderedDict
+from typing import List, Set, Optional, Dict, Tuple
 
 import attr
 
@@ -181,6 +181,47 @@ class ProgramTreeBuilder:
         return children
 
 
+@attr.s(slots=True)
+class _ProgramTreeIndex:
+    """
+    Lookup tables of a program tree, built in one depth-first traversal (respecting the order of the links).
+    The index observes the nodes of the tree : it is outdated as soon as children of one of them are attached,
+    detached or reordered.
+    """
+    root_node = attr.ib(type=Node)
+    is_outdated = attr.ib(type=bool, default=False)
+    nodes_by_path = attr.ib(type=Dict[Path, 'Node'], factory=OrderedDict)
+    smallest_path_by_node = attr.ib(type=Dict['Node', Path], factory=dict)
+    nodes_by_code_and_year = attr.ib(type=Dict[Tuple[str, int], 'Node'], factory=dict)
+    links = attr.ib(type=List['Link'], factory=list)
+    links_by_child = attr.ib(type=Dict['Node', List['Link']], factory=dict)
+    links_by_parent_and_child = attr.ib(type=Dict[Tuple['Node', 'Node'], 'Link'], factory=dict)
+
+    def is_up_to_date(self, root_node: 'Node') -> bool:
+        return self.root_node is root_node and not self.is_outdated
+
+    def structure_has_changed(self) -> None:
+        self.is_outdated = True
+
+
+def _build_index(root_node: 'Node') -> _ProgramTreeIndex:
+    index = _ProgramTreeIndex(root_node=root_node)
+    _add_to_index(index, root_node, str(root_node.pk))
+    return index
+
+
+def _add_to_index(index: _ProgramTreeIndex, node_obj: 'Node', path: Path) -> None:
+    node_obj.observe_structure(index)
+    index.nodes_by_path[path] = node_obj
+    index.smallest_path_by_node.setdefault(node_obj, path)
+    index.nodes_by_code_and_year.setdefault((node_obj.code, node_obj.year), node_obj)
+    for link in node_obj.children:
+        index.links.append(link)
+        index.links_by_child.setdefault(link.child, []).append(link)
+        index.links_by_parent_and_child.setdefault((link.parent, link.child), link)
+        _add_to_index(index, link.child, PATH_SEPARATOR.join([path, str(link.child.pk)]))
+
+
 @attr.s(slots=True)
 class ProgramTree(interface.RootEntity):
 
@@ -188,6 +229,8 @@ class ProgramTree(interface.RootEntity):
     authorized_relationships = attr.ib(type=AuthorizedRelationshipList, factory=list)
     entity_id = attr.ib(type=ProgramTreeIdentity)  # FIXME :: pass entity_id as mandatory param !
 
+    _index = attr.ib(type=_ProgramTreeIndex, default=None, init=False, repr=False, eq=False)
+
     def is_empty(self, parent_node=None):
         parent_node = parent_node or self.root_node
         for child_node in parent_node.children_as_nodes:
@@ -206,6 +249,15 @@ class ProgramTree(interface.RootEntity):
     def is_master_2m(self):
         return self.root_node.is_master_2m()
 
+    def _get_index(self) -> _ProgramTreeIndex:
+        """
+        Return the lookup tables of the tree. They are built on first use and rebuilt once children of a node
+        of the tree have been attached, detached or reordered (see Node.observe_structure).
+        """
+        if self._index is None or not self._index.is_up_to_date(self.root_node):
+            self._index = _build_index(self.root_node)
+        return self._index
+
     def is_root(self, node: 'Node'):
         return self.root_node == node
 
@@ -232,18 +284,15 @@ class ProgramTree(interface.RootEntity):
         )
         return tree_without_finalities.root_node.get_option_list()
 
-    def get_parents(self, path: Path) -> List['Node']:  # TODO :: unit tests
-        result = []
+    def get_parents(self, path: Path) -> List['Node']:
         str_nodes = path.split(PATH_SEPARATOR)
-        if len(str_nodes) > 1:
-            str_nodes = str_nodes[:-1]
-            path = '{}'.format(PATH_SEPARATOR).join(str_nodes)
-            result.append(self.get_node(path))
-            result += self.get_parents(PATH_SEPARATOR.join(str_nodes))
-        return result
+        return [
+            self.get_node(PATH_SEPARATOR.join(str_nodes[:nb_nodes]))
+            for nb_nodes in range(len(str_nodes) - 1, 0, -1)
+        ]
 
     def get_links_using_node(self, child_node: 'Node') -> List['Link']:
-        return [link_obj for link_obj in _links_from_root(self.root_node) if link_obj.child == child_node]
+        return list(self._get_index().links_by_child.get(child_node, []))
 
     def get_first_link_occurence_using_node(self, child_node: 'Node') -> 'Link':
         links = self.get_links_using_node(child_node)
@@ -257,10 +306,7 @@ class ProgramTree(interface.RootEntity):
         :return: Node
         """
         try:
-            return {
-                str(self.root_node.pk): self.root_node,
-                **self.root_node.descendents
-            }[path]
+            return self._get_index().nodes_by_path[path]
         except KeyError:
             from program_management.ddd.domain import node
             raise node.NodeNotFoundException
@@ -294,12 +340,7 @@ class ProgramTree(interface.RootEntity):
         """
         if node == self.root_node:
             return build_path(self.root_node)
-
-        nodes_by_path = self.root_node.descendents
-        return next(
-            (path for path, node_obj in nodes_by_path.items() if node_obj == node),
-            None
-        )
+        return self._get_index().smallest_path_by_node.get(node)
 
     def get_node_by_code_and_year(self, code: str, year: int) -> 'Node':
         """
@@ -308,20 +349,14 @@ class ProgramTree(interface.RootEntity):
         :param year: int
         :return: Node
         """
-        return next(
-            (
-                node for node in self.get_all_nodes()
-                if node.code == code and node.academic_year.year == year
-            ),
-            None
-        )
+        return self._get_index().nodes_by_code_and_year.get((code, year))
 
     def get_all_nodes(self, types: Set[EducationGroupTypesEnum] = None) -> Set['Node']:
         """
         Return a flat set of all nodes present in the tree
         :return: list of Node
         """
-        all_nodes = set([self.root_node] + _nodes_from_root(self.root_node))
+        all_nodes = set(self._get_index().nodes_by_path.values())
         if types:
             return set(n for n in all_nodes if n.node_type in types)
         return all_nodes
@@ -356,7 +391,7 @@ class ProgramTree(interface.RootEntity):
         )
 
     def count_usage(self, node: 'Node') -> int:
-        return Counter(_nodes_from_root(self.root_node))[node]
+        return len(self._get_index().links_by_child.get(node, [])) + (1 if node == self.root_node else 0)
 
     def get_all_finalities(self) -> Set['Node']:
         finality_types = set(TrainingType.finality_types_enum())
@@ -369,10 +404,10 @@ class ProgramTree(interface.RootEntity):
         return max(link_obj.block_max_value for link_obj in all_links)
 
     def get_all_links(self) -> List['Link']:
-        return _links_from_root(self.root_node)
+        return list(self._get_index().links)
 
     def get_link(self, parent: 'Node', child: 'Node') -> 'Link':
-        return next((link for link in self.get_all_links() if link.parent == parent and link.child == child), None)
+        return self._get_index().links_by_parent_and_child.get((parent, child))
 
     def prune(self, ignore_children_from: Set[EducationGroupTypesEnum] = None) -> 'ProgramTree':
         copied_root_node = _copy(self.root_node, ignore_children_from=ignore_children_from)
@@ -555,22 +590,6 @@ class ProgramTree(interface.RootEntity):
         return link_updated
 
 
-def _nodes_from_root(root: 'Node') -> List['Node']:
-    nodes = [root]
-    for link in root.children:
-        nodes.extend(_nodes_from_root(link.child))
-    return nodes
-
-
-def _links_from_root(root: 'Node', ignore: Set[EducationGroupTypesEnum] = None) -> List['Link']:
-    links = []
-    for link in root.children:
-        if not ignore or link.parent.node_type not in ignore:
-            links.append(link)
-            links.extend(_links_from_root(link.child, ignore=ignore))
-    return links
-
-
 def build_path(*nodes):
     return '{}'.format(PATH_SEPARATOR).join((str(n.node_id) for n in nodes))
 
@@ -23,25 +23,83 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from typing import List
+from typing import List, Optional, Set, Dict
 
 from django.db.models import F, Value, CharField, QuerySet, Case, When, IntegerField, OuterRef, Subquery
-from django.db.models.functions import Concat
 
 from base.models.entity_version import EntityVersion
 from base.models.enums.active_status import ActiveStatusEnum
 from base.models.enums.education_group_types import EducationGroupTypesEnum, GroupType, TrainingType, MiniTrainingType
+from base.models.enums.learning_component_year_type import LECTURING, PRACTICAL_EXERCISES
+from base.models.enums.learning_container_year_types import LearningContainerYearType
 from base.models.enums.learning_unit_year_periodicity import PeriodicityEnum
+from base.models.enums.quadrimesters import DerogationQuadrimester
 from base.models.enums.schedule_type import ScheduleTypeEnum
+from base.models.learning_component_year import LearningComponentYear
+from base.models.learning_unit_year import LearningUnitYear
 from education_group.models.group_year import GroupYear
 from learning_unit.ddd.repository import load_learning_unit_year
 from program_management.ddd.domain import node
-from program_management.ddd.domain._campus import Campus
 from program_management.models import element
 from program_management.models.enums.node_type import NodeType
 from education_group.models.enums.constraint_type import ConstraintTypes
 
 
+class NodeProjection:
+    """
+        Attributes of the nodes needed by a caller, in addition to the attributes always loaded (see IDENTITY_VALUES).
+        Only the joins and subqueries of these attributes are made, the other attributes keep their default value.
+    """
+
+    def __init__(self, name: str, attributes: Set[str]):
+        self.name = name
+        self.attributes = frozenset(attributes)
+
+    def __contains__(self, attribute: str) -> bool:
+        return attribute in self.attributes
+
+
+# Tree sidebar : code, title and type of the nodes, proposals of the learning units
+TREE_VIEW_PROJECTION = NodeProjection('tree_view', {'proposal_type'})
+# Summaries (excel, ...) : code, titles and credits
+SUMMARY_PROJECTION = NodeProjection('summary', {
+    'credits',
+    'group_title_fr',
+    'group_title_en',
+    'common_title_fr',
+    'specific_title_fr',
+    'common_title_en',
+    'specific_title_en',
+})
+
+IDENTITY_VALUES = ('id', 'type', 'node_type', 'code', 'title', 'year')
+
+# Values needed to build an attribute of the node, in addition to the value named as the attribute (if any)
+_VALUES_BY_ATTRIBUTE = {
+    'teaching_campus': ('teaching_campus_name', 'teaching_campus_university_name'),
+    'title': ('common_title_fr', 'specific_title_fr'),
+}
+
+
+def _build_enum_lookup_table(*enum_classes) -> Dict[str, 'Enum']:
+    """ The last enum class wins when a name is shared """
+    return {enum_member.name: enum_member for enum_class in enum_classes for enum_member in enum_class}
+
+
+# Precomputed once : converting a name to an enum must not scan the enum classes for each node
+_ENUM_LOOKUP_TABLES = {
+    'type': _build_enum_lookup_table(NodeType),
+    'node_type': _build_enum_lookup_table(*EducationGroupTypesEnum.__subclasses__()),
+    'category': _build_enum_lookup_table(MiniTrainingType, TrainingType, GroupType),
+    'periodicity': _build_enum_lookup_table(PeriodicityEnum),
+    'schedule_type': _build_enum_lookup_table(ScheduleTypeEnum),
+    'constraint_type': _build_enum_lookup_table(ConstraintTypes),
+    'offer_status': _build_enum_lookup_table(ActiveStatusEnum),
+    'quadrimester': _build_enum_lookup_table(DerogationQuadrimester),
+    'learning_unit_type': _build_enum_lookup_table(LearningContainerYearType),
+}
+
+
 # TODO: Depracated, must be deleted (use load method type are determined in element)
 def load_by_type(type: NodeType, element_id: int) -> node.Node:
     if type == NodeType.GROUP:
@@ -69,15 +127,19 @@ def load_node_learning_unit_year(node_id: int) -> node.Node:
         raise node.NodeNotFoundException
 
 
-def load(element_id: int) -> node.Node:
+def load(element_id: int, projection: Optional[NodeProjection] = None) -> node.Node:
     try:
-        return load_multiple([element_id])[0]
+        return load_multiple([element_id], projection=projection)[0]
     except IndexError:
         raise node.NodeNotFoundException
 
 
 # TODO :: create a new app group/ddd and move the fetch of Group, GroupYear into this new app? (like learning_unit?)
-def load_multiple(element_ids: List[int]) -> List[node.Node]:
+def load_multiple(element_ids: List[int], projection: Optional[NodeProjection] = None) -> List[node.Node]:
+    """
+        Load the nodes with one query by type of node.
+        With a projection, only the attributes of the projection are loaded (default: all the attributes).
+    """
     qs = element.Element.objects.filter(
         pk__in=element_ids
     ).annotate(
@@ -112,115 +174,116 @@ def load_multiple(element_ids: List[int]) -> List[node.Node]:
 
         nodes_objects += [
             __instanciate_node(**node_data, node_id=elem_grouped[node_data.pop('id')])
-            for node_data in get_method(elem_grouped.keys())
+            for node_data in get_method(elem_grouped.keys(), projection=projection)
         ]
     return nodes_objects
 
 
 def __instanciate_node(**node_attrs):
-    if node_attrs.get('teaching_campus_name'):
-        node_attrs['teaching_campus'] = Campus(
-            name=node_attrs.pop('teaching_campus_name'),
-            university_name=node_attrs.pop('teaching_campus_university_name'),
-        )
     return node.factory.get_node(**__convert_string_to_enum(node_attrs))
 
 
 def __convert_string_to_enum(node_data: dict) -> dict:
-    if node_data.get('node_type'):
-        node_data['node_type'] = convert_node_type_enum(node_data['node_type'])
-    if node_data.get('category'):
-        node_data['category'] = __convert_category_enum(node_data['category'])
-    if node_data.get('periodicity'):
-        node_data['periodicity'] = PeriodicityEnum[node_data['periodicity']]
-    if node_data.get('schedule_type'):
-        node_data['schedule_type'] = ScheduleTypeEnum[node_data['schedule_type']]
-    if node_data.get('constraint_type'):
-        node_data['constraint_type'] = ConstraintTypes[node_data['constraint_type']]
-    if node_data.get('offer_status'):
-        node_data['offer_status'] = ActiveStatusEnum[node_data['offer_status']]
-    node_data['type'] = NodeType[node_data['type']]
+    for attribute, enum_lookup_table in _ENUM_LOOKUP_TABLES.items():
+        value = node_data.get(attribute)
+        if value and isinstance(value, str):
+            node_data[attribute] = enum_lookup_table[value]
     return node_data
 
 
 def convert_node_type_enum(str_node_type: str) -> EducationGroupTypesEnum:
-    enum_node_type = None
-    for sub_enum in EducationGroupTypesEnum.__subclasses__():
-        try:
-            enum_node_type = sub_enum[str_node_type]
-        except KeyError:
-            pass
-    if not enum_node_type:
+    try:
+        return _ENUM_LOOKUP_TABLES['node_type'][str_node_type]
+    except KeyError:
         raise KeyError("Cannot convert '{}' str type to '{}' type".format(str_node_type, EducationGroupTypesEnum))
-    return enum_node_type
 
 
-def __convert_category_enum(category: str):
-    return getattr(GroupType, category, None) or getattr(TrainingType, category, None) or \
-           getattr(MiniTrainingType, category, None)
+def __get_values_to_load(available_values: List[str], projection: Optional[NodeProjection]) -> List[str]:
+    if projection is None:
+        return available_values
+    values_to_load = set()
+    for attribute in set(IDENTITY_VALUES) | projection.attributes:
+        values_to_load.add(attribute)
+        values_to_load.update(_VALUES_BY_ATTRIBUTE.get(attribute, ()))
+    return [value for value in available_values if value in values_to_load]
 
 
-def __load_multiple_node_group_year(node_group_year_ids: List[int]) -> QuerySet:
-    subquery_management_entity = EntityVersion.objects.filter(
-        entity=OuterRef('management_entity'),
-    ).current(
-        OuterRef('academic_year__start_date')
-    ).values('acronym')[:1]
+def __load_multiple_node_group_year(
+        node_group_year_ids: List[int],
+        projection: Optional[NodeProjection] = None
+) -> QuerySet:
+    annotations = {
+        'type': Value(NodeType.GROUP.name, output_field=CharField()),
+        'node_type': F('education_group_type__name'),
+        'category': F('education_group_type__name'),
+        'code': F('partial_acronym'),
+        'title': F('acronym'),
+        'year': F('academic_year__year'),
+        'start_year': F('group__start_year__year'),
+        'end_year': F('group__end_year__year'),
+        'management_entity_acronym': Subquery(
+            EntityVersion.objects.filter(
+                entity=OuterRef('management_entity'),
+            ).current(
+                OuterRef('academic_year__start_date')
+            ).values('acronym')[:1]
+        ),
+        'teaching_campus_name': F('main_teaching_campus__name'),
+        'teaching_campus_university_name': F('main_teaching_campus__organization__name'),
+        'offer_partial_title_fr': F('educationgroupversion__offer__partial_title'),
+        'offer_partial_title_en': F('educationgroupversion__offer__partial_title_english'),
+        'offer_title_fr': F('educationgroupversion__offer__title'),
+        'offer_title_en': F('educationgroupversion__offer__title_english'),
+        'offer_status': F('educationgroupversion__offer__active'),
+        'schedule_type': F('educationgroupversion__offer__schedule_type'),
+        'keywords': F('educationgroupversion__offer__keywords'),
+        'group_title_fr': F('title_fr'),
+        'group_title_en': F('title_en'),
+    }
+    values = __get_values_to_load(
+        [
+            'id',
+            'type',
+            'node_type',
+            'code',
+            'title',
+            'year',
+            'start_year',
+            'end_year',
+            'constraint_type',
+            'min_constraint',
+            'max_constraint',
+            'remark_fr',
+            'remark_en',
+            'credits',
 
-    return GroupYear.objects.filter(pk__in=node_group_year_ids).annotate(
-        type=Value(NodeType.GROUP.name, output_field=CharField()),
-        node_type=F('education_group_type__name'),
-        category=F('education_group_type__name'),
-        code=F('partial_acronym'),
-        title=F('acronym'),
-        year=F('academic_year__year'),
-        start_year=F('group__start_year__year'),
-        end_year=F('group__end_year__year'),
-        management_entity_acronym=Subquery(subquery_management_entity),
-        teaching_campus_name=F('main_teaching_campus__name'),
-        teaching_campus_university_name=F('main_teaching_campus__organization__name'),
-        offer_partial_title_fr=F('educationgroupversion__offer__partial_title'),
-        offer_partial_title_en=F('educationgroupversion__offer__partial_title_english'),
-        offer_title_fr=F('educationgroupversion__offer__title'),
-        offer_title_en=F('educationgroupversion__offer__title_english'),
-        offer_status=F('educationgroupversion__offer__active'),
-        schedule_type=F('educationgroupversion__offer__schedule_type'),
-        keywords=F('educationgroupversion__offer__keywords'),
-        group_title_fr=F('title_fr'),
-        group_title_en=F('title_en'),
-    ).values(
-        'id',
-        'type',
-        'node_type',
-        'code',
-        'title',
-        'year',
-        'start_year',
-        'end_year',
-        'constraint_type',
-        'min_constraint',
-        'max_constraint',
-        'remark_fr',
-        'remark_en',
-        'credits',
-
-        'offer_partial_title_fr',
-        'offer_partial_title_en',
-        'offer_title_fr',
-        'offer_title_en',
-        'group_title_fr',
-        'group_title_en',
-        'schedule_type',
-        'offer_status',
-        'keywords',
-        'category',
-        'management_entity_acronym',
-        'teaching_campus_name',
-        'teaching_campus_university_name',
+            'offer_partial_title_fr',
+            'offer_partial_title_en',
+            'offer_title_fr',
+            'offer_title_en',
+            'group_title_fr',
+            'group_title_en',
+            'schedule_type',
+            'offer_status',
+            'keywords',
+            'category',
+            'management_entity_acronym',
+            'teaching_campus_name',
+            'teaching_campus_university_name',
+        ],
+        projection
     )
+    return GroupYear.objects.filter(pk__in=node_group_year_ids).annotate(
+        **{name: expression for name, expression in annotations.items() if name in values}
+    ).values(*values)
 
 
-def __load_multiple_node_learning_unit_year(node_learning_unit_year_ids: List[int]):
+def __load_multiple_node_learning_unit_year(
+        node_learning_unit_year_ids: List[int],
+        projection: Optional[NodeProjection] = None
+) -> List[dict]:
+    if projection is not None:
+        return __load_multiple_node_learning_unit_year_projection(node_learning_unit_year_ids, projection)
     nodes = []
     for lu in load_learning_unit_year.load_multiple(node_learning_unit_year_ids):
         node_data = {
@@ -245,3 +308,67 @@ def __load_multiple_node_learning_unit_year(node_learning_unit_year_ids: List[in
         }
         nodes.append(node_data)
     return nodes
+
+
+def __load_multiple_node_learning_unit_year_projection(
+        node_learning_unit_year_ids: List[int],
+        projection: NodeProjection
+) -> List[dict]:
+    """ Load only the values of the projection, without building the LearningUnitYear domain objects """
+    subquery_component = LearningComponentYear.objects.filter(learning_unit_year_id=OuterRef('pk'))
+    annotations = {
+        'type': Value(NodeType.LEARNING_UNIT.name, output_field=CharField()),
+        'code': F('acronym'),
+        'year': F('academic_year__year'),
+        'learning_unit_type': F('learning_container_year__container_type'),
+        'proposal_type': F('proposallearningunit__type'),
+        'common_title_fr': F('learning_container_year__common_title'),
+        'specific_title_fr': F('specific_title'),
+        'common_title_en': F('learning_container_year__common_title_english'),
+        'specific_title_en': F('specific_title_english'),
+        'other_remark': F('learning_unit__other_remark'),
+        'volume_total_lecturing': Subquery(
+            subquery_component.filter(type=LECTURING).values('hourly_volume_total_annual')[:1]
+        ),
+        'volume_total_practical': Subquery(
+            subquery_component.filter(type=PRACTICAL_EXERCISES).values('hourly_volume_total_annual')[:1]
+        ),
+    }
+    values = __get_values_to_load(
+        [
+            'id',
+            'type',
+            'code',
+            'year',
+            'learning_unit_type',
+            'proposal_type',
+            'credits',
+            'status',
+            'periodicity',
+            'common_title_fr',
+            'specific_title_fr',
+            'common_title_en',
+            'specific_title_en',
+            'other_remark',
+            'quadrimester',
+            'volume_total_lecturing',
+            'volume_total_practical',
+        ],
+        projection
+    )
+    qs = LearningUnitYear.objects.filter(pk__in=node_learning_unit_year_ids).annotate(
+        **{name: expression for name, expression in annotations.items() if name in values}
+    ).values(*values)
+
+    nodes = []
+    for node_data in qs:
+        node_data['title'] = __get_full_title(node_data['common_title_fr'], node_data['specific_title_fr'])
+        nodes.append(node_data)
+    return nodes
+
+
+def __get_full_title(common_title: Optional[str], specific_title: Optional[str]) -> str:
+    full_title = common_title or ''
+    if specific_title:
+        full_title += ' - {}'.format(specific_title)
+    return full_title
@@ -23,16 +23,20 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import contextlib
+import threading
+from typing import List, Dict, Any, Set, Optional
 
-from typing import List, Dict, Any
+import attr
 
 from base.models import group_element_year
+from base.models.authorized_relationship import AuthorizedRelationshipList
 from base.models.enums.link_type import LinkTypes
 from base.models.enums.quadrimesters import DerogationQuadrimester
 from education_group.models.group_year import GroupYear
 from osis_common.decorators.deprecated import deprecated
 from program_management.ddd.business_types import *
-from program_management.ddd.domain import program_tree
+from program_management.ddd.domain import program_tree, node
 from program_management.ddd.domain.education_group_version_academic_year import EducationGroupVersionAcademicYear
 from program_management.ddd.domain.link import factory as link_factory, LinkIdentity
 from program_management.ddd.domain.prerequisite import NullPrerequisite, Prerequisite
@@ -49,32 +53,98 @@ TreeStructure = List[Dict[GroupElementYearColumnName, Any]]
 
 
 @deprecated  # use ProgramTreeRepository.get() instead
-def load(tree_root_id: int) -> 'ProgramTree':
-    return load_trees([tree_root_id])[0]
+def load(tree_root_id: int, projection: Optional[load_node.NodeProjection] = None) -> 'ProgramTree':
+    return load_trees([tree_root_id], projection=projection)[0]
+
+
+class _TreeIdentityMap(threading.local):
+    """
+    Nodes and links materialised while loading trees, keyed by element id and link key.
+    A subtree which does not depend on the tree it belongs to (no prerequisites) is shared between all trees.
+    """
+    def __init__(self):
+        self.is_active = False
+        self.clear()
+
+    def clear(self):
+        self.nodes = {}  # type: Dict[NodeKey, 'Node']
+        self.links = {}  # type: Dict[LinkKey, 'Link']
+        self.shared_subtrees = {}  # type: Dict[NodeKey, 'Node']
+
+
+_identity_map = _TreeIdentityMap()
+
+
+@contextlib.contextmanager
+def shared_identity_map():
+    """
+    Within this context, each node and link is loaded and instantiated once for all trees loaded.
+    Trees loaded within this context share their instances, so they must be used as read-only.
+    """
+    if _identity_map.is_active:  # Nested context : reuse the outer identity map
+        yield
+        return
+    _identity_map.is_active = True
+    try:
+        yield
+    finally:
+        _identity_map.is_active = False
+        _identity_map.clear()
+
+
+def _get_identity_map(projection: Optional[load_node.NodeProjection] = None) -> _TreeIdentityMap:
+    if _identity_map.is_active and projection is None:  # Nodes of a projection are partial : they can't be shared
+        return _identity_map
+    return _TreeIdentityMap()  # Private to the current load : trees loaded can be modified safely
 
 
 @deprecated  # use ProgramTreeRepository.search() instead
-def load_trees(tree_root_ids: List[int]) -> List['ProgramTree']:
+def load_trees(
+        tree_root_ids: List[int],
+        projection: Optional[load_node.NodeProjection] = None
+) -> List['ProgramTree']:
+    """
+        With a projection, only the attributes of the projection are loaded in the nodes (see load_node.load_multiple).
+        Such trees are read-only summaries : never persist them.
+    """
     trees = []
+    identity_map = _get_identity_map(projection)
     structure = group_element_year.GroupElementYear.objects.get_adjacency_list(tree_root_ids)
-    nodes = __load_tree_nodes(structure)
-    links = __load_tree_links(structure)
+    element_ids = set(tree_root_ids) | set(link['child_id'] for link in structure)
+    __load_missing_nodes(element_ids, identity_map, projection)
+    __load_missing_links(structure, identity_map)
+    nodes = {
+        element_id: identity_map.nodes[element_id] for element_id in element_ids if element_id in identity_map.nodes
+    }
     has_prerequisites = load_prerequisite.load_has_prerequisite_multiple(tree_root_ids, nodes)
     is_prerequisites = load_prerequisite.load_is_prerequisite_multiple(tree_root_ids, nodes)
+    authorized_relationships = load_authorized_relationship.load()
+    structure_by_root = __group_structure_by_root(structure)
     for tree_root_id in tree_root_ids:
-        root_node = load_node.load(tree_root_id)  # TODO : use load_multiple
-        nodes[root_node.pk] = root_node
+        if tree_root_id not in nodes:
+            raise node.NodeNotFoundException
         tree_prerequisites = {
             'has_prerequisite_dict': has_prerequisites.get(tree_root_id) or {},
             'is_prerequisite_dict': is_prerequisites.get(tree_root_id) or {},
         }
-        structure_for_current_root_node = [s for s in structure if s['starting_node_id'] == tree_root_id]
-        tree = __build_tree(root_node, structure_for_current_root_node, nodes, links, tree_prerequisites)
+        tree = __build_tree(
+            tree_root_id,
+            structure_by_root.get(tree_root_id) or [],
+            identity_map,
+            tree_prerequisites,
+            authorized_relationships
+        )
         trees.append(tree)
-        del nodes[root_node.pk]
     return trees
 
 
+def __group_structure_by_root(tree_structure: TreeStructure) -> Dict[TreeRootId, TreeStructure]:
+    structure_by_root = {}  # For performance : avoid to scan the whole structure for each root
+    for s_dict in tree_structure:
+        structure_by_root.setdefault(s_dict['starting_node_id'], []).append(s_dict)
+    return structure_by_root
+
+
 # FIXME :: to move into ProgramTreeRepository.search()
 def load_trees_from_children(
         child_element_ids: list,
@@ -84,10 +154,27 @@ def load_trees_from_children(
     return load_trees(list(root_ids))
 
 
-def __load_tree_nodes(tree_structure: TreeStructure) -> Dict[NodeKey, 'Node']:
-    element_ids = [link['child_id'] for link in tree_structure]
-    nodes_list = load_node.load_multiple(element_ids)
-    return {n.pk: n for n in nodes_list}
+def __load_missing_nodes(
+        element_ids: Set[NodeKey],
+        identity_map: _TreeIdentityMap,
+        projection: Optional[load_node.NodeProjection]
+) -> None:
+    missing_element_ids = [element_id for element_id in element_ids if element_id not in identity_map.nodes]
+    if missing_element_ids:
+        identity_map.nodes.update({n.pk: n for n in load_node.load_multiple(missing_element_ids, projection)})
+
+
+def __load_missing_links(tree_structure: TreeStructure, identity_map: _TreeIdentityMap) -> None:
+    missing_links_structure = [
+        s_dict for s_dict in tree_structure
+        if __build_link_key(s_dict['parent_id'], s_dict['child_id']) not in identity_map.links
+    ]
+    if missing_links_structure:
+        identity_map.links.update(__load_tree_links(missing_links_structure))
+
+
+def __build_link_key(parent_id: int, child_id: int) -> LinkKey:
+    return '_'.join([str(parent_id), str(child_id)])
 
 
 def __convert_link_type_to_enum(link_data: dict) -> None:
@@ -128,8 +215,7 @@ def __load_tree_links(tree_structure: TreeStructure) -> Dict[LinkKey, 'Link']:
         __convert_link_type_to_enum(gey_dict)
         __convert_quadrimester_to_enum(gey_dict)
 
-        tree_id = '_'.join([str(parent_id), str(child_id)])
-        tree_links[tree_id] = link_factory.get_link(parent=None, child=None, **gey_dict)
+        tree_links[__build_link_key(parent_id, child_id)] = link_factory.get_link(parent=None, child=None, **gey_dict)
     return tree_links
 
 
@@ -144,58 +230,109 @@ def __load_tree_prerequisites(
 
 
 def __build_tree(
-        root_node: 'Node',
+        root_node_id: NodeKey,
         tree_structure: TreeStructure,
-        nodes: Dict[NodeKey, 'Node'],
-        links: Dict[LinkKey, 'Link'],
-        prerequisites
+        identity_map: _TreeIdentityMap,
+        prerequisites,
+        authorized_relationships: AuthorizedRelationshipList
 ) -> 'ProgramTree':
     structure_by_parent = {}  # For performance
     for s_dict in tree_structure:
         if s_dict['path']:  # TODO :: Case child_id or parent_id is null - to remove after DB null constraint set
             parent_path = '|'.join(s_dict['path'].split('|')[:-1])
             structure_by_parent.setdefault(parent_path, []).append(s_dict)
-    root_node.children = __build_children(str(root_node.pk), structure_by_parent, nodes, links, prerequisites)
-    tree = program_tree.ProgramTree(root_node, authorized_relationships=load_authorized_relationship.load())
+    root_node = __build_node(
+        root_node_id,
+        str(root_node_id),
+        structure_by_parent,
+        identity_map,
+        prerequisites,
+        __get_tree_specific_node_ids(tree_structure, prerequisites),
+        {}
+    )
+    tree = program_tree.ProgramTree(root_node, authorized_relationships=authorized_relationships)
     return tree
 
 
-def __build_children(
-        root_path: 'Path',
-        map_parent_path_with_tree_structure: Dict['Path', TreeStructure],
-        nodes: Dict[NodeKey, 'Node'],
-        links: Dict[LinkKey, 'Link'],
-        prerequisites
-) -> List['Link']:
-    children = []
-    for child_structure in map_parent_path_with_tree_structure.get(root_path) or []:
-        child_id = child_structure['child_id']
-        parent_id = child_structure['parent_id']
-        child_node = nodes[child_id]
-
-        child_node.children = __build_children(
-            child_structure['path'],
-            map_parent_path_with_tree_structure,
-            nodes,
-            links,
-            prerequisites
-        )
+def __get_tree_specific_node_ids(tree_structure: TreeStructure, prerequisites) -> Set[NodeKey]:
+    """
+    Prerequisites depend on the tree : learning units having prerequisites, and all their ancestors, can't be shared.
+    """
+    node_ids_with_prerequisites = set(prerequisites['has_prerequisite_dict']) | \
+        set(prerequisites['is_prerequisite_dict'])
+    tree_specific_node_ids = set()
+    for s_dict in tree_structure:
+        if s_dict['path'] and s_dict['child_id'] in node_ids_with_prerequisites:
+            tree_specific_node_ids |= set(int(element_id) for element_id in s_dict['path'].split('|'))
+    return tree_specific_node_ids
 
-        if child_node.is_learning_unit():
-            child_node.prerequisite = prerequisites['has_prerequisite_dict'].get(child_node.pk, NullPrerequisite())
-            child_node.is_prerequisite_of = prerequisites['is_prerequisite_dict'].get(child_node.pk, [])
-
-        link_node = links['_'.join([str(parent_id), str(child_node.pk)])]
-        link_node.parent = nodes[parent_id]
-        link_node.child = child_node
-        link_node.entity_id = LinkIdentity(
-            parent_code=link_node.parent.code,
-            child_code=link_node.child.code,
-            parent_year=link_node.parent.year,
-            child_year=link_node.child.year
+
+def __build_node(
+        node_id: NodeKey,
+        node_path: 'Path',
+        map_parent_path_with_tree_structure: Dict['Path', TreeStructure],
+        identity_map: _TreeIdentityMap,
+        prerequisites,
+        tree_specific_node_ids: Set[NodeKey],
+        tree_specific_nodes: Dict[NodeKey, 'Node']
+) -> 'Node':
+    """
+    A node is built once per tree : the same node at several paths of the tree is one instance.
+    """
+    is_shared = node_id not in tree_specific_node_ids
+    built_nodes = identity_map.shared_subtrees if is_shared else tree_specific_nodes
+    if node_id in built_nodes:
+        return built_nodes[node_id]
+
+    node_obj = identity_map.nodes[node_id]
+    is_copy = not is_shared and identity_map is _identity_map
+    if is_copy:
+        # Copy-on-write : the instance shared between trees must not hold data specific to the current tree
+        node_obj = node.factory.deepcopy_node_without_copy_children_recursively(node_obj)
+    built_nodes[node_id] = node_obj
+
+    if node_obj.is_learning_unit():
+        node_obj.prerequisite = prerequisites['has_prerequisite_dict'].get(node_id, NullPrerequisite())
+        node_obj.is_prerequisite_of = prerequisites['is_prerequisite_dict'].get(node_id, [])
+
+    node_obj.children = [
+        __build_link(
+            node_obj,
+            __build_node(
+                child_structure['child_id'],
+                child_structure['path'],
+                map_parent_path_with_tree_structure,
+                identity_map,
+                prerequisites,
+                tree_specific_node_ids,
+                tree_specific_nodes
+            ),
+            identity_map,
+            is_copy
         )
-        children.append(link_node)
-    return children
+        for child_structure in map_parent_path_with_tree_structure.get(node_path) or []
+    ]
+    return node_obj
+
+
+def __build_link(
+        parent_node: 'Node',
+        child_node: 'Node',
+        identity_map: _TreeIdentityMap,
+        is_copy: bool
+) -> 'Link':
+    link_node = identity_map.links[__build_link_key(parent_node.pk, child_node.pk)]
+    if is_copy:
+        link_node = attr.evolve(link_node)
+    link_node.parent = parent_node
+    link_node.child = child_node
+    link_node.entity_id = LinkIdentity(
+        parent_code=link_node.parent.code,
+        child_code=link_node.child.code,
+        parent_year=link_node.parent.year,
+        child_year=link_node.child.year
+    )
+    return link_node
 
 
 #  TODO :: to remove
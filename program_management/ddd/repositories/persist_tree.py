@@ -28,33 +28,57 @@ from typing import List, Set, Dict
 
 from django.db import transaction
 from django.db.models import Q, F
+from django.utils import timezone
 
 from base.models.enums.link_type import LinkTypes
 from base.models.group_element_year import GroupElementYear
 from osis_common.decorators.deprecated import deprecated
 from program_management.ddd.business_types import *
-from program_management.ddd.repositories import _persist_prerequisite
+from program_management.ddd.repositories import _persist_prerequisite, tree_cache
 from program_management.models.element import Element
 
 
 ElementId = int
 
+BULK_BATCH_SIZE = 500
+GROUP_ELEMENT_YEAR_FIELDS = [
+    'relative_credits',
+    'min_credits',
+    'max_credits',
+    'is_mandatory',
+    'block',
+    'access_condition',
+    'comment',
+    'comment_english',
+    'own_comment',
+    'quadrimester_derogation',
+    'link_type',
+    'order',
+]
+
 
 @deprecated  # use ProgramTreeRepository.create() or .update() instead
 @transaction.atomic
 def persist(tree: 'ProgramTree') -> None:
-    __update_or_create_links(tree)
-    __delete_links(tree, tree.root_node)
+    """
+        Apply the changes of the tree as a diff against the database : the links changed are created or updated
+        in bulk and the links detached are deleted by one set-based statement.
+    """
+    changed_parent_ids = __update_or_create_links(tree)
+    deleted_parent_ids = __delete_links(tree)
     _persist_prerequisite.persist(tree)
+    # Bulk statements do not send the model signals : the revisions of the trees must be bumped here
+    tree_cache.bump_revisions({tree.root_node.node_id} | changed_parent_ids | deleted_parent_ids)
 
 
-def __update_or_create_links(tree: 'ProgramTree'):
+def __update_or_create_links(tree: 'ProgramTree') -> Set[ElementId]:
     links_has_changed = [
         link for link in tree.get_all_links() if link.has_changed
     ]
+    if not links_has_changed:
+        return set()
     elements_by_identity = __get_elements_by_node_identity(links_has_changed)
-    for link in links_has_changed:
-        __persist_group_element_year(link, elements_by_identity)
+    return __bulk_update_or_create_group_element_years(links_has_changed, elements_by_identity)
 
 
 def __get_elements_by_node_identity(links_has_changed: List['Link']) -> Dict['NodeIdentity', ElementId]:
@@ -63,14 +87,15 @@ def __get_elements_by_node_identity(links_has_changed: List['Link']) -> Dict['No
     group_elements = __get_elements_as_group(nodes)
     learning_unit_elements = __get_elements_as_learning_unit(nodes)
 
+    group_element_ids = {(elem['code'], elem['year']): elem['pk'] for elem in group_elements}
+    learning_unit_element_ids = {(elem['code'], elem['year']): elem['pk'] for elem in learning_unit_elements}
+
     result = {}
     for node in nodes:
-        elements = group_elements
+        element_ids = group_element_ids
         if node.is_learning_unit():
-            elements = learning_unit_elements
-
-        element = next(elem for elem in elements if elem['code'] == node.code and elem['year'] == node.year)
-        result[node.entity_id] = element['pk']
+            element_ids = learning_unit_element_ids
+        result[node.entity_id] = element_ids[(node.code, node.year)]
 
     return result
 
@@ -97,35 +122,82 @@ def __get_elements_as_learning_unit(nodes: Set['Node']):
     ).values('pk', 'code', 'year')
 
 
-def __persist_group_element_year(link: 'Link', elements_by_identity: Dict['NodeIdentity', ElementId]):
-    group_element_year, _ = GroupElementYear.objects.update_or_create(
-        parent_element_id=elements_by_identity[link.parent.entity_id],
-        child_element_id=elements_by_identity[link.child.entity_id],
-        defaults={
-            'relative_credits': link.relative_credits,
-            'min_credits': link.min_credits,
-            'max_credits': link.max_credits,
-            'is_mandatory': link.is_mandatory,
-            'block': link.block,
-            'access_condition': link.access_condition,
-            'comment': link.comment,
-            'comment_english': link.comment_english,
-            'own_comment': link.own_comment,
-            'quadrimester_derogation': link.quadrimester_derogation.name if link.quadrimester_derogation else None,
-            # FIXME : Find a rules for enum in order to be consistant
-            'link_type': link.link_type.name if isinstance(link.link_type, LinkTypes) else link.link_type,
-            'order': link.order,
-
-        }
+def __bulk_update_or_create_group_element_years(
+        links: List['Link'],
+        elements_by_identity: Dict['NodeIdentity', ElementId]
+) -> Set[ElementId]:
+    links_with_element_ids = [
+        (link, elements_by_identity[link.parent.entity_id], elements_by_identity[link.child.entity_id])
+        for link in links
+    ]
+    parent_ids = {parent_id for _, parent_id, _ in links_with_element_ids}
+    existing_group_element_years = {
+        (group_element_year.parent_element_id, group_element_year.child_element_id): group_element_year
+        for group_element_year in GroupElementYear.objects.filter(
+            parent_element_id__in=parent_ids,
+            child_element_id__in={child_id for _, _, child_id in links_with_element_ids},
+        )
+    }
+
+    group_element_years_to_create = []
+    group_element_years_to_update = []
+    now = timezone.now()
+    for link, parent_id, child_id in links_with_element_ids:
+        group_element_year = existing_group_element_years.get((parent_id, child_id))
+        if group_element_year:
+            group_element_year.changed = now
+            group_element_years_to_update.append(group_element_year)
+        else:
+            group_element_year = GroupElementYear(parent_element_id=parent_id, child_element_id=child_id)
+            if link.order is None:
+                # The order is computed by the model on save : it can't be created in bulk
+                __set_group_element_year_values(group_element_year, link)
+                group_element_year.save()
+                continue
+            group_element_years_to_create.append(group_element_year)
+        __set_group_element_year_values(group_element_year, link)
+
+    GroupElementYear.objects.bulk_update(
+        group_element_years_to_update,
+        GROUP_ELEMENT_YEAR_FIELDS + ['changed'],
+        batch_size=BULK_BATCH_SIZE
     )
+    GroupElementYear.objects.bulk_create(group_element_years_to_create, batch_size=BULK_BATCH_SIZE)
+    return parent_ids
+
+
+def __set_group_element_year_values(group_element_year: GroupElementYear, link: 'Link') -> None:
+    group_element_year.relative_credits = link.relative_credits
+    group_element_year.min_credits = link.min_credits
+    group_element_year.max_credits = link.max_credits
+    group_element_year.is_mandatory = link.is_mandatory
+    group_element_year.block = link.block
+    group_element_year.access_condition = link.access_condition
+    group_element_year.comment = link.comment
+    group_element_year.comment_english = link.comment_english
+    group_element_year.own_comment = link.own_comment
+    group_element_year.quadrimester_derogation = \
+        link.quadrimester_derogation.name if link.quadrimester_derogation else None
+    # FIXME : Find a rules for enum in order to be consistant
+    group_element_year.link_type = link.link_type.name if isinstance(link.link_type, LinkTypes) else link.link_type
+    group_element_year.order = link.order
+
+
+def __delete_links(tree: 'ProgramTree') -> Set[ElementId]:
+    deleted_links = __get_deleted_links(tree.root_node)
+    if not deleted_links:
+        return set()
+    for link in deleted_links:
+        __persist_deleted_prerequisites(tree, link.child)
+    __delete_group_element_years(deleted_links)
+    return {link.parent.node_id for link in deleted_links}
 
 
-def __delete_links(tree: 'ProgramTree', node: 'Node'):
-    for link in node._deleted_children:
-        __persist_deleted_prerequisites(tree, link.child)
-        __delete_group_element_year(link)
+def __get_deleted_links(node: 'Node') -> List['Link']:
+    deleted_links = list(node._deleted_children)
     for link in node.children:
-        __delete_links(tree, link.child)
+        deleted_links += __get_deleted_links(link.child)
+    return deleted_links
 
 
 def __persist_deleted_prerequisites(tree: 'ProgramTree', node: 'Node'):
@@ -136,5 +208,5 @@ def __persist_deleted_prerequisites(tree: 'ProgramTree', node: 'Node'):
             _persist_prerequisite._persist(tree.root_node, child_node)
 
 
-def __delete_group_element_year(link):
-    GroupElementYear.objects.filter(pk=link.pk).delete()
+def __delete_group_element_years(links: List['Link']) -> None:
+    GroupElementYear.objects.filter(pk__in=[link.pk for link in links]).delete()
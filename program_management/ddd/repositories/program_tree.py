@@ -25,22 +25,32 @@
 ##############################################################################
 from typing import Optional, List, Union
 
+from django.db.models import Q
+
 from base.models.group_element_year import GroupElementYear
 from education_group.ddd.command import CreateOrphanGroupCommand, CopyGroupCommand
 from osis_common.ddd import interface
-from osis_common.ddd.interface import Entity
 from program_management.ddd import command
 from program_management.ddd.business_types import *
 from program_management.ddd.domain import exception
-from program_management.ddd.repositories import persist_tree, load_tree, node
+from program_management.ddd.repositories import persist_tree, load_tree, node, tree_cache, load_node
 from program_management.models.element import Element
 
 
 class ProgramTreeRepository(interface.AbstractRepository):
 
     @classmethod
-    def search(cls, entity_ids: Optional[List['ProgramTreeIdentity']] = None, **kwargs) -> List[Entity]:
-        raise NotImplementedError
+    def search(
+            cls,
+            entity_ids: Optional[List['ProgramTreeIdentity']] = None,
+            root_ids: Optional[List[int]] = None,
+            **kwargs
+    ) -> List['ProgramTree']:
+        if entity_ids:
+            root_ids = _search_root_ids_by_entity_ids(entity_ids)
+        if root_ids:
+            return load_tree.load_trees(list(root_ids))
+        return []
 
     @classmethod
     def search_from_children(cls, node_ids: List['NodeIdentity'], **kwargs) -> List['ProgramTree']:
@@ -112,21 +122,37 @@ class ProgramTreeRepository(interface.AbstractRepository):
         return program_tree.entity_id
 
     @classmethod
-    def get(cls, entity_id: 'ProgramTreeIdentity') -> 'ProgramTree':
+    def get(
+            cls,
+            entity_id: 'ProgramTreeIdentity',
+            projection: Optional[load_node.NodeProjection] = None
+    ) -> 'ProgramTree':
         try:
             tree_root_id = Element.objects.get(
                 group_year__partial_acronym=entity_id.code,
                 group_year__academic_year__year=entity_id.year
             ).pk
-            return load_tree.load(tree_root_id)
+            return load_tree.load(tree_root_id, projection=projection)
         except Element.DoesNotExist:
             raise exception.ProgramTreeNotFoundException()
 
 
+def _search_root_ids_by_entity_ids(entity_ids: List['ProgramTreeIdentity']) -> List[int]:
+    filter_search_from = Q()
+    for identity in entity_ids:
+        filter_search_from |= Q(
+            group_year__partial_acronym=identity.code,
+            group_year__academic_year__year=identity.year,
+        )
+    return list(Element.objects.filter(filter_search_from).values_list('pk', flat=True))
+
+
 def _delete_node_content(parent_node: 'Node', delete_node_service: interface.ApplicationService) -> None:
+    tree_cache.bump_revisions([parent_node.node_id])
+    # The links of a level are deleted at once, before checking if their children are still used elsewhere
+    GroupElementYear.objects.filter(pk__in=[link.pk for link in parent_node.children]).delete()
     for link in parent_node.children:
         child_node = link.child
-        GroupElementYear.objects.filter(pk=link.pk).delete()
         try:
             cmd = command.DeleteNodeCommand(
                 code=child_node.code,
@@ -0,0 +1,124 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import functools
+import operator
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.translation import get_language
+
+from base.utils.revisioned_cache import CacheRevision
+from program_management.ddd.business_types import *
+from program_management.ddd.repositories import load_tree, load_node
+from program_management.models.element import Element
+from program_management.models.element_closure import ElementClosure
+
+TREE_CACHE_KEY = 'program_tree_{root_id}_{revision}_{projection}'
+VIEW_CACHE_KEY = 'program_tree_view_{root_id}_{revision}_{language}_{view_name}'
+CACHE_TIMEOUT = 3600  # seconds
+
+
+def _get_root_ids_of_trees_using(element_lookups: Set[Tuple[str, Any]]) -> Set[int]:
+    """
+        The trees using the elements are the trees of the elements and of their ancestors.
+        The lookups notified during the transaction are resolved at once : one query for the elements, one for
+        their ancestors.
+    """
+    values_by_lookup = defaultdict(set)
+    for lookup, value in element_lookups:
+        values_by_lookup[lookup].add(value)
+    element_ids = values_by_lookup.pop('pk', set())
+    if values_by_lookup:
+        elements_filter = functools.reduce(
+            operator.or_,
+            (Q(**{lookup + '__in': values}) for lookup, values in values_by_lookup.items())
+        )
+        element_ids |= set(Element.objects.filter(elements_filter).values_list('pk', flat=True))
+    if not element_ids:
+        return set()
+    ancestor_ids = ElementClosure.objects.filter(descendant_id__in=element_ids).values_list('ancestor_id', flat=True)
+    return element_ids | set(ancestor_ids)
+
+
+tree_revision = CacheRevision('program_tree', resolve_keys=_get_root_ids_of_trees_using)
+
+
+def get_revision(root_id: int) -> str:
+    """ Return the revision of the tree of root_id, shared by all processes through the cache."""
+    return tree_revision.get(root_id)
+
+
+def bump_revisions(element_ids: Iterable[int]) -> None:
+    """ Bump on commit the revision of all the trees using the elements """
+    tree_revision.bump(('pk', element_id) for element_id in element_ids if element_id is not None)
+
+
+def bump_revisions_of_elements(lookup: str, value: Any) -> None:
+    """
+        Bump on commit the revision of all the trees using the elements matching the lookup (e.g. group_year_id).
+        The elements are only looked up on commit : the signals of the rows shown in the trees don't query.
+    """
+    if value is not None:
+        tree_revision.bump([(lookup, value)])
+
+
+def load(tree_root_id: int, projection: Optional[load_node.NodeProjection] = None) -> 'ProgramTree':
+    """
+        Load the tree from the cache of its current revision (see settings.PROGRAM_TREE_CACHE).
+        Use it for reading : a tree to modify must be loaded through the ProgramTreeRepository.
+    """
+    if not settings.PROGRAM_TREE_CACHE or tree_revision.is_bump_pending():
+        return load_tree.load(tree_root_id, projection=projection)
+    key = TREE_CACHE_KEY.format(
+        root_id=tree_root_id,
+        revision=get_revision(tree_root_id),
+        projection=projection.name if projection else 'all',
+    )
+    tree = cache.get(key)
+    if tree is None:
+        tree = load_tree.load(tree_root_id, projection=projection)
+        cache.set(key, tree, CACHE_TIMEOUT)
+    return tree
+
+
+def get_or_build_view(tree_root_id: int, view_name: str, build_view: Callable[[], Any]) -> Any:
+    """ Return the serialized view of the tree from the cache of its current revision and of the active language."""
+    if not settings.PROGRAM_TREE_CACHE or tree_revision.is_bump_pending():
+        return build_view()
+    key = VIEW_CACHE_KEY.format(
+        root_id=tree_root_id,
+        revision=get_revision(tree_root_id),
+        language=get_language(),
+        view_name=view_name,
+    )
+    view = cache.get(key)
+    if view is None:
+        view = build_view()
+        cache.set(key, view, CACHE_TIMEOUT)
+    return view
@@ -23,14 +23,15 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from threading import Thread
-from typing import List
+from typing import List, Optional
 
-import requests
-from django.conf import settings
+from celery.utils import uuid
+from django.core.exceptions import ImproperlyConfigured
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
+from program_management import tasks
+from program_management.business import publication
 from program_management.ddd.business_types import *
 from program_management.ddd.command import PublishProgramTreesVersionUsingNodeCommand, GetProgramTreesFromNodeCommand
 from program_management.ddd.domain.service.get_node_publish_url import GetNodePublishUrl
@@ -42,30 +43,27 @@ def publish_program_trees_using_node(cmd: PublishProgramTreesVersionUsingNodeCom
     cmd = GetProgramTreesFromNodeCommand(code=cmd.code, year=cmd.year)
     program_trees = search_program_trees_using_node_service.search_program_trees_using_node(cmd)
     nodes_to_publish = [program_tree.root_node for program_tree in program_trees]
-    t = Thread(target=_bulk_publish, args=(nodes_to_publish,))
-    t.start()
+    _bulk_publish(nodes_to_publish)
     return [program_tree.entity_id for program_tree in program_trees]
 
 
-def _bulk_publish(nodes: List['NodeGroupYear']) -> None:
-    error_root_nodes_ids = []
-    for node in nodes:
-        publish_url = GetNodePublishUrl.get_url_from_node(node)
-        try:
-            __publish(publish_url)
-        except Exception:
-            error_root_nodes_ids.append(node.entity_id)
+def _bulk_publish(nodes: List['NodeGroupYear']) -> Optional[str]:
+    """
+    The publication task is enqueued when the transaction is committed.
+    :return: The id of the publication task (see publication.get_publication_task_id), None if nothing to publish
+    """
+    try:
+        publish_urls = [GetNodePublishUrl.get_url_from_node(node) for node in nodes]
+    except ImproperlyConfigured:
+        raise PublishNodesException(node_ids=[node.entity_id for node in nodes])
 
-    if error_root_nodes_ids:
-        raise PublishNodesException(node_ids=error_root_nodes_ids)
-
-
-def __publish(publish_url: str):
-    return requests.get(
-        publish_url,
-        headers={"Authorization": settings.ESB_AUTHORIZATION},
-        timeout=settings.REQUESTS_TIMEOUT or 20
-    )
+    publish_urls = publication.exclude_recently_published(publish_urls)
+    if not publish_urls:
+        return None
+    task_id = uuid()
+    publication.store_publication_task(publish_urls, task_id)
+    transaction.on_commit(lambda: tasks.publish_program_trees.apply_async(args=(publish_urls,), task_id=task_id))
+    return task_id
 
 
 class PublishNodesException(Exception):
@@ -24,32 +24,22 @@
 
 import osis_common.ddd.interface
 from base.ddd.utils.business_validator import BusinessValidator
-from base.models.enums.link_type import LinkTypes
-from program_management.ddd.business_types import *
 from program_management.ddd.validators._authorized_relationship import PasteAuthorizedRelationshipValidator
+from program_management.ddd.validators._paste_validation_context import PasteNodeValidationContext
 
 
 class ValidateAuthorizedRelationshipForAllTrees(BusinessValidator):
-    def __init__(
-            self,
-            tree: 'ProgramTree',
-            node_to_paste: 'Node',
-            path: 'Path',
-            tree_repository: 'ProgramTreeRepository'
-    ) -> None:
+    def __init__(self, context: PasteNodeValidationContext) -> None:
         super().__init__()
-        self.tree = tree
-        self.node_to_paste = node_to_paste
-        self.path = path
-        self.tree_repository = tree_repository
+        self.context = context
 
     def validate(self, *args, **kwargs):
-        child_node = self.tree.get_node(self.path)
-        trees = self.tree_repository.search_from_children([child_node.entity_id], link_type=LinkTypes.REFERENCE)
+        child_node = self.context.node_to_paste_into
+        node_to_paste = self.context.node_to_paste
         messages = []
-        for tree in trees:
+        for tree in self.context.trees_using_node_to_paste_into_as_reference:
             for parent_from_reference_link in tree.get_parents_using_node_as_reference(child_node):
-                validator = PasteAuthorizedRelationshipValidator(tree, self.node_to_paste, parent_from_reference_link)
+                validator = PasteAuthorizedRelationshipValidator(tree, node_to_paste, parent_from_reference_link)
                 if not validator.is_valid():
                     for msg in validator.error_messages:
                         messages.append(msg.message)
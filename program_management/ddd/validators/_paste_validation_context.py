@@ -0,0 +1,78 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from typing import List
+
+from django.utils.functional import cached_property
+
+from base.models.enums.link_type import LinkTypes
+from program_management.ddd.business_types import *
+from program_management.ddd.domain import program_tree as program_tree_domain
+
+
+class PasteNodeValidationContext:
+    """
+    Facts shared by the validators of a paste (or check paste) command.
+    Each fact is computed at most once, on first use, so as the validators do not traverse the tree
+    nor load the same trees from the repository again.
+    """
+
+    def __init__(
+            self,
+            tree: 'ProgramTree',
+            node_to_paste: 'Node',
+            path: 'Path',
+            tree_repository: 'ProgramTreeRepository'
+    ):
+        self.tree = tree
+        self.node_to_paste = node_to_paste
+        self.path = path
+        self.tree_repository = tree_repository
+
+    @cached_property
+    def node_to_paste_into(self) -> 'Node':
+        return self.tree.get_node(self.path)
+
+    @cached_property
+    def trees_using_node_to_paste_into_as_reference(self) -> List['ProgramTree']:
+        return self.tree_repository.search_from_children(
+            [self.node_to_paste_into.entity_id],
+            link_type=LinkTypes.REFERENCE
+        )
+
+    @cached_property
+    def node_to_paste_tree(self) -> 'ProgramTree':
+        tree_identity = program_tree_domain.ProgramTreeIdentity(
+            code=self.node_to_paste.code,
+            year=self.node_to_paste.academic_year.year
+        )
+        return self.tree_repository.get(tree_identity)
+
+    @cached_property
+    def trees_2m_using_finalities_to_paste(self) -> List['ProgramTree']:
+        finality_ids = [n.entity_id for n in self.node_to_paste_tree.get_all_finalities()]
+        if not self.node_to_paste.is_finality() and not finality_ids:
+            return []
+        return [tree for tree in self.tree_repository.search_from_children(finality_ids) if tree.is_master_2m()]
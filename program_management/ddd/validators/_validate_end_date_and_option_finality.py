@@ -23,39 +23,27 @@
 # ############################################################################
 import osis_common.ddd.interface
 from base.ddd.utils import business_validator
-from program_management.ddd.business_types import *
-from program_management.ddd.domain import program_tree as program_tree_domain
 from program_management.ddd.validators import _attach_finality_end_date
 from program_management.ddd.validators import _attach_option
+from program_management.ddd.validators._paste_validation_context import PasteNodeValidationContext
 
 
 class ValidateEndDateAndOptionFinality(business_validator.BusinessValidator):
-    def __init__(self, node_to_paste: 'Node', tree_repository: 'ProgramTreeRepository'):
+    def __init__(self, context: PasteNodeValidationContext):
         super().__init__()
-        self.node_to_paste = node_to_paste
-        self.tree_repository = tree_repository
+        self.context = context
 
     def validate(self, *args, **kwargs):
-        tree_identity = program_tree_domain.ProgramTreeIdentity(
-            code=self.node_to_paste.code,
-            year=self.node_to_paste.academic_year.year
-        )
-        tree = self.tree_repository.get(tree_identity)
-        finality_ids = [n.entity_id for n in tree.get_all_finalities()]
+        tree = self.context.node_to_paste_tree
         messages = []
-        if self.node_to_paste.is_finality() or finality_ids:
-            trees_2m = [
-                tree for tree in self.tree_repository.search_from_children(finality_ids)
-                if tree.is_master_2m()
-            ]
-            for tree_2m in trees_2m:
-                validator = _attach_finality_end_date.AttachFinalityEndDateValidator(tree_2m, tree)
-                if not validator.is_valid():
-                    for msg in validator.error_messages:
-                        messages.append(msg.message)
-                validator = _attach_option.AttachOptionsValidator(tree_2m, tree)
-                if not validator.is_valid():
-                    for msg in validator.error_messages:
-                        messages.append(msg.message)
+        for tree_2m in self.context.trees_2m_using_finalities_to_paste:
+            validator = _attach_finality_end_date.AttachFinalityEndDateValidator(tree_2m, tree)
+            if not validator.is_valid():
+                for msg in validator.error_messages:
+                    messages.append(msg.message)
+            validator = _attach_option.AttachOptionsValidator(tree_2m, tree)
+            if not validator.is_valid():
+                for msg in validator.error_messages:
+                    messages.append(msg.message)
         if messages:
             raise osis_common.ddd.interface.BusinessExceptions(messages)
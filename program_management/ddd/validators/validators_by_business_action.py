@@ -48,6 +48,7 @@ from program_management.ddd.validators._infinite_recursivity import InfiniteRecu
 from program_management.ddd.validators._minimum_editable_year import \
     MinimumEditableYearValidator
 from program_management.ddd.validators._node_have_link import NodeHaveLinkValidator
+from program_management.ddd.validators._paste_validation_context import PasteNodeValidationContext
 from program_management.ddd.validators._prerequisite_expression_syntax import PrerequisiteExpressionSyntaxValidator
 from program_management.ddd.validators._prerequisites_items import PrerequisiteItemsValidator
 from program_management.ddd.validators._relative_credits import RelativeCreditsValidator
@@ -66,28 +67,29 @@ class PasteNodeValidatorList(business_validator.BusinessListValidator):
         path = paste_command.path_where_to_paste
         link_type = paste_command.link_type
         block = paste_command.block
+        context = PasteNodeValidationContext(tree, node_to_paste, path, tree_repository)
 
         if node_to_paste.is_group_or_mini_or_training():
             self.validators = [
-                CreateLinkValidatorList(tree.get_node(path), node_to_paste),
-                PasteAuthorizedRelationshipValidator(tree, node_to_paste, tree.get_node(path)),
+                CreateLinkValidatorList(context.node_to_paste_into, node_to_paste),
+                PasteAuthorizedRelationshipValidator(tree, node_to_paste, context.node_to_paste_into),
                 MinimumEditableYearValidator(tree),
                 InfiniteRecursivityTreeValidator(tree, node_to_paste, path),
                 AuthorizedLinkTypeValidator(tree.root_node, node_to_paste, link_type),
                 BlockValidator(block),
-                _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(node_to_paste, tree_repository),
-                ValidateAuthorizedRelationshipForAllTrees(tree, node_to_paste, path, tree_repository)
+                _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(context),
+                ValidateAuthorizedRelationshipForAllTrees(context)
             ]
 
         elif node_to_paste.is_learning_unit():
             self.validators = [
-                CreateLinkValidatorList(tree.get_node(path), node_to_paste),
-                AuthorizedRelationshipLearningUnitValidator(tree, node_to_paste, tree.get_node(path)),
+                CreateLinkValidatorList(context.node_to_paste_into, node_to_paste),
+                AuthorizedRelationshipLearningUnitValidator(tree, node_to_paste, context.node_to_paste_into),
                 MinimumEditableYearValidator(tree),
                 InfiniteRecursivityTreeValidator(tree, node_to_paste, path),
                 AuthorizedLinkTypeValidator(tree.root_node, node_to_paste, link_type),
                 BlockValidator(block),
-                ValidateAuthorizedRelationshipForAllTrees(tree, node_to_paste, path, tree_repository)
+                ValidateAuthorizedRelationshipForAllTrees(context)
             ]
 
         else:
@@ -115,19 +117,20 @@ class CheckPasteNodeValidatorList(business_validator.BusinessListValidator):
             tree_repository: 'ProgramTreeRepository'
     ):
         path = check_paste_command.path_to_paste
+        context = PasteNodeValidationContext(tree, node_to_paste, path, tree_repository)
 
         if node_to_paste.is_group_or_mini_or_training():
             self.validators = [
-                CreateLinkValidatorList(tree.get_node(path), node_to_paste),
+                CreateLinkValidatorList(context.node_to_paste_into, node_to_paste),
                 MinimumEditableYearValidator(tree),
                 InfiniteRecursivityTreeValidator(tree, node_to_paste, path),
-                _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(node_to_paste, tree_repository),
+                _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(context),
             ]
 
         elif node_to_paste.is_learning_unit():
             self.validators = [
-                CreateLinkValidatorList(tree.get_node(path), node_to_paste),
-                AuthorizedRelationshipLearningUnitValidator(tree, node_to_paste, tree.get_node(path)),
+                CreateLinkValidatorList(context.node_to_paste_into, node_to_paste),
+                AuthorizedRelationshipLearningUnitValidator(tree, node_to_paste, context.node_to_paste_into),
                 MinimumEditableYearValidator(tree),
                 InfiniteRecursivityTreeValidator(tree, node_to_paste, path),
             ]
@@ -0,0 +1,124 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+ELEMENT_CLOSURE_PATHS_SQL = """
+    SELECT ancestors.ancestor_id, descendants.descendant_id, SUM(ancestors.path_count * descendants.path_count)
+    FROM (
+        SELECT ancestor_id, path_count FROM program_management_elementclosure WHERE descendant_id = link_parent_id
+        UNION ALL
+        SELECT link_parent_id, 1
+    ) ancestors
+    CROSS JOIN (
+        SELECT descendant_id, path_count FROM program_management_elementclosure WHERE ancestor_id = link_child_id
+        UNION ALL
+        SELECT link_child_id, 1
+    ) descendants
+    GROUP BY ancestors.ancestor_id, descendants.descendant_id
+"""
+
+CREATE_FUNCTIONS_AND_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION add_element_closure_paths(link_parent_id integer, link_child_id integer)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO program_management_elementclosure (ancestor_id, descendant_id, path_count)
+    {paths_sql}
+    ON CONFLICT (ancestor_id, descendant_id)
+    DO UPDATE SET path_count = program_management_elementclosure.path_count + EXCLUDED.path_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION remove_element_closure_paths(link_parent_id integer, link_child_id integer)
+RETURNS void AS $$
+BEGIN
+    UPDATE program_management_elementclosure closure
+    SET path_count = closure.path_count - removed.path_count
+    FROM ({paths_sql}) AS removed(ancestor_id, descendant_id, path_count)
+    WHERE closure.ancestor_id = removed.ancestor_id AND closure.descendant_id = removed.descendant_id;
+
+    DELETE FROM program_management_elementclosure closure
+    WHERE closure.path_count <= 0 AND (
+        closure.descendant_id = link_child_id OR closure.descendant_id IN (
+            SELECT descendant_id FROM program_management_elementclosure WHERE ancestor_id = link_child_id
+        )
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_element_closure()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.parent_element_id IS NOT NULL AND OLD.child_element_id IS NOT NULL THEN
+        PERFORM remove_element_closure_paths(OLD.parent_element_id, OLD.child_element_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.parent_element_id IS NOT NULL AND NEW.child_element_id IS NOT NULL THEN
+        PERFORM add_element_closure_paths(NEW.parent_element_id, NEW.child_element_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER maintain_element_closure_on_insert_or_delete
+AFTER INSERT OR DELETE ON base_groupelementyear
+FOR EACH ROW EXECUTE PROCEDURE maintain_element_closure();
+
+CREATE TRIGGER maintain_element_closure_on_update
+AFTER UPDATE OF parent_element_id, child_element_id ON base_groupelementyear
+FOR EACH ROW
+WHEN (
+    OLD.parent_element_id IS DISTINCT FROM NEW.parent_element_id OR
+    OLD.child_element_id IS DISTINCT FROM NEW.child_element_id
+)
+EXECUTE PROCEDURE maintain_element_closure();
+""".format(paths_sql=ELEMENT_CLOSURE_PATHS_SQL)
+
+DROP_FUNCTIONS_AND_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS maintain_element_closure_on_insert_or_delete ON base_groupelementyear;
+DROP TRIGGER IF EXISTS maintain_element_closure_on_update ON base_groupelementyear;
+DROP FUNCTION IF EXISTS maintain_element_closure();
+DROP FUNCTION IF EXISTS add_element_closure_paths(integer, integer);
+DROP FUNCTION IF EXISTS remove_element_closure_paths(integer, integer);
+"""
+
+FILL_ELEMENT_CLOSURE_SQL = """
+INSERT INTO program_management_elementclosure (ancestor_id, descendant_id, path_count)
+WITH RECURSIVE paths AS (
+    SELECT parent_element_id AS ancestor_id, child_element_id AS descendant_id
+    FROM base_groupelementyear
+    WHERE parent_element_id IS NOT NULL AND child_element_id IS NOT NULL
+
+    UNION ALL
+
+    SELECT paths.ancestor_id, gey.child_element_id
+    FROM paths
+    INNER JOIN base_groupelementyear gey ON gey.parent_element_id = paths.descendant_id
+    WHERE gey.child_element_id IS NOT NULL
+)
+SELECT ancestor_id, descendant_id, COUNT(*)
+FROM paths
+GROUP BY ancestor_id, descendant_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0530_auto_20200818_0805'),
+        ('program_management', '0008_auto_20200826_0835'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElementClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path_count', models.PositiveIntegerField(default=1)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_closures', to='program_management.Element')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_closures', to='program_management.Element')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS_AND_TRIGGERS_SQL, reverse_sql=DROP_FUNCTIONS_AND_TRIGGERS_SQL),
+        migrations.RunSQL(FILL_ELEMENT_CLOSURE_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -1,2 +1,3 @@
 from program_management.models import education_group_version
 from program_management.models import element
+from program_management.models import element_closure
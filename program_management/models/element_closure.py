@@ -0,0 +1,53 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.db import models
+
+from program_management.models.element import Element
+
+
+class ElementClosure(models.Model):
+    """
+        Ancestor/descendant pairs of the element hierarchy built by GroupElementYear.
+        Rows are maintained incrementally by database triggers on base_groupelementyear (see migrations) :
+        'path_count' is the number of distinct paths from the ancestor to the descendant.
+    """
+    ancestor = models.ForeignKey(
+        Element,
+        related_name='descendant_closures',
+        on_delete=models.CASCADE,
+    )
+    descendant = models.ForeignKey(
+        Element,
+        related_name='ancestor_closures',
+        on_delete=models.CASCADE,
+    )
+    path_count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+
+    def __str__(self):
+        return "{} - {}".format(self.ancestor, self.descendant)
@@ -23,15 +23,14 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from typing import List
+from typing import List, Optional
 
 from django.templatetags.static import static
-from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from base.models.enums import link_type
 from base.models.enums.proposal_type import ProposalType
-from base.utils.urls import reverse_with_get
+from base.utils.urls import UrlTemplate
 from program_management.ddd.business_types import *
 from program_management.ddd.domain.node import NodeIdentity
 from program_management.ddd.domain.program_tree import PATH_SEPARATOR
@@ -40,28 +39,64 @@ from program_management.models.enums.node_type import NodeType
 from backoffice.settings.base import LANGUAGE_CODE_EN
 
 
+class TreeUrlTemplates:
+    """ URLs of the tree view, reversed once for all the nodes of a serialization """
+
+    def __init__(self):
+        self.element_identification = UrlTemplate('element_identification', nb_args=2)
+        self.paste = UrlTemplate('tree_paste_node')
+        self.detach = UrlTemplate('tree_detach_node', nb_args=1)
+        self.modify = UrlTemplate('group_element_year_update', nb_args=3)
+        self.quick_search_learning_unit = UrlTemplate('quick_search_learning_unit', nb_args=1)
+        self.quick_search_education_group = UrlTemplate('quick_search_education_group', nb_args=1)
+        self.learning_unit_utilization = UrlTemplate('learning_unit_utilization', nb_args=2)
+
+
+def _get_url_templates(context: dict) -> TreeUrlTemplates:
+    if 'url_templates' not in context:
+        context['url_templates'] = TreeUrlTemplates()
+    return context['url_templates']
+
+
 def serialize_children(
         children: List['Link'],
         path: str,
         tree: 'ProgramTree',
         context=None,
-        nodes_of_tree_versions: List['ProgramTreeVersion'] = None
+        nodes_of_tree_versions: List['ProgramTreeVersion'] = None,
+        depth: Optional[int] = None
 ) -> List[dict]:
+    """
+        Serialize the children until 'depth' levels under path (default: all levels).
+        The group nodes of the last level have 'children' set to True when they have children to load on expand.
+    """
     serialized_children = []
     for link in children:
         child_path = path + PATH_SEPARATOR + str(link.child.pk)
         if link.child.is_learning_unit():
             serialized_node = _leaf_view_serializer(link, child_path, tree, context=context)
         else:
-            serialized_node = _get_node_view_serializer(link, child_path, tree, context, nodes_of_tree_versions)
+            serialized_node = _get_node_view_serializer(
+                link,
+                child_path,
+                tree,
+                context,
+                nodes_of_tree_versions,
+                depth=depth
+            )
         serialized_children.append(serialized_node)
     return serialized_children
 
 
 def _get_node_view_attribute_serializer(link: 'Link', path: 'Path', tree: 'ProgramTree', context=None) -> dict:
+    url_templates = _get_url_templates(context)
+    if tree.allows_learning_unit_child(link.child):
+        quick_search_url_template = url_templates.quick_search_learning_unit
+    else:
+        quick_search_url_template = url_templates.quick_search_education_group
     return {
         'path': path,
-        'href': reverse_with_get('element_identification', args=[link.child.year, link.child.code], get={"path": path}),
+        'href': url_templates.element_identification.format(link.child.year, link.child.code, get={"path": path}),
         'root': context['root'].pk,
         'group_element_year': link.pk,
         'element_id': link.child.pk,
@@ -69,15 +104,10 @@ def _get_node_view_attribute_serializer(link: 'Link', path: 'Path', tree: 'Progr
         'element_code': link.child.code,
         'element_year': link.child.year,
         'title': link.child.code,
-        'paste_url': reverse_with_get('tree_paste_node', get={"path": path}),
-        'detach_url': reverse_with_get('tree_detach_node', args=[context['root'].pk], get={"path": path}),
-        'modify_url': reverse('group_element_year_update', args=[context['root'].pk, link.child.pk, link.pk]),
-        'search_url': reverse_with_get(
-            'quick_search_learning_unit' if tree.allows_learning_unit_child(
-                link.child) else 'quick_search_education_group',
-            args=[link.child.academic_year.year],
-            get={"path": path}
-        ),
+        'paste_url': url_templates.paste.format(get={"path": path}),
+        'detach_url': url_templates.detach.format(context['root'].pk, get={"path": path}),
+        'modify_url': url_templates.modify.format(context['root'].pk, link.child.pk, link.pk),
+        'search_url': quick_search_url_template.format(link.child.academic_year.year, get={"path": path}),
     }
 
 
@@ -86,7 +116,7 @@ def _get_leaf_view_attribute_serializer(link: 'Link', path: str, tree: 'ProgramT
     attrs.update({
         'path': path,
         'icon': None,
-        'href': reverse('learning_unit_utilization', args=[context['root'].pk, link.child.pk]),
+        'href': _get_url_templates(context).learning_unit_utilization.format(context['root'].pk, link.child.pk),
         'paste_url': None,
         'search_url': None,
         'has_prerequisite': link.child.has_prerequisite,
@@ -124,8 +154,20 @@ def _get_node_view_serializer(
         path: str,
         tree: 'ProgramTree',
         context=None,
-        nodes_of_tree_versions: List['ProgramTreeVersion'] = None
+        nodes_of_tree_versions: List['ProgramTreeVersion'] = None,
+        depth: Optional[int] = None
 ) -> dict:
+    if depth is None or depth > 1:
+        children = serialize_children(
+            children=link.child.children,
+            path=path,
+            tree=tree,
+            context=context,
+            nodes_of_tree_versions=nodes_of_tree_versions,
+            depth=depth - 1 if depth else None
+        )
+    else:
+        children = bool(link.child.children)
 
     return {
         'id': path,
@@ -139,13 +181,7 @@ def _get_node_view_serializer(
                      nodes_of_tree_versions
                  )
                  },
-        'children': serialize_children(
-            children=link.child.children,
-            path=path,
-            tree=tree,
-            context=context,
-            nodes_of_tree_versions=nodes_of_tree_versions
-        ),
+        'children': children,
         'a_attr': _get_node_view_attribute_serializer(link, path, tree, context=context),
     }
 
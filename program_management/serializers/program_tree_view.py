@@ -23,7 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from typing import List, Set
+from typing import List, Optional, Set
 
 from django.urls import reverse
 
@@ -33,10 +33,13 @@ from program_management.ddd.business_types import *
 from program_management.ddd.domain.node import NodeIdentity
 from program_management.ddd.repositories.program_tree_version import ProgramTreeVersionRepository
 from program_management.ddd.service.read.search_all_versions_from_root_nodes import search_all_versions_from_root_nodes
-from program_management.serializers.node_view import serialize_children
+from program_management.serializers.node_view import serialize_children, TreeUrlTemplates
 
+# Number of levels embedded in the pages and returned on expand, the deeper ones are loaded on expand
+TREE_VIEW_DEPTH = 3
 
-def program_tree_view_serializer(tree: 'ProgramTree') -> dict:
+
+def program_tree_view_serializer(tree: 'ProgramTree', depth: Optional[int] = None) -> dict:
     path = str(tree.root_node.pk)
 
     return {
@@ -51,8 +54,9 @@ def program_tree_view_serializer(tree: 'ProgramTree') -> dict:
             children=tree.root_node.children,
             path=path,
             tree=tree,
-            context={'root': tree.root_node},
-            nodes_of_tree_versions=_get_version_of_nodes(tree.get_all_nodes())
+            context={'root': tree.root_node, 'url_templates': TreeUrlTemplates()},
+            nodes_of_tree_versions=_get_version_of_nodes(_get_descendants_until_depth(tree.root_node, depth)),
+            depth=depth
         ),
         'a_attr': {
             'href': reverse('element_identification', args=[tree.root_node.year, tree.root_node.code]),
@@ -66,10 +70,33 @@ def program_tree_view_serializer(tree: 'ProgramTree') -> dict:
                 args=[tree.root_node.academic_year.year],
                 get={"path": str(tree.root_node.pk)}
             ),
+            'children_url': reverse('tree_children', args=[tree.root_node.pk]),
         }
     }
 
 
+def program_tree_children_view_serializer(tree: 'ProgramTree', path: str, depth: Optional[int] = None) -> List[dict]:
+    node = tree.get_node(path)
+    return serialize_children(
+        children=node.children,
+        path=path,
+        tree=tree,
+        context={'root': tree.root_node, 'url_templates': TreeUrlTemplates()},
+        nodes_of_tree_versions=_get_version_of_nodes(_get_descendants_until_depth(node, depth)),
+        depth=depth
+    )
+
+
+def _get_descendants_until_depth(node: 'Node', depth: Optional[int]) -> Set['Node']:
+    descendants = set()
+    nodes = [node]
+    while nodes and (depth is None or depth > 0):
+        nodes = [link.child for parent in nodes for link in parent.children if link.child not in descendants]
+        descendants.update(nodes)
+        depth = depth - 1 if depth is not None else None
+    return descendants
+
+
 def _get_version_of_nodes(nodes: Set['Node']) -> List['ProgramTreeVersion']:
     commands = [
         program_management.ddd.command.SearchAllVersionsFromRootNodesCommand(
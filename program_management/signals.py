@@ -23,12 +23,26 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, post_save, post_delete
 from django.dispatch import receiver
 
+from base.models.campus import Campus
+from base.models.education_group_year import EducationGroupYear
+from base.models.entity_version import EntityVersion
+from base.models.group_element_year import GroupElementYear
+from base.models.learning_component_year import LearningComponentYear
+from base.models.learning_container_year import LearningContainerYear
+from base.models.learning_unit import LearningUnit
+from base.models.learning_unit_year import LearningUnitYear
+from base.models.organization import Organization
+from base.models.prerequisite import Prerequisite
+from base.models.prerequisite_item import PrerequisiteItem
+from base.models.proposal_learning_unit import ProposalLearningUnit
 from education_group import publisher
 from education_group.models.group_year import GroupYear
 from osis_common.utils.models import get_object_or_none
+from program_management.ddd.repositories import tree_cache
+from program_management.models.education_group_version import EducationGroupVersion
 from program_management.models.element import Element
 
 
@@ -58,3 +72,72 @@ def delete_element_of_group(sender, group_identity, **kwargs):
         group_year__partial_acronym=group_identity.code,
         group_year__academic_year__year=group_identity.year
     ).delete()
+
+
+@receiver([post_save, post_delete], sender=GroupElementYear)
+def bump_revision_of_trees_using_link(sender, instance, **kwargs):
+    tree_cache.bump_revisions([instance.parent_element_id])
+
+
+@receiver([post_save, post_delete], sender=GroupYear)
+def bump_revision_of_trees_using_group_year(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=LearningUnitYear)
+def bump_revision_of_trees_using_learning_unit_year(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('learning_unit_year_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProposalLearningUnit)
+@receiver([post_save, post_delete], sender=LearningComponentYear)
+def bump_revision_of_trees_using_learning_unit_year_data(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('learning_unit_year_id', instance.learning_unit_year_id)
+
+
+@receiver([post_save, post_delete], sender=LearningContainerYear)
+def bump_revision_of_trees_using_learning_container_year(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('learning_unit_year__learning_container_year_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=LearningUnit)
+def bump_revision_of_trees_using_learning_unit(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('learning_unit_year__learning_unit_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=EducationGroupVersion)
+def bump_revision_of_trees_using_education_group_version(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year_id', instance.root_group_id)
+
+
+@receiver([post_save, post_delete], sender=EducationGroupYear)
+def bump_revision_of_trees_using_education_group_year(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year__educationgroupversion__offer_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Campus)
+def bump_revision_of_trees_using_campus(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year__main_teaching_campus_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def bump_revision_of_trees_using_organization(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year__main_teaching_campus__organization_id', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=EntityVersion)
+def bump_revision_of_trees_using_entity(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year__management_entity_id', instance.entity_id)
+
+
+@receiver([post_save, post_delete], sender=Prerequisite)
+def bump_revision_of_trees_using_prerequisite(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements('group_year__educationgroupversion__id', instance.education_group_version_id)
+
+
+@receiver([post_save, post_delete], sender=PrerequisiteItem)
+def bump_revision_of_trees_using_prerequisite_item(sender, instance, **kwargs):
+    tree_cache.bump_revisions_of_elements(
+        'group_year__educationgroupversion__prerequisite__id',
+        instance.prerequisite_id
+    )
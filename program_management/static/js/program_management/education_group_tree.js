@@ -229,7 +229,17 @@ function initializeJsTree($documentTree, cut_element_url, copy_element_url) {
     $documentTree.jstree({
             "core": {
                 "check_callback": true,
-                "data": tree,
+                "data": function (node, callback) {
+                    // The deepest levels are not in the page, they are loaded when their parent is opened
+                    if (node.id === "#") {
+                        callback.call(this, tree);
+                        return;
+                    }
+                    const instance = this;
+                    $.getJSON(tree.a_attr.children_url, {"path": node.id}, function (children) {
+                        callback.call(instance, children);
+                    });
+                },
             },
             "plugins": [
                 "contextmenu",
@@ -0,0 +1,100 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from program_management.business import publication
+
+
+class StubEsbRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.received_paths.append(self.path)
+        status_codes = self.server.status_codes_by_path.get(self.path) or [200]
+        self.send_response(status_codes.pop(0) if len(status_codes) > 1 else status_codes[0])
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(ESB_AUTHORIZATION="Basic dummy")
+class TestProgramTreePublisher(SimpleTestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StubEsbRequestHandler)
+        self.server.received_paths = []
+        self.server.status_codes_by_path = {}
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.publisher = publication.ProgramTreePublisher(max_workers=2, max_retries=2, backoff_factor=0)
+
+    def _get_url(self, path):
+        return "http://127.0.0.1:{}{}".format(self.server.server_port, path)
+
+    def test_should_publish_all_urls(self):
+        urls = [self._get_url("/tree/{}".format(index)) for index in range(5)]
+
+        results = self.publisher.publish(urls)
+
+        self.assertEqual(results, {'published': urls, 'failed': []})
+        self.assertCountEqual(self.server.received_paths, ["/tree/{}".format(index) for index in range(5)])
+
+    def test_should_retry_on_server_error(self):
+        self.server.status_codes_by_path["/tree"] = [503, 200]
+
+        results = self.publisher.publish([self._get_url("/tree")])
+
+        self.assertEqual(results['published'], [self._get_url("/tree")])
+        self.assertEqual(self.server.received_paths, ["/tree", "/tree"])
+
+    def test_should_report_failed_publication_after_retries(self):
+        self.server.status_codes_by_path["/tree"] = [500]
+
+        results = self.publisher.publish([self._get_url("/tree")])
+
+        self.assertEqual(results['failed'], [self._get_url("/tree")])
+        self.assertEqual(len(self.server.received_paths), 3)
+
+
+class TestExcludeRecentlyPublished(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    def test_should_remove_duplicates(self):
+        self.assertEqual(publication.exclude_recently_published(["url1", "url2", "url1"], window=0), ["url1", "url2"])
+
+    def test_should_exclude_urls_published_within_window(self):
+        publication.exclude_recently_published(["url1"], window=60)
+        self.assertEqual(publication.exclude_recently_published(["url1", "url2"], window=60), ["url2"])
+
+    def test_should_publish_again_forgotten_urls(self):
+        publication.exclude_recently_published(["url1"], window=60)
+        publication.forget_publications(["url1"])
+        self.assertEqual(publication.exclude_recently_published(["url1"], window=60), ["url1"])
@@ -112,6 +112,41 @@ class TestGetNodeProgramTree(SimpleTestCase):
             self.root_node.pk
         )
 
+    def test_get_node_should_find_node_added_after_a_previous_lookup(self):
+        self.tree.get_node(path=str(self.root_node.pk))
+        new_child = NodeGroupYearFactory()
+        self.subgroup_node.add_child(new_child)
+
+        path = build_path(self.root_node, self.subgroup_node, new_child)
+        self.assertEqual(self.tree.get_node(path), new_child)
+        self.assertEqual(self.tree.get_node_by_code_and_year(new_child.code, new_child.year), new_child)
+
+    def test_get_node_should_find_node_appended_directly_to_children_after_a_previous_lookup(self):
+        self.tree.get_node(path=str(self.root_node.pk))
+        new_child = NodeGroupYearFactory()
+        LinkFactory(parent=self.subgroup_node, child=new_child)  # Appended directly to the children list
+
+        path = build_path(self.root_node, self.subgroup_node, new_child)
+        self.assertEqual(self.tree.get_node(path), new_child)
+
+    def test_index_should_be_kept_when_nodes_of_another_tree_change(self):
+        self.tree.get_node(path=str(self.root_node.pk))
+        index = self.tree._index
+        other_link = LinkFactory()
+        other_link.parent.add_child(NodeGroupYearFactory())
+
+        self.tree.get_node(path=str(self.root_node.pk))
+        self.assertIs(self.tree._index, index)
+
+    def test_get_node_should_not_find_node_detached_after_a_previous_lookup(self):
+        path = build_path(self.root_node, self.subgroup_node)
+        self.tree.get_node(path)
+        self.root_node.detach_child(self.subgroup_node)
+
+        with self.assertRaises(node.NodeNotFoundException):
+            self.tree.get_node(path)
+        self.assertIsNone(self.tree.get_link(self.root_node, self.subgroup_node))
+
 
 class TestGetNodeByIdAndTypeProgramTree(SimpleTestCase):
     def setUp(self):
@@ -184,6 +219,18 @@ class TestGetNodePath(SimpleTestCase):
             path_expected
         )
 
+    def test_when_links_are_reordered_after_a_previous_lookup_should_return_new_smallest_ordered_path(self):
+        self.tree.get_node_smallest_ordered_path(self.link_1_1_1.child)
+        self.link_1.order, self.link_2.order = 0, 1
+        self.tree.root_node.up_child(self.link_2.child)
+
+        path = self.tree.get_node_smallest_ordered_path(self.link_1_1_1.child)
+
+        self.assertEqual(
+            path,
+            program_tree.build_path(self.tree.root_node, self.link_2.child, self.link_2_1.child)
+        )
+
 
 class TestGetCNodesByType(SimpleTestCase):
     def setUp(self):
@@ -0,0 +1,81 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import SimpleTestCase, TestCase
+
+from base.models.enums.education_group_types import TrainingType
+from program_management.ddd.repositories import load_node
+from program_management.models.enums.node_type import NodeType
+from program_management.tests.factories.element import ElementGroupYearFactory, ElementLearningUnitYearFactory
+
+
+class TestLoadMultipleWithProjection(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.element_group_year = ElementGroupYearFactory(
+            group_year__education_group_type__name=TrainingType.BACHELOR.name
+        )
+        cls.element_learning_unit_year = ElementLearningUnitYearFactory(
+            learning_unit_year__specific_title='Specific title'
+        )
+
+    def test_should_load_identity_of_group_without_attributes_out_of_projection(self):
+        node = load_node.load(self.element_group_year.pk, projection=load_node.TREE_VIEW_PROJECTION)
+
+        group_year = self.element_group_year.group_year
+        self.assertEqual(node.node_id, self.element_group_year.pk)
+        self.assertEqual(node.code, group_year.partial_acronym)
+        self.assertEqual(node.title, group_year.acronym)
+        self.assertEqual(node.year, group_year.academic_year.year)
+        self.assertEqual(node.node_type, TrainingType.BACHELOR)
+        self.assertIsNone(node.credits)
+        self.assertIsNone(node.group_title_fr)
+
+    def test_should_load_attributes_of_projection(self):
+        node = load_node.load(self.element_group_year.pk, projection=load_node.SUMMARY_PROJECTION)
+
+        self.assertEqual(node.credits, self.element_group_year.group_year.credits)
+        self.assertEqual(node.group_title_fr, self.element_group_year.group_year.title_fr)
+
+    def test_should_load_full_title_of_learning_unit(self):
+        node = load_node.load(self.element_learning_unit_year.pk, projection=load_node.SUMMARY_PROJECTION)
+
+        learning_unit_year = self.element_learning_unit_year.learning_unit_year
+        self.assertEqual(node.type, NodeType.LEARNING_UNIT)
+        self.assertEqual(node.code, learning_unit_year.acronym)
+        self.assertEqual(
+            node.title,
+            "{} - Specific title".format(learning_unit_year.learning_container_year.common_title)
+        )
+        self.assertEqual(node.credits, learning_unit_year.credits)
+
+
+class TestConvertNodeTypeEnum(SimpleTestCase):
+    def test_should_convert_name_to_education_group_type(self):
+        self.assertEqual(load_node.convert_node_type_enum(TrainingType.BACHELOR.name), TrainingType.BACHELOR)
+
+    def test_should_raise_key_error_when_name_unknown(self):
+        with self.assertRaises(KeyError):
+            load_node.convert_node_type_enum('UNKNOWN')
@@ -24,7 +24,9 @@
 #
 ##############################################################################
 import mock
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from base.models.enums import prerequisite_operator
 from base.models.enums.link_type import LinkTypes
@@ -162,6 +164,95 @@ class TestLoadTree(TestCase):
         self.assertIsNone(leaf.proposal_type)
 
 
+class TestSharedIdentityMap(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+            root_node               other_root_node
+            |-link_level_1          |-other_link_level_1
+              |-common_core           |-common_core
+                |-- leaf                |-- leaf
+        """
+        cls.root_node = ElementGroupYearFactory()
+        cls.link_level_1 = GroupElementYearFactory(parent_element=cls.root_node)
+        cls.common_core_link = GroupElementYearFactory(parent_element=cls.link_level_1.child_element)
+        cls.leaf_link = GroupElementYearChildLeafFactory(parent_element=cls.common_core_link.child_element)
+        cls.education_group_version = EducationGroupVersionFactory(root_group=cls.root_node.group_year)
+
+        cls.other_root_node = ElementGroupYearFactory()
+        cls.other_link_level_1 = GroupElementYearFactory(parent_element=cls.other_root_node)
+        GroupElementYearFactory(
+            parent_element=cls.other_link_level_1.child_element,
+            child_element=cls.common_core_link.child_element
+        )
+
+    def _get_common_core(self, tree: program_tree.ProgramTree) -> node.Node:
+        return tree.root_node.children[0].child.children[0].child
+
+    def test_should_share_common_subtree_between_loads_within_context(self):
+        with load_tree.shared_identity_map():
+            tree = load_tree.load(self.root_node.pk)
+            other_tree = load_tree.load(self.other_root_node.pk)
+        self.assertIs(self._get_common_core(tree), self._get_common_core(other_tree))
+
+    def test_should_not_share_instances_between_loads_outside_context(self):
+        tree = load_tree.load(self.root_node.pk)
+        other_tree = load_tree.load(self.other_root_node.pk)
+        self.assertIsNot(self._get_common_core(tree), self._get_common_core(other_tree))
+
+    def test_should_not_query_twice_nodes_already_loaded_within_context(self):
+        with load_tree.shared_identity_map():
+            load_tree.load(self.root_node.pk)
+            with CaptureQueriesContext(connection) as second_load_queries:
+                load_tree.load(self.root_node.pk)
+        with CaptureQueriesContext(connection) as load_outside_context_queries:
+            load_tree.load(self.root_node.pk)
+        self.assertLess(len(second_load_queries), len(load_outside_context_queries))
+
+    def test_should_not_share_subtree_with_prerequisites_specific_to_a_tree(self):
+        PrerequisiteFactory(
+            education_group_version=self.education_group_version,
+            learning_unit_year=self.leaf_link.child_element.learning_unit_year,
+            items__groups=((LearningUnitYearFactory(
+                academic_year=self.leaf_link.child_element.learning_unit_year.academic_year
+            ),),)
+        )
+        with load_tree.shared_identity_map():
+            tree = load_tree.load(self.root_node.pk)
+            other_tree = load_tree.load(self.other_root_node.pk)
+
+        leaf = self._get_common_core(tree).children[0].child
+        other_leaf = self._get_common_core(other_tree).children[0].child
+        self.assertIsNot(leaf, other_leaf)
+        self.assertTrue(leaf.has_prerequisite)
+        self.assertFalse(other_leaf.has_prerequisite)
+
+    def test_should_build_node_with_prerequisites_once_per_tree(self):
+        other_parent_link = GroupElementYearFactory(parent_element=self.root_node)
+        GroupElementYearFactory(
+            parent_element=other_parent_link.child_element,
+            child_element=self.leaf_link.child_element
+        )
+        PrerequisiteFactory(
+            education_group_version=self.education_group_version,
+            learning_unit_year=self.leaf_link.child_element.learning_unit_year,
+            items__groups=((LearningUnitYearFactory(
+                academic_year=self.leaf_link.child_element.learning_unit_year.academic_year
+            ),),)
+        )
+        with load_tree.shared_identity_map():
+            tree_within_context = load_tree.load(self.root_node.pk)
+        tree_outside_context = load_tree.load(self.root_node.pk)
+
+        for tree in (tree_within_context, tree_outside_context):
+            with self.subTest(tree=tree):
+                occurrences = [
+                    link.child for link in tree.get_all_links() if link.child.pk == self.leaf_link.child_element.pk
+                ]
+                self.assertEqual(len(occurrences), 2)
+                self.assertIs(occurrences[0], occurrences[1])
+
+
 class TestLoadTreesFromChildren(TestCase):
 
     @classmethod
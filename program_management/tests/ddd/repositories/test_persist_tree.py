@@ -26,7 +26,9 @@
 from unittest.mock import patch
 from unittest import mock
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from base.models.group_element_year import GroupElementYear
 from base.tests.factories.academic_year import AcademicYearFactory
@@ -105,7 +107,10 @@ class TestPersistTree(TestCase):
             ).exists()
         )
 
-    @patch("program_management.ddd.repositories.persist_tree.__persist_group_element_year")
+    @patch(
+        "program_management.ddd.repositories.persist_tree.__bulk_update_or_create_group_element_years",
+        return_value=set()
+    )
     def test_save_when_link_has_not_changed(self, mock):
         GroupElementYearFactory(parent_element=self.root_group, child_element=self.common_core_element)
         tree = load_tree.load(self.root_node.node_id)
@@ -113,7 +118,10 @@ class TestPersistTree(TestCase):
         assertion_msg = "No changes made, so function GroupelementYear.save() should not have been called"
         self.assertFalse(mock.called, assertion_msg)
 
-    @patch("program_management.ddd.repositories.persist_tree.__persist_group_element_year")
+    @patch(
+        "program_management.ddd.repositories.persist_tree.__bulk_update_or_create_group_element_years",
+        return_value=set()
+    )
     def test_save_when_link_has_changed(self, mock):
         GroupElementYearFactory(parent_element=self.root_group, child_element=self.common_core_element)
         tree = load_tree.load(self.root_node.node_id)
@@ -139,7 +147,49 @@ class TestPersistTree(TestCase):
         persist_tree.persist(tree)
         self.assertEqual(qs_link_will_be_detached.count(), 0)
 
-    @patch("program_management.ddd.repositories.persist_tree.__delete_group_element_year")
+    def test_should_update_values_of_existing_link(self):
+        GroupElementYearFactory(
+            parent_element=self.root_group,
+            child_element=self.common_core_element,
+            relative_credits=5
+        )
+        tree = load_tree.load(self.root_node.node_id)
+        link = tree.root_node.children[0]
+        link.relative_credits = 10
+        link._has_changed = True
+
+        persist_tree.persist(tree)
+
+        self.assertEqual(
+            GroupElementYear.objects.get(
+                parent_element=self.root_group,
+                child_element=self.common_core_element
+            ).relative_credits,
+            10
+        )
+
+    @patch.object(DetachNodeValidatorList, 'validate', return_value=None)
+    def test_should_delete_detached_links_in_one_statement(self, mock_detach):
+        GroupElementYearFactory(parent_element=self.root_group, child_element=self.common_core_element)
+        GroupElementYearFactory(
+            parent_element=self.root_group,
+            child_element__group_year__academic_year=self.root_group.group_year.academic_year
+        )
+        tree = load_tree.load(self.root_node.node_id)
+        for child_node in tree.root_node.children_as_nodes:
+            tree.detach_node("|".join([str(self.root_node.pk), str(child_node.pk)]), mock.Mock())
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            persist_tree.persist(tree)
+
+        delete_statements = [
+            query for query in captured_queries.captured_queries
+            if query['sql'].startswith('DELETE FROM "base_groupelementyear"')
+        ]
+        self.assertEqual(len(delete_statements), 1)
+        self.assertFalse(GroupElementYear.objects.filter(parent_element=self.root_group).exists())
+
+    @patch("program_management.ddd.repositories.persist_tree.__delete_group_element_years")
     def test_delete_when_nothing_has_been_deleted(self, mock):
         GroupElementYearFactory(parent_element=self.root_group, child_element=self.common_core_element)
         tree = load_tree.load(self.root_node.node_id)
@@ -159,7 +209,7 @@ class TestPersistPrerequisites(TestCase):
         mock_persist_prerequisite.assert_called_once_with(tree)
 
     @patch("program_management.ddd.repositories._persist_prerequisite._persist")
-    @patch("program_management.ddd.repositories.persist_tree.__delete_group_element_year")
+    @patch("program_management.ddd.repositories.persist_tree.__delete_group_element_years")
     def test_should_call_persist_prerequisites_on_all_children_when_link_deleted(
             self,
             mock_delete_group_element_year,
@@ -21,7 +21,9 @@
 #  at the root of the source code of this program.  If not,
 #  see http://www.gnu.org/licenses/.
 # ############################################################################
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from mock import Mock
 
 from base.models.enums.education_group_types import TrainingType, GroupType, MiniTrainingType
@@ -114,6 +116,56 @@ class TestSearchTreesFromChildren(TestCase):
         )
 
 
+class TestSearchProgramTrees(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        academic_year = AcademicYearFactory()
+        cls.link_1 = GroupElementYearFactory(
+            parent_element__group_year__academic_year=academic_year,
+            child_element__group_year__academic_year=academic_year
+        )
+        cls.other_tree_link_1 = GroupElementYearFactory(
+            parent_element__group_year__academic_year=academic_year,
+            child_element=cls.link_1.child_element
+        )
+        cls.tree_identities = [
+            ProgramTreeIdentity(
+                code=cls.link_1.parent_element.group_year.partial_acronym,
+                year=academic_year.year
+            ),
+            ProgramTreeIdentity(
+                code=cls.other_tree_link_1.parent_element.group_year.partial_acronym,
+                year=academic_year.year
+            ),
+        ]
+
+    def test_should_return_empty_list_when_no_entity_ids(self):
+        self.assertEqual(ProgramTreeRepository.search(), [])
+
+    def test_should_return_all_trees_matching_entity_ids(self):
+        result = ProgramTreeRepository.search(entity_ids=self.tree_identities)
+
+        self.assertCountEqual(
+            [tree.entity_id for tree in result],
+            self.tree_identities
+        )
+
+    def test_should_share_node_instances_between_trees(self):
+        result = ProgramTreeRepository.search(entity_ids=self.tree_identities)
+
+        shared_children = [tree.root_node.children[0].child for tree in result]
+        self.assertIs(shared_children[0], shared_children[1])
+
+    def test_should_load_trees_with_fixed_number_of_queries(self):
+        with CaptureQueriesContext(connection) as one_tree_queries:
+            ProgramTreeRepository.search(root_ids=[self.link_1.parent_element.pk])
+        with CaptureQueriesContext(connection) as two_trees_queries:
+            ProgramTreeRepository.search(
+                root_ids=[self.link_1.parent_element.pk, self.other_tree_link_1.parent_element.pk]
+            )
+        self.assertEqual(len(one_tree_queries), len(two_trees_queries))
+
+
 class TestDeleteProgramTree(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -0,0 +1,168 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import mock
+from django.test import TestCase, override_settings
+from django.utils.translation import override
+
+from base.tests.factories.group_element_year import GroupElementYearFactory
+from base.tests.factories.proposal_learning_unit import ProposalLearningUnitFactory
+from program_management.ddd.repositories import tree_cache, load_tree
+from program_management.tests.factories.education_group_version import EducationGroupVersionFactory
+from program_management.tests.factories.element import ElementGroupYearFactory, ElementLearningUnitYearFactory
+
+
+class TestTreeRevision(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+            root_element
+            |-link_level_1
+              |-link_level_2
+        """
+        cls.root_element = ElementGroupYearFactory()
+        cls.link_level_1 = GroupElementYearFactory(
+            parent_element=cls.root_element,
+            child_element__group_year__academic_year=cls.root_element.group_year.academic_year
+        )
+        cls.link_level_2 = GroupElementYearFactory(
+            parent_element=cls.link_level_1.child_element,
+            child_element__group_year__academic_year=cls.root_element.group_year.academic_year
+        )
+
+    def test_should_bump_revision_of_ancestors_when_link_changed(self):
+        revision = tree_cache.get_revision(self.root_element.pk)
+
+        self.link_level_2.comment = 'Changed'
+        self.link_level_2.save()
+        tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertNotEqual(tree_cache.get_revision(self.root_element.pk), revision)
+
+    def test_should_keep_revision_when_link_of_another_tree_changed(self):
+        revision = tree_cache.get_revision(self.link_level_2.child_element.pk)
+
+        self.link_level_1.comment = 'Changed'
+        self.link_level_1.save()
+        tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertEqual(tree_cache.get_revision(self.link_level_2.child_element.pk), revision)
+
+    def test_should_bump_revision_when_group_year_of_tree_changed(self):
+        revision = tree_cache.get_revision(self.root_element.pk)
+
+        group_year = self.link_level_2.child_element.group_year
+        group_year.title_fr = 'Changed'
+        group_year.save()
+        tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertNotEqual(tree_cache.get_revision(self.root_element.pk), revision)
+
+    def test_should_bump_revision_when_offer_of_tree_changed(self):
+        version = EducationGroupVersionFactory(root_group=self.link_level_2.child_element.group_year)
+        revision = tree_cache.get_revision(self.root_element.pk)
+
+        version.offer.title = 'Changed'
+        version.offer.save()
+        tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertNotEqual(tree_cache.get_revision(self.root_element.pk), revision)
+
+    def test_should_bump_revision_when_proposal_of_learning_unit_of_tree_changed(self):
+        link = GroupElementYearFactory(
+            parent_element=self.link_level_2.child_element,
+            child_element=ElementLearningUnitYearFactory(
+                learning_unit_year__academic_year=self.root_element.group_year.academic_year
+            )
+        )
+        revision = tree_cache.get_revision(self.root_element.pk)
+
+        ProposalLearningUnitFactory(learning_unit_year=link.child_element.learning_unit_year)
+        tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertNotEqual(tree_cache.get_revision(self.root_element.pk), revision)
+
+    def test_should_look_up_the_elements_once_on_commit(self):
+        revision = tree_cache.get_revision(self.root_element.pk)
+
+        with self.assertNumQueries(0):
+            tree_cache.bump_revisions_of_elements('group_year_id', self.link_level_2.child_element.group_year_id)
+            tree_cache.bump_revisions_of_elements('group_year__partial_acronym', 'UNKNOWN')
+            tree_cache.bump_revisions([self.link_level_1.child_element.pk])
+        with self.assertNumQueries(2):
+            tree_cache.tree_revision.flush()  # Changes are committed
+
+        self.assertNotEqual(tree_cache.get_revision(self.root_element.pk), revision)
+
+
+class TestLoad(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root_element = ElementGroupYearFactory()
+        cls.link = GroupElementYearFactory(
+            parent_element=cls.root_element,
+            child_element__group_year__academic_year=cls.root_element.group_year.academic_year
+        )
+
+    @override_settings(PROGRAM_TREE_CACHE=True)
+    @mock.patch.object(tree_cache.tree_revision, 'is_bump_pending', return_value=False)
+    def test_should_load_tree_once_per_revision(self, mock_is_bump_pending):
+        with mock.patch.object(load_tree, 'load', wraps=load_tree.load) as mock_load:
+            tree = tree_cache.load(self.root_element.pk)
+            self.assertEqual(tree_cache.load(self.root_element.pk), tree)
+            self.assertEqual(mock_load.call_count, 1)
+
+            self.link.comment = 'Changed'
+            self.link.save()
+            tree_cache.tree_revision.flush()  # Changes are committed
+
+            tree_cache.load(self.root_element.pk)
+            self.assertEqual(mock_load.call_count, 2)
+
+    @override_settings(PROGRAM_TREE_CACHE=False)
+    def test_should_always_load_tree_when_cache_disabled(self):
+        with mock.patch.object(load_tree, 'load', wraps=load_tree.load) as mock_load:
+            tree_cache.load(self.root_element.pk)
+            tree_cache.load(self.root_element.pk)
+            self.assertEqual(mock_load.call_count, 2)
+
+    @override_settings(PROGRAM_TREE_CACHE=True)
+    def test_should_always_load_tree_when_changes_of_tree_are_not_committed(self):
+        self.link.comment = 'Changed'
+        self.link.save()
+
+        with mock.patch.object(load_tree, 'load', wraps=load_tree.load) as mock_load:
+            tree_cache.load(self.root_element.pk)
+            tree_cache.load(self.root_element.pk)
+            self.assertEqual(mock_load.call_count, 2)
+
+    @override_settings(PROGRAM_TREE_CACHE=True)
+    @mock.patch.object(tree_cache.tree_revision, 'is_bump_pending', return_value=False)
+    def test_should_build_view_once_per_language(self, mock_is_bump_pending):
+        build_view = mock.Mock(return_value=[])
+        for language in ['fr-be', 'fr-be', 'en']:
+            with override(language):
+                tree_cache.get_or_build_view(self.root_element.pk, 'sidebar', build_view)
+        self.assertEqual(build_view.call_count, 2)
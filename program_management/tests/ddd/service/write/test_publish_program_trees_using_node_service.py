@@ -23,12 +23,15 @@
 # ############################################################################
 from unittest import mock
 
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 
 from base.models.enums.education_group_types import TrainingType, MiniTrainingType
+from program_management.business import publication
 from program_management.ddd import command
 from program_management.ddd.service.write import publish_program_trees_using_node_service
+from program_management.ddd.service.write.publish_program_trees_using_node_service import PublishNodesException
 from program_management.tests.ddd.factories.node import NodeGroupYearFactory
 from program_management.tests.ddd.factories.program_tree import ProgramTreeFactory
 
@@ -59,13 +62,20 @@ class TestPublishProgramTreesUsingNodeService(TestCase):
         )
         self.mocked_get_publish_url = self.get_publish_url_patcher.start()
         self.addCleanup(self.get_publish_url_patcher.stop)
+        self.addCleanup(cache.clear)
 
-    @mock.patch('requests.get', return_value=HttpResponse)
-    @mock.patch('threading.Thread')
-    def test_publish_call_seperate_thread(self, mock_thread, mock_requests_get):
-        mock_thread.start.return_value = True
-        publish_program_trees_using_node_service.publish_program_trees_using_node(self.cmd)
-        self.assertTrue(mock_thread.start)
+    @mock.patch("django.db.transaction.on_commit")
+    @mock.patch("program_management.tasks.publish_program_trees.apply_async")
+    def test_publish_in_celery_task_when_transaction_is_committed(self, mock_apply_async, mock_on_commit):
+        result = publish_program_trees_using_node_service.publish_program_trees_using_node(self.cmd)
+
+        self.assertEqual(result, [self.program_tree.entity_id])
+        self.assertFalse(mock_apply_async.called)
+
+        on_commit_callback = mock_on_commit.call_args[0][0]
+        on_commit_callback()
+        task_id = publication.get_publication_task_id("dummy-url")
+        mock_apply_async.assert_called_once_with(args=(["dummy-url"],), task_id=task_id)
 
 
 class TestBulkPublish(TestCase):
@@ -77,24 +87,41 @@ class TestBulkPublish(TestCase):
         cls.training = NodeGroupYearFactory(node_type=TrainingType.PGRM_MASTER_120)
 
     def setUp(self):
-        self.requests_get_patcher = mock.patch('requests.get', return_value=HttpResponse)
-        self.mocked_requests_get = self.requests_get_patcher.start()
-        self.addCleanup(self.requests_get_patcher.stop)
+        self.apply_async_patcher = mock.patch("program_management.tasks.publish_program_trees.apply_async")
+        self.mocked_apply_async = self.apply_async_patcher.start()
+        self.addCleanup(self.apply_async_patcher.stop)
+
+        self.on_commit_patcher = mock.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+        self.on_commit_patcher.start()
+        self.addCleanup(self.on_commit_patcher.stop)
 
         self.get_publish_url_patcher = mock.patch(
             "program_management.ddd.service.write.publish_program_trees_using_node_service."
             "GetNodePublishUrl.get_url_from_node",
-            return_value="dummy-url"
+            side_effect=lambda node: "url-{}".format(node.code)
         )
         self.mocked_get_publish_url = self.get_publish_url_patcher.start()
         self.addCleanup(self.get_publish_url_patcher.stop)
+        self.addCleanup(cache.clear)
+
+    def test_assert_multiple_publication_in_one_task(self):
+        nodes = [self.minor, self.deepening, self.major, self.training]
+        task_id = publish_program_trees_using_node_service._bulk_publish(nodes)
+        self.mocked_apply_async.assert_called_once_with(
+            args=(["url-{}".format(node.code) for node in nodes],),
+            task_id=task_id
+        )
+        self.assertEqual(publication.get_publication_task_id("url-{}".format(self.minor.code)), task_id)
+
+    def test_should_not_publish_again_a_tree_recently_published(self):
+        publish_program_trees_using_node_service._bulk_publish([self.minor, self.major])
+        publish_program_trees_using_node_service._bulk_publish([self.minor, self.training])
 
-    def test_assert_multiple_publication_call(self):
-        publish_program_trees_using_node_service._bulk_publish([
-            self.minor,
-            self.deepening,
-            self.major,
-            self.training
-        ])
-        self.assertEqual(self.mocked_requests_get.call_count, 4)
+        self.assertEqual(self.mocked_apply_async.call_count, 2)
+        self.assertEqual(self.mocked_apply_async.call_args[1]['args'], (["url-{}".format(self.training.code)],))
 
+    def test_should_raise_exception_when_publication_is_not_configured(self):
+        self.mocked_get_publish_url.side_effect = ImproperlyConfigured
+        with self.assertRaises(PublishNodesException):
+            publish_program_trees_using_node_service._bulk_publish([self.minor])
+        self.assertFalse(self.mocked_apply_async.called)
@@ -0,0 +1,71 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase
+
+from base.models.enums.education_group_types import TrainingType
+from base.models.enums.link_type import LinkTypes
+from program_management.ddd.validators._paste_validation_context import PasteNodeValidationContext
+from program_management.tests.ddd.factories.link import LinkFactory
+from program_management.tests.ddd.factories.node import NodeGroupYearFactory
+from program_management.tests.ddd.factories.program_tree import ProgramTreeFactory
+
+
+class TestPasteNodeValidationContext(SimpleTestCase):
+    def setUp(self):
+        self.tree = ProgramTreeFactory()
+        self.link = LinkFactory(parent=self.tree.root_node)
+        self.path = "|".join([str(self.tree.root_node.pk), str(self.link.child.pk)])
+        self.node_to_paste = NodeGroupYearFactory(node_type=TrainingType.BACHELOR)
+        self.mock_repository = Mock()
+        self.mock_repository.configure_mock(**{
+            "get.return_value": ProgramTreeFactory(root_node=self.node_to_paste),
+            "search_from_children.return_value": [],
+        })
+        self.context = PasteNodeValidationContext(self.tree, self.node_to_paste, self.path, self.mock_repository)
+
+    def test_node_to_paste_into_should_be_node_of_path(self):
+        self.assertEqual(self.context.node_to_paste_into, self.link.child)
+
+    def test_trees_using_node_as_reference_should_be_loaded_once(self):
+        self.context.trees_using_node_to_paste_into_as_reference
+        self.context.trees_using_node_to_paste_into_as_reference
+
+        self.mock_repository.search_from_children.assert_called_once_with(
+            [self.link.child.entity_id],
+            link_type=LinkTypes.REFERENCE
+        )
+
+    def test_node_to_paste_tree_should_be_loaded_once(self):
+        self.context.node_to_paste_tree
+        self.context.trees_2m_using_finalities_to_paste
+
+        self.assertEqual(self.mock_repository.get.call_count, 1)
+
+    def test_trees_2m_should_not_be_searched_when_no_finality_to_paste(self):
+        self.assertListEqual(self.context.trees_2m_using_finalities_to_paste, [])
+        self.assertFalse(self.mock_repository.search_from_children.called)
@@ -31,6 +31,7 @@ from base.models.enums.education_group_types import TrainingType
 from program_management.ddd.validators import _validate_end_date_and_option_finality
 from program_management.ddd.validators._attach_finality_end_date import AttachFinalityEndDateValidator
 from program_management.ddd.validators._attach_option import AttachOptionsValidator
+from program_management.ddd.validators._paste_validation_context import PasteNodeValidationContext
 from program_management.tests.ddd.factories.node import NodeGroupYearFactory
 from program_management.tests.ddd.factories.program_tree import ProgramTreeFactory
 from program_management.tests.ddd.service.mixins import ValidatorPatcherMixin
@@ -47,6 +48,10 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
 
         self.mock_repository = self._mock_repository()
 
+    def _get_validator(self, node_to_paste):
+        context = PasteNodeValidationContext(self.tree_2m, node_to_paste, self.root_path, self.mock_repository)
+        return _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(context)
+
     def _mock_repository(self):
         mock = Mock()
         attrs = {
@@ -60,10 +65,7 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
         self.mock_validator(AttachFinalityEndDateValidator, ['Success message'], level=MessageLevel.SUCCESS)
 
         self.assertValidatorNotRaises(
-            _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(
-                self.node_to_attach_not_finality,
-                self.mock_repository
-            )
+            self._get_validator(self.node_to_attach_not_finality)
         )
         self.assertFalse(self.mock_repository.search_from_children.called)
 
@@ -77,10 +79,7 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
         self.mock_validator(AttachFinalityEndDateValidator, ['Error end date finality message'])
 
         self.assertValidatorRaises(
-            _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(
-                node_to_attach,
-                self.mock_repository
-            ),
+            self._get_validator(node_to_attach),
             ['Error end date finality message']
         )
 
@@ -96,7 +95,7 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
         self.mock_validator(AttachFinalityEndDateValidator, ['Error end date finality message'])
 
         self.assertValidatorRaises(
-            _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(not_finality, self.mock_repository),
+            self._get_validator(not_finality),
             ['Error end date finality message']
         )
 
@@ -110,7 +109,7 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
         self.mock_validator(AttachFinalityEndDateValidator, [_('Success')], level=MessageLevel.SUCCESS)
 
         self.assertValidatorNotRaises(
-            _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(finality, self.mock_repository)
+            self._get_validator(finality)
         )
 
     def test_should_raise_exception_when_option_validator_not_valid(self):
@@ -123,9 +122,6 @@ class TestValidateEndDateAndOptionFinality(TestValidatorValidateMixin, Validator
         self.mock_validator(AttachOptionsValidator, ['Error attach option message'])
 
         self.assertValidatorRaises(
-            _validate_end_date_and_option_finality.ValidateEndDateAndOptionFinality(
-                node_to_attach,
-                self.mock_repository
-            ),
+            self._get_validator(node_to_attach),
             None
         )
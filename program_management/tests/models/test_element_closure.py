@@ -0,0 +1,79 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2019 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import TestCase
+
+from base.tests.factories.group_element_year import GroupElementYearFactory
+from program_management.models.element_closure import ElementClosure
+from program_management.tests.factories.element import ElementGroupYearFactory
+
+
+class TestElementClosure(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+            root
+            |-child
+              |-common_core
+            |-other_child
+              |-common_core
+        """
+        cls.root = ElementGroupYearFactory()
+        cls.link_child = GroupElementYearFactory(parent_element=cls.root)
+        cls.link_other_child = GroupElementYearFactory(parent_element=cls.root)
+        cls.common_core = ElementGroupYearFactory()
+        cls.link_child_common_core = GroupElementYearFactory(
+            parent_element=cls.link_child.child_element,
+            child_element=cls.common_core
+        )
+        cls.link_other_child_common_core = GroupElementYearFactory(
+            parent_element=cls.link_other_child.child_element,
+            child_element=cls.common_core
+        )
+
+    def _get_path_count(self, ancestor, descendant) -> int:
+        return ElementClosure.objects.filter(
+            ancestor=ancestor,
+            descendant=descendant
+        ).values_list('path_count', flat=True).first() or 0
+
+    def test_should_add_ancestors_of_created_link(self):
+        self.assertEqual(self._get_path_count(self.root, self.link_child.child_element), 1)
+        self.assertEqual(self._get_path_count(self.link_child.child_element, self.common_core), 1)
+
+    def test_should_count_all_paths_between_ancestor_and_descendant(self):
+        self.assertEqual(self._get_path_count(self.root, self.common_core), 2)
+
+    def test_should_decrement_paths_when_link_deleted(self):
+        self.link_child_common_core.delete()
+
+        self.assertEqual(self._get_path_count(self.root, self.common_core), 1)
+        self.assertEqual(self._get_path_count(self.link_child.child_element, self.common_core), 0)
+
+    def test_should_remove_descendants_of_detached_child(self):
+        self.link_child_common_core.delete()
+        self.link_other_child_common_core.delete()
+
+        self.assertFalse(ElementClosure.objects.filter(descendant=self.common_core).exists())
@@ -27,7 +27,8 @@ from django.test import TestCase
 from mock import patch
 
 from program_management.ddd.domain.program_tree import ProgramTree
-from program_management.serializers.program_tree_view import program_tree_view_serializer
+from program_management.serializers.program_tree_view import program_tree_view_serializer, \
+    program_tree_children_view_serializer
 from program_management.tests.ddd.factories.link import LinkFactory
 from program_management.tests.ddd.factories.node import NodeGroupYearFactory, NodeLearningUnitYearFactory
 
@@ -76,7 +77,7 @@ class TestProgramTreeViewSerializer(TestCase):
         serialized_data = program_tree_view_serializer(self.tree)
         expected_keys = [
             'element_id', 'element_type', 'element_code', 'element_year', 'href', 'paste_url',
-            'search_url'
+            'search_url', 'children_url'
         ]
 
         self.assertSetEqual(set(serialized_data["a_attr"].keys()), set(expected_keys))
@@ -119,3 +120,23 @@ class TestProgramTreeViewSerializer(TestCase):
         serialized_data = program_tree_view_serializer(self.tree)
         self.assertEqual(serialized_data['text'],
                          "{} - {}{}".format(self.root_node.code, self.root_node.title, "[CEMS]"))
+
+    def test_serialize_program_tree_until_depth(self):
+        serialized_data = program_tree_view_serializer(self.tree, depth=2)
+
+        subgroup1_data = serialized_data['children'][1]
+        subgroup2_data = subgroup1_data['children'][1]
+        self.assertEqual(subgroup2_data['id'], "|".join(str(node.pk) for node in [
+            self.root_node, self.subgroup1, self.subgroup2
+        ]))
+        self.assertIs(subgroup2_data['children'], True)
+
+    def test_serialize_children_of_path(self):
+        path = "|".join([str(self.root_node.pk), str(self.subgroup1.pk)])
+        serialized_data = program_tree_children_view_serializer(self.tree, path, depth=1)
+
+        self.assertListEqual(
+            [child['id'] for child in serialized_data],
+            [path + "|" + str(self.ldroi120b.pk), path + "|" + str(self.subgroup2.pk)]
+        )
+        self.assertIs(serialized_data[1]['children'], True)
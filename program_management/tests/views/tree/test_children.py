@@ -0,0 +1,81 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.http import HttpResponseForbidden, HttpResponseNotFound, HttpResponseNotModified
+from django.test import TestCase
+from django.urls import reverse
+
+from base.tests.factories.group_element_year import GroupElementYearFactory
+from base.tests.factories.person import PersonWithPermissionsFactory
+from base.tests.factories.user import UserFactory
+from program_management.tests.factories.element import ElementGroupYearFactory
+
+
+class TestTreeChildrenView(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = PersonWithPermissionsFactory('view_educationgroup')
+        cls.root_element = ElementGroupYearFactory()
+        cls.link = GroupElementYearFactory(
+            parent_element=cls.root_element,
+            child_element__group_year__academic_year=cls.root_element.group_year.academic_year
+        )
+        cls.url = reverse('tree_children', args=[cls.root_element.pk])
+
+    def setUp(self):
+        self.client.force_login(self.person.user)
+
+    def test_case_user_have_not_permission(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HttpResponseForbidden.status_code)
+
+    def test_should_return_children_of_path(self):
+        response = self.client.get(self.url, data={'path': str(self.root_element.pk)})
+
+        children = response.json()
+        self.assertEqual(len(children), 1)
+        self.assertEqual(children[0]['id'], "{}|{}".format(self.root_element.pk, self.link.child_element.pk))
+
+    def test_should_return_not_found_when_path_not_in_tree(self):
+        response = self.client.get(self.url, data={'path': "{}|0".format(self.root_element.pk)})
+        self.assertEqual(response.status_code, HttpResponseNotFound.status_code)
+
+    def test_should_return_not_modified_when_tree_not_changed(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HttpResponseNotModified.status_code)
+
+    def test_should_change_etag_when_tree_changed(self):
+        etag = self.client.get(self.url)['ETag']
+
+        GroupElementYearFactory(
+            parent_element=self.root_element,
+            child_element__group_year__academic_year=self.root_element.group_year.academic_year
+        )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(response.json()), 2)
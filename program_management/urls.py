@@ -26,6 +26,7 @@
 from django.conf.urls import url
 from django.urls import include, path
 
+import program_management.views.tree.children
 import program_management.views.tree.copy_cut
 import program_management.views.tree_version.check_version_name
 from program_management.views import quick_search, create_element, publish_general_information
@@ -70,6 +71,7 @@ urlpatterns = [
         path('update/', tree.update.UpdateLinkView.as_view(), name='tree_update_link'),
         path('detach/', tree.detach.DetachNodeView.as_view(), name='tree_detach_node'),
         path('move/', tree.paste.PasteNodesView.as_view(), name='group_element_year_move'),
+        path('children/', tree.children.tree_children, name='tree_children'),
         path('<int:link_id>/', include([
             path('up/', tree.move.up, name="group_element_year_up"),
             path('down/', tree.move.down, name="group_element_year_down")
@@ -45,10 +45,10 @@ from base.views.mixins import FlagMixin, AjaxTemplateMixin
 from education_group.models.group_year import GroupYear
 from osis_common.utils.models import get_object_or_none
 from osis_role.contrib.views import AjaxPermissionRequiredMixin
-from program_management.ddd.repositories import load_tree
+from program_management.ddd.repositories import tree_cache
 from program_management.models.enums.node_type import NodeType
 from program_management.ddd.business_types import *
-from program_management.serializers.program_tree_view import program_tree_view_serializer
+from program_management.serializers.program_tree_view import program_tree_view_serializer, TREE_VIEW_DEPTH
 from program_management.ddd.repositories.program_tree_version import ProgramTreeVersionRepository
 from program_management.ddd.domain.service.identity_search import ProgramTreeVersionIdentitySearch
 from program_management.ddd.domain.node import NodeIdentity
@@ -128,7 +128,7 @@ class LearningUnitGeneric(CatalogGenericDetailView, TemplateView):
 
     @cached_property
     def program_tree(self):
-        return load_tree.load(int(self.kwargs['root_element_id']))
+        return tree_cache.load(int(self.kwargs['root_element_id']))
 
     @cached_property
     def node(self):
@@ -159,7 +159,11 @@ class LearningUnitGeneric(CatalogGenericDetailView, TemplateView):
         context['root_id'] = self.program_tree.root_node.pk
         context['parent'] = self.program_tree.root_node
         context['node'] = self.node
-        context['tree'] = json.dumps(program_tree_view_serializer(self.current_version.get_tree()))
+        context['tree'] = json.dumps(tree_cache.get_or_build_view(
+            self.program_tree.root_node.pk,
+            'sidebar',
+            lambda: program_tree_view_serializer(self.current_version.get_tree(), depth=TREE_VIEW_DEPTH)
+        ))
         context['group_to_parent'] = self.request.GET.get("group_to_parent") or '0'
         context['show_prerequisites'] = self.show_prerequisites(self.program_tree.root_node)
         context['selected_element_clipboard'] = self.get_selected_element_for_clipboard()
@@ -0,0 +1,68 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2020 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.translation import get_language
+from django.views.decorators.http import condition, require_http_methods
+
+from education_group.models.group_year import GroupYear
+from osis_role.contrib.views import permission_required
+from program_management.ddd.domain.node import NodeNotFoundException
+from program_management.ddd.repositories import tree_cache, load_node
+from program_management.serializers.program_tree_view import program_tree_children_view_serializer, TREE_VIEW_DEPTH
+
+
+def _get_root_group_year(request, root_id: int) -> GroupYear:
+    return get_object_or_404(GroupYear, element__pk=root_id)
+
+
+def _get_tree_etag(request, root_id: int) -> str:
+    etag_content = "{}|{}|{}".format(root_id, tree_cache.get_revision(root_id), get_language())
+    return hashlib.md5(etag_content.encode()).hexdigest()
+
+
+@login_required
+@require_http_methods(['GET'])
+@permission_required('base.view_educationgroup', fn=_get_root_group_year, raise_exception=True)
+@condition(etag_func=_get_tree_etag)
+def tree_children(request, root_id: int):
+    path = request.GET.get('path', str(root_id))
+    try:
+        children = tree_cache.get_or_build_view(
+            root_id,
+            'children_{}'.format(path),
+            lambda: program_tree_children_view_serializer(
+                tree_cache.load(root_id, projection=load_node.TREE_VIEW_PROJECTION),
+                path,
+                depth=TREE_VIEW_DEPTH
+            )
+        )
+    except NodeNotFoundException:
+        raise Http404
+    return JsonResponse(children, safe=False)
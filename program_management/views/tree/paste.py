@@ -43,6 +43,7 @@ from base.utils.cache import ElementCache
 from base.views.common import display_warning_messages, display_success_messages
 from base.views.mixins import AjaxTemplateMixin
 from education_group.models.group_year import GroupYear
+from osis_role.contrib.permissions import has_perms_for_objects
 from osis_role.contrib.views import PermissionRequiredMixin
 from program_management.ddd.domain import node, link
 from program_management.ddd.repositories import node as node_repository
@@ -63,8 +64,7 @@ class PasteNodesView(PermissionRequiredMixin, AjaxTemplateMixin, SuccessMessageM
             for element_selected in self.nodes_to_paste if element_selected["path_to_detach"]
         ]
         objs_to_detach_from = GroupYear.objects.filter(element__id__in=nodes_to_detach_from)
-        return all(self.request.user.has_perms(("base.can_detach_node",), obj_to_detach)
-                   for obj_to_detach in objs_to_detach_from)
+        return all(has_perms_for_objects(self.request.user, "base.can_detach_node", objs_to_detach_from).values())
 
     def get_permission_object(self) -> GroupYear:
         node_to_paste_to_id = int(self.request.GET['path'].split("|")[-1])